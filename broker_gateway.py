@@ -0,0 +1,499 @@
+"""broker_gateway.py — async order gateway in front of BrokerAdapter.
+
+The BrokerAdapter subclasses in st_pullback_cci wrap synchronous broker
+SDKs, so every ``send_live_entry_order`` / ``send_live_exit_order`` held the
+strategy loop for a full HTTP round-trip and a slow modify could delay an
+exit.  BrokerGateway runs an asyncio loop on its own thread and puts every
+call through:
+
+  * lanes        — ``exit``, ``entry`` and ``modify`` each have their own
+                   worker threads and adapter (session) pool, so an exit
+                   never queues behind a slow modify or chase call
+  * rate limiter — multi-window token bucket sized to the broker's order
+                   limits; entries and modifies leave headroom for exits
+  * retries      — every order carries a client order id (the order tag);
+                   after a failed or timed-out call the gateway looks the id
+                   up before retrying, so a lost acknowledgement cannot
+                   place the order twice
+  * metrics      — per-operation calls / errors / retries and latency
+                   percentiles (``metrics()`` / ``log_metrics()``); call and
+                   order round-trip histograms and per-lane queue depth are
+                   also exported through the metrics module
+
+Coroutines (``place_entry`` / ``place_exit`` / ``modify``) are for async
+callers; the ``*_sync`` wrappers submit to the gateway loop and wait only
+for that call, or at most ``wait`` seconds with the late outcome handed to
+an ``on_late`` callback.  FakeBrokerAdapter is an in-process broker with configurable
+latency and failure injection for tests.
+
+Log tags
+--------
+[GATEWAY]          start / retry / recovered order / metrics summary
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import itertools
+import logging
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple, Union
+
+from metrics import counter, gauge, histogram
+from st_pullback_cci import BrokerAdapter
+
+# Order-API limits as (orders, seconds) windows.
+BROKER_RATE_LIMITS: Dict[str, List[Tuple[int, float]]] = {
+    "FyersAdapter":       [(10, 1.0), (200, 60.0)],
+    "ZerodhaKiteAdapter": [(10, 1.0), (200, 60.0)],
+    "AngelOneAdapter":    [(20, 1.0), (500, 60.0)],
+}
+DEFAULT_RATE_LIMITS: List[Tuple[int, float]] = [(10, 1.0)]
+
+LANES = ("exit", "entry", "modify")
+# Tokens each lane leaves in the bucket for higher-priority lanes.
+LANE_RESERVE = {"exit": 0, "entry": 1, "modify": 2}
+
+MAX_RETRIES = 2
+RETRY_BACKOFF_SEC = 0.25
+CALL_TIMEOUT_SEC = 10.0
+LATENCY_SAMPLES = 1024
+
+_CALL_SECONDS = histogram("gateway_call_seconds", "Broker adapter call latency", ("broker", "op"))
+_CALL_ERRORS = counter("gateway_call_errors_total", "Failed broker adapter calls", ("broker", "op"))
+_ORDER_SECONDS = histogram("gateway_order_seconds",
+                           "Order round trip including lookups and retries", ("broker", "op"))
+_LANE_WAITING = gauge("gateway_lane_waiting", "Calls waiting for a rate token or adapter",
+                      ("broker", "lane"))
+
+
+def rate_limits_for(adapter: BrokerAdapter) -> List[Tuple[int, float]]:
+    """Rate windows for ``adapter`` (ccxt exchanges publish ``rateLimit`` in ms)."""
+    name = type(adapter).__name__
+    if name in BROKER_RATE_LIMITS:
+        return BROKER_RATE_LIMITS[name]
+    exchange = getattr(adapter, "_exchange", None)
+    ms = getattr(exchange, "rateLimit", None)
+    if isinstance(ms, (int, float)) and ms > 0:
+        return [(1, ms / 1000.0)]
+    return DEFAULT_RATE_LIMITS
+
+
+class AsyncRateLimiter:
+    """Token buckets over several windows; ``acquire`` waits for a token in all."""
+
+    def __init__(self, limits: Sequence[Tuple[int, float]], clock=time.monotonic):
+        self._clock = clock
+        now = clock()
+        # [capacity, refill per second, tokens, stamp]
+        self._windows = [[float(n), n / float(sec), float(n), now] for n, sec in limits]
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        for w in self._windows:
+            w[2] = min(w[0], w[2] + (now - w[3]) * w[1])
+            w[3] = now
+
+    def _shortfall(self, reserve: int) -> float:
+        wait = 0.0
+        for cap, rate, tokens, _ in self._windows:
+            need = 1.0 + min(reserve, cap - 1.0)
+            if tokens < need:
+                wait = max(wait, (need - tokens) / rate)
+        return wait
+
+    async def acquire(self, reserve: int = 0) -> float:
+        """Take one token, leaving ``reserve`` tokens; returns seconds waited."""
+        waited = 0.0
+        while True:
+            async with self._lock:
+                self._refill()
+                wait = self._shortfall(reserve)
+                if wait <= 0:
+                    for w in self._windows:
+                        w[2] -= 1.0
+                    return waited
+            await asyncio.sleep(wait)
+            waited += wait
+
+
+@dataclass
+class CallStats:
+    """Per-operation counters and latency samples (ms)."""
+
+    op: str
+    calls: int = 0
+    errors: int = 0
+    retries: int = 0
+    recovered: int = 0
+    rate_wait_ms: float = 0.0
+    max_ms: float = 0.0
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=LATENCY_SAMPLES))
+
+    def record(self, ms: float, ok: bool) -> None:
+        self.calls += 1
+        if not ok:
+            self.errors += 1
+        self.samples.append(ms)
+        self.max_ms = max(self.max_ms, ms)
+
+    def pct(self, q: float) -> float:
+        if not self.samples:
+            return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def as_row(self) -> dict:
+        return {
+            "op": self.op,
+            "calls": self.calls,
+            "errors": self.errors,
+            "retries": self.retries,
+            "recovered": self.recovered,
+            "p50_ms": round(self.pct(0.50), 2),
+            "p95_ms": round(self.pct(0.95), 2),
+            "max_ms": round(self.max_ms, 2),
+            "rate_wait_ms": round(self.rate_wait_ms, 2),
+        }
+
+
+class _Lane:
+    def __init__(self, name: str, adapters: List[BrokerAdapter]):
+        self.name = name
+        self.executor = ThreadPoolExecutor(max_workers=len(adapters), thread_name_prefix=f"gw-{name}")
+        self.idle = list(adapters)
+        self.available: Optional[asyncio.Queue] = None
+
+    def bind(self) -> None:
+        self.available = asyncio.Queue()
+        for adapter in self.idle:
+            self.available.put_nowait(adapter)
+
+
+class BrokerGateway:
+    """Async, rate-limited, retrying front end for a BrokerAdapter."""
+
+    def __init__(
+        self,
+        adapter: Union[BrokerAdapter, Callable[[], BrokerAdapter]],
+        pool_size: int = 2,
+        limits: Optional[Sequence[Tuple[int, float]]] = None,
+        max_retries: int = MAX_RETRIES,
+        backoff: float = RETRY_BACKOFF_SEC,
+        timeout: float = CALL_TIMEOUT_SEC,
+        name: str = "",
+    ):
+        factory = (lambda: adapter) if isinstance(adapter, BrokerAdapter) else adapter
+        self._lanes = {lane: _Lane(lane, [factory() for _ in range(pool_size)]) for lane in LANES}
+        probe = self._lanes["exit"].idle[0]
+        self.name = name or type(probe).__name__
+        self.limits = list(limits or rate_limits_for(probe))
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.supports_cid = "client_order_id" in inspect.signature(probe.place_entry).parameters
+        self.supports_lookup = self.supports_cid and bool(getattr(probe, "supports_lookup", False))
+        self.stats: Dict[str, CallStats] = {}
+        self._seq = itertools.count(1)
+        self._stamp = time.strftime("%H%M%S")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._limiter: Optional[AsyncRateLimiter] = None
+        self._start_lock = threading.Lock()
+
+    # ── lifecycle ─────────────────────────────────────────────────────────
+
+    def start(self) -> "BrokerGateway":
+        with self._start_lock:
+            if self._thread is not None:
+                return self
+            ready = threading.Event()
+            self._loop = asyncio.new_event_loop()
+
+            def _run():
+                asyncio.set_event_loop(self._loop)
+                self._limiter = AsyncRateLimiter(self.limits)
+                for lane in self._lanes.values():
+                    lane.bind()
+                ready.set()
+                self._loop.run_forever()
+
+            self._thread = threading.Thread(target=_run, name=f"gateway-{self.name}", daemon=True)
+            self._thread.start()
+            ready.wait()
+        logging.info(
+            f"[GATEWAY] {self.name} started lanes={list(self._lanes)} limits={self.limits} "
+            f"idempotent_retry={self.supports_lookup}"
+        )
+        return self
+
+    def close(self) -> None:
+        if self._loop is None:
+            return
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join(timeout=5)
+        for lane in self._lanes.values():
+            lane.executor.shutdown(wait=False)
+        self._loop.close()
+        self._loop = self._thread = None
+
+    def submit(self, coro) -> Future:
+        """Schedule ``coro`` on the gateway loop; returns a concurrent Future."""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    # ── core call path ────────────────────────────────────────────────────
+
+    def client_order_id(self, tag: str) -> str:
+        """Alphanumeric order tag: reason prefix + session stamp + sequence."""
+        prefix = re.sub(r"[^A-Za-z0-9]", "", str(tag))[:6].upper() or "ORD"
+        return f"{prefix}{self._stamp}{next(self._seq):05d}"
+
+    def _stats(self, op: str) -> CallStats:
+        st = self.stats.get(op)
+        if st is None:
+            st = self.stats[op] = CallStats(op)
+        return st
+
+    async def _call(self, lane_name: str, op: str, method: str, *args, **kwargs):
+        """One rate-limited adapter call on ``lane_name``; returns (ok, value)."""
+        lane = self._lanes[lane_name]
+        st = self._stats(op)
+        waiting = _LANE_WAITING.labels(self.name, lane_name)
+        waiting.inc()
+        try:
+            st.rate_wait_ms += 1000.0 * await self._limiter.acquire(LANE_RESERVE[lane_name])
+            adapter = await lane.available.get()
+        finally:
+            waiting.dec()
+        t0 = time.perf_counter()
+        fut = self._loop.run_in_executor(lane.executor, partial(getattr(adapter, method), *args, **kwargs))
+        # The adapter goes back to the pool only once its thread is done with it.
+        fut.add_done_callback(lambda _f: lane.available.put_nowait(adapter))
+        try:
+            result = await asyncio.wait_for(asyncio.shield(fut), self.timeout)
+            ok = bool(result[0]) if isinstance(result, tuple) else result is not None
+        except Exception as exc:
+            logging.warning(f"[GATEWAY] {self.name} {op} {type(exc).__name__}: {exc}")
+            result, ok = None, False
+        elapsed = time.perf_counter() - t0
+        st.record(elapsed * 1000.0, ok)
+        _CALL_SECONDS.labels(self.name, op).observe(elapsed)
+        if not ok:
+            _CALL_ERRORS.labels(self.name, op).inc()
+        return ok, result
+
+    async def _order(self, lane: str, op: str, method: str, args: tuple, tag: str) -> Tuple[bool, Optional[str]]:
+        with _ORDER_SECONDS.labels(self.name, op).time():
+            return await self._order_attempts(lane, op, method, args, tag)
+
+    async def _order_attempts(self, lane: str, op: str, method: str, args: tuple, tag: str):
+        cid = self.client_order_id(tag) if self.supports_cid else None
+        kwargs = {"client_order_id": cid} if cid else {}
+        st = self._stats(op)
+        for attempt in range(self.max_retries + 1):
+            ok, result = await self._call(lane, op, method, *args, **kwargs)
+            if ok:
+                return True, result[1]
+            if not self.supports_lookup:
+                # Without a lookup a retry could duplicate the order.
+                return False, None
+            # find_order skips rejected / cancelled orders, so those retry.
+            found_ok, found = await self._call(lane, "find_order", "find_order", cid)
+            if found_ok and found:
+                order_id, status = found
+                st.recovered += 1
+                logging.info(f"[GATEWAY] {self.name} {op} cid={cid} found at broker "
+                             f"id={order_id} status={status}")
+                return True, order_id
+            if attempt < self.max_retries:
+                st.retries += 1
+                delay = self.backoff * (2 ** attempt)
+                logging.warning(f"[GATEWAY] {self.name} {op} cid={cid} retry {attempt + 1} in {delay:.2f}s")
+                await asyncio.sleep(delay)
+        return False, None
+
+    # ── async API ─────────────────────────────────────────────────────────
+
+    async def place_entry(self, symbol: str, qty: int, side_int: int, limit_price: float = 0.0,
+                          stop: float = 0.0, target: float = 0.0, tag: str = "ENTRY"):
+        return await self._order("entry", "place_entry", "place_entry",
+                                 (symbol, qty, side_int, limit_price, stop, target), tag)
+
+    async def place_exit(self, symbol: str, qty: int, reason: str):
+        return await self._order("exit", "place_exit", "place_exit", (symbol, qty, reason), reason)
+
+    async def modify(self, order_id: str, limit_price: float, qty: int):
+        ok, result = await self._call("modify", "modify_order", "modify_order", order_id, limit_price, qty)
+        return (True, result[1]) if ok else (False, None)
+
+    # ── sync facade ───────────────────────────────────────────────────────
+
+    @staticmethod
+    def _settle(fut: Future, wait: Optional[float], on_late: Optional[Callable]):
+        """``fut.result(wait)``; past ``wait`` hand the outcome to ``on_late``.
+
+        With ``on_late`` a call still in flight (retries included) returns
+        ``(None, None)`` and ``on_late(ok, order_id)`` runs on the gateway
+        thread once it settles; without it the timeout propagates.
+        """
+        try:
+            return fut.result(wait)
+        except FutureTimeout:
+            if on_late is None:
+                raise
+
+        def _done(f: Future) -> None:
+            try:
+                ok, order_id = f.result()
+            except Exception:
+                ok, order_id = False, None
+            on_late(ok, order_id)
+
+        fut.add_done_callback(_done)
+        return None, None
+
+    def place_entry_sync(self, *args, wait: Optional[float] = None,
+                         on_late: Optional[Callable] = None, **kwargs):
+        return self._settle(self.submit(self.place_entry(*args, **kwargs)), wait, on_late)
+
+    def place_exit_sync(self, symbol: str, qty: int, reason: str, wait: Optional[float] = None,
+                        on_late: Optional[Callable] = None):
+        return self._settle(self.submit(self.place_exit(symbol, qty, reason)), wait, on_late)
+
+    def modify_sync(self, order_id: str, limit_price: float, qty: int, wait: Optional[float] = None):
+        return self.submit(self.modify(order_id, limit_price, qty)).result(wait)
+
+    # ── metrics ───────────────────────────────────────────────────────────
+
+    def metrics(self) -> List[dict]:
+        return [st.as_row() for st in self.stats.values()]
+
+    def log_metrics(self) -> None:
+        for row in self.metrics():
+            logging.info(
+                f"[GATEWAY] {self.name} op={row['op']} calls={row['calls']} errors={row['errors']} "
+                f"retries={row['retries']} recovered={row['recovered']} p50={row['p50_ms']}ms "
+                f"p95={row['p95_ms']}ms max={row['max_ms']}ms rate_wait={row['rate_wait_ms']}ms"
+            )
+
+
+_GATEWAYS: Dict[str, BrokerGateway] = {}
+
+
+def get_gateway(key: str, factory: Callable[[], BrokerAdapter], **kwargs) -> BrokerGateway:
+    """Process-wide BrokerGateway for ``key`` (created with ``factory`` on first use)."""
+    gw = _GATEWAYS.get(key)
+    if gw is None:
+        gw = _GATEWAYS[key] = BrokerGateway(factory, name=key, **kwargs)
+    return gw
+
+
+def close_gateway(key: str) -> None:
+    """Stop and forget the process-wide gateway for ``key`` (next get_gateway rebuilds it)."""
+    gw = _GATEWAYS.pop(key, None)
+    if gw is not None:
+        gw.close()
+
+
+def log_gateway_metrics() -> None:
+    """Log the metrics of every process-wide gateway."""
+    for gw in _GATEWAYS.values():
+        gw.log_metrics()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Fake broker
+# ─────────────────────────────────────────────────────────────────────────────
+
+class FakeBrokerAdapter(BrokerAdapter):
+    """In-process broker for gateway tests — no network.
+
+    ``latency`` / ``modify_latency`` add a sleep per call; ``fail_next`` makes
+    the next N order calls raise before the order is accepted; ``lose_ack``
+    makes the next N accept the order and then raise, like a timeout after
+    the broker received it; ``reject_next`` books the next N orders as
+    rejected (status 5) and reports the failure.
+    """
+
+    supports_lookup = True
+
+    def __init__(self, latency: float = 0.0, modify_latency: Optional[float] = None,
+                 fail_next: int = 0, lose_ack: int = 0, reject_next: int = 0):
+        self.latency = latency
+        self.modify_latency = latency if modify_latency is None else modify_latency
+        self.fail_next = fail_next
+        self.lose_ack = lose_ack
+        self.reject_next = reject_next
+        self.orders: Dict[str, dict] = {}
+        self.calls: List[Tuple[str, float]] = []
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def _accept(self, kind: str, **order) -> Tuple[bool, Optional[str]]:
+        time.sleep(self.latency)
+        with self._lock:
+            self.calls.append((kind, time.monotonic()))
+            if self.fail_next > 0:
+                self.fail_next -= 1
+                raise ConnectionError("fake broker: connection reset")
+            oid = f"FAKE{next(self._ids):06d}"
+            self.orders[oid] = dict(order, kind=kind, id=oid, status=6)
+            if self.reject_next > 0:
+                self.reject_next -= 1
+                self.orders[oid]["status"] = 5
+                return False, None
+            lost = self.lose_ack > 0
+            if lost:
+                self.lose_ack -= 1
+        if lost:
+            raise TimeoutError("fake broker: acknowledgement lost")
+        return True, oid
+
+    def place_entry(self, symbol, qty, side_int, limit_price=0.0, stop=0.0, target=0.0,
+                    client_order_id=None):
+        return self._accept("entry", symbol=symbol, qty=qty, side=side_int,
+                            limit_price=limit_price, tag=client_order_id)
+
+    def place_exit(self, symbol, qty, reason, client_order_id=None):
+        return self._accept("exit", symbol=symbol, qty=qty, side=-1, reason=reason,
+                            tag=client_order_id)
+
+    def find_order(self, client_order_id):
+        with self._lock:
+            for oid, order in self.orders.items():
+                if client_order_id and order.get("tag") == client_order_id and order["status"] in (2, 6):
+                    return oid, "FILLED" if order["status"] == 2 else "OPEN"
+        return None
+
+    def modify_order(self, order_id, limit_price, qty):
+        time.sleep(self.modify_latency)
+        with self._lock:
+            self.calls.append(("modify", time.monotonic()))
+            order = self.orders.get(order_id)
+            if order is None:
+                return False, None
+            order.update(limit_price=limit_price, qty=qty)
+        return True, order_id
+
+
+__all__ = [
+    "AsyncRateLimiter",
+    "BROKER_RATE_LIMITS",
+    "BrokerGateway",
+    "CallStats",
+    "FakeBrokerAdapter",
+    "close_gateway",
+    "get_gateway",
+    "log_gateway_metrics",
+    "rate_limits_for",
+]
@@ -16,6 +16,10 @@ Usage
     place_st_pullback_entry(..., broker_fn=adapter)
     place_st_pullback_exit(...,  broker_fn=adapter)
 
+    # — or put the adapter behind the async order gateway —
+    gateway = build_broker_gateway()          # one adapter session per worker
+    ok, oid = gateway.place_exit_sync(symbol, qty, "EOD")
+
 Supported brokers
 -----------------
 "fyers"   → :class:`~st_pullback_cci.FyersAdapter`
@@ -97,6 +101,20 @@ def build_broker_adapter(
     return _dispatch[selected]()
 
 
+def build_broker_gateway(
+    broker_override: Optional[str] = None,
+    pool_size: int = 2,
+) -> "BrokerGateway":
+    """Build a :class:`~broker_gateway.BrokerGateway` for the configured broker.
+
+    Each gateway worker gets its own adapter (and so its own SDK session)
+    from :func:`build_broker_adapter`; rate limits follow the broker.
+    """
+    from broker_gateway import BrokerGateway  # noqa: PLC0415
+
+    return BrokerGateway(lambda: build_broker_adapter(broker_override), pool_size=pool_size)
+
+
 # ---------------------------------------------------------------------------
 # Fyers
 # ---------------------------------------------------------------------------
@@ -34,6 +34,12 @@ Usage
                      fixed_paths=["fixed.log"],
                      output_dir="reports/")
 
+    # Intraday: follow a growing log, refreshing P&L / blockers every 5 s
+    #   python dashboard.py live options_trade_engine_2026-03-05.log -n 5
+
+    # Months of replays / sessions from one trade-store scan:
+    #   python dashboard.py history --start 2026-01-01 --mode REPLAY --by month
+
 Log-parsing targets
 -------------------
 [TRADE OPEN][REPLAY|PAPER|LIVE]  — new-format entry fill
@@ -59,18 +65,17 @@ from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
+from equity_curve import EquityCurve, render_equity_curve
+from exit_rules import log_rule_metrics, save_rule_metrics_csv
+
 # ── optional matplotlib (gracefully absent in headless / CI environments) ──
-try:
-    import matplotlib
-    matplotlib.use("Agg")          # non-interactive backend — safe on servers
-    import matplotlib.pyplot as plt
-    import matplotlib.ticker as mticker
-    _MPL_AVAILABLE = True
-except ImportError:
-    _MPL_AVAILABLE = False
+# Plotting lives in equity_curve.py; the flag is re-exported for callers.
+from equity_curve import _MPL_AVAILABLE
 
 logger = logging.getLogger(__name__)
 
+_EQUITY_CURVES: Dict[str, EquityCurve] = {}
+
 # ── Log-line regex patterns ──────────────────────────────────────────────────
 
 # 2024-01-15 09:30:00,123 - INFO - [ENTRY DISPATCH] broker=... symbol=... side=...
@@ -343,6 +348,10 @@ def plot_equity_curve(
 ) -> Optional[Path]:
     """Plot cumulative P&L over the trade sequence and save as PNG.
 
+    The curve is decimated to the chart's pixel width (LTTB, keeping the
+    peak and trough) and the PNG is regenerated only when the trades
+    changed since it was written — see equity_curve.py.
+
     Parameters
     ----------
     df          : DataFrame with at least a ``pnl_points`` column.
@@ -362,44 +371,15 @@ def plot_equity_curve(
         return None
 
     output_path = Path(output_path) if output_path else Path("reports") / "equity_curve.png"
-    output_path.parent.mkdir(parents=True, exist_ok=True)
 
-    pnl    = df["pnl_points"].fillna(0.0)
-    cumsum = pnl.cumsum().reset_index(drop=True)
-    x      = range(1, len(cumsum) + 1)
-
-    fig, ax = plt.subplots(figsize=(10, 4))
-    ax.plot(x, cumsum, linewidth=1.8, color="#2196F3", label="Cumulative P&L")
-    ax.fill_between(x, cumsum, 0,
-                    where=(cumsum >= 0), alpha=0.15, color="green", label="Profit")
-    ax.fill_between(x, cumsum, 0,
-                    where=(cumsum < 0),  alpha=0.15, color="red",   label="Loss")
-    ax.axhline(0, color="black", linewidth=0.8, linestyle="--")
-
-    final_pnl = float(cumsum.iloc[-1]) if len(cumsum) else 0.0
-    color = "green" if final_pnl >= 0 else "red"
-    ax.annotate(
-        f"Final: {final_pnl:+.2f} pts",
-        xy=(len(x), final_pnl),
-        xytext=(-60, 12),
-        textcoords="offset points",
-        fontsize=9,
-        color=color,
-        fontweight="bold",
-    )
-
-    ax.set_title(title, fontsize=13, fontweight="bold")
-    ax.set_xlabel("Trade #")
-    ax.set_ylabel("P&L (points)")
-    ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda v, _: f"{v:+.0f}"))
-    ax.legend(fontsize=8)
-    ax.grid(axis="y", alpha=0.3)
-    fig.tight_layout()
-    fig.savefig(output_path, dpi=150)
-    plt.close(fig)
-
-    logger.info(f"[DASHBOARD] Equity curve saved → {output_path}")
-    return output_path
+    # Curves persist per chart path, so a growing session only appends its
+    # new trades; the PNG itself is reused until the trades change.
+    key = str(output_path.resolve())
+    curve = _EQUITY_CURVES.get(key)
+    if curve is None:
+        curve = _EQUITY_CURVES[key] = EquityCurve()
+    curve.sync(pd.to_numeric(df["pnl_points"], errors="coerce").fillna(0.0).to_numpy(dtype=float))
+    return render_equity_curve(curve, output_path, title=title)
 
 
 # ── CSV report ────────────────────────────────────────────────────────────────
@@ -533,7 +513,9 @@ class SessionDashboard:
 
         Returns
         -------
-        dict with keys ``csv``, ``chart``, ``summary``.
+        dict with keys ``csv``, ``chart``, ``exit_rules``, ``summary``.
+        ``exit_rules`` is the per-rule exit counter CSV (None when no exit
+        checks ran in this process).
         """
         out_dir  = Path(output_dir) if output_dir else Path("reports")
         out_dir.mkdir(parents=True, exist_ok=True)
@@ -544,6 +526,8 @@ class SessionDashboard:
 
         csv_path   = save_report_csv(df, out_dir / f"trades_{tag}.csv") if not df.empty else None
         chart_path = plot_equity_curve(df, output_path=out_dir / f"equity_curve_{tag}.png")
+        rules_path = save_rule_metrics_csv(out_dir / f"exit_rules_{tag}.csv")
+        log_rule_metrics()
 
         print_summary(summary)
         logging.info(
@@ -554,9 +538,10 @@ class SessionDashboard:
         )
 
         return {
-            "csv":     csv_path,
-            "chart":   chart_path,
-            "summary": summary,
+            "csv":        csv_path,
+            "chart":      chart_path,
+            "exit_rules": rules_path,
+            "summary":    summary,
         }
 
 
@@ -732,6 +717,97 @@ def generate_full_report(
     }
 
 
+def store_history_report(
+    store_dir: Optional[str | Path] = None,
+    start: Optional[str] = None,
+    end: Optional[str] = None,
+    modes: Optional[List[str]] = None,
+    by: str = "date",
+    output_dir: str | Path = "reports",
+    top_blockers: int = 10,
+) -> dict:
+    """Multi-session report from one scan of the trade store (see trade_store).
+
+    Produces:
+      history_{by}_{start}_{end}.csv   trades / wins / win rate / P&L per group
+      equity_curve_{start}_{end}.png   cumulative P&L over every stored trade
+
+    Returns
+    -------
+    dict with keys: csv, chart, summary (DataFrame), blockers (Series), trades
+    """
+    from trade_store import TradeStore, get_trade_store
+
+    store = TradeStore(store_dir) if store_dir else get_trade_store()
+    if store is None:
+        raise ValueError("trade store disabled (TRADE_STORE_DIR) and no store_dir given")
+
+    scan = dict(start=start, end=end, modes=modes)
+    trades = store.scan("trades", columns=["entry_time", "pnl_points", "pnl_value"], **scan)
+    trades = trades.sort_values(["date", "entry_time"], kind="stable").reset_index(drop=True)
+    summary = store.trade_summary(by=by, **scan)
+    blockers = store.aggregate("blockers", by="blocker", agg={"count": "sum"}, **scan)
+    blockers = (blockers.set_index("blocker")["count"].sort_values(ascending=False).head(top_blockers)
+                if not blockers.empty else pd.Series(dtype="int64", name="count"))
+
+    out_dir = Path(output_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    span = f"{start or 'first'}_{end or 'last'}"
+    csv_path = save_report_csv(summary, out_dir / f"history_{by}_{span}.csv")
+    chart_path = plot_equity_curve(trades, output_path=out_dir / f"equity_curve_{span}.png",
+                                   title=f"Cumulative P&L (points) {span}")
+
+    logger.info(
+        f"[DASHBOARD_HISTORY] span={span} groups={len(summary)} trades={len(trades)} "
+        f"net_pnl={trades['pnl_points'].sum() if not trades.empty else 0.0:+.1f}pts"
+    )
+    return {"csv": csv_path, "chart": chart_path, "summary": summary,
+            "blockers": blockers, "trades": len(trades)}
+
+
+def format_live_status(session, top_blockers: int = 3) -> str:
+    """One-line intraday status for a (tailed) SessionSummary."""
+    blockers = sorted(session.blocked_counts.items(), key=lambda kv: -kv[1])[:top_blockers]
+    blocked = " ".join(f"{k}={v}" for k, v in blockers) or "-"
+    return (
+        f"[LIVE DASHBOARD] {session.date_tag or '-'} trades={session.total_trades} "
+        f"W/L={session.winners}/{session.losers} win={session.win_rate_pct:.1f}% "
+        f"net={session.net_pnl_pts:+.2f}pts ({session.net_pnl_rs:+.0f}Rs) "
+        f"signals={session.signals_fired} ok={session.entry_ok_count} "
+        f"blocked={session.total_blocked} [{blocked}]"
+    )
+
+
+def watch_session(
+    log_path: str | Path,
+    interval: float = 5.0,
+    iterations: Optional[int] = None,
+    emit=print,
+):
+    """Follow a growing session log and emit a status line every ``interval`` s.
+
+    Uses TailingLogParser, so each refresh reads only the new lines.
+    ``iterations`` bounds the loop (None = until interrupted).  Returns the
+    last SessionSummary.
+    """
+    import time
+    from log_parser import TailingLogParser
+
+    tail = TailingLogParser(log_path)
+    session = None
+    n = 0
+    try:
+        while iterations is None or n < iterations:
+            if n:
+                time.sleep(interval)
+            session = tail.poll()
+            emit(format_live_status(session))
+            n += 1
+    except KeyboardInterrupt:
+        pass
+    return session
+
+
 def _write_text_report(session, output_path: Path) -> Path:
     """Write a human-readable text report for a SessionSummary."""
     output_path.parent.mkdir(parents=True, exist_ok=True)
@@ -1291,6 +1367,8 @@ def compare_sessions(
     baseline_paths: List[str | Path],
     fixed_paths: List[str | Path],
     output_dir: str | Path = "reports",
+    workers: Optional[int] = None,
+    use_cache: bool = True,
 ) -> dict:
     """Compare baseline vs fixed log files and write a comparison report.
 
@@ -1299,6 +1377,9 @@ def compare_sessions(
     baseline_paths : List of log file paths representing the pre-fix baseline.
     fixed_paths    : List of log file paths with P1–P4 fixes active.
     output_dir     : Directory for the comparison report.
+    workers        : Parser process count (default: CPU count).
+    use_cache      : Reuse parsed summaries from ``output_dir/.parse_cache``
+                     for logs that have not changed since they were parsed.
 
     Returns
     -------
@@ -1309,8 +1390,11 @@ def compare_sessions(
     out_dir = Path(output_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    baseline_sessions = parse_multiple(baseline_paths)
-    fixed_sessions    = parse_multiple(fixed_paths)
+    cache_dir = out_dir / ".parse_cache" if use_cache else None
+    all_sessions = parse_multiple(list(baseline_paths) + list(fixed_paths),
+                                  workers=workers, cache_dir=cache_dir)
+    baseline_sessions = all_sessions[:len(baseline_paths)]
+    fixed_sessions    = all_sessions[len(baseline_paths):]
 
     def _aggregate(sessions: List[SessionSummary]) -> dict:
         trades = []
@@ -1634,6 +1718,12 @@ def _build_parser() -> argparse.ArgumentParser:
     rep.add_argument("-o", "--output-dir", default="reports",
                      help="Output directory (default: reports/)")
 
+    # live sub-command
+    live = sub.add_parser("live", help="Follow a growing session log (intraday).")
+    live.add_argument("log", help="Path to the session log file.")
+    live.add_argument("-n", "--interval", type=float, default=5.0,
+                      help="Refresh interval in seconds (default: 5)")
+
     # compare sub-command
     cmp = sub.add_parser("compare", help="Compare baseline vs fixed log files.")
     cmp.add_argument("--baseline", nargs="+", required=True,
@@ -1642,6 +1732,23 @@ def _build_parser() -> argparse.ArgumentParser:
                      help="Fixed log file(s) (P1–P4 active).")
     cmp.add_argument("-o", "--output-dir", default="reports",
                      help="Output directory (default: reports/)")
+    cmp.add_argument("-j", "--workers", type=int, default=None,
+                     help="Parser processes (default: CPU count).")
+    cmp.add_argument("--no-cache", action="store_true",
+                     help="Re-parse every log instead of using the summary cache.")
+
+    # history sub-command
+    hist = sub.add_parser("history", help="Multi-session report from the trade store.")
+    hist.add_argument("--store", default=None,
+                      help="Trade store root (default: TRADE_STORE_DIR or trade_store/).")
+    hist.add_argument("--start", default=None, help="First date, YYYY-MM-DD.")
+    hist.add_argument("--end", default=None, help="Last date, YYYY-MM-DD.")
+    hist.add_argument("--mode", nargs="+", default=None,
+                      help="Modes to include (REPLAY / PAPER / LIVE; default: all).")
+    hist.add_argument("--by", default="date",
+                      help="Group by date, month, symbol, side, exit_reason ... (default: date)")
+    hist.add_argument("-o", "--output-dir", default="reports",
+                      help="Output directory (default: reports/)")
 
     return p
 
@@ -1658,11 +1765,16 @@ def _main(argv=None) -> None:
             if key != "summary" and val:
                 print(f"  {key:<6}: {val}")
 
+    elif args.command == "live":
+        watch_session(args.log, interval=args.interval)
+
     elif args.command == "compare":
         result = compare_sessions(
             baseline_paths=args.baseline,
             fixed_paths=args.fixed,
             output_dir=args.output_dir,
+            workers=args.workers,
+            use_cache=not args.no_cache,
         )
         print(f"\nComparison report: {result['text']}")
         b = result["baseline_summary"]
@@ -1672,6 +1784,21 @@ def _main(argv=None) -> None:
         print(f"  Fixed:    {f['total_trades']} trades, "
               f"{f['win_rate_pct']:.1f}% win, {f['net_pnl_pts']:+.2f} pts")
 
+    elif args.command == "history":
+        result = store_history_report(
+            store_dir=args.store,
+            start=args.start,
+            end=args.end,
+            modes=args.mode,
+            by=args.by,
+            output_dir=args.output_dir,
+        )
+        print(result["summary"].to_string(index=False))
+        if not result["blockers"].empty:
+            print("\nTop blockers:")
+            print(result["blockers"].to_string())
+        print(f"\nHistory report: {result['csv']}")
+
 
 if __name__ == "__main__":
     _main()
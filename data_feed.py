@@ -32,9 +32,13 @@ import pytz
 
 from fyers_apiv3.FyersWebsocket import data_ws, order_ws
 from setup import client_id, access_token, fyers, fyers_async, ticker, symbols, df
-from order_utils import update_order_status, map_status_code
+from order_tracker import get_order_tracker
+from broker_gateway import get_gateway
+from st_pullback_cci import FyersAdapter
 from tickdb import TickDatabase
-from pulse_module import get_pulse_module, PulseModule
+from pulse_module import get_pulse_engine, PulseEngine, PulseModule
+from greeks_surface import get_greeks_surfaces
+from metrics import counter, gauge
 
 # ── ANSI colours ─────────────────────────────────────────────────────────────
 RESET  = "\033[0m"
@@ -63,8 +67,27 @@ spot_price: float = 0.0
 INDEX_SYMBOLS = {"NSE:NIFTY50-INDEX", "NSE:BANKNIFTY-INDEX", "NSE:FINNIFTY-INDEX"}
 
 # ── Pulse Module (Tick-Rate Momentum) ────────────────────────────────────────
-# Initialize the global pulse module for tick-rate momentum calculation
-pulse: PulseModule = get_pulse_module()
+# Global per-symbol pulse engine for tick-rate momentum calculation
+pulse: PulseEngine = get_pulse_engine()
+
+# ── Metrics (scraped via metrics.start_metrics_server) ───────────────────────
+TICKS_TOTAL = counter("feed_ticks_total", "Market data ticks received", ("symbol",))
+PULSE_TICK_RATE = gauge("pulse_tick_rate", "Pulse ticks/sec per symbol and window", ("symbol", "window"))
+
+
+def _register_pulse_gauges(symbol: str, module: PulseModule) -> None:
+    for w in module.windows:
+        PULSE_TICK_RATE.labels(symbol, f"{w}s").set_function(
+            lambda w=w: module.get_pulse(window=w).tick_rate
+        )
+
+
+pulse.on_new_symbol = _register_pulse_gauges
+for _sym in pulse.symbols():
+    _register_pulse_gauges(_sym, pulse.get(_sym))
+
+# ── Greeks surfaces (registered from the option chain in main.run) ───────────
+greeks_surfaces = get_greeks_surfaces()
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -81,21 +104,24 @@ def onmessage(ticks: dict) -> None:
       3. Feeds MarketData in-memory CandleAggregator (indicators source)
 
     For option contracts:
-      - Updates the quote `df` DataFrame only (used by order chasing)
+      - Updates the quote `df` DataFrame (used by order chasing)
+      - Marks the contract dirty on its Greeks surface (greeks_surface)
     """
     global spot_price
 
     sym = ticks.get("symbol")
     if not sym:
         return
+    TICKS_TOTAL.labels(sym).inc()
 
-    # ── Option contracts → quote df only ────────────────────────────────────
+    # ── Option contracts → quote df + Greeks surface ────────────────────────
     if sym not in INDEX_SYMBOLS:
         if sym not in df.index:
             df.loc[sym] = [None] * len(df.columns)
         for key, value in ticks.items():
             if key in df.columns:
                 df.at[sym, key] = value
+        greeks_surfaces.on_quote(sym, ticks.get("ltp"))
         return
 
     # ── Underlying index ─────────────────────────────────────────────────────
@@ -148,10 +174,13 @@ def onmessage(ticks: dict) -> None:
             f"[TICK DROPPED→MD] {sym} ltp={ltp:.2f} — market_data not yet wired"
         )
 
-    # 6. Feed Pulse Module (Tick-Rate Momentum)
+    # 6. Mark the underlying's Greeks surfaces dirty (refreshed off-thread)
+    greeks_surfaces.on_spot(sym, ltp)
+
+    # 7. Feed Pulse Module (Tick-Rate Momentum)
     try:
         timestamp_ms = time.time() * 1000  # Current time in milliseconds
-        pulse.on_tick(timestamp_ms, ltp)
+        pulse.on_tick(sym, timestamp_ms, ltp)
     except Exception as exc:
         logging.debug(f"[PULSE][TICK ERROR] {sym}: {exc}")
 
@@ -203,36 +232,36 @@ fyers_socket = data_ws.FyersDataSocket(
 #  ORDER CHASING
 # ─────────────────────────────────────────────────────────────────────────────
 
+order_tracker = get_order_tracker()     # local order cache fed by on_orders
+gauge("orders_pending", "Working orders in the local order tracker").set_function(
+    lambda: len(order_tracker.pending())
+)
+
+
+def _ltp(symbol):
+    return df.loc[symbol, "ltp"] if symbol in df.index else None
+
+
+def _modify(payload: dict):
+    # Modifies share the broker gateway with orders; its exit lane is separate,
+    # so chasing can never hold up a square-off.
+    ok, _ = get_gateway("live", lambda: FyersAdapter(fyers)).modify_sync(
+        payload["id"], payload["limitPrice"], payload["qty"]
+    )
+    return {"s": "ok" if ok else "error", "id": payload["id"]}
+
+
+def chase_pending() -> list:
+    """Chase pending LIMIT orders from the local order cache (non-blocking)."""
+    return order_tracker.chase(_ltp, _modify)
+
+
 def chase_order(ord_df: pd.DataFrame) -> None:
-    """Adjust limit price of pending orders toward the current LTP."""
+    """Reconcile an order-book snapshot into the cache, then chase pending orders."""
     if ord_df.empty:
         return
-    pending = ord_df[ord_df["status"] == 6]
-    for _, o1 in pending.iterrows():
-        name = o1["symbol"]
-        current_price = df.loc[name, "ltp"] if name in df.index else None
-        if current_price is None or pd.isna(current_price):
-            logging.warning(f"[CHASE] No LTP for {name}, skipping")
-            continue
-        try:
-            if o1["type"] == 1:  # Limit order
-                id1        = o1["id"]
-                lmt_price  = o1["limitPrice"]
-                qty        = o1["qty"]
-                new_price  = (
-                    round(lmt_price + 0.1, 2)
-                    if current_price > lmt_price
-                    else round(lmt_price - 0.1, 2)
-                )
-                logging.info(
-                    f"[CHASE] {name}: old={lmt_price} new={new_price} qty={qty}"
-                )
-                fyers.modify_order(data={
-                    "id": id1, "type": 1,
-                    "limitPrice": new_price, "qty": qty,
-                })
-        except Exception as exc:
-            logging.error(f"[CHASE ERROR] {exc}")
+    order_tracker.reconcile(ord_df.to_dict("records"))
+    chase_pending()
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -242,14 +271,9 @@ def chase_order(ord_df: pd.DataFrame) -> None:
 def on_orders(message):
     logging.info(f"[ORDER UPDATE RAW] {message}")
     try:
-        orders       = message.get("orders", {})
-        order_id     = orders.get("id")
-        status_code  = orders.get("status")
-        filled_qty   = orders.get("filledQty", 0)
-        traded_price = orders.get("tradedPrice", 0)
-        symbol       = orders.get("symbol")
-        status       = map_status_code(status_code)
-        update_order_status(order_id, status, filled_qty, traded_price, symbol)
+        orders = message.get("orders", {})
+        if orders:
+            order_tracker.on_order(orders, source="ws")
     except Exception as exc:
         logging.error(f"[ORDER UPDATE ERROR] {exc}")
 
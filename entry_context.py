@@ -0,0 +1,236 @@
+"""Per-symbol entry context shared by paper_order, live_order and replay.
+
+Entry evaluation needs the same handful of derived values on every new
+candle: ATR, CPR / traditional / Camarilla pivots from the previous
+completed bar, the opening range, and the day-type classifier.  Each order
+path used to recompute them from the full candle frame; EntryContext keeps
+them per symbol and recomputes only what a new candle invalidates:
+
+  * day-fixed   — day-type classifier and the opening range once the
+                  opening window has closed (reset by ``begin_day``)
+  * per pivot   — CPR / traditional / Camarilla, keyed on the pivot bar's
+                  high/low/close, so they are built once per candle
+  * per bar     — ATR (from the last ``period + 1`` rows only) and the
+                  day-type update, keyed on the last bar
+
+Usage (paper/live)::
+
+    ctx = get_entry_context(ticker)
+    ctx.begin_day(ct.strftime("%Y-%m-%d"))
+    piv = ctx.pivots(candles_3m)
+    atr = ctx.atr(candles_3m)
+    orb_h, orb_l = ctx.opening_range(candles_3m)
+"""
+
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from indicators import (
+    calculate_cpr,
+    calculate_traditional_pivots,
+    calculate_camarilla_pivots,
+    resolve_atr,
+)
+from signals import get_opening_range
+from day_type import make_day_type_classifier
+
+ATR_PERIOD = 14
+ORB_BARS = 5            # get_opening_range default
+_ORB_PATTERN = "09:3|09:4"
+
+
+@dataclass
+class PivotLevels:
+    """Pivot levels built from one completed bar (previous bar by default)."""
+
+    high: float
+    low: float
+    close: float
+    cpr: dict
+    trad: dict
+    cam: dict
+
+
+def _last(candles: pd.DataFrame, col: str, pos: int = -1):
+    return candles[col].iat[pos] if col in candles.columns else None
+
+
+def _bar_key(candles: pd.DataFrame) -> tuple:
+    """Identity of the newest bar: row count, index/time and last OHLC."""
+    return (
+        len(candles),
+        candles.index[-1],
+        _last(candles, "time"),
+        _last(candles, "date"),
+        _last(candles, "high"),
+        _last(candles, "low"),
+        _last(candles, "close"),
+    )
+
+
+def open_bias_context(close: float, cam: Optional[dict]) -> dict:
+    """Gap / bias / opening-bias tags of ``close`` against Camarilla levels."""
+    cam = cam or {}
+    gap = "NO_GAP"
+    if np.isfinite(close) and np.isfinite(cam.get("r3", float("nan"))) and close > float(cam.get("r3")):
+        gap = "GAP_UP"
+    elif np.isfinite(close) and np.isfinite(cam.get("s3", float("nan"))) and close < float(cam.get("s3")):
+        gap = "GAP_DOWN"
+    bias = "Positive" if gap == "GAP_UP" else ("Negative" if gap == "GAP_DOWN" else "Neutral")
+
+    open_bias = "UNKNOWN"
+    if np.isfinite(close):
+        if np.isfinite(cam.get("r4", float("nan"))) and close > float(cam.get("r4")):
+            open_bias = "Above R4, continuation likely"
+        elif np.isfinite(cam.get("r3", float("nan"))) and close > float(cam.get("r3")):
+            open_bias = "Above R3, expected momentum continuation"
+        elif np.isfinite(cam.get("s4", float("nan"))) and close < float(cam.get("s4")):
+            open_bias = "Below S4, downside continuation likely"
+        elif np.isfinite(cam.get("s3", float("nan"))) and close < float(cam.get("s3")):
+            open_bias = "Below S3, downside pressure active"
+        else:
+            open_bias = "Inside S3-R3, balanced open"
+    return {"gap_tag": gap, "bias": bias, "open_bias": open_bias}
+
+
+class EntryContext:
+    """Entry-time levels for one symbol, cached per day and per candle."""
+
+    def __init__(self, symbol: str = ""):
+        self.symbol = symbol
+        self.day: Optional[str] = None
+        self.classifier = None
+        self._pivots: Optional[PivotLevels] = None
+        self._atr_key: Optional[tuple] = None
+        self._atr: Optional[float] = None
+        self._orb_key: Optional[tuple] = None
+        self._orb: Tuple[Optional[float], Optional[float]] = (None, None)
+        self._orb_final = False
+        self._orb_anchor = None
+        self._dt_key: Optional[tuple] = None
+        self._dt_result = None
+
+    # ── day scope ─────────────────────────────────────────────────────────
+
+    def begin_day(self, day: str) -> bool:
+        """Reset day-fixed state when ``day`` changes; True on a new day."""
+        if day == self.day:
+            return False
+        self.day = day
+        self.classifier = None
+        self._orb_key = None
+        self._orb = (None, None)
+        self._orb_final = False
+        self._orb_anchor = None
+        self._dt_key = None
+        self._dt_result = None
+        return True
+
+    def init_classifier(self, piv: PivotLevels):
+        """Build the day-type classifier from ``piv``; kept until the next day."""
+        self.classifier = make_day_type_classifier(
+            piv.cam, piv.cpr, float(piv.high), float(piv.low), float(piv.close),
+        )
+        return self.classifier
+
+    def day_type(self, candles: pd.DataFrame):
+        """``classifier.update`` once per bar; None until the classifier exists."""
+        if self.classifier is None:
+            return None
+        key = _bar_key(candles)
+        if key != self._dt_key:
+            self._dt_result = self.classifier.update(candles)
+            self._dt_key = key
+        return self._dt_result
+
+    # ── per candle ────────────────────────────────────────────────────────
+
+    def pivots(self, candles: pd.DataFrame, src_pos: Optional[int] = None) -> PivotLevels:
+        """CPR / traditional / Camarilla from the previous completed bar.
+
+        ``src_pos`` defaults to -2 (or -1 while only one bar exists).  Levels
+        are rebuilt only when the source bar's high/low/close change.
+        """
+        if src_pos is None:
+            src_pos = -2 if len(candles) >= 2 else -1
+        h = candles["high"].iat[src_pos]
+        l = candles["low"].iat[src_pos]
+        c = candles["close"].iat[src_pos]
+        p = self._pivots
+        if p is None or (p.high, p.low, p.close) != (h, l, c):
+            p = PivotLevels(
+                high=h, low=l, close=c,
+                cpr=calculate_cpr(h, l, c),
+                trad=calculate_traditional_pivots(h, l, c),
+                cam=calculate_camarilla_pivots(h, l, c),
+            )
+            self._pivots = p
+        return p
+
+    def atr(self, candles: pd.DataFrame, period: int = ATR_PERIOD):
+        """``resolve_atr`` on the newest bar, using only the rows it reads.
+
+        The rolling ATR of the last bar depends on the last ``period`` true
+        ranges, i.e. the last ``period + 1`` rows.
+        """
+        key = _bar_key(candles)
+        if key != self._atr_key:
+            self._atr, _ = resolve_atr(candles.tail(period + 1), period=period)
+            self._atr_key = key
+        return self._atr
+
+    def opening_range(self, candles: pd.DataFrame, n_bars: int = ORB_BARS):
+        """``get_opening_range``, frozen once the opening window is complete."""
+        anchor = (candles.index[0], _last(candles, "time", 0), _last(candles, "date", 0)) if len(candles) else None
+        if self._orb_final and anchor == self._orb_anchor:
+            return self._orb
+        key = _bar_key(candles) if len(candles) else None
+        if key is not None and key == self._orb_key:
+            return self._orb
+        self._orb = get_opening_range(candles, n_bars)
+        self._orb_key = key
+        # Later rows cannot change the result once n_bars opening bars exist
+        # (or n_bars rows, when there is no time column to match on).
+        time_col = "date" if "date" in candles.columns else "time" if "time" in candles.columns else None
+        try:
+            if time_col:
+                done = int(candles[time_col].astype(str).str.contains(_ORB_PATTERN).sum()) >= n_bars
+            else:
+                done = len(candles) >= n_bars
+        except Exception:
+            done = False
+        if done:
+            self._orb_final = True
+            self._orb_anchor = anchor
+            logging.debug(f"[ENTRY CONTEXT] {self.symbol} opening range fixed {self._orb}")
+        return self._orb
+
+
+_CONTEXTS: Dict[str, EntryContext] = {}
+
+
+def get_entry_context(symbol: str) -> EntryContext:
+    """Get or create the process-wide EntryContext for ``symbol``."""
+    ctx = _CONTEXTS.get(symbol)
+    if ctx is None:
+        ctx = _CONTEXTS[symbol] = EntryContext(symbol)
+    return ctx
+
+
+def reset_entry_contexts() -> None:
+    _CONTEXTS.clear()
+
+
+__all__ = [
+    "EntryContext",
+    "PivotLevels",
+    "get_entry_context",
+    "open_bias_context",
+    "reset_entry_contexts",
+]
@@ -78,8 +78,11 @@ Empirically validated: all Feb 16–26 replay trades pass with zero regressions.
 """
 
 import logging
+import os
 import pandas as pd
 from day_type import apply_day_type_to_threshold, DayTypeResult
+from event_stream import emit_event
+from greeks_surface import get_greeks_surfaces
 
 GREEN  = "\033[92m"
 YELLOW = "\033[93m"
@@ -121,6 +124,13 @@ ATR_HIGH_MIN = 120   # above → HIGH regime
 _THETA_PENALTY_THRESHOLD = 5.0
 # Vega risk high: vega pts per 1% vol move > threshold → reduce position size
 _VEGA_RISK_HIGH = 15.0
+# Greeks from the live surface (greeks_surface) are scored only when
+# GREEKS_SURFACE_SCORING is on: replay has no surface, so with it on
+# LIVE/PAPER scores diverge from replay for the same bars.
+GREEKS_SURFACE_SCORING = os.getenv("GREEKS_SURFACE_SCORING", "0").strip().lower() in ("1", "true", "yes", "on")
+# ATM weekly NIFTY theta runs ~7-23 pts/day, so surface Greeks are penalised
+# only past that range (expiry-day decay), not on every entry.
+_SURFACE_THETA_PENALTY_THRESHOLD = 25.0
 
 # ── Pivot tier multipliers (applied within type bracket) ───────────────────────
 # Used to differentiate quality within Acceptance/Rejection/Breakout brackets.
@@ -895,6 +905,17 @@ def check_entry_condition(candle, indicators, bias_15m,
     st_bias_3m  = _norm_bias(indicators.get("st_bias_3m",  "NEUTRAL"))
     st_bias_15m = _norm_bias(indicators.get("st_bias_15m", "NEUTRAL"))
 
+    # Greeks per side: the caller's, else (GREEKS_SURFACE_SCORING) the ATM
+    # CE / PE from the underlying's live Greeks surface — a snapshot read,
+    # no solve at decision time
+    greeks_by_side = {"CALL": greeks, "PUT": greeks}
+    theta_threshold = _THETA_PENALTY_THRESHOLD
+    if greeks is None and GREEKS_SURFACE_SCORING and symbol is not None:
+        _surface = get_greeks_surfaces().snapshot(symbol)
+        if _surface is not None:
+            greeks_by_side = {"CALL": _surface.nearest("CE"), "PUT": _surface.nearest("PE")}
+            theta_threshold = _SURFACE_THETA_PENALTY_THRESHOLD
+
     logging.debug(
         f"[ENTRY SCORING v5 START] regime={regime} base_threshold={threshold} "
         f"ST_15m={st_bias_15m} ST_3m={st_bias_3m} "
@@ -1069,14 +1090,15 @@ def check_entry_condition(candle, indicators, bias_15m,
         # Theta decay penalty: penalise entries with high daily theta decay
         # High theta erodes premium quickly — reduces expected holding value
         _theta_adj = 0
-        _theta_val = getattr(greeks, "theta", None) if greeks is not None else None
-        _vega_val  = getattr(greeks, "vega",  None) if greeks is not None else None
-        if _theta_val is not None and abs(_theta_val) > _THETA_PENALTY_THRESHOLD:
+        side_greeks = greeks_by_side[side]
+        _theta_val = getattr(side_greeks, "theta", None) if side_greeks is not None else None
+        _vega_val  = getattr(side_greeks, "vega",  None) if side_greeks is not None else None
+        if _theta_val is not None and abs(_theta_val) > theta_threshold:
             _theta_adj = -8
         bd["theta_penalty"] = _theta_adj
 
         # Indicator–Greeks alignment: log theta/vega risk characterisation
-        if greeks is not None:
+        if side_greeks is not None:
             _vega_risk = (
                 "HIGH" if (_vega_val is not None and abs(_vega_val) > _VEGA_RISK_HIGH) else "NORMAL"
             )
@@ -1089,7 +1111,7 @@ def check_entry_condition(candle, indicators, bias_15m,
             )
 
         # Log combined vol-context adjustment once per side when any adjustment applies
-        if vix_tier is not None or greeks is not None:
+        if vix_tier is not None or side_greeks is not None:
             logging.debug(
                 f"[VOL_CONTEXT][SCORE_ADJUST][{side}] "
                 f"vix_tier={vix_tier or 'N/A'} "
@@ -1184,9 +1206,10 @@ def check_entry_condition(candle, indicators, bias_15m,
         # Scale lots by: confidence, ATR, VIX tier, Vega risk.
         # Floor at 1 lot; cap at config default (already resolved as _effective_lot).
         _vix_reduce  = (vix_tier in ("HIGH", "CALM"))  # both vol extremes reduce lots
+        _best_greeks = greeks_by_side[best_side]
         _vega_reduce = (
-            greeks is not None
-            and abs(getattr(greeks, "vega", 0.0)) > _VEGA_RISK_HIGH
+            _best_greeks is not None
+            and abs(getattr(_best_greeks, "vega", 0.0)) > _VEGA_RISK_HIGH
         )
         _conf_low    = (best_score < best_threshold + 5)   # marginal entry
         # Each active risk flag reduces by 1 lot (cumulative, floored at 1)
@@ -1274,6 +1297,18 @@ def check_entry_condition(candle, indicators, bias_15m,
             f" {_mom_s} {_cpr_s} {_adx_s}"
             f"{_ob_s}{_rev_s}{_piv_s}{_zone_s}{_pulse_s}{_ba_s}{_sn_s}{RESET}"
         )
+        emit_event(
+            "entry_ok",
+            side=best_side,
+            score=best_score,
+            threshold=best_threshold,
+            regime=regime,
+            strength=strength,
+            bar_align_status=_ba_status,
+            bar_align_tf=_ba_tf,
+            breakdown={k: v for k, v in best_bd.items()
+                       if not k.startswith("_") and isinstance(v, (int, float))},
+        )
     else:
         result["reason"] = (
             f"Score too low: {best_score}<{best_threshold} ({regime}) "
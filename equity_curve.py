@@ -0,0 +1,238 @@
+"""equity_curve.py — incremental equity curve with decimated, cached rendering.
+
+``dashboard.plot_equity_curve`` used to hand every trade to matplotlib on
+every report, so multi-month charts were slow to draw and unreadable.  Now:
+
+  * ``EquityCurve`` keeps cumulative P&L, running peak and max drawdown and
+    a content digest, all updated incrementally by ``extend`` (new trades
+    cost O(new), not O(history)); ``sync`` reuses the held prefix when a
+    caller passes the full, grown trade list again
+  * ``downsample`` reduces the curve to a fixed point budget with
+    Largest-Triangle-Three-Buckets, then re-inserts the global peak and
+    trough so decimation never hides the max drawdown
+  * ``render_equity_curve`` plots at most one point per horizontal pixel and
+    writes ``<chart>.json`` next to the PNG; while the digest, title and
+    pixel budget are unchanged the existing PNG is returned without
+    touching matplotlib
+
+Rendering cost is therefore bounded by the pixel budget, not trade count.
+
+Log tags
+--------
+[DASHBOARD]  equity curve saved / served from cache
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+from pathlib import Path
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+try:
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    import matplotlib.ticker as mticker
+    _MPL_AVAILABLE = True
+except ImportError:
+    _MPL_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+FIGSIZE = (10, 4)
+DPI = 150
+# One plotted point per horizontal pixel of the saved PNG.
+PIXEL_BUDGET = FIGSIZE[0] * DPI
+
+
+def lttb(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Indices of ``n_out`` points chosen by Largest-Triangle-Three-Buckets.
+
+    First and last points are always kept; each interior bucket keeps the
+    point forming the largest triangle with the previous pick and the next
+    bucket's centroid, which preserves the visual shape of the series.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=float)
+    y = np.asarray(y, dtype=float)
+    edges = np.linspace(1, n - 1, n_out - 1).astype(np.int64)   # n_out - 2 interior buckets
+    picks = np.empty(n_out, dtype=np.int64)
+    picks[0], picks[-1] = 0, n - 1
+    a = 0
+    for i in range(n_out - 2):
+        lo, hi = edges[i], max(edges[i + 1], edges[i] + 1)
+        nlo, nhi = hi, (edges[i + 2] if i + 2 < len(edges) else n)
+        if nlo >= nhi:
+            cx, cy = x[-1], y[-1]
+        else:
+            cx, cy = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        bx, by = x[lo:hi], y[lo:hi]
+        area = np.abs((x[a] - cx) * (by - y[a]) - (x[a] - bx) * (cy - y[a]))
+        a = lo + int(area.argmax())
+        picks[i + 1] = a
+    return picks
+
+
+def downsample(x: np.ndarray, y: np.ndarray, max_points: int) -> Tuple[np.ndarray, np.ndarray]:
+    """LTTB to ``max_points``, keeping the global max and min points too."""
+    if len(y) <= max_points:
+        return np.asarray(x), np.asarray(y)
+    idx = lttb(x, y, max(3, max_points - 2))
+    idx = np.union1d(idx, [int(np.argmax(y)), int(np.argmin(y))])
+    return np.asarray(x)[idx], np.asarray(y)[idx]
+
+
+class EquityCurve:
+    """Cumulative P&L over the trade sequence, maintained incrementally."""
+
+    def __init__(self) -> None:
+        self._pnl = np.empty(0, dtype=np.float64)
+        self._cum = np.empty(0, dtype=np.float64)
+        self._n = 0
+        self._hash = hashlib.blake2b(digest_size=16)
+        self.total = 0.0
+        self.peak = 0.0
+        self.max_drawdown = 0.0
+
+    @classmethod
+    def from_pnl(cls, pnl: Iterable[float]) -> "EquityCurve":
+        curve = cls()
+        curve.extend(pnl)
+        return curve
+
+    def __len__(self) -> int:
+        return self._n
+
+    @property
+    def pnl(self) -> np.ndarray:
+        return self._pnl[: self._n]
+
+    @property
+    def cumulative(self) -> np.ndarray:
+        return self._cum[: self._n]
+
+    @property
+    def digest(self) -> str:
+        """Content hash of every P&L value so far (cache key)."""
+        return self._hash.hexdigest()
+
+    def _reserve(self, need: int) -> None:
+        if need <= len(self._pnl):
+            return
+        cap = max(need, 2 * len(self._pnl), 64)
+        for name in ("_pnl", "_cum"):
+            grown = np.empty(cap, dtype=np.float64)
+            grown[: self._n] = getattr(self, name)[: self._n]
+            setattr(self, name, grown)
+
+    def extend(self, pnl: Iterable[float]) -> None:
+        """Append per-trade P&L values (NaN counts as 0)."""
+        new = np.nan_to_num(np.asarray(list(pnl) if not isinstance(pnl, np.ndarray) else pnl,
+                                       dtype=np.float64))
+        if not len(new):
+            return
+        start, end = self._n, self._n + len(new)
+        self._reserve(end)
+        cum = self.total + np.cumsum(new)
+        self._pnl[start:end] = new
+        self._cum[start:end] = cum
+        self._n = end
+        self._hash.update(new.tobytes())
+        running_peak = np.maximum.accumulate(np.maximum(cum, self.peak))
+        self.max_drawdown = max(self.max_drawdown, float((running_peak - cum).max()))
+        self.peak = float(running_peak[-1])
+        self.total = float(cum[-1])
+
+    def sync(self, pnl: Iterable[float]) -> int:
+        """Bring the curve in line with a full P&L sequence; returns points added.
+
+        When the sequence starts with the points already held only the tail
+        is appended; anything else (edited or reordered history) rebuilds.
+        """
+        arr = np.nan_to_num(np.asarray(list(pnl) if not isinstance(pnl, np.ndarray) else pnl,
+                                       dtype=np.float64))
+        if len(arr) >= self._n and np.array_equal(arr[: self._n], self.pnl):
+            added = len(arr) - self._n
+            self.extend(arr[self._n:])
+            return added
+        self.__init__()
+        self.extend(arr)
+        return len(arr)
+
+
+def _cache_meta_path(output_path: Path) -> Path:
+    return output_path.with_name(output_path.name + ".json")
+
+
+def render_equity_curve(
+    curve: EquityCurve,
+    output_path: str | Path,
+    title: str = "Cumulative P&L (points)",
+    max_points: int = PIXEL_BUDGET,
+) -> Optional[Path]:
+    """Save ``curve`` as a PNG, reusing the cached file when nothing changed."""
+    if not _MPL_AVAILABLE:
+        logger.warning("[DASHBOARD] matplotlib not installed — equity curve skipped.")
+        return None
+    output_path = Path(output_path)
+    meta_path = _cache_meta_path(output_path)
+    meta = {"n": len(curve), "digest": curve.digest, "title": title, "max_points": max_points}
+    if output_path.exists():
+        try:
+            if json.loads(meta_path.read_text(encoding="utf-8")) == meta:
+                logger.info(f"[DASHBOARD] Equity curve unchanged ({len(curve)} trades) → {output_path}")
+                return output_path
+        except (OSError, ValueError):
+            pass
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    x, y = downsample(np.arange(1, len(curve) + 1), curve.cumulative, max_points)
+
+    fig, ax = plt.subplots(figsize=FIGSIZE)
+    ax.plot(x, y, linewidth=1.8, color="#2196F3", label="Cumulative P&L")
+    ax.fill_between(x, y, 0, where=(y >= 0), alpha=0.15, color="green", label="Profit")
+    ax.fill_between(x, y, 0, where=(y < 0), alpha=0.15, color="red", label="Loss")
+    ax.axhline(0, color="black", linewidth=0.8, linestyle="--")
+
+    final_pnl = curve.total
+    ax.annotate(
+        f"Final: {final_pnl:+.2f} pts",
+        xy=(len(curve), final_pnl),
+        xytext=(-60, 12),
+        textcoords="offset points",
+        fontsize=9,
+        color="green" if final_pnl >= 0 else "red",
+        fontweight="bold",
+    )
+
+    ax.set_title(title, fontsize=13, fontweight="bold")
+    ax.set_xlabel("Trade #")
+    ax.set_ylabel("P&L (points)")
+    ax.yaxis.set_major_formatter(mticker.FuncFormatter(lambda v, _: f"{v:+.0f}"))
+    ax.legend(fontsize=8)
+    ax.grid(axis="y", alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(output_path, dpi=DPI)
+    plt.close(fig)
+    meta_path.write_text(json.dumps(meta), encoding="utf-8")
+
+    logger.info(
+        f"[DASHBOARD] Equity curve saved → {output_path} "
+        f"(trades={len(curve)} plotted={len(x)} max_dd={curve.max_drawdown:.1f}pts)"
+    )
+    return output_path
+
+
+__all__ = [
+    "EquityCurve",
+    "PIXEL_BUDGET",
+    "downsample",
+    "lttb",
+    "render_equity_curve",
+]
@@ -0,0 +1,264 @@
+"""event_stream.py — structured JSONL events written next to the text log.
+
+The dashboards and replay analyzers rebuild trades, gate blocks and signal
+counts by running regexes over the human-readable log.  The engine now also
+emits those facts as compact JSON lines into a sidecar file, so the parsers
+can read them back with ``json.loads`` instead of regex extraction:
+
+    options_trade_engine_2026-03-07.log           (text, unchanged)
+    options_trade_engine_2026-03-07.events.jsonl  (this module)
+
+  * ``emit_event(kind, **fields)`` — call-site API; appends to an in-memory
+                                     deque and returns (no I/O, no JSON)
+  * a daemon writer thread drains the deque every ``flush_interval`` s (or
+    as soon as ``batch_size`` events are pending), serialises the batch
+    and writes it with a single ``write`` call
+  * every time the file is opened a header line records the schema version;
+    readers apply the most recent header to the lines that follow it
+
+Line format (``separators=(",", ":")``, no spaces):
+
+    {"t":"header","v":1,"pid":4242,"ts":1772855100.0}
+    {"t":"trade_open","ts":1772855160.123,"time":"2026-03-07 09:45:00",...}
+
+The process-wide stream follows the root logger's ``FileHandler`` (see
+config.py), so the events file always sits next to the log it describes.
+Without a file handler (unit tests, ad-hoc scripts) ``emit_event`` is a no-op.
+
+Event kinds (schema v1)
+-----------------------
+trade_open      position_manager  [TRADE OPEN] structured record
+trade_exit      position_manager  [TRADE EXIT] structured record
+exit            execution         [EXIT][PAPER|LIVE reason] rich exit record
+exit_audit      execution         [EXIT AUDIT]
+exit_regime     execution         [EXIT AUDIT][REGIME_ADAPTIVE]
+entry_blocked   execution / st_pullback_cci  [ENTRY BLOCKED][subtype]
+entry_ok        entry_logic       [ENTRY OK] with the winning score breakdown
+signal_fired    signals           [SIGNAL FIRED] with bias / tilt attribution
+regime_context  regime_context    [REGIME_CONTEXT]
+
+Log tags
+--------
+[EVENT STREAM]  stream opened / closed / write failure
+"""
+
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Iterator, Optional
+
+from metrics import gauge
+
+SCHEMA_VERSION = 1
+EVENTS_SUFFIX = ".events.jsonl"
+
+_SEPARATORS = (",", ":")
+
+
+def events_path_for(log_path: str | Path) -> Path:
+    """Sidecar events path for a text log (``x.log`` → ``x.events.jsonl``)."""
+    path = Path(log_path)
+    stem = path.stem if path.suffix == ".log" else path.name
+    return path.with_name(stem + EVENTS_SUFFIX)
+
+
+class EventStream:
+    """Batched, append-only JSONL writer fed from any thread."""
+
+    def __init__(
+        self,
+        path: str | Path,
+        batch_size: int = 256,
+        flush_interval: float = 0.5,
+    ) -> None:
+        self.path = Path(path)
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = float(flush_interval)
+        self.written = 0
+        self.dropped = 0
+        self._pending: deque = deque()
+        self._wake = threading.Event()
+        self._closed = False
+        self._fh = None
+        self._thread = threading.Thread(target=self._run, name="event-stream", daemon=True)
+        self._thread.start()
+
+    def emit(self, kind: str, **fields) -> None:
+        """Queue one event; serialisation and I/O happen on the writer thread."""
+        if self._closed:
+            return
+        self._pending.append((kind, time.time(), fields))
+        if len(self._pending) >= self.batch_size:
+            self._wake.set()
+
+    def flush(self, timeout: float = 5.0) -> None:
+        """Block until every event queued so far has been written."""
+        if self._closed:
+            return
+        done = threading.Event()
+        self._pending.append(done)
+        self._wake.set()
+        done.wait(timeout)
+
+    def close(self) -> None:
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join(timeout=5.0)
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+            logging.info(f"[EVENT STREAM] closed path={self.path} events={self.written}")
+
+    # ── writer thread ─────────────────────────────────────────────────────────
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            self._drain()
+            if self._closed:
+                self._drain()
+                return
+
+    def _drain(self) -> None:
+        pending = self._pending
+        batch: list = []
+        markers: list = []
+        while pending:
+            item = pending.popleft()
+            if isinstance(item, threading.Event):
+                markers.append(item)            # flush() barrier
+                continue
+            kind, ts, fields = item
+            rec = {"t": kind, "ts": round(ts, 3)}
+            rec.update(fields)
+            batch.append(json.dumps(rec, separators=_SEPARATORS, default=str))
+            if len(batch) >= 4 * self.batch_size:
+                self._write(batch)
+                batch = []
+        if batch:
+            self._write(batch)
+        for marker in markers:
+            marker.set()
+
+    def _write(self, lines: list) -> None:
+        try:
+            if self._fh is None:
+                self._open()
+            self._fh.write("\n".join(lines) + "\n")
+            self._fh.flush()
+            self.written += len(lines)
+        except OSError as exc:
+            if not self.dropped:
+                logging.warning(f"[EVENT STREAM] write failed path={self.path}: {exc}")
+            self.dropped += len(lines)
+
+    def _open(self) -> None:
+        self._fh = self.path.open("a", encoding="utf-8")
+        header = {"t": "header", "v": SCHEMA_VERSION, "pid": os.getpid(), "ts": round(time.time(), 3)}
+        self._fh.write(json.dumps(header, separators=_SEPARATORS) + "\n")
+        logging.info(f"[EVENT STREAM] opened path={self.path} schema=v{SCHEMA_VERSION}")
+
+
+class _NullEventStream:
+    """Stand-in when no log file is configured: every call is a no-op."""
+
+    path = None
+
+    def emit(self, kind: str, **fields) -> None:
+        pass
+
+    def flush(self, timeout: float = 5.0) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+
+_NULL = _NullEventStream()
+_STREAM: Optional[EventStream] = None
+_STREAM_LOCK = threading.Lock()
+
+gauge("event_stream_pending", "Events queued for the JSONL writer").set_function(
+    lambda: len(_STREAM._pending) if _STREAM is not None else 0
+)
+
+
+def _root_log_file() -> Optional[str]:
+    for handler in logging.getLogger().handlers:
+        # pytest's logging plugin installs a FileHandler on os.devnull
+        if isinstance(handler, logging.FileHandler) and handler.baseFilename != os.devnull:
+            return handler.baseFilename
+    return None
+
+
+def get_event_stream():
+    """Process-wide EventStream next to the root logger's log file.
+
+    Returns a no-op stream (without caching it) while no FileHandler is
+    installed, so a logger configured later still gets its sidecar.
+    """
+    global _STREAM
+    stream = _STREAM
+    if stream is not None:
+        return stream
+    log_file = _root_log_file()
+    if log_file is None:
+        return _NULL
+    with _STREAM_LOCK:
+        if _STREAM is None:
+            _STREAM = EventStream(events_path_for(log_file))
+            atexit.register(_STREAM.close)
+        return _STREAM
+
+
+def emit_event(kind: str, **fields) -> None:
+    """Emit one event on the process-wide stream (see module docstring)."""
+    stream = _STREAM
+    if stream is None:
+        stream = get_event_stream()
+    stream.emit(kind, **fields)
+
+
+def read_events(path: str | Path) -> Iterator[dict]:
+    """Yield event dicts from a JSONL events file, skipping headers.
+
+    A torn last line (the writer is mid-batch) and events from a schema
+    newer than this reader understands are skipped.
+    """
+    version = SCHEMA_VERSION
+    try:
+        fh = Path(path).open(encoding="utf-8", errors="replace")
+    except OSError:
+        return
+    with fh:
+        for line in fh:
+            try:
+                rec = json.loads(line)
+            except ValueError:
+                continue
+            if rec.get("t") == "header":
+                version = rec.get("v", SCHEMA_VERSION)
+                continue
+            if version <= SCHEMA_VERSION:
+                yield rec
+
+
+__all__ = [
+    "EVENTS_SUFFIX",
+    "EventStream",
+    "SCHEMA_VERSION",
+    "emit_event",
+    "events_path_for",
+    "get_event_stream",
+    "read_events",
+]
@@ -1,5 +1,6 @@
     # ===== execution.py =====
 import logging
+import os
 import pickle
 import pathlib
 import re
@@ -27,6 +28,7 @@ from config import (
 _setup_loaded = False
 df = fyers = ticker = option_chain = spot_price = None
 start_time = end_time = hist_data = None
+_sim_client = None      # use_sim_exchange(): replaces the setup Fyers client
 
 
 def _ensure_setup():
@@ -41,8 +43,11 @@ def _ensure_setup():
         start_time as _st, end_time as _et, hist_data as _hd
     )
     df, fyers, ticker, option_chain, spot_price = _df, _fyers, _ticker, _oc, _sp
+    if _sim_client is not None:
+        fyers = _sim_client
     start_time, end_time, hist_data = _st, _et, _hd
     _setup_loaded = True
+    _get_chain_index()
 from indicators import (
     calculate_cpr,
     calculate_traditional_pivots,
@@ -64,6 +69,15 @@ from option_exit_manager import OptionExitManager
 from day_type import (make_day_type_classifier, apply_day_type_to_pm,
                       DayType, DayTypeResult, DayTypeClassifier)
 from compression_detector import CompressionState
+from stage_profiler import stage, log_summary as log_stage_profile
+from entry_context import EntryContext, get_entry_context, open_bias_context
+from option_chain_index import OptionChainIndex
+from state_journal import get_journal, import_legacy_ledger
+from broker_gateway import close_gateway, get_gateway
+from event_stream import emit_event, get_event_stream
+from metrics import BAR_LAG_BUCKETS, histogram
+from trade_store import get_trade_store
+from st_pullback_cci import FyersAdapter
 from reversal_detector import detect_reversal
 from failed_breakout_detector import detect_failed_breakout
 from zone_detector import (
@@ -112,10 +126,15 @@ SCALP_HISTORY_MAXLEN = 120
 STARTUP_SUPPRESSION_MINUTES = 5
 # Pulse module threshold for scalp entry (ticks per second)
 PULSE_TICKRATE_THRESHOLD = 15.0
+# Underlying whose per-symbol pulse gates scalp entries
+PULSE_SYMBOL = symbols[0] if isinstance(symbols, (list, tuple)) else symbols
 # P3-C: Paper mode slippage — models bid/ask spread + market impact on fills.
 # Applied to ENTRY price in paper mode so paper P&L reflects realistic fills.
 # Set to 0.0 to disable. Realistic for NIFTY ITM options: 1.5 pts per side.
 PAPER_SLIPPAGE_POINTS = 1.5
+# Longest the strategy loop waits on a live order call; the gateway keeps
+# retrying in the background and the outcome is handled when it lands.
+LIVE_ORDER_WAIT_SECONDS = 5.0
 # P2-D: Trade class labels — ensures scalp_mode never bleeds into trend trades.
 TRADE_CLASS_SCALP = "SCALP"
 TRADE_CLASS_TREND = "TREND"
@@ -157,10 +176,6 @@ _paper_zones_date = ""   # date guard for daily reload
 _live_zones = []         # List[Zone] for live_order zone revisit detection
 _live_zones_date = ""    # date guard for daily reload
 
-_paper_dtc = None        # DayTypeClassifier for paper_order per-session
-_paper_dtc_date = ""     # date guard for daily reset
-_live_dtc = None         # DayTypeClassifier for live_order per-session
-_live_dtc_date = ""      # date guard for daily reset
 
 def map_status_code(code):
     status_map = {
@@ -196,61 +211,65 @@ last_signal_candle_time = None
 
 # ===== Persistence with Ledger =====
 
+def _ledger_paths(account_type_):
+    """(journal, legacy pickle ledger) paths for today's ``account_type_`` state."""
+    stem = f"data-{dt.now(time_zone).date()}-{account_type_}"
+    return f"{stem}.journal", f"{stem}.pickle"
+
+
+def _state_journal(account_type_):
+    journal_path, legacy_path = _ledger_paths(account_type_)
+    journal = get_journal(journal_path)
+    import_legacy_ledger(journal, legacy_path)
+    return journal
+
+
+def _persisted_state(data):
+    """``data`` with per-leg ``_exit_*`` caches dropped (legs are shallow copies).
+
+    The compiled exit plan holds rule closures and cannot be pickled; it is
+    recompiled by check_exit_condition after a load.
+    """
+    if not isinstance(data, dict):
+        return data
+    return {
+        k: ({f: v for f, v in leg.items() if not f.startswith("_exit_")}
+            if isinstance(leg, dict) and any(f.startswith("_exit_") for f in leg) else leg)
+        for k, leg in data.items()
+    }
+
+
 def store(data, account_type_):
     """
-    Append trading state to a ledger stored in a pickle file.
-    Each call adds a new snapshot to the list instead of overwriting.
-    Compatible with both legacy dict and new ledger format.
+    Append trading state to today's state journal.
+    Each call appends one checksummed snapshot record instead of rewriting
+    the whole ledger; a legacy pickle ledger from earlier in the day is
+    imported on first use.  The restart state is saved even if the journal
+    append fails.
     """
-    filename = f"data-{dt.now(time_zone).date()}-{account_type_}.pickle"
     try:
-        # Try to load existing ledger
-        try:
-            with open(filename, "rb") as f:
-                ledger = pickle.load(f)
-
-            # Normalize legacy formats
-            if isinstance(ledger, dict):
-                # Old format: single dict snapshot
-                ledger = [ledger]
-            elif not isinstance(ledger, list):
-                # Unexpected format: reset to empty list
-                ledger = []
-        except Exception:
-            ledger = []
-
-        # Append current snapshot with timestamp + state
         snapshot = {
             "timestamp": dt.now(time_zone),
-            "state": data
+            "state": _persisted_state(data)
         }
-        ledger.append(snapshot)
-
-        # Save back to pickle
-        with open(filename, "wb") as f:
-            pickle.dump(ledger, f, protocol=pickle.HIGHEST_PROTOCOL)
-        _save_restart_state(data, account_type_)
-
+        _state_journal(account_type_).append(snapshot)
     except Exception as e:
         logging.error(f"Failed to store state: {e}")
+    _save_restart_state(data, account_type_)
 
 
 def load(account_type_):
     """
-    Load the latest trading state from pickle file.
-    Returns the most recent snapshot's state dict.
+    Load the latest trading state from the state journal.
+    Returns the most recent valid snapshot's state dict.
     """
-    filename = f"data-{dt.now(time_zone).date()}-{account_type_}.pickle"
     try:
-        with open(filename, "rb") as f:
-            ledger = pickle.load(f)
-
-        # Ledger is a list of snapshots; return the latest state
-        if isinstance(ledger, list) and ledger:
-            return ledger[-1]["state"]
-        elif isinstance(ledger, dict):
+        snapshot = _state_journal(account_type_).last()
+        if isinstance(snapshot, dict) and "state" in snapshot:
+            return snapshot["state"]
+        elif isinstance(snapshot, dict):
             # Legacy single snapshot
-            return ledger
+            return snapshot
         else:
             raise ValueError("Ledger format invalid or empty")
     except Exception as e:
@@ -260,21 +279,11 @@ def load(account_type_):
 
 def load_ledger(account_type_):
     """
-    Load the full ledger (all snapshots) from pickle file.
+    Load the full ledger (all snapshots) from the state journal.
     Useful for audit, replay, or debugging.
     """
-    filename = f"data-{dt.now(time_zone).date()}-{account_type_}.pickle"
     try:
-        with open(filename, "rb") as f:
-            ledger = pickle.load(f)
-
-        # Normalize legacy formats
-        if isinstance(ledger, dict):
-            return [ledger]
-        elif isinstance(ledger, list):
-            return ledger
-        else:
-            return []
+        return list(_state_journal(account_type_).snapshots())
     except Exception as e:
         logging.warning(f"Ledger load failed: {e}")
         return []
@@ -320,8 +329,10 @@ def _save_restart_state(info: dict, account_type_: str) -> None:
                         "entry_time": st.get("entry_time"),
                     }
                 )
-        with open(_restart_state_file(account_type_), "wb") as f:
+        path = _restart_state_file(account_type_)
+        with open(path + ".tmp", "wb") as f:
             pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(path + ".tmp", path)
     except Exception as e:
         logging.debug(f"[RESTART STATE] save failed: {e}")
 
@@ -535,6 +546,17 @@ def _validate_restored_positions_on_startup(
     info["_restored_validation_done"] = True
     store(info, account_type_)
 
+_option_chain_index = None
+
+
+def _get_chain_index():
+    """OptionChainIndex for the loaded option_chain, rebuilt only if it changes."""
+    global _option_chain_index
+    if _option_chain_index is None or _option_chain_index.source is not option_chain:
+        _option_chain_index = OptionChainIndex.from_frame(option_chain)
+    return _option_chain_index
+
+
 def get_option_by_moneyness(spot_price_, side, moneyness='ITM', points=0):
     """
     Select ITM option strike with strike_diff points inside ATM.
@@ -568,43 +590,21 @@ def get_option_by_moneyness(spot_price_, side, moneyness='ITM', points=0):
         f"side={side}, requested_strike={strike}"
     )
 
-    # Filter candidates by side
-    candidates = option_chain[
-        (option_chain['option_type'].isin([side, side.replace('E','ALL')]))
-    ].copy()
+    # Strike-indexed lookup: bisect + neighbour scan, preferring symbols in
+    # the live feed (df).  In REPLAY df may be empty, so the closest strike
+    # from the chain is used.
+    quotes = df if isinstance(df, pd.DataFrame) else None
+    selected_symbol, selected_strike, liquid = _get_chain_index().select(side, strike, quotes)
 
-    if candidates.empty:
+    if selected_symbol is None:
         logging.error(f"[get_option_by_moneyness] No options available for side={side}")
         return None, None
 
-    # Calculate distance to desired strike
-    candidates['strike_diff_abs'] = (candidates['strike_price'] - strike).abs()
-    candidates = candidates.sort_values('strike_diff_abs')
-
-    # Liquidity-aware selection: prefer symbol present in live feed (df)
-    selected_symbol = None
-    selected_strike = None
-
-    for _, row in candidates.iterrows():
-        sym = row['symbol']
-        # In LIVE/PAPER mode, df holds subscribed symbols. In REPLAY, df might be empty or irrelevant.
-        # We check if df is populated (LIVE/PAPER) and if sym is in it.
-        if not df.empty and sym in df.index:
-            selected_symbol = sym
-            selected_strike = row['strike_price']
-            break
-    
-    # If no live symbol found (or REPLAY mode where df might be empty/irrelevant for selection),
-    # fall back to the closest strike from option_chain.
-    if not selected_symbol:
-        best_match = candidates.iloc[0]
-        selected_symbol = best_match['symbol']
-        selected_strike = best_match['strike_price']
-        if not df.empty: # Only warn if we expected live data
-             logging.warning(
-                f"[get_option_by_moneyness] No liquid option found in df for {side} near {strike}. "
-                f"Using closest from chain: {selected_symbol}"
-            )
+    if not liquid and quotes is not None and not quotes.empty:  # Only warn if we expected live data
+        logging.warning(
+            f"[get_option_by_moneyness] No liquid option found in df for {side} near {strike}. "
+            f"Using closest from chain: {selected_symbol}"
+        )
 
     if selected_strike != strike:
          logging.warning(
@@ -750,6 +750,7 @@ def _is_startup_suppression_active(info, now_ts, mode_label):
             f"until={suppress_until} remaining_s={remaining:.0f} "
             "reason=Startup suppression active, entry ignored."
         )
+        emit_event("entry_blocked", subtype="STARTUP_SUPPRESSION")
         info["startup_suppression_logged_at"] = now_ts
     return True
 
@@ -1120,6 +1121,7 @@ def _trend_entry_quality_gate(
                 f"side=CALL close={close_val:.1f} daily_s4={_daily_s4:.1f} "
                 f"reason=Price below daily S4, bearish regime — CALL blocked"
             )
+            emit_event("entry_blocked", subtype="DAILY_S4_FILTER", bar_ts=str(timestamp), symbol=symbol)
             st_details["blocked_by"] = "DAILY_S4_FILTER"
             return False, allowed_side, "Price below daily S4 — CALL blocked in bearish regime.", st_details
         if np.isfinite(_daily_r4) and close_val > _daily_r4 and allowed_side == "PUT":
@@ -1128,6 +1130,7 @@ def _trend_entry_quality_gate(
                 f"side=PUT close={close_val:.1f} daily_r4={_daily_r4:.1f} "
                 f"reason=Price above daily R4, bullish regime — PUT blocked"
             )
+            emit_event("entry_blocked", subtype="DAILY_R4_FILTER", bar_ts=str(timestamp), symbol=symbol)
             st_details["blocked_by"] = "DAILY_R4_FILTER"
             return False, allowed_side, "Price above daily R4 — PUT blocked in bullish regime.", st_details
 
@@ -1152,6 +1155,7 @@ def _trend_entry_quality_gate(
                     f"side=CALL close={close_val:.1f} daily_s4={_daily_s4:.1f} "
                     f"reason=ST conflict candidate CALL blocked — price below daily S4"
                 )
+                emit_event("entry_blocked", subtype="DAILY_S4_FILTER", bar_ts=str(timestamp), symbol=symbol)
                 st_details["blocked_by"] = "DAILY_S4_FILTER"
                 return False, candidate_side, "Price below daily S4 — CALL blocked.", st_details
             if np.isfinite(_daily_r4) and close_val > _daily_r4 and candidate_side == "PUT":
@@ -1160,6 +1164,7 @@ def _trend_entry_quality_gate(
                     f"side=PUT close={close_val:.1f} daily_r4={_daily_r4:.1f} "
                     f"reason=ST conflict candidate PUT blocked — price above daily R4"
                 )
+                emit_event("entry_blocked", subtype="DAILY_R4_FILTER", bar_ts=str(timestamp), symbol=symbol)
                 st_details["blocked_by"] = "DAILY_R4_FILTER"
                 return False, candidate_side, "Price above daily R4 — PUT blocked.", st_details
 
@@ -1196,6 +1201,7 @@ def _trend_entry_quality_gate(
                 f"timestamp={timestamp} symbol={symbol} allowed_side={candidate_side} "
                 "reason=Supertrend conflict, no override qualified."
             )
+            emit_event("entry_blocked", subtype="ST_CONFLICT", bar_ts=str(timestamp), symbol=symbol)
             return False, candidate_side, "Supertrend conflict, entry suppressed.", st_details
 
     # Failed breakout governance:
@@ -1213,6 +1219,7 @@ def _trend_entry_quality_gate(
                 f"timestamp={timestamp} symbol={symbol} allowed_side={allowed_side} "
                 f"failed_breakout_side={fb_side} pivot={st_details['failed_breakout_pivot']}"
             )
+            emit_event("entry_blocked", subtype="FAILED_BREAKOUT_MISMATCH", bar_ts=str(timestamp), symbol=symbol)
             return False, allowed_side, "Failed breakout opposite direction, entry suppressed.", st_details
         logging.info(
             "[FAILED_BREAKOUT][REVERSAL] "
@@ -1339,6 +1346,7 @@ def _trend_entry_quality_gate(
                 f"timestamp={timestamp} symbol={symbol} allowed_side={allowed_side} "
                 f"ST3m_bias={st_details['ST3m_bias']} ST3m_slope={st_details['ST3m_slope']}"
             )
+            emit_event("entry_blocked", subtype="ST_SLOPE_CONFLICT", bar_ts=str(timestamp), symbol=symbol)
             logging.info(
                 f"[CONFLICT_BLOCKED] timestamp={timestamp} symbol={symbol} "
                 f"side={allowed_side} type=ST_SLOPE_CONFLICT "
@@ -1384,6 +1392,7 @@ def _trend_entry_quality_gate(
                 f"timestamp={timestamp} symbol={symbol} allowed_side={allowed_side} "
                 f"ADX={adx_val} adx_min={_adx_gate_min} reason=Weak trend strength, entry suppressed."
             )
+            emit_event("entry_blocked", subtype="WEAK_ADX", bar_ts=str(timestamp), symbol=symbol)
             return False, allowed_side, "Weak trend strength, entry suppressed.", st_details
 
     # Standalone EMA stretch governance (independent of reversal detector score generation).
@@ -1458,6 +1467,7 @@ def _trend_entry_quality_gate(
                 f"stretch={ema_stretch_mult:.2f}x threshold={_ema_block_mult:.1f}x "
                 "reason=Distance from EMA exceeded standalone stretch gate."
             )
+            emit_event("entry_blocked", subtype="EMA_STRETCH", bar_ts=str(timestamp), symbol=symbol)
             return False, allowed_side, "EMA stretch gate, entry suppressed.", st_details
 
     # ── Trend-aware oscillator thresholds ─────────────────────────────────────
@@ -1742,6 +1752,7 @@ def _trend_entry_quality_gate(
                 f"rsi_expanded={_rsi_in_expanded} cci_expanded={_cci_in_expanded} "
                 "reason=Bias misaligned AND oscillator in extreme zone, entry suppressed."
             )
+            emit_event("entry_blocked", subtype="BIAS_MISALIGN_BLOCKED", bar_ts=str(timestamp), symbol=symbol)
             return False, allowed_side, "Bias misalignment with oscillator extreme, entry suppressed.", st_details
 
     # Case 4: S4/R4 breakout relief — price below S4−ATR (PUT) or above R4+ATR (CALL)
@@ -1815,6 +1826,7 @@ def _trend_entry_quality_gate(
         f"tier={_adx_osc_tier} atr_tier={_atr_expand_tier} ADX={adx_val:.1f} "
         "reason=Oscillator extreme outside all expanded thresholds, entry suppressed."
     )
+    emit_event("entry_blocked", subtype="OSC_EXTREME", bar_ts=str(timestamp), symbol=symbol)
     if zone_tag == "ZoneA":
         logging.info(
             "[OSC_EXTREME][ZoneA][BLOCKER] "
@@ -1836,46 +1848,38 @@ def _trend_entry_quality_gate(
     return False, allowed_side, "Oscillator extreme, entry suppressed.", st_details
 
 
-def check_exit_condition(df_slice, state, option_price=None, option_volume=None, timestamp=None):
-    """Evaluate exits with strict precedence and structured audit logs.
+def compile_exit_plan(state):
+    """Compile (or reuse) the exit plan of the position held in ``state``.
 
-    Precedence:
-    1) HFT override
-    2) Stop loss
-    3) PT/TG structured profit checks
-    4) Minimum bar maturity gate
-    5) Contextual exits (ATR/CPR/CAMARILLA mapped by signal source)
+    Everything that is fixed once a position is open — regime-adaptive hold,
+    trail and time-exit parameters, oscillator thresholds, the applicable rule
+    table and the bar-cache key columns — is built here once, from the entry
+    path, and stored in ``state["_exit_plan"]``.  Leg dicts are reused across
+    trades, so the plan is keyed on every state field it is derived from and
+    recompiled when one of them changes.  Rules take the per-tick context built
+    by check_exit_condition as their only argument.
     """
-    i = len(df_slice) - 1
+    plan_key = tuple(state.get(k) for k in (
+        "position_id", "entry_candle", "buy_price", "side", "atr_value",
+        "time_exit_candles", "trail_step", "entry_regime_context",
+        "day_type", "adx_tier", "gap_tag", "scalp_mode", "scalp_pt_points",
+        "source", "pivot", "regime_context", "osc_rsi_call", "osc_rsi_put",
+        "osc_cci_call", "osc_cci_put", "osc_wr_call", "osc_wr_put",
+    ))
+    plan = state.get("_exit_plan")
+    if plan is not None and plan.get("key") == plan_key:
+        return plan
+
     side = state["side"]
-    position_side = state.get("position_side", "LONG")
-    symbol = state.get("option_name", "N/A")
     position_id = state.get("position_id", "UNKNOWN")
     entry_price = state.get("buy_price", 0.0)
-    entry_candle = state.get("entry_candle", i)
-    current_ltp = option_price if option_price is not None else df_slice["close"].iloc[-1]
-    option_volume = option_volume if option_volume is not None else 0.0
-    timestamp = timestamp if timestamp is not None else dt.now(time_zone)
+    # Phase 3: frozen RegimeContext from entry time (None for legacy state dicts)
+    _entry_rc = state.get("entry_regime_context")
 
     atr_for_hold = float(state.get("atr_value", 0.0) or 0.0)
     min_bars_for_pt_tg = 2 if atr_for_hold < 30.0 else 3
     time_exit_candles = int(state.get("time_exit_candles", 8))
-    osc_rsi_call = float(state.get("osc_rsi_call", 75.0))
-    osc_rsi_put = float(state.get("osc_rsi_put", 25.0))
-    osc_cci_call = float(state.get("osc_cci_call", 130.0))
-    osc_cci_put = float(state.get("osc_cci_put", -130.0))
-    osc_wr_call = float(state.get("osc_wr_call", -10.0))
-    osc_wr_put = float(state.get("osc_wr_put", -88.0))
-    bars_held = i - entry_candle
-    stop = state.get("stop")
-    pt = state.get("pt")
-    tg = state.get("tg")
     trail_step = state.get("trail_step", 5)
-    regime_ctx = state.get("regime_context", f"ATR={state.get('atr_value', 'N/A')}")
-    trade_class = state.get("trade_class", "TREND")
-    qty = state.get("quantity", 0)
-    # Phase 3: frozen RegimeContext from entry time (None for legacy state dicts)
-    _entry_rc = state.get("entry_regime_context")
 
     # ── Phase 4: Regime-Adaptive Exit Parameters ───────────────────────────
     # Derive adaptive hold times, trailing, and thresholds from entry regime.
@@ -1910,35 +1914,98 @@ def check_exit_condition(df_slice, state, option_price=None, option_volume=None,
     # Apply min_hold adjustment from day type
     min_bars_for_pt_tg = max(1, min_bars_for_pt_tg + _regime_min_hold_adj)
 
-    # Log regime-adaptive parameters once per exit check
-    if _entry_rc is not None and not state.get("_regime_exit_logged", False):
-        logging.info(
-            f"[EXIT AUDIT][REGIME_ADAPTIVE] day_type={_rc_day_type} adx_tier={_rc_adx_tier} "
-            f"gap_tag={_rc_gap_tag} min_hold_adj={_regime_min_hold_adj:+d} "
-            f"trail_step={trail_step} time_exit={time_exit_candles} "
-            f"gap_suppress={'ON' if _gap_day_active else 'OFF'}"
-        )
-        state["_regime_exit_logged"] = True
+    # Contextual structure exits keyed by source/pivot context.
+    ctx_text = (
+        f"{str(state.get('source', '')).upper()}|"
+        f"{str(state.get('pivot', '')).upper()}|"
+        f"{str(state.get('regime_context', '')).upper()}"
+    )
+    src = str(state.get("source", "")).upper()
+    scalp_mode = bool(state.get("scalp_mode", False))
+    rules = ("HFT", "SL") + (("SCALP_PT",) if scalp_mode else ()) + (
+        "PREMATURE", "MIN_BAR", "TG", "PT", "TRAIL",
+    ) + (("CPR",) if "CPR" in ctx_text else ()) + (
+        ("CAMARILLA",) if "CAMARILLA" in ctx_text else ()
+    ) + ("OSC", "ST_FLIP", "REVERSAL", "MOMENTUM", "TIME")
+
+    plan = {
+        "key": plan_key,
+        "rules": rules,
+        "atr": atr_for_hold,
+        "min_bars_for_pt_tg": min_bars_for_pt_tg,
+        "time_exit_candles": time_exit_candles,
+        "trail_step": trail_step,
+        "day_type": _rc_day_type,
+        "adx_tier": _rc_adx_tier,
+        "gap_tag": _rc_gap_tag,
+        "min_hold_adj": _regime_min_hold_adj,
+        "gap_day_active": _gap_day_active,
+        # Phase 4: Gap day suppression — on gap days, require 3+ osc_hits instead of 2
+        # to avoid premature exits when gap momentum may persist
+        "osc_exit_threshold": 3 if _gap_day_active else 2,
+        "osc_rsi_call": float(state.get("osc_rsi_call", 75.0)),
+        "osc_rsi_put": float(state.get("osc_rsi_put", 25.0)),
+        "osc_cci_call": float(state.get("osc_cci_call", 130.0)),
+        "osc_cci_put": float(state.get("osc_cci_put", -130.0)),
+        "osc_wr_call": float(state.get("osc_wr_call", -10.0)),
+        "osc_wr_put": float(state.get("osc_wr_put", -88.0)),
+        "scalp_mode": scalp_mode,
+        "contextual_exit_type": "CPR" if "CPR" in src else ("CAMARILLA" if "CAMARILLA" in src else "ATR"),
+        # Bar-cache key columns, resolved against the candle frame on the first check.
+        "bar_spec": None,
+    }
 
-    if not state.get("is_open", False):
-        logging.info(
-            f"[EXIT SKIP] symbol={symbol} option_type={side} position_side={position_side} "
-            f"position_id={position_id} reason=POSITION_CLOSED"
-        )
-        return False, None
+    # ── Rule helpers: bar-derived inputs are cached in t["bar"] ──────────────
+    def last_adx(t) -> float:
+        bar, df_slice = t["bar"], t["df"]
+        if "last_adx" not in bar:
+            bar["last_adx"] = float(df_slice["adx14"].iloc[-1]) if ("adx14" in t["cols"] and len(df_slice) > 0 and pd.notna(df_slice["adx14"].iloc[-1])) else float("nan")
+        return bar["last_adx"]
+
+    def osc_hits(t) -> list:
+        bar, df_slice, cols = t["bar"], t["df"], t["cols"]
+        if "osc_hits" in bar:
+            return bar["osc_hits"]
+        hits = []
+        try:
+            cci_s = calculate_cci(df_slice) if "cci20" not in cols else df_slice["cci20"]
+            cci = float(cci_s.iloc[-1]) if not cci_s.empty else None
+            if cci and not pd.isna(cci):
+                if side == "CALL" and cci > plan["osc_cci_call"]:
+                    hits.append(f"CCI={cci:.0f}")
+                if side == "PUT" and cci < plan["osc_cci_put"]:
+                    hits.append(f"CCI={cci:.0f}")
+        except Exception:
+            pass
 
-    def contextual_exit_type() -> str:
-        src = str(state.get("source", "")).upper()
-        if "CPR" in src:
-            return "CPR"
-        if "CAMARILLA" in src:
-            return "CAMARILLA"
-        return "ATR"
+        try:
+            rsi_col = df_slice["rsi14"] if "rsi14" in cols else pd.Series(dtype=float)
+            rsi = float(rsi_col.iloc[-1]) if not rsi_col.empty else None
+            if rsi and not pd.isna(rsi):
+                if side == "CALL" and rsi > plan["osc_rsi_call"]:
+                    hits.append(f"RSI={rsi:.0f}")
+                if side == "PUT" and rsi < plan["osc_rsi_put"]:
+                    hits.append(f"RSI={rsi:.0f}")
+        except Exception:
+            pass
 
-    def audit(exit_type: str, reason: str, triggering_condition: str, premium_move=None) -> None:
+        try:
+            wr = williams_r(df_slice)
+            if wr and not pd.isna(wr):
+                if side == "CALL" and wr > plan["osc_wr_call"]:
+                    hits.append(f"WR={wr:.0f}")
+                if side == "PUT" and wr < plan["osc_wr_put"]:
+                    hits.append(f"WR={wr:.0f}")
+        except Exception:
+            pass
+        bar["osc_hits"] = hits
+        return hits
+
+    def audit(t, exit_type: str, reason: str, triggering_condition: str, premium_move=None) -> None:
         state["last_exit_type"] = exit_type
         state["last_triggering_condition"] = triggering_condition
         pm = f" premium_move={premium_move:.2f}" if premium_move is not None else ""
+        regime_ctx = state.get("regime_context", f"ATR={state.get('atr_value', 'N/A')}")
         _rc_label = _entry_rc.regime_label if _entry_rc is not None else regime_ctx
         _regime_note = (
             f" day={_rc_day_type} adx={_rc_adx_tier} gap={_rc_gap_tag}"
@@ -1947,17 +2014,36 @@ def check_exit_condition(df_slice, state, option_price=None, option_volume=None,
         )
         logging.info(
             "[EXIT AUDIT] "
-            f"timestamp={timestamp} symbol={symbol} option_type={side} position_side={position_side} "
+            f"timestamp={t['ts']} symbol={t['symbol']} option_type={side} position_side={t['position_side']} "
             f"exit_type={exit_type} "
             f"reason={reason} triggering_condition={triggering_condition} "
-            f"candle={i} bars_held={bars_held} regime={_rc_label} position_id={position_id}{pm}{_regime_note}"
+            f"candle={t['i']} bars_held={t['bars_held']} regime={_rc_label} position_id={position_id}{pm}{_regime_note}"
+        )
+        emit_event(
+            "exit_audit",
+            timestamp=str(t["ts"]),
+            symbol=t["symbol"],
+            option_type=side,
+            position_side=t["position_side"],
+            exit_type=exit_type,
+            reason=reason,
+            triggering_condition=triggering_condition,
+            candle=t["i"],
+            bars_held=t["bars_held"],
+            regime=str(_rc_label),
+            position_id=position_id,
+            premium_move=round(premium_move, 2) if premium_move is not None else None,
         )
 
     # 1) HFT exit - highest precedence override
-    hf_mgr = state.get("hf_exit_manager")
-    if hf_mgr is not None:
+    def hft_rule(t):
+        hf_mgr = state.get("hf_exit_manager")
+        if hf_mgr is None:
+            return None
+        current_ltp, bars_held = t["ltp"], t["bars_held"]
+        symbol, position_side = t["symbol"], t["position_side"]
         try:
-            if hf_mgr.check_exit(current_ltp, timestamp, current_volume=option_volume, bars_held=bars_held):
+            if hf_mgr.check_exit(current_ltp, t["ts"], current_volume=t["volume"], bars_held=bars_held):
                 hf_reason = hf_mgr.last_reason or "HF_EXIT"
                 if hf_reason == "MOMENTUM_EXHAUSTION" and bars_held < 3:
                     logging.info(
@@ -1972,7 +2058,7 @@ def check_exit_condition(df_slice, state, option_price=None, option_volume=None,
                         f"reason=Premature exit suppressed, minimum hold enforced. bars_held={bars_held}"
                     )
                 else:
-                    audit("HFT", hf_reason, f"hf_condition={hf_reason}")
+                    audit(t, "HFT", hf_reason, f"hf_condition={hf_reason}")
                     logging.info(
                         f"{YELLOW}[EXIT][HF] {side} {hf_reason} ltp={current_ltp:.2f} "
                         f"entry={entry_price:.2f} bars_held={bars_held}{RESET}"
@@ -1980,55 +2066,45 @@ def check_exit_condition(df_slice, state, option_price=None, option_volume=None,
                     return True, hf_reason
         except Exception as e:
             logging.warning(f"[HF EXIT] manager error: {e}")
+        return None
 
     # 2) Stop loss - with scalp survivability guardrail.
     # Scalp trades should survive initial noise for >=2 bars unless move is extreme.
-    if stop is not None and current_ltp <= stop:
-        if state.get("scalp_mode", False):
-            atr_val = float(state.get("atr_value", 0.0) or 0.0)
-            min_hold = 2 if atr_val < 30.0 else 3
+    def stop_loss_rule(t):
+        stop = state.get("stop")
+        current_ltp, bars_held, symbol = t["ltp"], t["bars_held"], t["symbol"]
+        if stop is None or not current_ltp <= stop:
+            return None
+        atr_val = plan["atr"]
+        min_hold = 2 if atr_val < 30.0 else 3
+        if plan["scalp_mode"]:
+            tag = "SCALP"
             extreme_mul = float(state.get("scalp_extreme_move_atr_mult", SCALP_EXTREME_MOVE_ATR_MULT))
             extreme_pts = max(2.0, atr_val * extreme_mul * 0.06)
-            emergency_stop = float(stop) - extreme_pts
-            if bars_held < min_hold and current_ltp > emergency_stop:
-                logging.info(
-                    "[EXIT SUPPRESSED][SCALP_MIN_HOLD] "
-                    f"symbol={symbol} option_type={side} bars_held={bars_held} "
-                    f"min_hold={min_hold} ltp={current_ltp:.2f} stop={stop:.2f} "
-                    f"emergency_stop={emergency_stop:.2f}"
-                )
-                return False, None
-            if bars_held < min_hold and current_ltp <= emergency_stop:
-                logging.info(
-                    "[EXIT ALLOWED][SCALP_EXTREME_MOVE] "
-                    f"symbol={symbol} option_type={side} bars_held={bars_held} "
-                    f"ltp={current_ltp:.2f} emergency_stop={emergency_stop:.2f}"
-                )
         else:
-            atr_val = float(state.get("atr_value", 0.0) or 0.0)
-            min_hold = 2 if atr_val < 30.0 else 3
+            tag = "TREND"
             extreme_mul = float(state.get("trend_extreme_move_atr_mult", TREND_EXTREME_MOVE_ATR_MULT))
             extreme_pts = max(3.0, atr_val * extreme_mul * 0.06)
-            emergency_stop = float(stop) - extreme_pts
-            if bars_held < min_hold and current_ltp > emergency_stop:
-                logging.info(
-                    "[EXIT SUPPRESSED][TREND_MIN_HOLD] "
-                    f"symbol={symbol} option_type={side} bars_held={bars_held} "
-                    f"min_hold={min_hold} ltp={current_ltp:.2f} stop={stop:.2f} "
-                    f"emergency_stop={emergency_stop:.2f}"
-                )
-                return False, None
-            if bars_held < min_hold and current_ltp <= emergency_stop:
-                logging.info(
-                    "[EXIT ALLOWED][TREND_EXTREME_MOVE] "
-                    f"symbol={symbol} option_type={side} bars_held={bars_held} "
-                    f"ltp={current_ltp:.2f} emergency_stop={emergency_stop:.2f}"
-                )
-        audit("SL", "SL_HIT", f"ltp<={stop:.2f}")
+        emergency_stop = float(stop) - extreme_pts
+        if bars_held < min_hold and current_ltp > emergency_stop:
+            logging.info(
+                f"[EXIT SUPPRESSED][{tag}_MIN_HOLD] "
+                f"symbol={symbol} option_type={side} bars_held={bars_held} "
+                f"min_hold={min_hold} ltp={current_ltp:.2f} stop={stop:.2f} "
+                f"emergency_stop={emergency_stop:.2f}"
+            )
+            return False, None
+        if bars_held < min_hold and current_ltp <= emergency_stop:
+            logging.info(
+                f"[EXIT ALLOWED][{tag}_EXTREME_MOVE] "
+                f"symbol={symbol} option_type={side} bars_held={bars_held} "
+                f"ltp={current_ltp:.2f} emergency_stop={emergency_stop:.2f}"
+            )
+        audit(t, "SL", "SL_HIT", f"ltp<={stop:.2f}")
         logging.info(
             f"{RED}[EXIT][SL_HIT] {side} ltp={current_ltp:.2f} stop={stop:.2f} bars_held={bars_held}{RESET}"
         )
-        if state.get("scalp_mode", False):
+        if plan["scalp_mode"]:
             logging.info(
                 f"[SCALP_SL_HIT] {side} trade_class={state.get('trade_class', 'SCALP')} "
                 f"bars_held={bars_held} entry={state.get('buy_price', '?')} stop={stop:.2f} ltp={current_ltp:.2f}"
@@ -2046,78 +2122,84 @@ def check_exit_condition(df_slice, state, option_price=None, option_volume=None,
         return True, "SL_HIT"
 
     # 2B) Dip/rally scalp exits — only for SCALP trade class (P1-B / P2-D).
-    if state.get("scalp_mode", False):
+    # No SCALP_SL_HIT logic here: the SL rule uses the ATR-based `state['stop']`.
+    def scalp_pt_rule(t):
+        current_ltp, bars_held = t["ltp"], t["bars_held"]
         # Survivability guardrail: must hold for at least 2 bars
-        if bars_held >= 2:
-            scalp_pt = float(state.get("scalp_pt_points", SCALP_PT_POINTS))
-            premium_move = float(current_ltp - entry_price)
-            logging.debug(
-                f"[SCALP_EXIT_CHECK] bars_held={bars_held} "
-                f"premium_move={premium_move:.2f} scalp_pt={scalp_pt:.2f}"
+        if bars_held < 2:
+            return None
+        scalp_pt = float(state.get("scalp_pt_points", SCALP_PT_POINTS))
+        premium_move = float(current_ltp - entry_price)
+        logging.debug(
+            f"[SCALP_EXIT_CHECK] bars_held={bars_held} "
+            f"premium_move={premium_move:.2f} scalp_pt={scalp_pt:.2f}"
+        )
+        if premium_move >= scalp_pt:
+            audit(t, "SCALP_PT_HIT", "SCALP_PT_HIT", f"premium_move>={scalp_pt:.2f}", premium_move=premium_move)
+            logging.info(
+                f"{GREEN}[EXIT][SCALP_PT_HIT] {side} "
+                f"premium_move={premium_move:.2f} target={scalp_pt:.2f} ltp={current_ltp:.2f}{RESET}"
             )
-            if premium_move >= scalp_pt:
-                audit("SCALP_PT_HIT", "SCALP_PT_HIT", f"premium_move>={scalp_pt:.2f}", premium_move=premium_move)
-                logging.info(
-                    f"{GREEN}[EXIT][SCALP_PT_HIT] {side} "
-                    f"premium_move={premium_move:.2f} target={scalp_pt:.2f} ltp={current_ltp:.2f}{RESET}"
-                )
-                return True, "SCALP_PT_HIT"
-        # No SCALP_SL_HIT logic here. The main SL_HIT check at the top of the function
-        # will use the ATR-based `state['stop']`.
-        # Do not return, allow fall-through to other exit checks like HFT.
+            return True, "SCALP_PT_HIT"
+        return None
 
     # 3) PT/TG structured checks
-    tg_hit = tg is not None and current_ltp >= tg
-    pt_hit = pt is not None and current_ltp >= pt and not state.get("partial_booked", False)
-
-    if bars_held <= 0 and not pt_hit:
-        logging.info(
-            "[EXIT SUPPRESSED] "
-            f"symbol={symbol} option_type={side} position_side={position_side} "
-            "reason=Premature exit suppressed, minimum hold enforced."
-        )
-        return False, None
+    def premature_rule(t):
+        if t["bars_held"] <= 0 and not t["pt_hit"]:
+            logging.info(
+                "[EXIT SUPPRESSED] "
+                f"symbol={t['symbol']} option_type={side} position_side={t['position_side']} "
+                "reason=Premature exit suppressed, minimum hold enforced."
+            )
+            return False, None
+        return None
 
     # 4) Min-bar maturity gate
-    last_adx = float(df_slice["adx14"].iloc[-1]) if ("adx14" in df_slice.columns and len(df_slice) > 0 and pd.notna(df_slice["adx14"].iloc[-1])) else float("nan")
-    tg_adx_override = bool(tg_hit and np.isfinite(last_adx) and last_adx > 40.0)
-    if bars_held < min_bars_for_pt_tg and (tg_hit or pt_hit):
-        if tg_adx_override:
+    def min_bar_rule(t):
+        tg_hit, pt_hit, tg, pt = t["tg_hit"], t["pt_hit"], t["tg"], t["pt"]
+        current_ltp, bars_held, symbol = t["ltp"], t["bars_held"], t["symbol"]
+        if not (bars_held < min_bars_for_pt_tg and (tg_hit or pt_hit)):
+            return None
+        adx = last_adx(t)
+        if tg_hit and np.isfinite(adx) and adx > 40.0:
             logging.info(
                 "[EXIT ALLOWED][TG_ADX_OVERRIDE] "
                 f"symbol={symbol} option_type={side} bars_held={bars_held} "
-                f"min_hold={min_bars_for_pt_tg} adx={last_adx:.1f} tg={tg:.2f}"
+                f"min_hold={min_bars_for_pt_tg} adx={adx:.1f} tg={tg:.2f}"
             )
-            audit("TG", "TARGET_HIT", f"ltp>={tg:.2f} adx={last_adx:.1f}")
+            audit(t, "TG", "TARGET_HIT", f"ltp>={tg:.2f} adx={adx:.1f}")
             return True, "TARGET_HIT"
         if bars_held <= 0 and pt_hit:
-            audit("PT", "PT_HIT", f"ltp>={pt:.2f}")
+            audit(t, "PT", "PT_HIT", f"ltp>={pt:.2f}")
             state["partial_booked"] = True
             if (state.get("stop") or 0) < entry_price:
                 state["stop"] = entry_price
             return True, "PT_HIT"
-        audit("MIN_BAR", "DEFERRED", f"bars_held<{min_bars_for_pt_tg}")
+        audit(t, "MIN_BAR", "DEFERRED", f"bars_held<{min_bars_for_pt_tg}")
         if tg_hit:
             logging.info(
                 "[TG_HIT_EXIT_SUPPRESSED] "
                 f"symbol={symbol} option_type={side} bars_held={bars_held} "
-                f"min_hold={min_bars_for_pt_tg} adx={last_adx if np.isfinite(last_adx) else 'N/A'}"
+                f"min_hold={min_bars_for_pt_tg} adx={adx if np.isfinite(adx) else 'N/A'}"
             )
             logging.info(
                 f"[SURVIVABILITY_OVERRIDE] Minimum hold enforced. "
                 f"{YELLOW}[EXIT DEFERRED] TG hit before min bars ({bars_held} < {min_bars_for_pt_tg}). "
-                f"ltp={current_ltp:.2f} tg={tg:.2f} defer_until={entry_candle + min_bars_for_pt_tg}{RESET}"
+                f"ltp={current_ltp:.2f} tg={tg:.2f} defer_until={t['entry_candle'] + min_bars_for_pt_tg}{RESET}"
             )
         elif state.get("pt_deferred_logged", 0) == 0:
             logging.info(
                 f"[SURVIVABILITY_OVERRIDE] Minimum hold enforced. "
                 f"{YELLOW}[EXIT DEFERRED] PT hit before min bars ({bars_held} < {min_bars_for_pt_tg}). "
-                f"ltp={current_ltp:.2f} pt={pt:.2f} defer_until={entry_candle + min_bars_for_pt_tg}{RESET}"
+                f"ltp={current_ltp:.2f} pt={pt:.2f} defer_until={t['entry_candle'] + min_bars_for_pt_tg}{RESET}"
             )
             state["pt_deferred_logged"] = 1
         return False, None
 
-    if tg_hit:
+    def target_rule(t):
+        if not t["tg_hit"]:
+            return None
+        tg, current_ltp, bars_held = t["tg"], t["ltp"], t["bars_held"]
         # P2-C: Partial TG exit — first TG hit exits 50% of quantity.
         # The remaining 50% continues with SL ratcheted to TG (break-even+).
         # On second trigger (full_tg_booked=True already consumed), full exit.
@@ -2127,7 +2209,7 @@ def check_exit_condition(df_slice, state, option_price=None, option_volume=None,
             state["partial_tg_qty"]    = partial_qty
             state["stop"]              = tg   # ratchet SL to TG level
             state["pt_deferred_logged"] = 0
-            audit("TG", "TG_PARTIAL_EXIT", f"ltp>={tg:.2f} qty={partial_qty}")
+            audit(t, "TG", "TG_PARTIAL_EXIT", f"ltp>={tg:.2f} qty={partial_qty}")
             logging.info(
                 f"{GREEN}[EXIT][PARTIAL_EXIT][TG] {side} ltp={current_ltp:.2f} "
                 f"tg={tg:.2f} partial_qty={partial_qty} "
@@ -2135,193 +2217,292 @@ def check_exit_condition(df_slice, state, option_price=None, option_volume=None,
                 f"SL_ratcheted_to={tg:.2f} bars_held={bars_held}{RESET}"
             )
             return True, "TG_PARTIAL_EXIT"
-        else:
-            # Remaining 50% has now run beyond TG — full close
-            audit("TG", "TARGET_HIT", f"ltp>={tg:.2f} full_exit")
-            logging.info(
-                f"{GREEN}[EXIT][TG_HIT][FULL] {side} ltp={current_ltp:.2f} "
-                f"tg={tg:.2f} bars_held={bars_held}{RESET}"
-            )
-            return True, "TARGET_HIT"
-
-    if pt_hit and bars_held >= min_bars_for_pt_tg:
-        audit("PT", "PT_HIT", f"ltp>={pt:.2f}")
-        state["partial_booked"] = True
-        state["pt_deferred_logged"] = 0
-        if (state.get("stop") or 0) < entry_price:
-            state["stop"] = entry_price
+        # Remaining 50% has now run beyond TG — full close
+        audit(t, "TG", "TARGET_HIT", f"ltp>={tg:.2f} full_exit")
         logging.info(
-            f"{GREEN}[PARTIAL] {side} ltp={current_ltp:.2f} >= pt={pt:.2f} bars_held={bars_held} "
-            f"stop_locked={entry_price:.2f}{RESET}"
+            f"{GREEN}[EXIT][TG_HIT][FULL] {side} ltp={current_ltp:.2f} "
+            f"tg={tg:.2f} bars_held={bars_held}{RESET}"
         )
+        return True, "TARGET_HIT"
 
-    # Trailing stop update only after maturity.
-    pnl = current_ltp - entry_price
-    if bars_held >= min_bars_for_pt_tg and pnl >= 5 and trail_step > 0:
-        new_stop = current_ltp - trail_step
-        if new_stop > state.get("stop", 0):
-            state["stop"] = new_stop
-            state["trail_updates"] = state.get("trail_updates", 0) + 1
+    # PT books the partial and locks the stop at entry; it never exits by itself.
+    def partial_rule(t):
+        if t["pt_hit"] and t["bars_held"] >= min_bars_for_pt_tg:
+            pt = t["pt"]
+            audit(t, "PT", "PT_HIT", f"ltp>={pt:.2f}")
+            state["partial_booked"] = True
+            state["pt_deferred_logged"] = 0
+            if (state.get("stop") or 0) < entry_price:
+                state["stop"] = entry_price
             logging.info(
-                f"{CYAN}[TRAIL] {side} stop={new_stop:.2f} ltp={current_ltp:.2f} bars_held={bars_held}{RESET}"
+                f"{GREEN}[PARTIAL] {side} ltp={t['ltp']:.2f} >= pt={pt:.2f} bars_held={t['bars_held']} "
+                f"stop_locked={entry_price:.2f}{RESET}"
             )
+        return None
 
-    # 5) Contextual exits (ATR/CPR/CAMARILLA)
-    osc_hits = []
-    try:
-        cci_s = calculate_cci(df_slice) if "cci20" not in df_slice.columns else df_slice["cci20"]
-        cci = float(cci_s.iloc[-1]) if not cci_s.empty else None
-        if cci and not pd.isna(cci):
-            if side == "CALL" and cci > osc_cci_call:
-                osc_hits.append(f"CCI={cci:.0f}")
-            if side == "PUT" and cci < osc_cci_put:
-                osc_hits.append(f"CCI={cci:.0f}")
-    except Exception:
-        pass
+    # Trailing stop update only after maturity.
+    def trail_rule(t):
+        current_ltp, bars_held = t["ltp"], t["bars_held"]
+        pnl = current_ltp - entry_price
+        if bars_held >= min_bars_for_pt_tg and pnl >= 5 and trail_step > 0:
+            new_stop = current_ltp - trail_step
+            if new_stop > state.get("stop", 0):
+                state["stop"] = new_stop
+                state["trail_updates"] = state.get("trail_updates", 0) + 1
+                logging.info(
+                    f"{CYAN}[TRAIL] {side} stop={new_stop:.2f} ltp={current_ltp:.2f} bars_held={bars_held}{RESET}"
+                )
+        return None
 
-    try:
-        rsi_col = df_slice["rsi14"] if "rsi14" in df_slice.columns else pd.Series(dtype=float)
-        rsi = float(rsi_col.iloc[-1]) if not rsi_col.empty else None
-        if rsi and not pd.isna(rsi):
-            if side == "CALL" and rsi > osc_rsi_call:
-                osc_hits.append(f"RSI={rsi:.0f}")
-            if side == "PUT" and rsi < osc_rsi_put:
-                osc_hits.append(f"RSI={rsi:.0f}")
-    except Exception:
-        pass
+    # 5) Contextual exits (ATR/CPR/CAMARILLA)
+    def cpr_rule(t):
+        bar, df_slice, current_ltp, bars_held = t["bar"], t["df"], t["ltp"], t["bars_held"]
+        if bars_held < min_bars_for_pt_tg or len(df_slice) < 2:
+            return None
+        if "prev_close" not in bar:
+            bar["prev_close"] = float(df_slice["close"].iloc[-2])
+        prev_close = bar["prev_close"]
+        if side == "CALL" and current_ltp < prev_close:
+            audit(t, "CPR", "CPR_CONTEXT_EXIT", "close<prev_close")
+            logging.info(f"{YELLOW}[EXIT][CPR] CALL context breakdown bars_held={bars_held}{RESET}")
+            return True, "CPR_CONTEXT_EXIT"
+        if side == "PUT" and current_ltp > prev_close:
+            audit(t, "CPR", "CPR_CONTEXT_EXIT", "close>prev_close")
+            logging.info(f"{YELLOW}[EXIT][CPR] PUT context breakdown bars_held={bars_held}{RESET}")
+            return True, "CPR_CONTEXT_EXIT"
+        return None
 
-    try:
-        wr = williams_r(df_slice)
-        if wr and not pd.isna(wr):
-            if side == "CALL" and wr > osc_wr_call:
-                osc_hits.append(f"WR={wr:.0f}")
-            if side == "PUT" and wr < osc_wr_put:
-                osc_hits.append(f"WR={wr:.0f}")
-    except Exception:
-        pass
+    def camarilla_rule(t):
+        bar, df_slice, current_ltp, bars_held = t["bar"], t["df"], t["ltp"], t["bars_held"]
+        if bars_held < min_bars_for_pt_tg or len(df_slice) < 2:
+            return None
+        if "prev_open" not in bar:
+            bar["prev_open"] = float(df_slice["open"].iloc[-2])
+        prev_open = bar["prev_open"]
+        if side == "CALL" and current_ltp < prev_open:
+            audit(t, "CAMARILLA", "CAM_CONTEXT_EXIT", "close<prev_open")
+            logging.info(f"{YELLOW}[EXIT][CAMARILLA] CALL context breakdown bars_held={bars_held}{RESET}")
+            return True, "CAM_CONTEXT_EXIT"
+        if side == "PUT" and current_ltp > prev_open:
+            audit(t, "CAMARILLA", "CAM_CONTEXT_EXIT", "close>prev_open")
+            logging.info(f"{YELLOW}[EXIT][CAMARILLA] PUT context breakdown bars_held={bars_held}{RESET}")
+            return True, "CAM_CONTEXT_EXIT"
+        return None
 
-    # Contextual structure exits keyed by source/pivot context.
-    ctx_text = (
-        f"{str(state.get('source', '')).upper()}|"
-        f"{str(state.get('pivot', '')).upper()}|"
-        f"{str(state.get('regime_context', '')).upper()}"
-    )
-    if bars_held >= min_bars_for_pt_tg:
-        if "CPR" in ctx_text and len(df_slice) >= 2:
-            prev_close = float(df_slice["close"].iloc[-2])
-            if side == "CALL" and current_ltp < prev_close:
-                audit("CPR", "CPR_CONTEXT_EXIT", "close<prev_close")
-                logging.info(f"{YELLOW}[EXIT][CPR] CALL context breakdown bars_held={bars_held}{RESET}")
-                return True, "CPR_CONTEXT_EXIT"
-            if side == "PUT" and current_ltp > prev_close:
-                audit("CPR", "CPR_CONTEXT_EXIT", "close>prev_close")
-                logging.info(f"{YELLOW}[EXIT][CPR] PUT context breakdown bars_held={bars_held}{RESET}")
-                return True, "CPR_CONTEXT_EXIT"
-        if "CAMARILLA" in ctx_text and len(df_slice) >= 2:
-            prev_open = float(df_slice["open"].iloc[-2])
-            if side == "CALL" and current_ltp < prev_open:
-                audit("CAMARILLA", "CAM_CONTEXT_EXIT", "close<prev_open")
-                logging.info(f"{YELLOW}[EXIT][CAMARILLA] CALL context breakdown bars_held={bars_held}{RESET}")
-                return True, "CAM_CONTEXT_EXIT"
-            if side == "PUT" and current_ltp > prev_open:
-                audit("CAMARILLA", "CAM_CONTEXT_EXIT", "close>prev_open")
-                logging.info(f"{YELLOW}[EXIT][CAMARILLA] PUT context breakdown bars_held={bars_held}{RESET}")
-                return True, "CAM_CONTEXT_EXIT"
-
-    # Phase 4: Gap day suppression — on gap days, require 3+ osc_hits instead of 2
-    # to avoid premature exits when gap momentum may persist
-    _osc_exit_threshold = 3 if _gap_day_active else 2
-
-    if len(osc_hits) >= _osc_exit_threshold and bars_held >= min_bars_for_pt_tg:
+    def oscillator_rule(t):
+        bars_held = t["bars_held"]
+        if bars_held < min_bars_for_pt_tg:
+            return None
+        hits = osc_hits(t)
+        if len(hits) < plan["osc_exit_threshold"]:
+            return None
         if OSCILLATOR_EXIT_MODE == "HARD":
-            x_type = contextual_exit_type()
-            audit(x_type, "OSC_EXHAUSTION", f"osc_hits={'+'.join(osc_hits)} gap_suppress={_gap_day_active}")
-            logging.info(f"{YELLOW}[EXIT][OSC] {side} {'+'.join(osc_hits)} bars_held={bars_held}{RESET}")
+            audit(t, plan["contextual_exit_type"], "OSC_EXHAUSTION", f"osc_hits={'+'.join(hits)} gap_suppress={_gap_day_active}")
+            logging.info(f"{YELLOW}[EXIT][OSC] {side} {'+'.join(hits)} bars_held={bars_held}{RESET}")
             return True, "OSC_EXHAUSTION"
         # TRAIL mode: lock SL at entry (breakeven) instead of closing
         _prev_stop = state.get("stop", 0) or 0
         if _prev_stop < entry_price:
             state["stop"] = entry_price
             logging.info(
-                f"{YELLOW}[OSC_TRAIL] {side} osc_hits={'+'.join(osc_hits)} "
+                f"{YELLOW}[OSC_TRAIL] {side} osc_hits={'+'.join(hits)} "
                 f"SL locked at entry={entry_price:.2f} (was {_prev_stop:.2f}) "
                 f"bars_held={bars_held}{RESET}"
             )
+        return None
 
-    if "supertrend_bias" in df_slice.columns and len(df_slice) >= 2 and bars_held >= min_bars_for_pt_tg:
-        def norm(b):
-            return "UP" if b in ("UP", "BULLISH") else ("DOWN" if b in ("DOWN", "BEARISH") else "N")
-        b1 = norm(df_slice["supertrend_bias"].iloc[-1])
-        b2 = norm(df_slice["supertrend_bias"].iloc[-2])
+    def st_flip_rule(t):
+        bar, df_slice, bars_held = t["bar"], t["df"], t["bars_held"]
+        if not ("supertrend_bias" in t["cols"] and len(df_slice) >= 2 and bars_held >= min_bars_for_pt_tg):
+            return None
+        if "st_bias" not in bar:
+            def norm(b):
+                return "UP" if b in ("UP", "BULLISH") else ("DOWN" if b in ("DOWN", "BEARISH") else "N")
+            bar["st_bias"] = (norm(df_slice["supertrend_bias"].iloc[-1]),
+                              norm(df_slice["supertrend_bias"].iloc[-2]))
+        b1, b2 = bar["st_bias"]
         if side == "CALL" and b1 == "DOWN" and b2 == "DOWN":
-            x_type = contextual_exit_type()
-            audit(x_type, "ST_FLIP", "supertrend=DOWNx2")
+            audit(t, plan["contextual_exit_type"], "ST_FLIP", "supertrend=DOWNx2")
             logging.info(f"{YELLOW}[EXIT][ST_FLIP] CALL bearish x2 bars_held={bars_held}{RESET}")
             return True, "ST_FLIP"
         if side == "PUT" and b1 == "UP" and b2 == "UP":
-            x_type = contextual_exit_type()
-            audit(x_type, "ST_FLIP", "supertrend=UPx2")
+            audit(t, plan["contextual_exit_type"], "ST_FLIP", "supertrend=UPx2")
             logging.info(f"{YELLOW}[EXIT][ST_FLIP] PUT bullish x2 bars_held={bars_held}{RESET}")
             return True, "ST_FLIP"
+        return None
 
-    last_c = df_slice.iloc[-1]
-    is_reversal = ((side == "CALL" and last_c["close"] < last_c["open"]) or
-                   (side == "PUT" and last_c["close"] > last_c["open"]))
-    state["consec_count"] = (state.get("consec_count", 0) + 1) if is_reversal else 0
-    rev_atr = float(state.get("atr_value", 0.0) or 0.0)
-    rev_threshold = 3
-    if np.isfinite(rev_atr) and rev_atr >= 30.0 and np.isfinite(last_adx) and last_adx >= 25.0:
-        rev_threshold = 2
-    # Phase 4: Strong ADX → need more consecutive reversals before exiting (trend protects)
-    if _rc_adx_tier == "ADX_STRONG_40":
-        rev_threshold = max(rev_threshold, 3)
-    if state["consec_count"] >= rev_threshold and bars_held >= min_bars_for_pt_tg:
-        x_type = contextual_exit_type()
-        audit(x_type, "REVERSAL_EXIT", f"reversal_count={state['consec_count']} threshold={rev_threshold}")
-        logging.info(
-            f"{YELLOW}[EXIT][REVERSAL] {side} {state['consec_count']} "
-            f"bars_held={bars_held} threshold={rev_threshold} "
-            f"atr={rev_atr if np.isfinite(rev_atr) else 'N/A'} "
-            f"adx={last_adx if np.isfinite(last_adx) else 'N/A'}{RESET}"
-        )
-        return True, "REVERSAL_EXIT"
+    def reversal_rule(t):
+        bar, bars_held = t["bar"], t["bars_held"]
+        if "is_reversal" not in bar:
+            last_c = t["df"].iloc[-1]
+            bar["is_reversal"] = bool((side == "CALL" and last_c["close"] < last_c["open"]) or
+                                      (side == "PUT" and last_c["close"] > last_c["open"]))
+        state["consec_count"] = (state.get("consec_count", 0) + 1) if bar["is_reversal"] else 0
+        rev_atr = plan["atr"]
+        adx = last_adx(t)
+        rev_threshold = 3
+        if np.isfinite(rev_atr) and rev_atr >= 30.0 and np.isfinite(adx) and adx >= 25.0:
+            rev_threshold = 2
+        # Phase 4: Strong ADX → need more consecutive reversals before exiting (trend protects)
+        if _rc_adx_tier == "ADX_STRONG_40":
+            rev_threshold = max(rev_threshold, 3)
+        if state["consec_count"] >= rev_threshold and bars_held >= min_bars_for_pt_tg:
+            audit(t, plan["contextual_exit_type"], "REVERSAL_EXIT", f"reversal_count={state['consec_count']} threshold={rev_threshold}")
+            logging.info(
+                f"{YELLOW}[EXIT][REVERSAL] {side} {state['consec_count']} "
+                f"bars_held={bars_held} threshold={rev_threshold} "
+                f"atr={rev_atr if np.isfinite(rev_atr) else 'N/A'} "
+                f"adx={adx if np.isfinite(adx) else 'N/A'}{RESET}"
+            )
+            return True, "REVERSAL_EXIT"
+        return None
 
-    ema9 = df_slice["close"].ewm(span=9, adjust=False).mean().iloc[-1]
-    ema13 = df_slice["close"].ewm(span=13, adjust=False).mean().iloc[-1]
-    ema_gap = abs(ema9 - ema13)
-    _, momentum = momentum_ok(df_slice, side)
-    momentum = momentum or 0
+    def momentum_rule(t):
+        bar, df_slice = t["bar"], t["df"]
+        if "ema_gap" not in bar:
+            ema9 = df_slice["close"].ewm(span=9, adjust=False).mean().iloc[-1]
+            ema13 = df_slice["close"].ewm(span=13, adjust=False).mean().iloc[-1]
+            _, mom = momentum_ok(df_slice, side)
+            bar["ema_gap"], bar["momentum"] = abs(ema9 - ema13), mom or 0
+        ema_gap, momentum = bar["ema_gap"], bar["momentum"]
+
+        prev_gap = state.get("prev_gap", ema_gap)
+        peak_momentum = state.get("peak_momentum", abs(momentum))
+        if ema_gap > prev_gap:
+            state["prev_gap"] = ema_gap
+            state["peak_momentum"] = max(peak_momentum, abs(momentum))
+            state["plateau_count"] = 0
+            logging.debug(
+                f"[EMA PLATEAU RESET] symbol={t['symbol']} option_type={side} "
+                f"ema_gap={ema_gap:.4f} peak_momentum={state['peak_momentum']:.4f}"
+            )
+            return False, None
 
-    prev_gap = state.get("prev_gap", ema_gap)
-    peak_momentum = state.get("peak_momentum", abs(momentum))
-    if ema_gap > prev_gap:
+        state["plateau_count"] = state.get("plateau_count", 0) + 1
         state["prev_gap"] = ema_gap
-        state["peak_momentum"] = max(peak_momentum, abs(momentum))
-        state["plateau_count"] = 0
-        logging.debug(
-            f"[EMA PLATEAU RESET] symbol={symbol} option_type={side} "
-            f"ema_gap={ema_gap:.4f} peak_momentum={state['peak_momentum']:.4f}"
+        if state["plateau_count"] >= 2 and abs(momentum) < peak_momentum * 0.4 and len(osc_hits(t)) >= 1:
+            momentum_reason = "MOMENTUM_EXHAUSTION" if not state.get("scalp_mode", False) else "MOMENTUM_EXIT"
+            audit(t, plan["contextual_exit_type"], momentum_reason, "ema_plateau+momentum_drop")
+            logging.info(
+                f"{YELLOW}[EXIT][MOMENTUM] {side} reason={momentum_reason} "
+                f"plateau+drop+osc bars_held={t['bars_held']}{RESET}"
+            )
+            return True, momentum_reason
+        return None
+
+    def time_rule(t):
+        held = t["i"] - t["entry_candle"]
+        if held >= time_exit_candles and state.get("trail_updates", 0) == 0:
+            audit(t, "ATR", "TIME_EXIT", f"no_trail_for_{time_exit_candles}_candles")
+            logging.info(f"{YELLOW}[EXIT][TIME] {side} {held} candles no trail{RESET}")
+            return True, "TIME_EXIT"
+        return None
+
+    table = {
+        "HFT": hft_rule, "SL": stop_loss_rule, "SCALP_PT": scalp_pt_rule,
+        "PREMATURE": premature_rule, "MIN_BAR": min_bar_rule, "TG": target_rule,
+        "PT": partial_rule, "TRAIL": trail_rule, "CPR": cpr_rule,
+        "CAMARILLA": camarilla_rule, "OSC": oscillator_rule, "ST_FLIP": st_flip_rule,
+        "REVERSAL": reversal_rule, "MOMENTUM": momentum_rule, "TIME": time_rule,
+    }
+    plan["table"] = tuple((name, table[name]) for name in rules)
+    state["_exit_plan"] = plan
+    state.pop("_exit_bar_cache", None)
+    return plan
+
+
+def check_exit_condition(df_slice, state, option_price=None, option_volume=None, timestamp=None):
+    """Evaluate exits with strict precedence and structured audit logs.
+
+    Precedence:
+    1) HFT override
+    2) Stop loss
+    3) PT/TG structured profit checks
+    4) Minimum bar maturity gate
+    5) Contextual exits (ATR/CPR/CAMARILLA mapped by signal source)
+
+    The checks run as an ordered rule table through exit_rules.evaluate_rules
+    (first decision wins; per-rule counters in exit_rules.rule_metrics()).
+    The rule table and parameters fixed at entry come from compile_exit_plan
+    (built once per position) and bar-derived inputs are cached per bar in
+    ``state["_exit_bar_cache"]``, so a per-tick check only builds the tick
+    context: premium, bar position and the PT/TG hit flags.
+    """
+    from exit_rules import evaluate_rules
+
+    plan = compile_exit_plan(state)
+    i = len(df_slice) - 1
+    side = state["side"]
+    position_side = state.get("position_side", "LONG")
+    symbol = state.get("option_name", "N/A")
+    position_id = state.get("position_id", "UNKNOWN")
+    entry_candle = state.get("entry_candle", i)
+    current_ltp = option_price if option_price is not None else df_slice["close"].iloc[-1]
+    timestamp = timestamp if timestamp is not None else dt.now(time_zone)
+    trail_step = plan["trail_step"]
+    _rc_day_type, _rc_adx_tier, _rc_gap_tag = plan["day_type"], plan["adx_tier"], plan["gap_tag"]
+    _gap_day_active = plan["gap_day_active"]
+
+    # Log regime-adaptive parameters once per exit check
+    if state.get("entry_regime_context") is not None and not state.get("_regime_exit_logged", False):
+        logging.info(
+            f"[EXIT AUDIT][REGIME_ADAPTIVE] day_type={_rc_day_type} adx_tier={_rc_adx_tier} "
+            f"gap_tag={_rc_gap_tag} min_hold_adj={plan['min_hold_adj']:+d} "
+            f"trail_step={trail_step} time_exit={plan['time_exit_candles']} "
+            f"gap_suppress={'ON' if _gap_day_active else 'OFF'}"
         )
-        return False, None
+        emit_event(
+            "exit_regime",
+            day_type=_rc_day_type,
+            adx_tier=_rc_adx_tier,
+            gap_tag=_rc_gap_tag,
+            min_hold_adj=plan["min_hold_adj"],
+            trail_step=trail_step,
+            time_exit=plan["time_exit_candles"],
+            gap_suppress=bool(_gap_day_active),
+        )
+        state["_regime_exit_logged"] = True
 
-    state["plateau_count"] = state.get("plateau_count", 0) + 1
-    state["prev_gap"] = ema_gap
-    if state["plateau_count"] >= 2 and abs(momentum) < peak_momentum * 0.4 and len(osc_hits) >= 1:
-        x_type = contextual_exit_type()
-        momentum_reason = "MOMENTUM_EXHAUSTION" if not state.get("scalp_mode", False) else "MOMENTUM_EXIT"
-        audit(x_type, momentum_reason, "ema_plateau+momentum_drop")
+    if not state.get("is_open", False):
         logging.info(
-            f"{YELLOW}[EXIT][MOMENTUM] {side} reason={momentum_reason} "
-            f"plateau+drop+osc bars_held={bars_held}{RESET}"
+            f"[EXIT SKIP] symbol={symbol} option_type={side} position_side={position_side} "
+            f"position_id={position_id} reason=POSITION_CLOSED"
         )
-        return True, momentum_reason
+        return False, None
 
-    if i - entry_candle >= time_exit_candles and state.get("trail_updates", 0) == 0:
-        audit("ATR", "TIME_EXIT", f"no_trail_for_{time_exit_candles}_candles")
-        logging.info(f"{YELLOW}[EXIT][TIME] {side} {i-entry_candle} candles no trail{RESET}")
-        return True, "TIME_EXIT"
+    # ── Bar cache: indicator-derived inputs, reused by every tick of a bar ──
+    # The key columns are resolved once per plan; a tick only reads their values.
+    cols = df_slice.columns
+    spec = plan["bar_spec"]
+    if spec is None or spec[0] != len(cols):
+        last = tuple((c, -1) for c in ("open", "high", "low", "close", "adx14", "cci20", "rsi14",
+                                       "ema9", "ema13", "supertrend_bias") if c in cols)
+        prev = tuple((c, -2) for c in ("open", "close", "supertrend_bias") if c in cols)
+        spec = plan["bar_spec"] = (len(cols), last, last + prev)
+    bar_key = [i + 1]
+    if i >= 0:
+        bar_key.append(df_slice.index[-1])
+        for c, pos in (spec[2] if i >= 1 else spec[1]):
+            v = df_slice[c].iat[pos]
+            bar_key.append(None if v != v else v)   # NaN-stable key
+    bar_key = tuple(bar_key)
+    bar = state.get("_exit_bar_cache")
+    if bar is None or bar.get("key") != bar_key:
+        bar = {"key": bar_key}
+        state["_exit_bar_cache"] = bar
 
-    return False, None
+    pt = state.get("pt")
+    tg = state.get("tg")
+    tick = {
+        "df": df_slice, "cols": cols, "bar": bar, "i": i,
+        "entry_candle": entry_candle, "bars_held": i - entry_candle, "ltp": current_ltp,
+        "volume": option_volume if option_volume is not None else 0.0,
+        "ts": timestamp, "symbol": symbol, "position_side": position_side,
+        "pt": pt, "tg": tg,
+        "tg_hit": tg is not None and current_ltp >= tg,
+        "pt_hit": pt is not None and current_ltp >= pt and not state.get("partial_booked", False),
+    }
+    return evaluate_rules(plan["table"], tick)
 
 
 def build_dynamic_levels(entry_price, atr, side, entry_candle,
@@ -2733,12 +2914,88 @@ elif not _is_offline_replay:
 
 # ===== Broker order functions =====
 
+def _live_gateway():
+    """Process-wide order gateway over the setup Fyers client (see broker_gateway)."""
+    return get_gateway("live", lambda: FyersAdapter(fyers))
+
+
+def use_sim_exchange(client):
+    """
+    Route the live order path to a local matching engine.
+
+    ``client`` is a sim_exchange.SimFyersClient (or any object with the same
+    Fyers calls).  It replaces the setup Fyers client for live_order,
+    send_live_entry_order / send_live_exit_order and check_order_status, and
+    the cached live gateway is rebuilt around it.  Pass None to go back to
+    the setup client.
+    """
+    global fyers, _sim_client
+    _sim_client = client
+    if client is not None:
+        fyers = client
+    elif _setup_loaded:
+        from setup import fyers as _fyers
+        fyers = _fyers
+    else:
+        fyers = None
+    close_gateway("live")
+    logging.info(f"[LIVE] order path -> {type(fyers).__name__ if fyers is not None else 'setup client'}")
+
+
+# symbol -> time.monotonic() of live entries still in flight past the wait
+_pending_live_entries = {}
+
+
+def _late_live_entry(symbol, qty):
+    """on_late callback for an entry that outlived LIVE_ORDER_WAIT_SECONDS."""
+    def _done(ok, order_id):
+        _pending_live_entries.pop(symbol, None)
+        if ok:
+            logging.error(
+                f"{RED}[LIVE ENTRY LATE] {symbol} Qty={qty} OrderID={order_id} placed after the "
+                f"strategy gave up — position is not tracked, reconcile at the broker{RESET}"
+            )
+        else:
+            logging.info(f"[LIVE ENTRY LATE] {symbol} Qty={qty} failed after the wait; nothing placed")
+    return _done
+
+
+# symbol -> {"reason", "qty", "status", "order_id"} for live exits still in
+# flight past the wait; the leg stays open until the exit has settled
+_pending_live_exits = {}
+
+
+def _late_live_exit(symbol, qty, reason):
+    """on_late callback for an exit that outlived LIVE_ORDER_WAIT_SECONDS."""
+    def _done(ok, order_id):
+        pending = _pending_live_exits.get(symbol)
+        if pending is not None:
+            pending["status"] = "FILLED" if ok else "FAILED"
+            pending["order_id"] = order_id
+        if ok:
+            logging.info(f"{YELLOW}[LIVE EXIT LATE][{reason}] {symbol} Qty={qty} OrderID={order_id}{RESET}")
+        else:
+            logging.error(
+                f"{RED}[LIVE EXIT LATE FAILED][{reason}] {symbol} Qty={qty} — "
+                f"leg kept open, exit will be re-issued{RESET}"
+            )
+    return _done
+
+
 def send_live_entry_order(symbol, qty, side, buffer=ENTRY_OFFSET):
     """
-    Place a live LIMIT entry order via Fyers API.
+    Place a live LIMIT entry order via the broker gateway (Fyers).
     Baseline logic: entry price = LTP - buffer (min 0.05).
+
+    Waits at most LIVE_ORDER_WAIT_SECONDS.  An entry still in flight after
+    that is reported as not placed; further entries on the symbol are
+    refused until it settles, and a late fill is logged for reconciliation.
     """
     try:
+        if symbol in _pending_live_entries:
+            logging.warning(f"{CYAN}[LIVE ENTRY PENDING] {symbol} earlier entry still in flight{RESET}")
+            return False, None
+
         # Get LTP
         quote = fyers.quotes({"symbols": symbol})
         ltp = quote["d"][0]["v"]["lp"]
@@ -2746,31 +3003,29 @@ def send_live_entry_order(symbol, qty, side, buffer=ENTRY_OFFSET):
         # Calculate limit price with buffer
         limit_price = max(ltp - buffer, 0.05)
 
-        order_data = {
-            "symbol": symbol,
-            "qty": qty,
-            "type": 1,              # LIMIT
-            "side": side,           # 1=BUY, -1=SELL
-            "productType": "INTRADAY",
-            "limitPrice": limit_price,
-            "stopPrice": 0,
-            "validity": "DAY",
-            "stopLoss": 0,
-            "takeProfit": 0,
-            "offlineOrder": False,
-            "disclosedQty": 0,
-            "isSliceOrder": False,
-            "orderTag": str(side)
-        }
-
-        response = fyers.place_order(data=order_data)
+        _pending_live_entries[symbol] = time.monotonic()   # cleared by the late callback
+        try:
+            ok, order_id = _live_gateway().place_entry_sync(
+                symbol, qty, side, limit_price, tag=f"E{side}",
+                wait=LIVE_ORDER_WAIT_SECONDS, on_late=_late_live_entry(symbol, qty),
+            )
+        except Exception:
+            _pending_live_entries.pop(symbol, None)
+            raise
+        if ok is None:
+            logging.warning(
+                f"{CYAN}[LIVE ENTRY PENDING] {symbol} no broker answer in "
+                f"{LIVE_ORDER_WAIT_SECONDS:.0f}s; skipping this entry{RESET}"
+            )
+            return False, None
+        _pending_live_entries.pop(symbol, None)
 
-        if response.get("s") == "ok":
+        if ok:
             logging.info(f"{YELLOW}[LIVE ENTRY] {symbol} Qty={qty}{RESET}")
-            return True, response.get("id")
+            return True, order_id
 
         else:
-            logging.error(f"{CYAN}[LIVE ENTRY FAILED] {symbol} {response}{RESET}")
+            logging.error(f"{CYAN}[LIVE ENTRY FAILED] {symbol} limit={limit_price}{RESET}")
             return False, None
 
     except Exception as e:
@@ -2780,40 +3035,60 @@ def send_live_entry_order(symbol, qty, side, buffer=ENTRY_OFFSET):
 
 def send_live_exit_order(symbol, qty, reason):
     """
-    Place a live MARKET exit order via Fyers API.
+    Place a live MARKET exit order via the broker gateway (Fyers).
     Baseline logic (8th Jan):
     - Always SELL (-1 side)
     - MARKET type (type=2)
-    - Tag order with exit reason for audit trail
+    - Tag order with exit reason for audit trail (reason prefix + client id)
+    - Runs on the gateway's exit lane: never queued behind modifies
+    - Waits at most LIVE_ORDER_WAIT_SECONDS: an exit still being retried is
+      reported as not sent, so the leg stays open.  Later calls for the
+      symbol send nothing while it is in flight, close the leg once it has
+      filled, and re-issue the exit if it failed.
     """
     try:
-        order_data = {
-            "symbol": symbol,
-            "qty": qty,
-            "type": 2,              # MARKET
-            "side": -1,             # SELL
-            "productType": "INTRADAY",
-            "limitPrice": 0,
-            "stopPrice": 0,
-            "validity": "DAY",
-            "stopLoss": 0,
-            "takeProfit": 0,
-            "offlineOrder": False,
-            "disclosedQty": 0,
-            "isSliceOrder": False,
-            "orderTag": str(reason)  # ensure string tag
-        }
+        pending = _pending_live_exits.get(symbol)
+        if pending is not None:
+            if pending["status"] == "PENDING":
+                logging.warning(
+                    f"{YELLOW}[LIVE EXIT PENDING][{pending['reason']}] {symbol} earlier exit "
+                    f"still in flight{RESET}"
+                )
+                return False, None
+            _pending_live_exits.pop(symbol, None)
+            if pending["status"] == "FILLED":
+                logging.info(
+                    f"{YELLOW}[LIVE EXIT][{pending['reason']}] {symbol} Qty={pending['qty']} "
+                    f"OrderID={pending['order_id']} (settled late){RESET}"
+                )
+                return True, pending["order_id"]
+            logging.warning(f"{YELLOW}[LIVE EXIT RETRY][{reason}] {symbol} re-issuing failed exit{RESET}")
 
-        response = fyers.place_order(data=order_data)
+        _pending_live_exits[symbol] = {"reason": reason, "qty": qty, "status": "PENDING", "order_id": None}
+        try:
+            ok, order_id = _live_gateway().place_exit_sync(
+                symbol, qty, str(reason),
+                wait=LIVE_ORDER_WAIT_SECONDS, on_late=_late_live_exit(symbol, qty, reason),
+            )
+        except Exception:
+            _pending_live_exits.pop(symbol, None)
+            raise
+        if ok is None:
+            logging.warning(
+                f"{YELLOW}[LIVE EXIT PENDING][{reason}] {symbol} Qty={qty} still with the "
+                f"gateway after {LIVE_ORDER_WAIT_SECONDS:.0f}s; leg held open until it settles{RESET}"
+            )
+            return False, None
+        _pending_live_exits.pop(symbol, None)
 
-        if response.get("s") == "ok":
+        if ok:
             logging.info(
                 f"{YELLOW}[LIVE EXIT][{reason}] {symbol} Qty={qty}{RESET}"
-                f"OrderID={response.get('id')}{RESET}"
+                f"OrderID={order_id}{RESET}"
             )
-            return True, response.get("id")
+            return True, order_id
         else:
-            logging.error(f"{RED}[LIVE EXIT FAILED] {symbol} {response}{RESET}")
+            logging.error(f"{RED}[LIVE EXIT FAILED] {symbol} reason={reason}{RESET}")
             return False, None
 
     except Exception as e:
@@ -2929,16 +3204,24 @@ def process_order(state, df_slice, info, spot_price,
     current_option_price, option_volume = _get_option_market_snapshot(symbol, spot_price)
     timestamp = df_slice.iloc[-1].get("time", dt.now(time_zone)) if not df_slice.empty else dt.now(time_zone)
 
-    # --- Hybrid exit logic (all precedence handled in check_exit_condition) ---
-    triggered, reason = check_exit_condition(
-        df_slice,
-        state,
-        option_price=current_option_price,
-        option_volume=option_volume,
-        timestamp=timestamp,
-    )
-    if triggered and reason:
-        exit_reason = reason
+    # A live exit that outlived the wait keeps the leg open: hold while it is
+    # in flight, then finish (or re-issue) it whatever the exit rules say now.
+    pending_exit = mode == "LIVE" and _pending_live_exits.get(symbol)
+    if pending_exit:
+        if pending_exit["status"] == "PENDING":
+            return False, None
+        exit_reason = pending_exit["reason"]
+    else:
+        # --- Hybrid exit logic (all precedence handled in check_exit_condition) ---
+        triggered, reason = check_exit_condition(
+            df_slice,
+            state,
+            option_price=current_option_price,
+            option_volume=option_volume,
+            timestamp=timestamp,
+        )
+        if triggered and reason:
+            exit_reason = reason
 
     if not exit_reason:
         # Show periodic exit check status (once per 5 bars to avoid spam)
@@ -3056,6 +3339,22 @@ def process_order(state, df_slice, info, spot_price,
             f"Levels: SL={state.get('stop', 'N/A')} "
             f"PT={state.get('pt','N/A')} TG={state.get('tg','N/A')}{RESET}"
         )
+        emit_event(
+            "exit",
+            mode=account_type.upper(),
+            reason=exit_reason,
+            side=side,
+            option_name=symbol,
+            entry=round(entry, 2),
+            exit=round(exit_price, 2),
+            qty=qty,
+            pnl_rs=round(pnl_value, 2),
+            pnl_pts=round(pnl_points, 2),
+            bars_held=bars_held,
+            exit_type=exit_type,
+            trigger=trigger_cond,
+            position_id=position_id,
+        )
         _is_tg_exit = str(exit_reason).upper() in {"TARGET_HIT", "TG_PARTIAL_EXIT"}
         _is_rev_exit = str(exit_reason).upper() in {"REVERSAL_EXIT", "MOMENTUM_EXHAUSTION"}
         _is_atr_exit = str(exit_reason).upper() in {"SL_HIT", "TIME_EXIT", "ST_FLIP", "OSC_EXHAUSTION", "MOMENTUM_EXIT"}
@@ -3146,6 +3445,21 @@ def cleanup_trade_exit(info, leg, side, name, qty, exit_price, mode, reason):
         f"regime={info[leg].get('regime_context', 'N/A')} "
         f"position_id={info[leg].get('position_id', 'UNKNOWN')}"
     )
+    emit_event(
+        "exit_audit",
+        timestamp=str(ct),
+        symbol=name,
+        option_type=side,
+        position_side=info[leg].get("position_side", "LONG"),
+        exit_type="ATR",
+        reason=reason,
+        triggering_condition="cleanup_trade_exit",
+        candle=-1,
+        bars_held=-1,
+        regime=str(info[leg].get("regime_context", "N/A")),
+        position_id=info[leg].get("position_id", "UNKNOWN"),
+        premium_move=None,
+    )
 
 def force_close_old_trades(info, mode):
     """Force close any open positions. Retrieves option's actual price from df."""
@@ -3206,6 +3520,31 @@ def update_risk(trade_info, risk_info):
             f"[RISK HALT] Max drawdown breached: {total_pnl:.2f} vs peak {risk_info['peak_equity']:.2f}"
         )
 
+_CANDLE_TO_SIGNAL = histogram("exec_candle_to_signal_seconds",
+                              "3m candle close to its first signal evaluation", ("mode",),
+                              buckets=BAR_LAG_BUCKETS)
+_last_signal_bar = {}
+
+
+def _observe_candle_to_signal(candles_3m, ct, mode):
+    """Record how long after a 3m close detect_signal first saw that bar."""
+    if candles_3m is None or candles_3m.empty or "time" not in candles_3m.columns:
+        return
+    bar = candles_3m.iloc[-1]["time"]
+    if _last_signal_bar.get(mode) == bar:
+        return
+    _last_signal_bar[mode] = bar
+    try:
+        bar_ts = pd.Timestamp(bar)
+        if bar_ts.tzinfo is None:
+            bar_ts = bar_ts.tz_localize(time_zone)
+        lag = (pd.Timestamp(ct) - bar_ts).total_seconds() - 180.0
+    except (TypeError, ValueError):
+        return
+    if lag >= 0:
+        _CANDLE_TO_SIGNAL.labels(mode).observe(lag)
+
+
 def paper_order(candles_3m, hist_yesterday_15m=None, exit=False, mode="REPLAY", spot_price=None):
     global quantity, paper_info, df, last_signal_candle_time, risk_info
 
@@ -3258,10 +3597,11 @@ def paper_order(candles_3m, hist_yesterday_15m=None, exit=False, mode="REPLAY",
     for leg, side in [("call_buy", "CALL"), ("put_buy", "PUT")]:
         if paper_info[leg].get("trade_flag", 0) == 1:
             state = paper_info[leg]
-            triggered, reason = process_order(
-                state, candles_3m, paper_info, spot_price,
-                account_type="paper", mode=mode
-            )
+            with stage("exit_check"):
+                triggered, reason = process_order(
+                    state, candles_3m, paper_info, spot_price,
+                    account_type="paper", mode=mode
+                )
             if triggered:
                 paper_info["last_exit_time"] = ct
                 logging.info(f"[EXIT DONE][PAPER] {side} reason={reason}")
@@ -3278,26 +3618,21 @@ def paper_order(candles_3m, hist_yesterday_15m=None, exit=False, mode="REPLAY",
     # Risk gate
     if risk_info.get("halt_trading", False):
         logging.info("[ENTRY BLOCKED][RISK] Halt active")
+        emit_event("entry_blocked", subtype="RISK")
         return
 
-    pre_atr, _ = resolve_atr(candles_3m)
-    pivot_src_pre = candles_3m.iloc[-2] if len(candles_3m) >= 2 else candles_3m.iloc[-1]
-    cpr_pre = calculate_cpr(pivot_src_pre["high"], pivot_src_pre["low"], pivot_src_pre["close"])
-    trad_pre = calculate_traditional_pivots(pivot_src_pre["high"], pivot_src_pre["low"], pivot_src_pre["close"])
-    cam_pre = calculate_camarilla_pivots(pivot_src_pre["high"], pivot_src_pre["low"], pivot_src_pre["close"])
+    # Per-candle entry context: pivots from the previous completed candle,
+    # ATR and opening range, shared with the replay loop.
+    _ctx = get_entry_context(ticker)
+    _ctx.begin_day(ct.strftime("%Y-%m-%d"))
+    _piv = _ctx.pivots(candles_3m)
+    pre_atr = _ctx.atr(candles_3m)
+    cpr_pre, trad_pre, cam_pre = _piv.cpr, _piv.trad, _piv.cam
 
     # ── Day Type Classifier (paper mode) — init once per calendar day ──────
-    global _paper_dtc, _paper_dtc_date
-    _today_paper = ct.strftime("%Y-%m-%d")
-    if _paper_dtc is None or _paper_dtc_date != _today_paper:
+    if _ctx.classifier is None:
         try:
-            _paper_dtc = make_day_type_classifier(
-                cam_pre, cpr_pre,
-                float(pivot_src_pre["high"]),
-                float(pivot_src_pre["low"]),
-                float(pivot_src_pre["close"]),
-            )
-            _paper_dtc_date = _today_paper
+            _ctx.init_classifier(_piv)
             logging.info(
                 f"[DAY TYPE] Paper classifier initialized "
                 f"R3={cam_pre.get('r3',float('nan')):.0f} R4={cam_pre.get('r4',float('nan')):.0f} "
@@ -3307,13 +3642,14 @@ def paper_order(candles_3m, hist_yesterday_15m=None, exit=False, mode="REPLAY",
             logging.debug(f"[DAY TYPE] Paper DTC init error: {_dtc_err}")
 
     _paper_day_type = DayTypeResult()   # UNKNOWN default
-    if _paper_dtc is not None:
+    if _ctx.classifier is not None:
         try:
-            _paper_day_type = _paper_dtc.update(candles_3m)
+            with stage("day_type"):
+                _paper_day_type = _ctx.day_type(candles_3m)
             # Lock classification at midday when confidence is stable
             _bar_t_paper = ct.hour * 60 + ct.minute
             if _bar_t_paper >= 12 * 60 and _paper_day_type.confidence in ("MEDIUM", "HIGH"):
-                _paper_dtc.lock_classification()
+                _ctx.classifier.lock_classification()
                 _paper_day_type.log()
         except Exception as _dtc_upd_err:
             logging.debug(f"[DAY TYPE] Paper DTC update error: {_dtc_upd_err}")
@@ -3336,6 +3672,7 @@ def paper_order(candles_3m, hist_yesterday_15m=None, exit=False, mode="REPLAY",
                 )
             else:
                 logging.info(f"[ENTRY BLOCKED][COOLDOWN] {elapsed:.0f}s < {COOLDOWN_SECONDS}s")
+                emit_event("entry_blocked", subtype="COOLDOWN")
                 return
 
     if _is_startup_suppression_active(paper_info, ct, "PAPER"):
@@ -3378,7 +3715,7 @@ def paper_order(candles_3m, hist_yesterday_15m=None, exit=False, mode="REPLAY",
     scalp_cd_until = paper_info.get("scalp_cooldown_until")
     
     # Initialize Pulse module for scalp entry confirmation
-    pulse = get_pulse_module()
+    pulse = get_pulse_module(symbol=PULSE_SYMBOL)
 
     # ── Pulse Check ───────────────────────────────────────────────
     # First check: pulse rate must exceed threshold
@@ -3523,6 +3860,7 @@ def paper_order(candles_3m, hist_yesterday_15m=None, exit=False, mode="REPLAY",
                         ),
                         "hf_deferred_logged": 0,
                     })
+                    compile_exit_plan(paper_info[scalp_leg])
                     paper_info[scalp_leg]["filled_df"].loc[ct] = {
                         "ticker": opt_name,
                         "price": entry_price,
@@ -3573,25 +3911,10 @@ def paper_order(candles_3m, hist_yesterday_15m=None, exit=False, mode="REPLAY",
 
     # Calculate gap/bias context (consistent with live_order)
     _paper_close = float(candles_3m.iloc[-1]["close"]) if len(candles_3m) else float("nan")
-    _paper_gap = "NO_GAP"
-    if np.isfinite(_paper_close) and np.isfinite(cam_pre.get("r3", float("nan"))) and _paper_close > float(cam_pre.get("r3")):
-        _paper_gap = "GAP_UP"
-    elif np.isfinite(_paper_close) and np.isfinite(cam_pre.get("s3", float("nan"))) and _paper_close < float(cam_pre.get("s3")):
-        _paper_gap = "GAP_DOWN"
-    _paper_bias = "Positive" if _paper_gap == "GAP_UP" else ("Negative" if _paper_gap == "GAP_DOWN" else "Neutral")
-    
-    _paper_open_bias = "UNKNOWN"
-    if np.isfinite(_paper_close):
-        if np.isfinite(cam_pre.get("r4", float("nan"))) and _paper_close > float(cam_pre.get("r4")):
-            _paper_open_bias = "Above R4, continuation likely"
-        elif np.isfinite(cam_pre.get("r3", float("nan"))) and _paper_close > float(cam_pre.get("r3")):
-            _paper_open_bias = "Above R3, expected momentum continuation"
-        elif np.isfinite(cam_pre.get("s4", float("nan"))) and _paper_close < float(cam_pre.get("s4")):
-            _paper_open_bias = "Below S4, downside continuation likely"
-        elif np.isfinite(cam_pre.get("s3", float("nan"))) and _paper_close < float(cam_pre.get("s3")):
-            _paper_open_bias = "Below S3, downside pressure active"
-        else:
-            _paper_open_bias = "Inside S3-R3, balanced open"
+    _paper_bias_ctx = open_bias_context(_paper_close, cam_pre)
+    _paper_gap = _paper_bias_ctx["gap_tag"]
+    _paper_bias = _paper_bias_ctx["bias"]
+    _paper_open_bias = _paper_bias_ctx["open_bias"]
 
     # Retrieve day_type tag safely with audit logging
     _dt_name_obj = getattr(_paper_day_type, "name", None)
@@ -3635,6 +3958,7 @@ def paper_order(candles_3m, hist_yesterday_15m=None, exit=False, mode="REPLAY",
             f"[ENTRY BLOCKED][LATE_ENTRY] timestamp={ct} symbol={ticker} "
             f"time={ct.hour:02d}:{ct.minute:02d} reason=Too close to EOD (15:10), entry suppressed"
         )
+        emit_event("entry_blocked", subtype="LATE_ENTRY", bar_ts=str(ct), symbol=ticker)
         _save_trades_paper()
         store(paper_info, account_type)
         return
@@ -3644,19 +3968,20 @@ def paper_order(candles_3m, hist_yesterday_15m=None, exit=False, mode="REPLAY",
         f"atr={atr:.2f} trade_count={paper_info.get('trade_count', 0)} "
         f"day_type={_paper_day_type_tag} confidence={getattr(_paper_day_type, 'confidence', 'N/A')}"
     )
-    quality_ok, allowed_side, gate_reason, st_details = _trend_entry_quality_gate(
-        candles_3m=candles_3m,
-        candles_15m=hist_yesterday_15m if hist_yesterday_15m is not None else pd.DataFrame(),
-        timestamp=ct,
-        symbol=ticker,
-        adx_min=float(TREND_ENTRY_ADX_MIN),
-        cpr_levels=cpr_pre,
-        camarilla_levels=cam_pre,
-        reversal_signal=_rev_sig_paper,
-        failed_breakout_signal=_fb_sig_paper,
-        day_type_result=_paper_day_type,
-        open_bias_context={"gap_tag": _paper_gap, "bias": _paper_bias, "open_bias": _paper_open_bias},
-    )
+    with stage("quality_gate"):
+        quality_ok, allowed_side, gate_reason, st_details = _trend_entry_quality_gate(
+            candles_3m=candles_3m,
+            candles_15m=hist_yesterday_15m if hist_yesterday_15m is not None else pd.DataFrame(),
+            timestamp=ct,
+            symbol=ticker,
+            adx_min=float(TREND_ENTRY_ADX_MIN),
+            cpr_levels=cpr_pre,
+            camarilla_levels=cam_pre,
+            reversal_signal=_rev_sig_paper,
+            failed_breakout_signal=_fb_sig_paper,
+            day_type_result=_paper_day_type,
+            open_bias_context={"gap_tag": _paper_gap, "bias": _paper_bias, "open_bias": _paper_open_bias},
+        )
     if not quality_ok:
         tag = (
             "ST_CONFLICT" if "Supertrend conflict" in gate_reason else
@@ -3677,6 +4002,7 @@ def paper_order(candles_3m, hist_yesterday_15m=None, exit=False, mode="REPLAY",
             f"ADX={st_details.get('adx14')} RSI={st_details.get('rsi14')} CCI={st_details.get('cci20')} "
             f"reason={gate_reason}"
         )
+        emit_event("entry_blocked", subtype=tag, bar_ts=str(st_details['timestamp']), symbol=st_details['symbol'])
         _save_trades_paper()
         store(paper_info, account_type)
         return
@@ -3685,7 +4011,7 @@ def paper_order(candles_3m, hist_yesterday_15m=None, exit=False, mode="REPLAY",
     tpma = float(candles_3m["vwap"].iloc[-1]) if "vwap" in candles_3m.columns and not pd.isna(candles_3m["vwap"].iloc[-1]) else None
 
     # Opening range (first 5 bars of session)
-    orb_h, orb_l = get_opening_range(candles_3m)
+    orb_h, orb_l = _ctx.opening_range(candles_3m)
 
     # FIX: pivots from previous completed candle (iloc[-2]), not current (iloc[-1])
     cpr = cpr_pre
@@ -3724,7 +4050,8 @@ def paper_order(candles_3m, hist_yesterday_15m=None, exit=False, mode="REPLAY",
 
     # ── Compression breakout entry ────────────────────────────────────────────
     if hist_yesterday_15m is not None and len(hist_yesterday_15m) >= 3:
-        _compression_state.update(hist_yesterday_15m)
+        with stage("compression"):
+            _compression_state.update(hist_yesterday_15m)
 
     if _compression_state.has_entry:
         comp_sig = _compression_state.entry_signal
@@ -3741,22 +4068,26 @@ def paper_order(candles_3m, hist_yesterday_15m=None, exit=False, mode="REPLAY",
         store(paper_info, account_type)
         return
 
-    signal = detect_signal(
-        candles_3m=candles_3m,
-        candles_15m=hist_yesterday_15m if hist_yesterday_15m is not None else pd.DataFrame(),
-        cpr_levels=cpr,
-        camarilla_levels=cam,
-        traditional_levels=trad,
-        atr=atr,
-        include_partial=False,
-        current_time=ct,
-        vwap=tpma,
-        orb_high=orb_h,
-        orb_low=orb_l,
-        osc_relief_active=st_details.get("osc_relief_override", False),
-        zone_signal=_zone_revisit_signal,
-        pulse_metrics=_pulse_dict,
-    )
+    with stage("detect_signal"):
+        signal = detect_signal(
+            candles_3m=candles_3m,
+            candles_15m=hist_yesterday_15m if hist_yesterday_15m is not None else pd.DataFrame(),
+            cpr_levels=cpr,
+            camarilla_levels=cam,
+            traditional_levels=trad,
+            atr=atr,
+            include_partial=False,
+            current_time=ct,
+            vwap=tpma,
+            orb_high=orb_h,
+            orb_low=orb_l,
+            osc_relief_active=st_details.get("osc_relief_override", False),
+            zone_signal=_zone_revisit_signal,
+            pulse_metrics=_pulse_dict,
+            symbol=ticker,
+        )
+    if mode != "REPLAY":                # replay bars are historical; ct is wall time
+        _observe_candle_to_signal(candles_3m, ct, "PAPER")
 
     # 7. Entry
     if not signal:
@@ -3785,6 +4116,7 @@ def paper_order(candles_3m, hist_yesterday_15m=None, exit=False, mode="REPLAY",
             f"ST15m_bias={st_details['ST15m_bias']} allowed_side={allowed_side} "
             f"signal_side={side} reason=Supertrend conflict, entry suppressed."
         )
+        emit_event("entry_blocked", subtype="ST_SIDE_MISMATCH", bar_ts=str(ct), symbol=ticker)
         _save_trades_paper()
         store(paper_info, account_type)
         return
@@ -3925,6 +4257,7 @@ def paper_order(candles_3m, hist_yesterday_15m=None, exit=False, mode="REPLAY",
                     })
                     # Merge regime context keys (replaces manual osc_context/day_type/etc.)
                     paper_info[leg].update(_rc.to_state_keys())
+                    compile_exit_plan(paper_info[leg])
 
                     paper_info[leg]["filled_df"].loc[ct] = {
                         'ticker': opt_name,
@@ -4026,10 +4359,11 @@ def live_order(candles_3m, hist_yesterday_15m=None, exit=False):
     for leg, side in [("call_buy", "CALL"), ("put_buy", "PUT")]:
         if live_info[leg].get("trade_flag", 0) == 1:
             state = live_info[leg]
-            triggered, reason = process_order(
-                state, candles_3m, live_info, spot_price,
-                account_type="live", mode="LIVE"
-            )
+            with stage("exit_check"):
+                triggered, reason = process_order(
+                    state, candles_3m, live_info, spot_price,
+                    account_type="live", mode="LIVE"
+                )
             if triggered:
                 live_info["last_exit_time"] = ct
                 logging.info(f"[EXIT DONE][LIVE] {side} reason={reason}")
@@ -4046,24 +4380,18 @@ def live_order(candles_3m, hist_yesterday_15m=None, exit=False):
     if risk_info.get("halt_trading", False):
         return
 
-    pre_atr, _ = resolve_atr(candles_3m)
-    pivot_src_pre = candles_3m.iloc[-2] if len(candles_3m) >= 2 else candles_3m.iloc[-1]
-    cpr_pre = calculate_cpr(pivot_src_pre["high"], pivot_src_pre["low"], pivot_src_pre["close"])
-    trad_pre = calculate_traditional_pivots(pivot_src_pre["high"], pivot_src_pre["low"], pivot_src_pre["close"])
-    cam_pre = calculate_camarilla_pivots(pivot_src_pre["high"], pivot_src_pre["low"], pivot_src_pre["close"])
+    # Per-candle entry context: pivots from the previous completed candle,
+    # ATR and opening range, shared with the replay loop.
+    _ctx = get_entry_context(ticker)
+    _ctx.begin_day(ct.strftime("%Y-%m-%d"))
+    _piv = _ctx.pivots(candles_3m)
+    pre_atr = _ctx.atr(candles_3m)
+    cpr_pre, trad_pre, cam_pre = _piv.cpr, _piv.trad, _piv.cam
 
     # ── Day Type Classifier (live mode) — init once per calendar day ───────
-    global _live_dtc, _live_dtc_date
-    _today_live = ct.strftime("%Y-%m-%d")
-    if _live_dtc is None or _live_dtc_date != _today_live:
+    if _ctx.classifier is None:
         try:
-            _live_dtc = make_day_type_classifier(
-                cam_pre, cpr_pre,
-                float(pivot_src_pre["high"]),
-                float(pivot_src_pre["low"]),
-                float(pivot_src_pre["close"]),
-            )
-            _live_dtc_date = _today_live
+            _ctx.init_classifier(_piv)
             logging.info(
                 f"[DAY TYPE] Live classifier initialized "
                 f"R3={cam_pre.get('r3',float('nan')):.0f} R4={cam_pre.get('r4',float('nan')):.0f} "
@@ -4073,13 +4401,14 @@ def live_order(candles_3m, hist_yesterday_15m=None, exit=False):
             logging.debug(f"[DAY TYPE] Live DTC init error: {_dtc_err}")
 
     _live_day_type = DayTypeResult()   # UNKNOWN default
-    if _live_dtc is not None:
+    if _ctx.classifier is not None:
         try:
-            _live_day_type = _live_dtc.update(candles_3m)
+            with stage("day_type"):
+                _live_day_type = _ctx.day_type(candles_3m)
             # Lock classification at midday when confidence is stable
             _bar_t_live = ct.hour * 60 + ct.minute
             if _bar_t_live >= 12 * 60 and _live_day_type.confidence in ("MEDIUM", "HIGH"):
-                _live_dtc.lock_classification()
+                _ctx.classifier.lock_classification()
                 _live_day_type.log()
         except Exception as _dtc_upd_err:
             logging.debug(f"[DAY TYPE] Live DTC update error: {_dtc_upd_err}")
@@ -4101,6 +4430,7 @@ def live_order(candles_3m, hist_yesterday_15m=None, exit=False):
                 )
             else:
                 logging.info(f"[ENTRY BLOCKED][COOLDOWN] {elapsed:.0f}s")
+                emit_event("entry_blocked", subtype="COOLDOWN")
                 return
 
     if _is_startup_suppression_active(live_info, ct, "LIVE"):
@@ -4127,7 +4457,7 @@ def live_order(candles_3m, hist_yesterday_15m=None, exit=False):
     scalp_cd_until = live_info.get("scalp_cooldown_until")
     
     # Initialize Pulse module for scalp entry confirmation
-    pulse = get_pulse_module()
+    pulse = get_pulse_module(symbol=PULSE_SYMBOL)
 
     # ── Pulse Check ───────────────────────────────────────────────
     pulse_metrics = pulse.get_pulse()
@@ -4269,6 +4599,7 @@ def live_order(candles_3m, hist_yesterday_15m=None, exit=False):
                             ),
                             "hf_deferred_logged": 0,
                         })
+                        compile_exit_plan(live_info[scalp_leg])
                         live_info[scalp_leg]["filled_df"].loc[ct] = {
                             "ticker": opt_name,
                             "price": entry_price,
@@ -4316,24 +4647,10 @@ def live_order(candles_3m, hist_yesterday_15m=None, exit=False):
 
     # 6. Signal evaluation
     _live_close = float(candles_3m.iloc[-1]["close"]) if len(candles_3m) else float("nan")
-    _live_gap = "NO_GAP"
-    if np.isfinite(_live_close) and np.isfinite(cam_pre.get("r3", float("nan"))) and _live_close > float(cam_pre.get("r3")):
-        _live_gap = "GAP_UP"
-    elif np.isfinite(_live_close) and np.isfinite(cam_pre.get("s3", float("nan"))) and _live_close < float(cam_pre.get("s3")):
-        _live_gap = "GAP_DOWN"
-    _live_bias = "Positive" if _live_gap == "GAP_UP" else ("Negative" if _live_gap == "GAP_DOWN" else "Neutral")
-    _live_open_bias = "UNKNOWN"
-    if np.isfinite(_live_close):
-        if np.isfinite(cam_pre.get("r4", float("nan"))) and _live_close > float(cam_pre.get("r4")):
-            _live_open_bias = "Above R4, continuation likely"
-        elif np.isfinite(cam_pre.get("r3", float("nan"))) and _live_close > float(cam_pre.get("r3")):
-            _live_open_bias = "Above R3, expected momentum continuation"
-        elif np.isfinite(cam_pre.get("s4", float("nan"))) and _live_close < float(cam_pre.get("s4")):
-            _live_open_bias = "Below S4, downside continuation likely"
-        elif np.isfinite(cam_pre.get("s3", float("nan"))) and _live_close < float(cam_pre.get("s3")):
-            _live_open_bias = "Below S3, downside pressure active"
-        else:
-            _live_open_bias = "Inside S3-R3, balanced open"
+    _live_bias_ctx = open_bias_context(_live_close, cam_pre)
+    _live_gap = _live_bias_ctx["gap_tag"]
+    _live_bias = _live_bias_ctx["bias"]
+    _live_open_bias = _live_bias_ctx["open_bias"]
 
     # Prefer DTC classification; fall back to gap-based tag for reversal_detector string param
     _dt_name_obj_live = getattr(_live_day_type, "name", None)
@@ -4372,6 +4689,7 @@ def live_order(candles_3m, hist_yesterday_15m=None, exit=False):
             f"[ENTRY BLOCKED][LATE_ENTRY] timestamp={ct} symbol={ticker} "
             f"time={ct.hour:02d}:{ct.minute:02d} reason=Too close to EOD (15:10), entry suppressed"
         )
+        emit_event("entry_blocked", subtype="LATE_ENTRY", bar_ts=str(ct), symbol=ticker)
         store(live_info, account_type)
         return
 
@@ -4380,19 +4698,20 @@ def live_order(candles_3m, hist_yesterday_15m=None, exit=False):
         f"atr={atr:.2f} trade_count={live_info.get('trade_count', 0)} "
         f"day_type={_live_day_type_tag} confidence={getattr(_live_day_type, 'confidence', 'N/A')}"
     )
-    quality_ok, allowed_side, gate_reason, st_details = _trend_entry_quality_gate(
-        candles_3m=candles_3m,
-        candles_15m=hist_yesterday_15m if hist_yesterday_15m is not None else pd.DataFrame(),
-        timestamp=ct,
-        symbol=ticker,
-        adx_min=float(TREND_ENTRY_ADX_MIN),
-        cpr_levels=cpr_pre,
-        camarilla_levels=cam_pre,
-        reversal_signal=_rev_sig_live,
-        failed_breakout_signal=_fb_sig_live,
-        day_type_result=_live_day_type,
-        open_bias_context={"gap_tag": _live_gap, "bias": _live_bias, "open_bias": _live_open_bias},
-    )
+    with stage("quality_gate"):
+        quality_ok, allowed_side, gate_reason, st_details = _trend_entry_quality_gate(
+            candles_3m=candles_3m,
+            candles_15m=hist_yesterday_15m if hist_yesterday_15m is not None else pd.DataFrame(),
+            timestamp=ct,
+            symbol=ticker,
+            adx_min=float(TREND_ENTRY_ADX_MIN),
+            cpr_levels=cpr_pre,
+            camarilla_levels=cam_pre,
+            reversal_signal=_rev_sig_live,
+            failed_breakout_signal=_fb_sig_live,
+            day_type_result=_live_day_type,
+            open_bias_context={"gap_tag": _live_gap, "bias": _live_bias, "open_bias": _live_open_bias},
+        )
     if not quality_ok:
         tag = (
             "ST_CONFLICT" if "Supertrend conflict" in gate_reason else
@@ -4413,6 +4732,7 @@ def live_order(candles_3m, hist_yesterday_15m=None, exit=False):
             f"ADX={st_details.get('adx14')} RSI={st_details.get('rsi14')} CCI={st_details.get('cci20')} "
             f"reason={gate_reason}"
         )
+        emit_event("entry_blocked", subtype=tag, bar_ts=str(st_details['timestamp']), symbol=st_details['symbol'])
         _save_trades_live()
         store(live_info, account_type)
         return
@@ -4421,7 +4741,7 @@ def live_order(candles_3m, hist_yesterday_15m=None, exit=False):
     tpma = float(candles_3m["vwap"].iloc[-1]) if "vwap" in candles_3m.columns and not pd.isna(candles_3m["vwap"].iloc[-1]) else None
 
     # Opening range (first 5 bars of session)
-    orb_h, orb_l = get_opening_range(candles_3m)
+    orb_h, orb_l = _ctx.opening_range(candles_3m)
 
     # FIX: pivots from previous completed candle
     cpr = cpr_pre
@@ -4460,7 +4780,8 @@ def live_order(candles_3m, hist_yesterday_15m=None, exit=False):
 
     # ── Compression breakout entry ────────────────────────────────────────────
     if hist_yesterday_15m is not None and len(hist_yesterday_15m) >= 3:
-        _compression_state.update(hist_yesterday_15m)
+        with stage("compression"):
+            _compression_state.update(hist_yesterday_15m)
 
     if _compression_state.has_entry:
         comp_sig = _compression_state.entry_signal
@@ -4477,22 +4798,25 @@ def live_order(candles_3m, hist_yesterday_15m=None, exit=False):
         store(live_info, account_type)
         return
 
-    signal = detect_signal(
-        candles_3m=candles_3m,
-        candles_15m=hist_yesterday_15m if hist_yesterday_15m is not None else pd.DataFrame(),
-        cpr_levels=cpr,
-        camarilla_levels=cam,
-        traditional_levels=trad,
-        atr=atr,
-        include_partial=False,
-        current_time=ct,
-        vwap=tpma,
-        orb_high=orb_h,
-        orb_low=orb_l,
-        osc_relief_active=st_details.get("osc_relief_override", False),
-        zone_signal=_zone_revisit_signal,
-        pulse_metrics=_pulse_dict,
-    )
+    with stage("detect_signal"):
+        signal = detect_signal(
+            candles_3m=candles_3m,
+            candles_15m=hist_yesterday_15m if hist_yesterday_15m is not None else pd.DataFrame(),
+            cpr_levels=cpr,
+            camarilla_levels=cam,
+            traditional_levels=trad,
+            atr=atr,
+            include_partial=False,
+            current_time=ct,
+            vwap=tpma,
+            orb_high=orb_h,
+            orb_low=orb_l,
+            osc_relief_active=st_details.get("osc_relief_override", False),
+            zone_signal=_zone_revisit_signal,
+            pulse_metrics=_pulse_dict,
+            symbol=ticker,
+        )
+    _observe_candle_to_signal(candles_3m, ct, "LIVE")
 
     # 7. Entry
     if not signal:
@@ -4521,6 +4845,7 @@ def live_order(candles_3m, hist_yesterday_15m=None, exit=False):
             f"ST15m_bias={st_details['ST15m_bias']} allowed_side={allowed_side} "
             f"signal_side={side} reason=Supertrend conflict, entry suppressed."
         )
+        emit_event("entry_blocked", subtype="ST_SIDE_MISMATCH", bar_ts=str(ct), symbol=ticker)
         _save_trades_live()
         store(live_info, account_type)
         return
@@ -4657,6 +4982,7 @@ def live_order(candles_3m, hist_yesterday_15m=None, exit=False):
                 })
                 # Merge regime context keys (replaces manual osc_context/day_type/etc.)
                 live_info[leg].update(_rc.to_state_keys())
+                compile_exit_plan(live_info[leg])
 
                 live_info[leg]["filled_df"].loc[ct] = {
                     'ticker': opt_name,
@@ -4763,7 +5089,8 @@ def _print_replay_summary():
 
 def run_offline_replay(tick_db, symbols_list=None, date_str=None,
                        min_warmup_candles=35, signal_only=False,
-                       output_dir=".", db_path=None):
+                       output_dir=".", db_path=None, auto_report=True,
+                       record_store=True):
     """
     Candle-by-candle offline replay using tick_db data. No live connection needed.
 
@@ -4783,10 +5110,17 @@ def run_offline_replay(tick_db, symbols_list=None, date_str=None,
         signal_only         True  → log signals, skip trade simulation.
                             False → simulate entries, SL/PT/TG exits, log PnL.
         output_dir          Directory for CSV trade log. Default = current dir.
+        auto_report         False → skip the dashboard report after the replay
+                            (batch callers such as walk_forward.py).
+        record_store        False → keep the run out of the trade store
+                            (parameter searches re-run the same days).
 
     Two CSVs are saved when signal_only=False:
         signals_<sym>_<date>.csv   — every signal that fired (bar, time, side, score, reason)
         trades_<sym>_<date>.csv    — every completed trade (entry, exit, PnL)
+    The same trades, signals and blocker counts are written to the
+    partitioned trade store (trade_store.get_trade_store) for cross-session
+    reports, replacing any earlier replay of the same symbol and day.
 
     Typical usage:
         # Terminal:
@@ -4803,6 +5137,7 @@ def run_offline_replay(tick_db, symbols_list=None, date_str=None,
     from collections import Counter
     # build_indicator_dataframe imported at top of module (from orchestration_v3)
     from signals import detect_signal
+    from position_manager import BarRecord
 
     if symbols_list is None:
         symbols_list = symbols if isinstance(symbols, list) else [symbols]
@@ -5133,7 +5468,7 @@ def run_offline_replay(tick_db, symbols_list=None, date_str=None,
         # ── Day Type Classifier — initialized once per session ────────────
         # Uses previous day OHLC from the first replay bar to build pivot context.
         # DTC is updated every bar; locked at 12:00 (midday — classification stable).
-        _dtc      = None   # populated on first bar below
+        _ctx      = EntryContext(sym)   # classifier populated on first bar below
         _day_type = DayTypeResult()   # UNKNOWN until DTC initializes
         _daily_cam = None  # fixed daily Camarilla levels from previous day OHLC
         _opening_bias_logged = False
@@ -5173,22 +5508,39 @@ def run_offline_replay(tick_db, symbols_list=None, date_str=None,
             def __init__(self, h, m):
                 self.hour, self.minute = h, m
 
+        # ── 3m → 15m alignment, computed once ─────────────────────────────────
+        # _n15_at[i] = number of 15m bars with datetime <= 3m bar i (both
+        # frames are sorted on time), so the visible 15m slice is iloc[:n].
+        _t3_ns = pd.DatetimeIndex(pd.to_datetime(df_3m_all[tc3])).asi8
+        if not df_15m_all.empty:
+            _t15_ns = pd.DatetimeIndex(pd.to_datetime(df_15m_all[tc15])).asi8
+            _n15_at = np.searchsorted(_t15_ns, _t3_ns, side="right")
+        else:
+            _n15_at = np.zeros(total_bars, dtype=np.int64)
+        _built_15m_n = -1
+        _built_15m   = pd.DataFrame()
+
         # ── Main loop ─────────────────────────────────────────────────────────
         for i in range(replay_start_idx, total_bars):
-            slice_3m = df_3m_all.iloc[:i + 1].copy()
-            cur_time = slice_3m.iloc[-1][tc3]    # tz-aware datetime for 15m alignment
-
-            # Align 15m: bars whose datetime <= current 3m datetime
-            if not df_15m_all.empty:
-                slice_15m = df_15m_all[df_15m_all[tc15] <= cur_time].copy()
-            else:
-                slice_15m = pd.DataFrame()
+            with stage("slice_align"):
+                # View, not copy — build_indicator_dataframe copies its input
+                slice_3m = df_3m_all.iloc[:i + 1]
+                cur_time = slice_3m.iloc[-1][tc3]
+                n15      = int(_n15_at[i])
 
             # Build indicators
             try:
-                slice_3m = build_indicator_dataframe(sym, slice_3m, interval="3m")
-                if not slice_15m.empty:
-                    slice_15m = build_indicator_dataframe(sym, slice_15m, interval="15m")
+                with stage("indicators"):
+                    slice_3m = build_indicator_dataframe(sym, slice_3m, interval="3m")
+                    # The 15m slice only grows when a 15m bar completes: rebuild
+                    # then, and reuse the same frame on the bars in between.
+                    if n15 != _built_15m_n:
+                        _built_15m = (
+                            build_indicator_dataframe(sym, df_15m_all.iloc[:n15], interval="15m")
+                            if n15 > 0 else pd.DataFrame()
+                        )
+                        _built_15m_n = n15
+                    slice_15m = _built_15m
             except Exception as e:
                 logging.debug(f"[REPLAY bar={i}] indicator error: {e}")
                 continue
@@ -5205,22 +5557,12 @@ def run_offline_replay(tick_db, symbols_list=None, date_str=None,
 
             # ── Day Type Classifier — update every bar ─────────────────────────
             # Initialize DTC on first bar using previous-session OHLC
-            if _dtc is None and len(slice_3m) >= 2:
+            if _ctx.classifier is None and len(slice_3m) >= 2:
                 try:
-                    prev_bar = slice_3m.iloc[-2]
-                    _cpr0  = calculate_cpr(float(prev_bar["high"]),
-                                           float(prev_bar["low"]),
-                                           float(prev_bar["close"]))
-                    _cam0  = calculate_camarilla_pivots(float(prev_bar["high"]),
-                                                        float(prev_bar["low"]),
-                                                        float(prev_bar["close"]))
-                    _dtc   = make_day_type_classifier(
-                        _cam0, _cpr0,
-                        float(prev_bar["high"]),
-                        float(prev_bar["low"]),
-                        float(prev_bar["close"]),
-                    )
-                    _session_prev_close = float(prev_bar["close"])
+                    _piv0  = _ctx.pivots(slice_3m)
+                    _cam0  = _piv0.cam
+                    _dtc   = _ctx.init_classifier(_piv0)
+                    _session_prev_close = float(_piv0.close)
                     _daily_cam = _cam0  # fixed for entire session
                     logging.info(
                         f"[DAY TYPE] Classifier initialized "
@@ -5232,8 +5574,10 @@ def run_offline_replay(tick_db, symbols_list=None, date_str=None,
                 except Exception as _e:
                     logging.debug(f"[DAY TYPE] init error: {_e}")
 
+            _dtc = _ctx.classifier
             if _dtc is not None:
-                _day_type = _dtc.update(slice_3m)
+                with stage("day_type"):
+                    _day_type = _ctx.day_type(slice_3m)
                 if (not _opening_bias_logged) and bar_t >= (9 * 60 + 30):
                     _opening_bias_logged = True
                     _gap_pct = float("nan")
@@ -5288,7 +5632,8 @@ def run_offline_replay(tick_db, symbols_list=None, date_str=None,
 
             # ── Compression state update (15m aligned) ───────────────────────────
             if not slice_15m.empty and len(slice_15m) >= 3:
-                _comp_state.update(slice_15m)
+                with stage("compression"):
+                    _comp_state.update(slice_15m)
 
             # ── Trend continuation update (Phase 6.2) ────────────────────────
             if _daily_cam is not None:
@@ -5305,19 +5650,13 @@ def run_offline_replay(tick_db, symbols_list=None, date_str=None,
                 if _comp_state.has_entry:
                     _comp_state.consume_entry()
 
-                # Enrich 3m row with 15m bias so ST_FLIP_2 can check HTF alignment
-                last_row_enriched = last_row.copy()
-                if not slice_15m.empty:
-                    last_15m = slice_15m.iloc[-1]
-                    last_row_enriched["st_bias_15m"]    = str(last_15m.get("supertrend_bias", "NEUTRAL"))
-                    last_row_enriched["st_slope_15m"]   = str(last_15m.get("supertrend_slope", "FLAT"))
-                    last_row_enriched["adx14_15m"]      = last_15m.get("adx14", float("nan"))
-                else:
-                    last_row_enriched["st_bias_15m"]  = "NEUTRAL"
-                    last_row_enriched["st_slope_15m"] = "FLAT"
-                    last_row_enriched["adx14_15m"]    = float("nan")
-
-                decision = pm.update(i, bar_time, bar_close, last_row_enriched)
+                # Typed bar record carrying the 15m bias so ST_FLIP_2 can check
+                # HTF alignment (replaces copying + enriching the 3m Series)
+                with stage("pm_update"):
+                    bar_rec = BarRecord.from_row(
+                        last_row, None if slice_15m.empty else slice_15m.iloc[-1]
+                    )
+                    decision = pm.update(i, bar_time, bar_close, bar_rec)
                 if decision.should_exit:
                     record = pm.close(i, bar_time, bar_close,
                                       decision.exit_px, decision.reason, quantity)
@@ -5361,7 +5700,7 @@ def run_offline_replay(tick_db, symbols_list=None, date_str=None,
                 continue
 
             # ── ENTRY EVALUATION — only runs when no position is open ──────────
-            atr, _ = resolve_atr(slice_3m)
+            atr = _ctx.atr(slice_3m)
 
             # ── TREND CONTINUATION RE-ENTRY (Phase 6.2) ──────────────────────
             # When trend continuation is active and spacing satisfied,
@@ -5452,12 +5791,10 @@ def run_offline_replay(tick_db, symbols_list=None, date_str=None,
                     if "vwap" in slice_3m.columns
                     and not pd.isna(slice_3m["vwap"].iloc[-1]) else None)
 
-            orb_h, orb_l = get_opening_range(slice_3m)
+            orb_h, orb_l = _ctx.opening_range(slice_3m)
 
-            pivot_src = slice_3m.iloc[-2] if len(slice_3m) >= 2 else slice_3m.iloc[-1]
-            cpr  = calculate_cpr(pivot_src["high"], pivot_src["low"], pivot_src["close"])
-            trad = calculate_traditional_pivots(pivot_src["high"], pivot_src["low"], pivot_src["close"])
-            cam  = calculate_camarilla_pivots(pivot_src["high"], pivot_src["low"], pivot_src["close"])
+            _piv = _ctx.pivots(slice_3m)
+            cpr, trad, cam = _piv.cpr, _piv.trad, _piv.cam
             if np.isfinite(atr):
                 update_zone_activity(_zones, bar_close, float(atr), bar_time)
                 _zone_revisit_signal = detect_zone_revisit(slice_3m, _zones, float(atr))
@@ -5472,20 +5809,21 @@ def run_offline_replay(tick_db, symbols_list=None, date_str=None,
                 day_type_tag=_rev_day_type_tag,
             )
             _fb_sig_replay = detect_failed_breakout(slice_3m, cam)
-            quality_ok, allowed_side, gate_reason, st_details = _trend_entry_quality_gate(
-                candles_3m=slice_3m,
-                candles_15m=slice_15m,
-                timestamp=bar_time,
-                symbol=sym,
-                adx_min=float(TREND_ENTRY_ADX_MIN),
-                cpr_levels=cpr,
-                camarilla_levels=cam,
-                reversal_signal=_rev_sig_replay,
-                failed_breakout_signal=_fb_sig_replay,
-                day_type_result=_day_type,
-                open_bias_context=_open_bias_context,
-                daily_camarilla_levels=_daily_cam,
-            )
+            with stage("quality_gate"):
+                quality_ok, allowed_side, gate_reason, st_details = _trend_entry_quality_gate(
+                    candles_3m=slice_3m,
+                    candles_15m=slice_15m,
+                    timestamp=bar_time,
+                    symbol=sym,
+                    adx_min=float(TREND_ENTRY_ADX_MIN),
+                    cpr_levels=cpr,
+                    camarilla_levels=cam,
+                    reversal_signal=_rev_sig_replay,
+                    failed_breakout_signal=_fb_sig_replay,
+                    day_type_result=_day_type,
+                    open_bias_context=_open_bias_context,
+                    daily_camarilla_levels=_daily_cam,
+                )
             if not quality_ok:
                 blocker_key = (
                     "DAILY_CAM_FILTER"
@@ -5527,23 +5865,25 @@ def run_offline_replay(tick_db, symbols_list=None, date_str=None,
 
 
             try:
-                signal = detect_signal(
-                    candles_3m=slice_3m,
-                    candles_15m=slice_15m,
-                    cpr_levels=cpr,
-                    camarilla_levels=cam,
-                    traditional_levels=trad,
-                    atr=atr,
-                    include_partial=False,
-                    current_time=fake_time,
-                    vwap=tpma,
-                    orb_high=orb_h,
-                    orb_low=orb_l,
-                    day_type_result=_day_type,
-                    osc_relief_active=st_details.get("osc_relief_override", False),
-                    zone_signal=_zone_dict,
-                    daily_camarilla_levels=_daily_cam,
-                )
+                with stage("detect_signal"):
+                    signal = detect_signal(
+                        candles_3m=slice_3m,
+                        candles_15m=slice_15m,
+                        cpr_levels=cpr,
+                        camarilla_levels=cam,
+                        traditional_levels=trad,
+                        atr=atr,
+                        include_partial=False,
+                        current_time=fake_time,
+                        vwap=tpma,
+                        orb_high=orb_h,
+                        orb_low=orb_l,
+                        day_type_result=_day_type,
+                        osc_relief_active=st_details.get("osc_relief_override", False),
+                        zone_signal=_zone_dict,
+                        daily_camarilla_levels=_daily_cam,
+                        symbol=sym,
+                    )
             except Exception as e:
                 logging.warning(f"[REPLAY bar={i}] detect_signal error: {e}")
                 blocker_counts["SIGNAL_ERROR"] = blocker_counts.get("SIGNAL_ERROR", 0) + 1
@@ -5756,6 +6096,15 @@ def run_offline_replay(tick_db, symbols_list=None, date_str=None,
             for reason, cnt in blocker_counts.most_common(10):
                 logging.info(f"    {reason:30s}: {cnt} bars")
 
+        # Cross-session analytics: same records into the partitioned store
+        store = get_trade_store() if record_store else None
+        if store is not None:
+            try:
+                store.record_session("REPLAY", sym, trades=trade_log, signals=signals_fired,
+                                     blockers=dict(blocker_counts), date=date_str)
+            except Exception as e:
+                logging.warning(f"[REPLAY] Trade store append failed: {e}")
+
         # Phase 6.2: Trend continuation summary
         if _trend_cont_trades > 0:
             logging.info(f"\n  Trend Continuation:")
@@ -5764,14 +6113,16 @@ def run_offline_replay(tick_db, symbols_list=None, date_str=None,
             logging.info(f"    Still active at EOD  : {_trend_cont.is_active}")
 
         logging.info("-" * 80 + "\n")
+        log_stage_profile(f"REPLAY {sym} ({date_tag})")
 
         # Auto-generate dashboard report
-        if not signal_only:
+        if not signal_only and auto_report:
             try:
                 from config import log_file
                 from dashboard import generate_full_report
                 if os.path.exists(log_file):
                     logging.info(f"[REPLAY] Auto-generating dashboard for {log_file}...")
+                    get_event_stream().flush()      # the report reads the events sidecar
                     generate_full_report(log_file, output_dir=output_dir)
             except Exception as e:
                 logging.warning(f"[REPLAY] Dashboard generation failed: {e}")
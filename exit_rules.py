@@ -0,0 +1,133 @@
+"""Ordered, short-circuiting exit rule table with per-rule metrics.
+
+An exit check is a precedence-ordered list of ``(name, rule)`` pairs.  Each
+rule is a plain callable ``rule(*args) -> Optional[(triggered, reason)]``:
+
+  * ``None``          → rule did not decide; evaluation continues
+  * ``(True, reason)``→ exit now
+  * ``(False, None)`` → decided "hold" (e.g. a suppression / min-hold gate)
+
+``evaluate_rules`` walks the table in order and stops at the first rule that
+returns a decision.  Rules may also update position state and return
+``None`` (stop ratchets, partial bookings), which keeps side-effect ordering
+identical to a hand-written if/return chain.
+
+Every evaluation records, per rule name, how often the rule was evaluated, how
+often it decided, and the time spent in it.  Counters are process-wide so the
+dashboard can export them at session end:
+
+    from exit_rules import rule_metrics, save_rule_metrics_csv
+    save_rule_metrics_csv("reports/exit_rules_2026-03-02.csv")
+"""
+
+from __future__ import annotations
+
+import csv
+import logging
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+ExitResult = Tuple[bool, Optional[str]]
+RuleFn = Callable[..., Optional[ExitResult]]
+
+NO_EXIT: ExitResult = (False, None)
+
+
+@dataclass
+class RuleStats:
+    """Evaluation / decision counters for one rule."""
+
+    evals: int = 0
+    hits: int = 0
+    total_ns: int = 0
+
+    def as_row(self, name: str) -> dict:
+        return {
+            "rule": name,
+            "evals": self.evals,
+            "hits": self.hits,
+            "hit_rate_pct": round(100.0 * self.hits / self.evals, 2) if self.evals else 0.0,
+            "total_ms": round(self.total_ns / 1e6, 3),
+            "mean_us": round(self.total_ns / self.evals / 1e3, 3) if self.evals else 0.0,
+        }
+
+
+_METRICS: Dict[str, RuleStats] = {}
+
+
+def _stats_for(name: str) -> RuleStats:
+    st = _METRICS.get(name)
+    if st is None:
+        st = _METRICS[name] = RuleStats()
+    return st
+
+
+def evaluate_rules(rules: Sequence[Tuple[str, RuleFn]], *args: Any) -> ExitResult:
+    """Evaluate ``(name, fn)`` pairs in order; the first decision wins."""
+    clock = time.perf_counter_ns
+    for name, fn in rules:
+        st = _METRICS.get(name) or _stats_for(name)
+        t0 = clock()
+        out = fn(*args)
+        st.total_ns += clock() - t0
+        st.evals += 1
+        if out is not None:
+            st.hits += 1
+            return out
+    return NO_EXIT
+
+
+def rule_metrics() -> List[dict]:
+    """One row per rule that has been evaluated, in first-seen order."""
+    return [st.as_row(name) for name, st in _METRICS.items() if st.evals]
+
+
+def reset_rule_metrics() -> None:
+    for st in _METRICS.values():
+        st.evals = st.hits = st.total_ns = 0
+
+
+def format_rule_metrics(rows: Optional[List[dict]] = None) -> str:
+    rows = rule_metrics() if rows is None else rows
+    header = f"{'rule':<20}{'evals':>10}{'hits':>8}{'hit%':>8}{'total_ms':>11}{'mean_us':>10}"
+    lines = [header, "-" * len(header)]
+    for r in rows:
+        lines.append(
+            f"{r['rule']:<20}{r['evals']:>10}{r['hits']:>8}{r['hit_rate_pct']:>8.2f}"
+            f"{r['total_ms']:>11.3f}{r['mean_us']:>10.3f}"
+        )
+    return "\n".join(lines)
+
+
+def log_rule_metrics(title: str = "EXIT RULES") -> None:
+    rows = rule_metrics()
+    if rows:
+        logging.info(f"[EXIT RULES] {title}\n{format_rule_metrics(rows)}")
+
+
+def save_rule_metrics_csv(output_path: str | Path) -> Optional[Path]:
+    """Write the per-rule counters as CSV; returns None when nothing recorded."""
+    rows = rule_metrics()
+    if not rows:
+        return None
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with output_path.open("w", newline="", encoding="utf-8") as fh:
+        writer = csv.DictWriter(fh, fieldnames=list(rows[0]))
+        writer.writeheader()
+        writer.writerows(rows)
+    return output_path
+
+
+__all__ = [
+    "NO_EXIT",
+    "RuleStats",
+    "evaluate_rules",
+    "format_rule_metrics",
+    "log_rule_metrics",
+    "reset_rule_metrics",
+    "rule_metrics",
+    "save_rule_metrics_csv",
+]
@@ -11,16 +11,50 @@ py_vollib conventions (used throughout this module)
   delta  — change in option value per 1-point move in the underlying
   gamma  — change in delta per 1-point move in the underlying
 
+Whole-chain batch engine
+------------------------
+``chain_greeks`` prices an entire option chain in one numpy pass: arrays of
+spot, strike, expiry, type and premium in, IV / delta / gamma / theta / vega
+arrays out, in the same units as ``get_greeks``.  IV is seeded with the
+Corrado-Miller rational approximation and refined by safeguarded Newton
+steps (bisection fallback inside a [lo, hi] bracket), all contracts at once.
+``ChainGreeksCache`` keeps the last result per contract and re-solves only
+rows whose premium / spot bucket or expiry changed, so a quote update that
+touches three strikes costs three solves, not a chain.
+
 Log Tags
 --------
   [GREEKS] symbol=... delta=... gamma=... theta=... vega=... iv=...
+  [GREEKS_CHAIN] contracts=... refreshed=... solved=... (DEBUG, one per batch)
 """
 
 from __future__ import annotations
 
 import logging
+import math
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Iterable, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+try:
+    from py_vollib.black_scholes_merton.greeks.analytical import (
+        delta as _bsm_delta, gamma as _bsm_gamma, theta as _bsm_theta, vega as _bsm_vega,
+    )
+    from py_vollib.black_scholes_merton.implied_volatility import (
+        implied_volatility as _bsm_iv,
+    )
+    _VOLLIB_AVAILABLE = True
+except ImportError:
+    _VOLLIB_AVAILABLE = False
+
+try:
+    from scipy.special import ndtr as _ndtr
+except ImportError:
+    _erf = np.frompyfunc(math.erf, 1, 1)
+
+    def _ndtr(x):
+        return 0.5 * (1.0 + _erf(np.asarray(x) / math.sqrt(2.0)).astype(np.float64))
 
 logger = logging.getLogger(__name__)
 
@@ -36,6 +70,19 @@ _DIVIDEND_YIELD = 0.015   # 1.5 %
 THETA_PENALTY_THRESHOLD = 5.0    # |theta| pts/day > 5 → theta penalty applies
 VEGA_HIGH_THRESHOLD     = 15.0   # vega pts per 1 % vol > 15 → high vega risk
 
+# ── Batch engine constants ────────────────────────────────────────────────────
+
+# Quotes are bucketed before the cache compares them: a premium that moved
+# less than one NSE tick, or a spot that moved less than SPOT_BUCKET points,
+# keeps the cached Greeks
+PRICE_BUCKET = 0.05
+SPOT_BUCKET  = 0.5
+
+# IV search bracket and Newton stopping rule (premium error in points)
+_IV_LO, _IV_HI = 1e-4, 5.0
+_IV_PRICE_TOL  = 1e-6
+_IV_MAX_ITER   = 60
+
 
 # ── Greeks result dataclass ───────────────────────────────────────────────────
 
@@ -76,8 +123,9 @@ def get_greeks(
 
     Returns
     -------
-    ``GreeksResult`` dataclass on success, ``None`` if py_vollib is missing
-    or if the IV solver fails (e.g. deeply OTM / expired contract).
+    ``GreeksResult`` dataclass on success, ``None`` if the IV solver fails
+    (e.g. deeply OTM / expired contract).  Without py_vollib the numpy batch
+    engine (``chain_greeks``) is used for the single contract.
     """
     flag = _norm_flag(option_type)
     if flag not in ("c", "p"):
@@ -89,46 +137,44 @@ def get_greeks(
     expiry_days = max(expiry_days, 1)   # guard against zero/negative
     t = expiry_days / 365.0
 
-    try:
-        from py_vollib.black_scholes_merton.greeks.analytical import (
-            delta, gamma, theta, vega,
-        )
-        from py_vollib.black_scholes_merton.implied_volatility import (
-            implied_volatility as _iv_calc,
-        )
-    except ImportError:
-        logger.warning(
-            "[GREEKS] py_vollib not installed — Greeks unavailable. "
-            "Install with: pip install py_vollib"
-        )
-        return None
-
-    # ── 1. Back-solve implied volatility ──────────────────────────────────────
-    try:
-        iv = _iv_calc(
-            option_price,
-            spot, strike, t,
-            _RISK_FREE_RATE, _DIVIDEND_YIELD,
-            flag,
-        )
-        if iv is None or iv != iv:   # NaN guard
-            raise ValueError("IV solver returned NaN / None")
-    except Exception as exc:
-        logger.debug(
-            f"[GREEKS] IV solve failed for {symbol}: {exc} | "
-            f"spot={spot} strike={strike} t={t:.4f} price={option_price}"
-        )
-        return None
-
-    # ── 2. Compute Greeks at solved IV ────────────────────────────────────────
-    try:
-        d  = delta(flag, spot, strike, t, _RISK_FREE_RATE, iv, _DIVIDEND_YIELD)
-        g  = gamma(flag, spot, strike, t, _RISK_FREE_RATE, iv, _DIVIDEND_YIELD)
-        th = theta(flag, spot, strike, t, _RISK_FREE_RATE, iv, _DIVIDEND_YIELD)
-        v  = vega( flag, spot, strike, t, _RISK_FREE_RATE, iv, _DIVIDEND_YIELD)
-    except Exception as exc:
-        logger.debug(f"[GREEKS] Greeks computation failed for {symbol}: {exc}")
-        return None
+    if not _VOLLIB_AVAILABLE:
+        # Same BSM model, solved by the numpy batch engine (chain of one)
+        chain = chain_greeks(spot, strike, expiry_days, flag, option_price)
+        iv = float(chain.iv[0])
+        if iv != iv:
+            logger.debug(
+                f"[GREEKS] IV solve failed for {symbol} | "
+                f"spot={spot} strike={strike} t={t:.4f} price={option_price}"
+            )
+            return None
+        d, g, th, v = (float(a[0]) for a in (chain.delta, chain.gamma, chain.theta, chain.vega))
+    else:
+        # ── 1. Back-solve implied volatility ──────────────────────────────────
+        try:
+            iv = _bsm_iv(
+                option_price,
+                spot, strike, t,
+                _RISK_FREE_RATE, _DIVIDEND_YIELD,
+                flag,
+            )
+            if iv is None or iv != iv:   # NaN guard
+                raise ValueError("IV solver returned NaN / None")
+        except Exception as exc:
+            logger.debug(
+                f"[GREEKS] IV solve failed for {symbol}: {exc} | "
+                f"spot={spot} strike={strike} t={t:.4f} price={option_price}"
+            )
+            return None
+
+        # ── 2. Compute Greeks at solved IV ────────────────────────────────────
+        try:
+            d  = _bsm_delta(flag, spot, strike, t, _RISK_FREE_RATE, iv, _DIVIDEND_YIELD)
+            g  = _bsm_gamma(flag, spot, strike, t, _RISK_FREE_RATE, iv, _DIVIDEND_YIELD)
+            th = _bsm_theta(flag, spot, strike, t, _RISK_FREE_RATE, iv, _DIVIDEND_YIELD)
+            v  = _bsm_vega( flag, spot, strike, t, _RISK_FREE_RATE, iv, _DIVIDEND_YIELD)
+        except Exception as exc:
+            logger.debug(f"[GREEKS] Greeks computation failed for {symbol}: {exc}")
+            return None
 
     # py_vollib theta: already per calendar day (negative for long options)
     # py_vollib vega:  already per 1 % change in implied volatility
@@ -175,6 +221,176 @@ def is_high_vega(greeks: Optional[GreeksResult]) -> bool:
     )
 
 
+# ── Batch (whole-chain) API ───────────────────────────────────────────────────
+
+ArrayLike = Union[float, Sequence[float], np.ndarray]
+
+
+@dataclass
+class ChainGreeks:
+    """Greeks for a batch of contracts; every field is aligned with ``symbols``.
+
+    ``iv`` (and every Greek) is NaN where the premium is outside the BSM
+    no-arbitrage bounds or the solver did not converge.
+    """
+
+    symbols: Tuple[str, ...]
+    is_call: np.ndarray
+    iv:      np.ndarray
+    delta:   np.ndarray
+    gamma:   np.ndarray
+    theta:   np.ndarray
+    vega:    np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.iv)
+
+    @property
+    def ok(self) -> np.ndarray:
+        """Boolean mask of contracts whose IV solved."""
+        return ~np.isnan(self.iv)
+
+    def get(self, symbol: str) -> Optional[GreeksResult]:
+        """``GreeksResult`` for one contract (rounded like ``get_greeks``)."""
+        try:
+            i = self.symbols.index(symbol)
+        except ValueError:
+            return None
+        iv = float(self.iv[i])
+        if iv != iv:
+            return None
+        return GreeksResult(
+            symbol=symbol,
+            delta=round(float(self.delta[i]), 4),
+            gamma=round(float(self.gamma[i]), 6),
+            theta=round(float(self.theta[i]), 4),
+            vega=round(float(self.vega[i]), 4),
+            iv=round(iv, 4),
+            iv_pct=round(iv * 100, 2),
+            option_type="c" if self.is_call[i] else "p",
+        )
+
+
+def chain_greeks(
+    spot:         ArrayLike,
+    strike:       ArrayLike,
+    expiry_days:  ArrayLike,
+    option_type:  Union[str, Sequence[str], np.ndarray],
+    option_price: ArrayLike,
+    symbols:      Optional[Sequence[str]] = None,
+    r:            float = _RISK_FREE_RATE,
+    q:            float = _DIVIDEND_YIELD,
+) -> ChainGreeks:
+    """Implied volatility and Greeks for a whole chain in one vectorised pass.
+
+    Scalars broadcast against arrays (e.g. one spot for every strike).
+    ``option_type`` takes the same spellings as ``get_greeks`` or a boolean
+    is-call array.  Units follow ``get_greeks`` (theta per calendar day,
+    vega per 1 % vol); values are not rounded.
+    """
+    S, K, days, P = np.broadcast_arrays(
+        np.asarray(spot, dtype=np.float64),
+        np.asarray(strike, dtype=np.float64),
+        np.asarray(expiry_days, dtype=np.float64),
+        np.asarray(option_price, dtype=np.float64),
+    )
+    S, K, P = S.ravel(), K.ravel(), P.ravel()
+    T = np.maximum(days.ravel(), 1.0) / 365.0
+    is_call = np.broadcast_to(_call_mask(option_type), S.shape).copy()
+
+    iv = _solve_iv(S, K, T, P, is_call, r, q)
+    delta, gamma, theta, vega = _bsm_greeks(S, K, T, iv, is_call, r, q)
+    if symbols is None:
+        symbols = tuple(f"#{i}" for i in range(len(S)))
+    return ChainGreeks(tuple(symbols), is_call, iv, delta, gamma, theta, vega)
+
+
+class ChainGreeksCache:
+    """Per-contract cache of chain Greeks, refreshed only where quotes moved.
+
+    Each contract's cache key is (premium bucket, spot bucket, expiry); an
+    ``update`` re-solves only rows whose key changed (or that are new) and
+    serves the rest from the previous solve.
+
+    Usage:
+        cache = ChainGreeksCache()
+        g = cache.update(symbols, spot, strikes, expiry_days, types, ltps)
+        atm = g.get("NSE:NIFTY2631022500CE")
+    """
+
+    def __init__(
+        self,
+        price_bucket: float = PRICE_BUCKET,
+        spot_bucket:  float = SPOT_BUCKET,
+        r:            float = _RISK_FREE_RATE,
+        q:            float = _DIVIDEND_YIELD,
+    ):
+        self.price_bucket = price_bucket
+        self.spot_bucket = spot_bucket
+        self.r, self.q = r, q
+        self._row: Dict[str, int] = {}
+        self._key = np.empty((0, 3), dtype=np.float64)
+        self._vals = np.empty((0, 5), dtype=np.float64)   # iv, delta, gamma, theta, vega
+        self.last_refreshed = 0
+
+    def __len__(self) -> int:
+        return len(self._row)
+
+    def clear(self) -> None:
+        self.__init__(self.price_bucket, self.spot_bucket, self.r, self.q)
+
+    def _rows_for(self, symbols: Sequence[str]) -> np.ndarray:
+        row = self._row
+        new = [s for s in dict.fromkeys(symbols) if s not in row]
+        if new:
+            start = len(row)
+            for i, s in enumerate(new):
+                row[s] = start + i
+            grow = len(new)
+            self._key = np.vstack([self._key, np.full((grow, 3), np.nan)])
+            self._vals = np.vstack([self._vals, np.full((grow, 5), np.nan)])
+        return np.fromiter((row[s] for s in symbols), dtype=np.int64, count=len(symbols))
+
+    def update(
+        self,
+        symbols:      Sequence[str],
+        spot:         ArrayLike,
+        strike:       ArrayLike,
+        expiry_days:  ArrayLike,
+        option_type:  Union[str, Sequence[str], np.ndarray],
+        option_price: ArrayLike,
+    ) -> ChainGreeks:
+        """Greeks for ``symbols``; only contracts whose quote moved are re-solved."""
+        symbols = tuple(symbols)
+        n = len(symbols)
+        S, K, days, P = (np.broadcast_to(np.asarray(a, dtype=np.float64), (n,))
+                         for a in (spot, strike, expiry_days, option_price))
+        is_call = np.broadcast_to(_call_mask(option_type), (n,))
+        rows = self._rows_for(symbols)
+
+        key = np.column_stack([
+            np.round(P / self.price_bucket),
+            np.round(S / self.spot_bucket),
+            days,
+        ])
+        stale = np.any(self._key[rows] != key, axis=1)     # NaN (new row) compares unequal
+        idx = np.flatnonzero(stale)
+        if len(idx):
+            fresh = chain_greeks(S[idx], K[idx], days[idx], is_call[idx], P[idx],
+                                 r=self.r, q=self.q)
+            self._key[rows[idx]] = key[idx]
+            self._vals[rows[idx]] = np.column_stack(
+                [fresh.iv, fresh.delta, fresh.gamma, fresh.theta, fresh.vega])
+        self.last_refreshed = len(idx)
+
+        vals = self._vals[rows]
+        logger.debug(
+            f"[GREEKS_CHAIN] contracts={n} refreshed={len(idx)} "
+            f"solved={int((~np.isnan(vals[:, 0])).sum())}"
+        )
+        return ChainGreeks(symbols, is_call.copy(), *(vals[:, j].copy() for j in range(5)))
+
+
 # ── Private helpers ───────────────────────────────────────────────────────────
 
 def _norm_flag(raw: str) -> str:
@@ -185,3 +401,86 @@ def _norm_flag(raw: str) -> str:
     if r in ("PE", "PUT", "P"):
         return "p"
     return r.lower()
+
+
+def _call_mask(option_type) -> np.ndarray:
+    """Boolean is-call array from flags / "CE" / "PUT" spellings or bools."""
+    arr = np.asarray(option_type)
+    if arr.dtype == bool:
+        return arr
+    flags = np.array([_norm_flag(str(x)) for x in arr.ravel()]).reshape(arr.shape)
+    if not np.isin(flags, ("c", "p")).all():
+        raise ValueError(f"Unsupported option_type in {sorted(set(flags.ravel()) - {'c', 'p'})}")
+    return flags == "c"
+
+
+def _npdf(x: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * x * x) / math.sqrt(2.0 * math.pi)
+
+
+def _bsm_price_vega(S, K, T, sigma, is_call, r, q):
+    """BSM premium and raw vega (per 1.00 vol) for arrays of contracts."""
+    sqrt_t = np.sqrt(T)
+    fs, fk = S * np.exp(-q * T), K * np.exp(-r * T)
+    vol_t = sigma * sqrt_t
+    d1 = (np.log(S / K) + (r - q) * T) / vol_t + 0.5 * vol_t
+    d2 = d1 - vol_t
+    call = fs * _ndtr(d1) - fk * _ndtr(d2)
+    price = np.where(is_call, call, call - fs + fk)      # put via parity
+    return price, fs * _npdf(d1) * sqrt_t
+
+
+def _solve_iv(S, K, T, P, is_call, r, q) -> np.ndarray:
+    """Vectorised IV: Corrado-Miller seed, then bracketed Newton iterations."""
+    fs, fk = S * np.exp(-q * T), K * np.exp(-r * T)
+    call_px = np.where(is_call, P, P + fs - fk)           # price every row as a call
+    lower, upper = np.maximum(fs - fk, 0.0), fs
+    valid = (call_px > lower) & (call_px < upper) & (S > 0) & (K > 0) & np.isfinite(P)
+
+    # Corrado-Miller (1996) rational approximation as the starting point
+    half = call_px - 0.5 * (fs - fk)
+    rad = np.maximum(half * half - (fs - fk) ** 2 / math.pi, 0.0)
+    seed = math.sqrt(2.0 * math.pi) / ((fs + fk) * np.sqrt(T)) * (half + np.sqrt(rad))
+    sigma = np.clip(np.nan_to_num(seed, nan=0.2), 0.01, 3.0)
+
+    lo = np.full_like(sigma, _IV_LO)
+    hi = np.full_like(sigma, _IV_HI)
+    active = valid.copy()
+    for _ in range(_IV_MAX_ITER):
+        if not active.any():
+            break
+        i = np.flatnonzero(active)
+        s = sigma[i]
+        price, vega = _bsm_price_vega(S[i], K[i], T[i], s, True, r, q)
+        diff = price - call_px[i]
+        done = np.abs(diff) < _IV_PRICE_TOL
+        hi[i] = np.where(diff > 0, s, hi[i])
+        lo[i] = np.where(diff < 0, s, lo[i])
+        with np.errstate(divide="ignore", invalid="ignore"):
+            step = s - diff / vega
+        bad = ~np.isfinite(step) | (step <= lo[i]) | (step >= hi[i])
+        sigma[i] = np.where(done, s, np.where(bad, 0.5 * (lo[i] + hi[i]), step))
+        active[i] = ~done & (hi[i] - lo[i] > 1e-10)
+    # Rows still active ran out of iterations: report them unsolved, not the last guess.
+    sigma[~valid | active] = np.nan
+    return sigma
+
+
+def _bsm_greeks(S, K, T, sigma, is_call, r, q):
+    """Analytical BSM delta / gamma / theta (per day) / vega (per 1 % vol)."""
+    sqrt_t = np.sqrt(T)
+    eq, er = np.exp(-q * T), np.exp(-r * T)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        vol_t = sigma * sqrt_t
+        d1 = (np.log(S / K) + (r - q) * T) / vol_t + 0.5 * vol_t
+        d2 = d1 - vol_t
+        pdf = _npdf(d1)
+        sign = np.where(is_call, 1.0, -1.0)
+        nd1, nd2 = _ndtr(sign * d1), _ndtr(sign * d2)
+        delta = sign * eq * nd1
+        gamma = eq * pdf / (S * vol_t)
+        theta = (-S * eq * pdf * sigma / (2.0 * sqrt_t)
+                 - sign * r * K * er * nd2
+                 + sign * q * S * eq * nd1) / 365.0
+        vega = S * eq * pdf * sqrt_t * 0.01
+    return delta, gamma, theta, vega
@@ -0,0 +1,397 @@
+"""greeks_surface.py — streaming Greeks surface per underlying and expiry.
+
+Greeks used to be computed ad hoc when an entry was evaluated, so exits and
+sizing never saw a current delta and ``PositionManager`` fell back to the
+linear ``DELTA_PER_POINT`` approximation.  Now:
+
+  * ``GreeksSurface`` holds one expiry's chain for one underlying.  Index
+    spot ticks (``on_spot``) and option quotes (``on_quote``) only record
+    the new value and mark the surface dirty — O(1) on the feed thread
+  * ``refresh`` recomputes just the affected strikes: contracts whose quote
+    moved, plus — on a spot move — the strikes within ``band_pts`` of spot.
+    ``ChainGreeksCache`` then skips any row whose premium / spot bucket has
+    not changed, and the result is published as an immutable
+    ``SurfaceSnapshot`` by a single reference swap
+  * ``GreeksSurfaceBook`` routes ticks to surfaces and runs one daemon
+    worker that refreshes dirty surfaces at most ``GREEKS_SURFACE_HZ`` times
+    a second, so a burst of ticks coalesces into one solve
+
+Readers (``check_entry_condition`` under GREEKS_SURFACE_SCORING,
+``PositionManager._adaptive_delta``) take ``book.snapshot(underlying)`` — an
+attribute read, no lock — and look up a contract or the ATM strike in it,
+so decision-time cost is a dict lookup.
+
+Environment:
+  GREEKS_SURFACE_HZ=<rate>    max refreshes per second (default 4; 0 disables)
+  GREEKS_SURFACE_MAX_AGE=<s>  snapshots older than this are ignored by
+                              readers (default 30)
+
+Log tags
+--------
+[GREEKS_SURFACE]  surface registered / worker started / refresh failure
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from greeks_calculator import ChainGreeks, ChainGreeksCache, GreeksResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_HZ = float(os.getenv("GREEKS_SURFACE_HZ", "4") or 0)
+DEFAULT_MAX_AGE_S = float(os.getenv("GREEKS_SURFACE_MAX_AGE", "30") or 0)
+
+# Strikes further than this from spot are refreshed only when their own
+# quote moves; spot moves leave them at their last solve.
+SURFACE_BAND_PTS = 1000.0
+
+
+@dataclass(frozen=True)
+class SurfaceSnapshot:
+    """Immutable Greeks surface published by ``GreeksSurface.refresh``."""
+
+    underlying: str
+    expiry:     date
+    spot:       float
+    updated_at: float                     # time.time() of the refresh
+    strikes:    np.ndarray
+    greeks:     ChainGreeks
+    _index:     Dict[str, int] = field(repr=False, default_factory=dict)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.updated_at
+
+    def get(self, symbol: str) -> Optional[GreeksResult]:
+        """Greeks of one contract, or None if unknown / unsolved."""
+        i = self._index.get(symbol)
+        return None if i is None else self._result(i)
+
+    def delta(self, symbol: str) -> Optional[float]:
+        """Raw delta of one contract (no rounding), None if unknown / unsolved."""
+        i = self._index.get(symbol)
+        if i is None:
+            return None
+        d = float(self.greeks.delta[i])
+        return d if d == d else None
+
+    def nearest(self, side: str, strike: Optional[float] = None) -> Optional[GreeksResult]:
+        """Solved contract of ``side`` (CE/CALL or PE/PUT) closest to ``strike`` (default spot)."""
+        want_call = str(side).upper() in ("CE", "CALL", "C")
+        target = self.spot if strike is None else strike
+        mask = (self.greeks.is_call == want_call) & self.greeks.ok
+        if not mask.any():
+            return None
+        dist = np.where(mask, np.abs(self.strikes - target), np.inf)
+        return self._result(int(np.argmin(dist)))
+
+    def _result(self, i: int) -> Optional[GreeksResult]:
+        return self.greeks.get(self.greeks.symbols[i])
+
+
+class GreeksSurface:
+    """Greeks for one underlying / expiry, refreshed from spot and quote updates."""
+
+    def __init__(
+        self,
+        underlying:   str,
+        expiry:       date,
+        symbols:      Sequence[str],
+        strikes:      Sequence[float],
+        option_types: Sequence[str],
+        band_pts:     float = SURFACE_BAND_PTS,
+    ):
+        self.underlying = underlying
+        self.expiry = expiry
+        self.band_pts = band_pts
+        self.symbols: Tuple[str, ...] = tuple(symbols)
+        self.strikes = np.asarray(strikes, dtype=np.float64)
+        self.is_call = np.array([str(t).upper() in ("CE", "CALL", "C") for t in option_types], dtype=bool)
+        self.index: Dict[str, int] = {s: i for i, s in enumerate(self.symbols)}
+        n = len(self.symbols)
+
+        self._cache = ChainGreeksCache()
+        self._px = np.full(n, np.nan)
+        self._spot = float("nan")
+        self._spot_dirty = False
+        self._dirty: set = set()
+        self._lock = threading.Lock()            # guards the dirty state only
+        self._vals = np.full((5, n), np.nan)     # iv, delta, gamma, theta, vega
+        self.snapshot: Optional[SurfaceSnapshot] = None
+        self.last_refreshed = 0
+
+    # ── feed side (cheap; called from the websocket thread) ─────────────────
+
+    def on_spot(self, spot: float) -> None:
+        with self._lock:
+            self._spot = float(spot)
+            self._spot_dirty = True
+
+    def on_quote(self, symbol: str, ltp: float) -> bool:
+        i = self.index.get(symbol)
+        if i is None:
+            return False
+        with self._lock:
+            self._px[i] = float(ltp)
+            self._dirty.add(i)
+        return True
+
+    @property
+    def dirty(self) -> bool:
+        return self._spot_dirty or bool(self._dirty)
+
+    # ── refresh (worker thread, or called directly in tests / replay) ───────
+
+    def refresh(self, today: Optional[date] = None) -> Optional[SurfaceSnapshot]:
+        """Re-solve the affected strikes and publish a new snapshot if anything changed."""
+        with self._lock:
+            spot, spot_dirty = self._spot, self._spot_dirty
+            if spot != spot or not (spot_dirty or self._dirty):
+                return self.snapshot              # no spot yet: keep quotes pending
+            rows = set(self._dirty)
+            px = self._px.copy()
+            self._spot_dirty = False
+            self._dirty.clear()
+
+        if spot_dirty:
+            rows.update(np.flatnonzero(np.abs(self.strikes - spot) <= self.band_pts).tolist())
+        idx = np.fromiter(sorted(rows), dtype=np.int64, count=len(rows))
+        idx = idx[np.isfinite(px[idx])]
+        days = max(((self.expiry - (today or date.today())).days), 1)
+
+        if len(idx):
+            g = self._cache.update([self.symbols[i] for i in idx], spot, self.strikes[idx],
+                                   days, self.is_call[idx], px[idx])
+            vals = self._vals.copy()                 # copy-on-write: readers keep the old arrays
+            vals[:, idx] = np.vstack([g.iv, g.delta, g.gamma, g.theta, g.vega])
+            self._vals = vals
+        self.last_refreshed = self._cache.last_refreshed if len(idx) else 0
+
+        iv, delta, gamma, theta, vega = self._vals
+        self.snapshot = SurfaceSnapshot(
+            underlying=self.underlying,
+            expiry=self.expiry,
+            spot=spot,
+            updated_at=time.time(),
+            strikes=self.strikes,
+            greeks=ChainGreeks(self.symbols, self.is_call, iv, delta, gamma, theta, vega),
+            _index=self.index,
+        )
+        return self.snapshot
+
+
+class GreeksSurfaceBook:
+    """Surfaces keyed by (underlying, expiry), with a coalescing refresh worker."""
+
+    def __init__(self, hz: float = DEFAULT_HZ, max_age_s: float = DEFAULT_MAX_AGE_S):
+        self.hz = hz
+        self.max_age_s = max_age_s
+        self._surfaces: Dict[Tuple[str, date], GreeksSurface] = {}
+        self._by_underlying: Dict[str, List[GreeksSurface]] = {}
+        self._by_symbol: Dict[str, GreeksSurface] = {}
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def __len__(self) -> int:
+        return len(self._surfaces)
+
+    def register(
+        self,
+        underlying:   str,
+        expiry:       date,
+        symbols:      Sequence[str],
+        strikes:      Sequence[float],
+        option_types: Sequence[str],
+        **kwargs,
+    ) -> GreeksSurface:
+        surface = GreeksSurface(underlying, expiry, symbols, strikes, option_types, **kwargs)
+        self._surfaces[(underlying, expiry)] = surface
+        # Nearest expiry first: it is the one snapshot() serves by default
+        same = [s for s in self._by_underlying.get(underlying, []) if s.expiry != expiry]
+        self._by_underlying[underlying] = sorted(same + [surface], key=lambda s: s.expiry)
+        for sym in surface.symbols:
+            self._by_symbol[sym] = surface
+        logger.info(
+            f"[GREEKS_SURFACE] registered underlying={underlying} expiry={expiry} "
+            f"contracts={len(surface.symbols)}"
+        )
+        return surface
+
+    def register_chain(self, chain, expiry: Optional[date] = None) -> int:
+        """Register every (underlying, expiry) in a Fyers option-chain DataFrame.
+
+        Rows need ``symbol``, ``strike_price``, ``option_type`` and
+        ``underlying``; the expiry comes from an ``expiry`` column (date
+        string or epoch seconds) or the ``expiry`` argument.  Returns the
+        number of surfaces registered.
+        """
+        if not isinstance(chain, pd.DataFrame) or chain.empty or not {
+            "symbol", "strike_price", "option_type", "underlying"
+        }.issubset(chain.columns):
+            return 0
+        frame = chain[chain["option_type"].astype(str).str.upper().isin(("CE", "PE", "CALL", "PUT"))]
+        expiries = (frame["expiry"].map(_as_date) if "expiry" in frame.columns
+                    else pd.Series(expiry, index=frame.index))
+        if expiry is not None:
+            expiries = expiries.fillna(expiry)
+        count = 0
+        for (und, exp), grp in frame.groupby([frame["underlying"], expiries], sort=False):
+            self.register(und, exp, grp["symbol"].tolist(),
+                          pd.to_numeric(grp["strike_price"], errors="coerce").to_numpy(dtype=float),
+                          grp["option_type"].astype(str).tolist())
+            count += 1
+        if not count:
+            logger.warning("[GREEKS_SURFACE] option chain has no expiry — no surfaces registered")
+        return count
+
+    # ── feed side ────────────────────────────────────────────────────────────
+
+    def on_spot(self, underlying: str, spot: float) -> None:
+        surfaces = self._by_underlying.get(underlying)
+        if surfaces:
+            for surface in surfaces:
+                surface.on_spot(spot)
+            self._wake.set()
+
+    def on_quote(self, symbol: str, ltp: float) -> None:
+        surface = self._by_symbol.get(symbol)
+        if surface is not None and ltp is not None:
+            surface.on_quote(symbol, ltp)
+            self._wake.set()
+
+    # ── read side (lock-free) ────────────────────────────────────────────────
+
+    def snapshot(self, underlying: Optional[str],
+                 expiry: Optional[date] = None) -> Optional[SurfaceSnapshot]:
+        """Latest fresh snapshot of ``underlying`` (nearest expiry by default).
+
+        No underlying, no snapshot: guessing one would hand a caller another
+        index's Greeks.
+        """
+        if underlying is None:
+            return None
+        surfaces = self._by_underlying.get(underlying)
+        if not surfaces:
+            return None
+        surface = surfaces[0] if expiry is None else self._surfaces.get((underlying, expiry))
+        return self._fresh(surface.snapshot if surface is not None else None)
+
+    def snapshot_for(self, symbol: str) -> Optional[SurfaceSnapshot]:
+        """Latest fresh snapshot of the surface that holds option ``symbol``."""
+        surface = self._by_symbol.get(symbol)
+        return self._fresh(surface.snapshot if surface is not None else None)
+
+    def _fresh(self, snap: Optional[SurfaceSnapshot]) -> Optional[SurfaceSnapshot]:
+        if snap is None or (self.max_age_s and snap.age > self.max_age_s):
+            return None
+        return snap
+
+    # ── refresh worker ───────────────────────────────────────────────────────
+
+    def refresh(self) -> int:
+        """Refresh every dirty surface now; returns how many were refreshed."""
+        done = 0
+        for surface in list(self._surfaces.values()):
+            if not surface.dirty:
+                continue
+            try:
+                surface.refresh()
+                done += 1
+            except Exception as exc:
+                logger.warning(f"[GREEKS_SURFACE] refresh failed for {surface.underlying} "
+                               f"{surface.expiry}: {exc}")
+        return done
+
+    def start(self) -> bool:
+        """Start the background worker; False when disabled (hz <= 0)."""
+        if self.hz <= 0:
+            return False
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="greeks-surface", daemon=True)
+            self._thread.start()
+            logger.info(f"[GREEKS_SURFACE] worker started rate={self.hz:g}/s surfaces={len(self)}")
+        return True
+
+    def stop(self, timeout: float = 1.0) -> None:
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self) -> None:
+        interval = 1.0 / self.hz
+        while not self._stop.is_set():
+            self._wake.wait()
+            if self._stop.is_set():
+                break
+            self._wake.clear()
+            started = time.monotonic()
+            self.refresh()
+            # Coalesce: ticks arriving during the pause only re-set _wake
+            self._stop.wait(max(0.0, interval - (time.monotonic() - started)))
+
+
+def _as_date(raw) -> Optional[date]:
+    """Expiry from a date / datetime, epoch seconds or a date string."""
+    if raw is None or (isinstance(raw, float) and raw != raw):
+        return None
+    if isinstance(raw, datetime):
+        return raw.date()
+    if isinstance(raw, date):
+        return raw
+    try:
+        epoch = float(raw)
+    except (TypeError, ValueError):
+        epoch = None
+    if epoch is not None and epoch > 1e9:                  # Fyers sends epoch seconds
+        return datetime.fromtimestamp(epoch, tz=timezone.utc).date()
+    try:
+        return date.fromisoformat(str(raw)[:10])
+    except ValueError:
+        pass
+    ts = pd.to_datetime(str(raw), errors="coerce", dayfirst=True)
+    return None if ts is pd.NaT else ts.date()
+
+
+# ── Module-level singleton ────────────────────────────────────────────────────
+
+_BOOK = GreeksSurfaceBook()
+
+
+def get_greeks_surfaces() -> GreeksSurfaceBook:
+    """Return the process-wide surface book (empty until ``start_greeks_surfaces``)."""
+    return _BOOK
+
+
+def start_greeks_surfaces(chain, expiry: Optional[date] = None) -> Optional[GreeksSurfaceBook]:
+    """Register ``chain`` and start the refresh worker; None when disabled or empty."""
+    if _BOOK.hz <= 0:
+        logger.info("[GREEKS_SURFACE] disabled (GREEKS_SURFACE_HZ=0)")
+        return None
+    if not len(_BOOK) and not _BOOK.register_chain(chain, expiry):
+        return None
+    _BOOK.start()
+    return _BOOK
+
+
+__all__ = [
+    "GreeksSurface",
+    "GreeksSurfaceBook",
+    "SURFACE_BAND_PTS",
+    "SurfaceSnapshot",
+    "get_greeks_surfaces",
+    "start_greeks_surfaces",
+]
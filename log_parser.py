@@ -11,6 +11,19 @@ Parses structured log tags emitted by the trading engine:
 
 Produces per-trade dicts and a SessionSummary for each log file.
 
+Lines are routed by their leading bracket tag through ``_DISPATCH`` to the
+handlers registered for that tag; lines with any other leading tag
+([TICK], [INDICATOR DF], ...) are skipped without running a regex.
+
+When the engine wrote an events sidecar next to the log (event_stream.py,
+``<log>.events.jsonl``), trades, exit audits, entry blocks, ENTRY OK,
+SIGNAL FIRED and REGIME_CONTEXT are read from it with ``json.loads``; the
+text scan then only runs the handlers for the remaining tags
+(``_EVENT_DISPATCH``).  A sidecar whose last event is older than the last
+of those lines in the log (writer killed or not yet flushed) is ignored and
+the file is re-scanned with the full regex chain.  Pass ``use_events=False``
+to force the regex path.
+
 Usage
 -----
     from log_parser import LogParser, SessionSummary
@@ -23,15 +36,34 @@ Usage
 
     print(summary.blocked_counts)   # {"ST_CONFLICT": 371, ...}
     print(summary.win_rate_pct)
+
+    # Many sessions: parsed across a process pool, cached on disk
+    summaries = parse_multiple(paths, cache_dir="reports/.parse_cache")
 """
 
 from __future__ import annotations
 
+import dataclasses
+import hashlib
+import logging
+import os
+import pickle
 import re
+import time
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from event_stream import events_path_for, read_events
+
+# Bump whenever a handler or SessionSummary field changes: cached summaries
+# written by an older parser are then re-parsed instead of reused.
+PARSER_VERSION = 2
+
+# parse_multiple only starts a process pool for at least this many misses.
+PARALLEL_MIN_FILES = 4
 
 # ── ANSI strip ────────────────────────────────────────────────────────────────
 _ANSI = re.compile(r"\x1b\[[0-9;]*m")
@@ -799,6 +831,186 @@ class SessionSummary:
         }
 
 
+# ── Scan state ────────────────────────────────────────────────────────────────
+
+@dataclass
+class _ScanState:
+    """Accumulators carried across lines by ``LogParser._scan_file``."""
+
+    trades:            List[dict] = field(default_factory=list)   # V1 [TRADE OPEN]/[TRADE EXIT] pairs
+    open_queue:        List[dict] = field(default_factory=list)   # pending TRADE OPEN records (FIFO)
+    # Structured format queues (keyed by option_name for exact matching)
+    open_queue_struct: Dict[str, dict] = field(default_factory=dict)
+    trades_struct:     List[dict] = field(default_factory=list)
+    # [EXIT][PAPER/LIVE ...] rich records — self-contained with all trade fields
+    rich_exit_trades:  List[dict] = field(default_factory=list)
+    # Keep EXIT AUDIT records as fallback when no TRADE OPEN+EXIT pairs found
+    audit_records:     List[dict] = field(default_factory=list)
+    session_types:     set = field(default_factory=set)
+    blocked:           Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    tags:              Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    zone_entry_counts: Dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    signals_fired:     int = 0
+    entry_ok_count:    int = 0
+    open_bias_tag:     str = "NONE"               # P5-A: OPEN_HIGH | OPEN_LOW | NONE
+    vs_close_tag:      str = "OPEN_CLOSE_EQUAL"   # P5-B
+    gap_tag:           str = "NO_GAP"             # P5-C: GAP_UP | GAP_DOWN | NO_GAP
+    balance_tag:       str = "OUTSIDE_BALANCE"    # P5-D: BALANCE_OPEN | OUTSIDE_BALANCE
+    day_type_tag:      str = "NEUTRAL_DAY"        # TREND_DAY | RANGE_DAY | GAP_DAY | BALANCE_DAY
+    cpr_width_tag:     str = "NORMAL"             # NARROW | NORMAL | WIDE
+    reversal_count:           int = 0   # [REVERSAL_OVERRIDE] fired count
+    slope_override_count:     int = 0   # [ST_SLOPE_OVERRIDE] fired count
+    osc_blocks:               int = 0   # [ENTRY BLOCKED][OSC_EXTREME] count
+    osc_overrides:            int = 0   # [OSC_OVERRIDE][TREND_CONFIRMED] count
+    osc_relief_count:         int = 0   # [OSC_RELIEF][S4/R4_BREAK] count
+    trend_loss_count:         int = 0   # [TREND_LOSS] trend trade SL count
+    expiry_roll_count:        int = 0   # [CONTRACT_ROLL] events
+    lot_size_mismatch_count:  int = 0   # [CONTRACT_METADATA][LOT_MISMATCH] events
+    intrinsic_filter_count:   int = 0   # [CONTRACT_FILTER]...SKIPPED events
+    vix_tier_count:           int = 0   # [VIX_CONTEXT] refreshes
+    greeks_usage_count:       int = 0   # [GREEKS] computations
+    theta_penalty_count:      int = 0   # [VOL_CONTEXT][SCORE_ADJUST] theta_adj < 0
+    vega_penalty_count:       int = 0   # [POSITION_SIZE] vega_high=True
+    vol_context_align_count:  int = 0   # [VOL_CONTEXT][ALIGN] per-side events
+    greeks_align_count:       int = 0   # [GREEKS_ALIGN] per-side events
+    score_matrix_usage_count: int = 0   # [SCORE_MATRIX] per-side events
+    reversal_signal_count:    int = 0   # [REVERSAL_SIGNAL] detector firings
+    regime_context_count:     int = 0   # [REGIME_CONTEXT] per-bar count
+    regime_adaptive_count:    int = 0   # [EXIT AUDIT][REGIME_ADAPTIVE] per-trade
+    # Phase 6 counters
+    bias_alignment_count:      int = 0
+    bar_close_alignment_count: int = 0
+    slope_override_time_count: int = 0
+    conflict_blocked_count:    int = 0
+    pulse_exhaustion_count:    int = 0
+    zone_absorption_count:     int = 0
+    spread_noise_count:        int = 0
+    # Phase 6.1 counters
+    tilt_state_count:          int = 0
+    governance_easy_count:     int = 0
+    governance_strict_count:   int = 0
+    tilt_bias_override_count:  int = 0
+    # Phase 6.2 counters
+    trend_cont_activations:    int = 0
+    trend_cont_entries:        int = 0
+    trend_cont_deactivations:  int = 0
+    trend_cont_side:           str = ""
+    # Last line whose facts the events sidecar also carries (staleness check)
+    last_event_line:     str = ""
+    # Last-seen context for trade attribution
+    last_tilt_state:     str = "NEUTRAL"
+    last_bias_alignment: str = "NEUTRAL"
+    last_regime: dict = field(default_factory=lambda: {
+        "atr_regime": "UNKNOWN", "adx_tier": "UNKNOWN",
+        "day_type": "UNKNOWN", "cpr_width": "UNKNOWN",
+    })
+
+
+# ── Tag dispatch ──────────────────────────────────────────────────────────────
+
+# (LogParser handler, leading tags it is registered for), in the precedence
+# order of the original per-line if/continue chain.  "*" = every tag.
+# A line is routed by its leading bracket tag (text up to "=" for
+# [TILT_STATE=...]); handlers for tags that are known to appear later in a
+# line — [BAR_CLOSE_ALIGNMENT] inside [ENTRY OK] — are registered under
+# the leading tag as well.
+_HANDLER_CHAIN = (
+    ("_on_trade_open_struct",   ("TRADE OPEN",)),
+    ("_on_trade_exit_struct",   ("TRADE EXIT",)),
+    ("_on_exit_rich",           ("EXIT",)),
+    ("_on_trade_open",          ("TRADE OPEN",)),
+    ("_on_trade_exit",          ("TRADE EXIT",)),
+    ("_on_entry_blocked",       ("ENTRY BLOCKED",)),
+    ("_on_slope_conflict_3m",   ("SLOPE_CONFLICT",)),
+    ("_on_entry_ok",            ("ENTRY OK",)),
+    ("_on_signal_fired",        ("SIGNAL FIRED",)),
+    ("_on_open_position",       ("OPEN_POSITION",)),
+    ("_on_open_vs_close",       ("OPEN_ABOVE_CLOSE", "OPEN_BELOW_CLOSE", "OPEN_CLOSE_EQUAL")),
+    ("_on_gap",                 ("GAP_UP", "GAP_DOWN", "NO_GAP")),
+    ("_on_balance_open",        ("BALANCE_OPEN", "OUTSIDE_BALANCE")),
+    ("_on_day_type_opening",    ("DAY_TYPE",)),
+    ("_on_day_type",            ("DAY_TYPE",)),
+    ("_on_day_type_dtc",        ("DAY TYPE",)),
+    ("_on_reversal_signal",     ("REVERSAL_SIGNAL",)),
+    ("_on_reversal_override",   ("REVERSAL_OVERRIDE",)),
+    ("_on_st_slope_override",   ("ENTRY ALLOWED",)),
+    ("_on_entry_allowed_zone",  ("ENTRY ALLOWED",)),
+    ("_on_osc_trend_override",  ("OSC_OVERRIDE",)),
+    ("_on_osc_relief",          ("OSC_RELIEF",)),
+    ("_on_trend_loss",          ("TREND_LOSS",)),
+    ("_on_contract_roll",       ("CONTRACT_ROLL",)),
+    ("_on_lot_mismatch",        ("CONTRACT_METADATA",)),
+    ("_on_contract_filter_skip", ("CONTRACT_FILTER",)),
+    ("_on_expiry_roll_bonus",   ("EXPIRY_ROLL",)),
+    ("_on_lot_size",            ("LOT_SIZE",)),
+    ("_on_config_lot_size",     ("CONFIG",)),
+    ("_on_vix_context",         ("VIX_CONTEXT",)),
+    ("_on_greeks",              ("GREEKS",)),
+    ("_on_vol_context_adjust",  ("VOL_CONTEXT",)),
+    ("_on_position_size",       ("POSITION_SIZE",)),
+    ("_on_vol_context_align",   ("VOL_CONTEXT",)),
+    ("_on_greeks_align",        ("GREEKS_ALIGN",)),
+    ("_on_score_matrix",        ("SCORE_MATRIX",)),
+    ("_on_regime_context",      ("REGIME_CONTEXT",)),
+    ("_on_exit_audit_regime",   ("EXIT AUDIT",)),
+    ("_on_bias_alignment",      ("BIAS_ALIGNMENT",)),
+    ("_on_bar_close_alignment", ("BAR_CLOSE_ALIGNMENT", "ENTRY OK")),
+    ("_on_slope_override_time", ("SLOPE_OVERRIDE_TIME",)),
+    ("_on_conflict_blocked",    ("CONFLICT_BLOCKED",)),
+    ("_on_pulse_exhaustion",    ("PULSE_EXHAUSTION",)),
+    ("_on_zone_absorption",     ("ZONE_ABSORPTION",)),
+    ("_on_spread_noise",        ("SPREAD_NOISE",)),
+    ("_on_tilt_state",          ("TILT_STATE",)),
+    ("_on_governance_easy",     ("GOVERNANCE_EASY",)),
+    ("_on_governance_strict",   ("GOVERNANCE_STRICT",)),
+    ("_on_trend_continuation",  ("TREND_CONTINUATION",)),
+    ("_on_p_tag",               ("*",)),
+    ("_on_exit_audit",          ("EXIT AUDIT",)),
+)
+
+_P_TAG_SET = frozenset(_P_TAGS)
+
+
+# Handlers whose facts come from the events sidecar when one exists.
+_EVENT_HANDLERS = frozenset({
+    "_on_trade_open_struct",
+    "_on_trade_exit_struct",
+    "_on_exit_rich",
+    "_on_entry_blocked",
+    "_on_entry_ok",
+    "_on_signal_fired",
+    "_on_regime_context",
+    "_on_exit_audit_regime",
+    "_on_exit_audit",
+})
+
+
+def _build_dispatch(skip: frozenset = frozenset()) -> Dict[str, tuple]:
+    """Leading tag → handler names; ``skip`` drops handlers fed by events.
+
+    A tag that loses a handler to ``skip`` also loses the ``*`` catch-all,
+    so lines the events already describe are not re-counted as plain tags.
+    """
+    keys = {k for _, tags in _HANDLER_CHAIN for k in tags if k != "*"} | _P_TAG_SET
+    dispatch = {}
+    for key in keys:
+        names = [name for name, tags in _HANDLER_CHAIN if key in tags or "*" in tags]
+        kept = [name for name in names if name not in skip]
+        if len(kept) < len(names):
+            kept = [name for name in kept if name != "_on_p_tag"]
+        if kept:
+            dispatch[key] = tuple(kept)
+    return dispatch
+
+
+# leading tag → LogParser handler names, in chain order
+_DISPATCH: Dict[str, tuple] = _build_dispatch()
+# same, for logs whose trade / gate / signal facts come from the events file
+_EVENT_DISPATCH: Dict[str, tuple] = _build_dispatch(_EVENT_HANDLERS)
+# leading tags whose lines the events file describes
+_EVENT_TAGS = frozenset(tag for tag, names in _DISPATCH.items() if _EVENT_DISPATCH.get(tag) != names)
+
+
 # ── LogParser ─────────────────────────────────────────────────────────────────
 
 class LogParser:
@@ -810,10 +1022,22 @@ class LogParser:
 
     When both are present, new-format pairs take precedence and EXIT AUDIT
     records are merged in for any remaining unmatched exits.
+
+    With ``use_events`` (default) an existing ``.events.jsonl`` sidecar
+    replaces the regex handlers listed in ``_EVENT_HANDLERS``.
     """
 
-    def __init__(self, log_path: str | Path) -> None:
+    def __init__(self, log_path: str | Path, use_events: bool = True) -> None:
         self.log_path = Path(log_path)
+        self.use_events = use_events
+
+    @property
+    def events_path(self) -> Optional[Path]:
+        """The events sidecar this parse reads, or None."""
+        if not self.use_events:
+            return None
+        path = events_path_for(self.log_path)
+        return path if path.exists() else None
 
     # ── public ────────────────────────────────────────────────────────────────
 
@@ -826,7 +1050,12 @@ class LogParser:
                 date_tag="",
             )
 
-        date_tag = self._extract_date_tag()
+        return self._build_summary(self._extract_date_tag(), self._scan_file())
+
+    # ── private ───────────────────────────────────────────────────────────────
+
+    def _build_summary(self, date_tag: str, scan: tuple) -> SessionSummary:
+        """Assemble a SessionSummary from the ``_scan_file`` tuple."""
         (trades, session_types, blocked, tags, signals, ok_count,
          open_bias_tag, vs_close_tag, gap_tag, balance_tag,
          day_type_tag, cpr_width_tag, reversal_count, slope_override_count,
@@ -845,7 +1074,7 @@ class LogParser:
          # Phase 6.2
          p62_tc_activations, p62_tc_entries,
          p62_tc_deactivations, p62_tc_side,
-         ) = self._scan_file()
+         ) = scan
 
         if session_types:
             session_type = session_types.pop() if len(session_types) == 1 else "MIXED"
@@ -908,8 +1137,6 @@ class LogParser:
             trend_continuation_side=p62_tc_side,
         )
 
-    # ── private ───────────────────────────────────────────────────────────────
-
     def _extract_date_tag(self) -> str:
         """Return YYYY-MM-DD from the log filename, or empty string."""
         m = re.search(r"(\d{4}-\d{2}-\d{2})", self.log_path.name)
@@ -918,6 +1145,13 @@ class LogParser:
     def _scan_file(self):
         """Single-pass scan of the log file.
 
+        Each line is classified by its leading bracket tag and only the
+        handlers registered for that tag in ``_DISPATCH`` run, in the same
+        precedence order as the original if/continue chain.  Lines whose
+        leading tag has no handler (``[TICK]``, ``[INDICATOR DF]``, …) cost
+        one ``find`` and one dict lookup; ANSI codes are stripped only when
+        the line contains an ESC byte.
+
         Returns
         -------
         (trades, session_types, blocked, tags, signals_fired, entry_ok_count,
@@ -930,590 +1164,748 @@ class LogParser:
          reversal_signal_count, zone_entry_counts,
          regime_context_count, regime_adaptive_count, regime_trade_breakdown)
         """
-        trades: List[dict] = []
-        open_queue: List[dict] = []   # pending TRADE OPEN records (FIFO)
-        # Structured format queues (keyed by option_name for exact matching)
-        open_queue_struct: Dict[str, dict] = {}
-        trades_struct: List[dict] = []
-        session_types: set = set()
-        blocked: Dict[str, int] = defaultdict(int)
-        tags: Dict[str, int] = defaultdict(int)
-        signals_fired: int = 0
-        entry_ok_count: int = 0
-        open_bias_tag: str = "NONE"               # P5-A: OPEN_HIGH | OPEN_LOW | NONE
-        vs_close_tag:  str = "OPEN_CLOSE_EQUAL"   # P5-B
-        gap_tag:       str = "NO_GAP"             # P5-C: GAP_UP | GAP_DOWN | NO_GAP
-        balance_tag:   str = "OUTSIDE_BALANCE"    # P5-D: BALANCE_OPEN | OUTSIDE_BALANCE
-        day_type_tag:  str = "NEUTRAL_DAY"        # TREND_DAY | RANGE_DAY | GAP_DAY | BALANCE_DAY
-        cpr_width_tag: str = "NORMAL"             # NARROW | NORMAL | WIDE
-        reversal_count: int = 0                   # [REVERSAL_OVERRIDE] fired count
-        slope_override_count: int = 0             # [ST_SLOPE_OVERRIDE] fired count
-        osc_blocks: int = 0                       # [ENTRY BLOCKED][OSC_EXTREME] count
-        osc_overrides: int = 0                    # [OSC_OVERRIDE][TREND_CONFIRMED] count
-        osc_relief_count: int = 0                 # [OSC_RELIEF][S4/R4_BREAK] count
-        trend_loss_count: int = 0                 # [TREND_LOSS] trend trade SL count
-        expiry_roll_count: int = 0                # [CONTRACT_ROLL] events
-        lot_size_mismatch_count: int = 0          # [CONTRACT_METADATA][LOT_MISMATCH] events
-        intrinsic_filter_count: int = 0           # [CONTRACT_FILTER]...SKIPPED events
-        vix_tier_count: int = 0                   # [VIX_CONTEXT] refreshes
-        greeks_usage_count: int = 0               # [GREEKS] computations
-        theta_penalty_count: int = 0              # [VOL_CONTEXT][SCORE_ADJUST] theta_adj < 0
-        vega_penalty_count: int = 0               # [POSITION_SIZE] vega_high=True
-        vol_context_align_count: int = 0          # [VOL_CONTEXT][ALIGN] per-side events
-        greeks_align_count: int = 0               # [GREEKS_ALIGN] per-side events
-        score_matrix_usage_count: int = 0         # [SCORE_MATRIX] per-side events
-        reversal_signal_count: int = 0            # [REVERSAL_SIGNAL] detector firings
-        zone_entry_counts: Dict[str, int] = defaultdict(int)  # ZoneA/B/C allowed entries
-        regime_context_count: int = 0            # [REGIME_CONTEXT] per-bar count
-        regime_adaptive_count: int = 0           # [EXIT AUDIT][REGIME_ADAPTIVE] per-trade
-        # Phase 6 counters
-        bias_alignment_count: int = 0
-        bar_close_alignment_count: int = 0
-        slope_override_time_count: int = 0
-        conflict_blocked_count: int = 0
-        pulse_exhaustion_count: int = 0
-        zone_absorption_count: int = 0
-        spread_noise_count: int = 0
-        # Phase 6.1 counters
-        tilt_state_count: int = 0
-        governance_easy_count: int = 0
-        governance_strict_count: int = 0
-        tilt_bias_override_count: int = 0
-        # Phase 6.2 counters
-        trend_cont_activations: int = 0
-        trend_cont_entries: int = 0
-        trend_cont_deactivations: int = 0
-        trend_cont_side: str = ""
-        _last_tilt_state: str = "NEUTRAL"        # last-seen for trade attribution
-        _last_bias_alignment: str = "NEUTRAL"   # last-seen for trade attribution
-        # Last-seen regime context for trade attribution
-        _last_regime: dict = {"atr_regime": "UNKNOWN", "adx_tier": "UNKNOWN",
-                              "day_type": "UNKNOWN", "cpr_width": "UNKNOWN"}
-        # Regime breakdown: dim -> label -> [pnl_list]
-        regime_breakdown: Dict[str, Dict[str, list]] = {
-            "day_type": defaultdict(list), "adx_tier": defaultdict(list),
-            "atr_regime": defaultdict(list), "cpr_width": defaultdict(list),
-        }
-
-        # Keep EXIT AUDIT records as fallback when no TRADE OPEN+EXIT pairs found
-        audit_records: List[dict] = []
-        # [EXIT][PAPER/LIVE ...] rich records — self-contained with all trade fields
-        rich_exit_trades: List[dict] = []
-
+        st = _ScanState()
+        events_path = self.events_path
         with self.log_path.open(encoding="utf-8", errors="replace") as fh:
-            for raw_line in fh:
-                line = _strip(raw_line)
-
-                # ── [TRADE OPEN][STRUCT] — structured format, exact option_name key ──
-                m = _RE_TRADE_OPEN_STRUCT.search(line)
-                if m:
-                    d = m.groupdict()
-                    log_ts = self._log_ts(line)
-                    _oba = re.search(r"open_bias_aligned=(ALIGNED|MISALIGNED|NEUTRAL)", line)
-                    _fb = re.search(r"\bfb=(0|1)\b", line)
-                    _ema = re.search(r"\bema_stretch=(0|1)\b", line)
-                    _zr = re.search(r"\bzone_revisit=(0|1)\b", line)
-                    _zt = re.search(r"\bzone_type=([A-Z_]+)\b", line)
-                    _za = re.search(r"\bzone_action=([A-Z_]+)\b", line)
-                    _zage = re.search(r"\bzone_age=(\d+)\b", line)
-                    open_queue_struct[d["option_name"]] = {
-                        "side":        d["side"].upper(),
-                        "bar_ts":      d["bar_ts"],
-                        "log_ts":      log_ts,
-                        "entry_prem":  float(d["entry"]),
-                        "lot":         int(d["lots"]),
-                        "option_name": d["option_name"],
-                        "open_bias_aligned": _oba.group(1).upper() if _oba else "NEUTRAL",
-                        "failed_breakout": bool(int(_fb.group(1))) if _fb else False,
-                        "ema_stretch": bool(int(_ema.group(1))) if _ema else False,
-                        "zone_revisit": bool(int(_zr.group(1))) if _zr else False,
-                        "zone_revisit_type": _zt.group(1).upper() if _zt else "NONE",
-                        "zone_revisit_action": _za.group(1).upper() if _za else "NONE",
-                        "zone_age_bars": int(_zage.group(1)) if _zage else 0,
-                        # Phase 5: regime at entry (snapshot of last-seen context)
-                        "regime_at_entry": dict(_last_regime),
-                        # Phase 6: bias alignment at entry
-                        "bias_alignment": _last_bias_alignment,
-                        "tilt_state": _last_tilt_state,
-                    }
-                    continue
-
-                # ── [TRADE EXIT][STRUCT] — structured format, matched by option_name ──
-                m = _RE_TRADE_EXIT_STRUCT.search(line)
-                if m:
-                    d = m.groupdict()
-                    log_ts = self._log_ts(line)
-                    exit_rec = {
-                        "exit_bar_ts": d["bar_ts"],
-                        "log_ts":      log_ts,
-                        "option_name": d["option_name"],
-                        "exit_prem":   float(d["exit_prem"]),
-                        "pnl_pts":     float(d["pnl_pts"]),
-                        "pnl_rs":      float(d["pnl_rs"]),
-                        "bars_held":   int(d["bars_held"]),
-                        "exit_reason": d["exit_reason"].upper(),
-                    }
-                    matched_open = open_queue_struct.pop(d["option_name"], None)
-                    if matched_open:
-                        trade = {**matched_open, **exit_rec}
-                    else:
-                        trade = exit_rec
-                    trades_struct.append(trade)
-                    continue
-
-                # ── [EXIT][PAPER/LIVE ...] — rich self-contained record ───
-                m = _RE_EXIT_RICH.search(line)
-                if m:
-                    d = m.groupdict()
-                    log_ts = self._log_ts(line)
-                    _mode = d.get("session_mode", "PAPER").upper()
-                    session_types.add(_mode)
-                    rich_exit_trades.append({
-                        "session_type": _mode,
-                        "side":         d["side"].upper(),
-                        "bar_ts":       log_ts,
-                        "log_ts":       log_ts,
-                        "option_name":  d["option_name"],
-                        "entry_prem":   float(d["entry_prem"]),
-                        "exit_prem":    float(d["exit_prem"]),
-                        "lot":          int(d["qty"]),
-                        "pnl_pts":      float(d["pnl_pts"]),
-                        "pnl_rs":       float(d["pnl_rs"]),
-                        "bars_held":    int(d["bars_held"]),
-                        "exit_reason":  d["exit_reason"].upper(),
-                        "regime_at_entry": dict(_last_regime),
-                        "bias_alignment": _last_bias_alignment,
-                        "tilt_state": _last_tilt_state,
-                    })
-                    continue
-
-                # ── [TRADE OPEN] ──────────────────────────────────────────
-                m = _RE_TRADE_OPEN.search(line)
-                if m:
-                    d = m.groupdict()
-                    log_ts = self._log_ts(line)
-                    open_queue.append({
-                        "session_type": d["session_type"].upper(),
-                        "side":         d["side"].upper(),
-                        "bar":          int(d["bar"]),
-                        "bar_ts":       d["bar_ts"],
-                        "log_ts":       log_ts,
-                        "underlying":   float(d["underlying"]),
-                        "entry_prem":   float(d["premium"]),
-                        "score":        int(d["score"]),
-                        "src":          d.get("src") or "",
-                        "pivot":        d.get("pivot") or "",
-                        "cpr":          d.get("cpr") or "",
-                        "day_type":     d.get("day") or "",
-                        "lot":          int(d["lot"]) if d.get("lot") else 0,
-                        "option_name":  d.get("option_name") or "",
-                        "regime_at_entry": dict(_last_regime),
-                        "bias_alignment": _last_bias_alignment,
-                        "tilt_state": _last_tilt_state,
-                    })
-                    session_types.add(d["session_type"].upper())
-                    continue
-
-                # ── [TRADE EXIT] ──────────────────────────────────────────
-                m = _RE_TRADE_EXIT.search(line)
-                if m:
-                    d = m.groupdict()
-                    log_ts = self._log_ts(line)
-                    # exit_reason: prefer the bracket tag (ST_FLIP_2 etc.),
-                    # fall back to WIN/LOSS outcome string
-                    reason = (d.get("exit_reason") or "").upper() or d["outcome"].upper()
-                    exit_rec = {
-                        "outcome":     d["outcome"].upper(),
-                        "side":        d["side"].upper(),
-                        "exit_bar":    int(d["bar"]),
-                        "exit_bar_ts": d["bar_ts"],
-                        "log_ts":      log_ts,
-                        "exit_prem":   float(d["exit_prem"]),
-                        "entry_prem":  float(d["entry_prem"]),
-                        "pnl_pts":     float(d["pnl_pts"]),
-                        "pnl_rs":      float(d["pnl_rs"]),
-                        "peak":        float(d["peak"]),
-                        "bars_held":   int(d["bars_held"]),
-                        "exit_reason": reason,
-                    }
-                    # Merge with matching open record (FIFO on same side)
-                    matched_open = self._pop_open(open_queue, d["side"].upper())
-                    if matched_open:
-                        trade = {**matched_open, **exit_rec}
-                    else:
-                        trade = exit_rec
-                    trades.append(trade)
-                    continue
-
-                # ── [ENTRY BLOCKED] ───────────────────────────────────────
-                m = _RE_ENTRY_BLOCKED.search(line)
-                if m:
-                    _subtype = m.group("subtype").upper()
-                    blocked[_subtype] += 1
-                    if _subtype == "OSC_EXTREME":
-                        osc_blocks += 1
-                    continue
-
-                # ── [SLOPE_CONFLICT][3m] (P6 renamed tag) ─────────────────
-                if _RE_SLOPE_CONFLICT_3M.search(line):
-                    blocked["ST_SLOPE_CONFLICT"] += 1
-                    continue
-
-                # ── [ENTRY OK] ────────────────────────────────────────────
-                m = _RE_ENTRY_OK.search(line)
-                if m:
-                    entry_ok_count += 1
-                    # Phase 6: [BAR_CLOSE_ALIGNMENT] may appear inside [ENTRY OK] line
-                    if _RE_BAR_CLOSE_ALIGNMENT.search(line):
-                        bar_close_alignment_count += 1
-                        tags["BAR_CLOSE_ALIGNMENT"] = tags.get("BAR_CLOSE_ALIGNMENT", 0) + 1
-                    continue
-
-                # ── [SIGNAL FIRED] ────────────────────────────────────────
-                m = _RE_SIGNAL_FIRED.search(line)
-                if m:
-                    signals_fired += 1
-                    continue
-
-                # ── [OPEN_POSITION] (P5-A) — extract bias tag before generic check ──
-                m = _RE_OPEN_POSITION.search(line)
-                if m:
-                    open_bias_tag = m.group("open_bias_tag").upper()
-                    tags["OPEN_POSITION"] += 1
-                    continue
-
-                # ── [OPEN_ABOVE/BELOW_CLOSE / OPEN_CLOSE_EQUAL] (P5-B) ────
-                m = _RE_OPEN_VS_CLOSE.search(line)
-                if m:
-                    vs_close_tag = m.group("vs_close_tag").upper()
-                    tags[vs_close_tag] += 1
-                    continue
-
-                # ── [GAP_UP / GAP_DOWN / NO_GAP] (P5-C) ──────────────────
-                m = _RE_GAP.search(line)
-                if m:
-                    gap_tag = m.group("gap_tag").upper()
-                    tags[gap_tag] += 1
-                    continue
-
-                # ── [BALANCE_OPEN / OUTSIDE_BALANCE] (P5-D) ──────────────
-                m = _RE_BALANCE_OPEN.search(line)
-                if m:
-                    balance_tag = m.group("balance_tag").upper()
-                    tags[balance_tag] += 1
-                    continue
-
-                # ── [DAY_TYPE] / [DAY TYPE] (DTC locked) ─────────────────
-                m = _RE_DAY_TYPE_OPENING.search(line)
-                if m:
-                    _gap = m.group("gap_tag").upper()
-                    gap_tag = _gap if _gap in {"GAP_UP", "GAP_DOWN"} else "NO_GAP"
-                    if day_type_tag in {"NEUTRAL_DAY", "UNKNOWN"}:
-                        day_type_tag = "GAP_DAY" if _gap in {"GAP_UP", "GAP_DOWN"} else "NEUTRAL_DAY"
-                    tags["DAY_TYPE"] += 1
-                    continue
-                m = _RE_DAY_TYPE.search(line)
-                if m:
-                    day_type_tag = m.group("day_type_tag").upper()
-                    _cw = m.group("cpr_width_tag")
-                    if _cw:
-                        cpr_width_tag = _cw.upper()
-                    tags["DAY_TYPE"] += 1
-                    continue
-                # Replay DTC locked format: [DAY TYPE] TRENDING confidence=HIGH ...
-                m = _RE_DAY_TYPE_DTC.search(line)
-                if m:
-                    _dtc_name = m.group("dtc_name").upper()
-                    if _dtc_name != "UNKNOWN":
-                        day_type_tag = _dtc_name + "_DAY"
-                    tags["DAY_TYPE"] += 1
-                    continue
-
-                # ── [REVERSAL_SIGNAL] ─────────────────────────────────────
-                m = _RE_REVERSAL_SIGNAL.search(line)
-                if m:
-                    reversal_signal_count += 1
-                    tags["REVERSAL_SIGNAL"] += 1
-                    continue
-
-                # ── [REVERSAL_OVERRIDE] ───────────────────────────────────
-                m = _RE_REVERSAL_OVERRIDE.search(line)
-                if m:
-                    reversal_count += 1
-                    tags["REVERSAL_OVERRIDE"] += 1
-                    blocked["REVERSAL_OVERRIDE"] = blocked.get("REVERSAL_OVERRIDE", 0)  # ensure key exists
-                    continue
-
-                # ── [ENTRY ALLOWED][ST_SLOPE_OVERRIDE] ───────────────────
-                m = _RE_ST_SLOPE_OVERRIDE.search(line)
-                if m:
-                    slope_override_count += 1
-                    tags["ST_SLOPE_OVERRIDE"] += 1
-                    continue
-
-                # ── [ENTRY ALLOWED][ST_BIAS_OK] ... osc_context=ZoneX ─────
-                m = _RE_ENTRY_ALLOWED_ZONE.search(line)
-                if m:
-                    zone = m.group("zone")
-                    zone_entry_counts[zone] = zone_entry_counts.get(zone, 0) + 1
-                    continue
-
-                # ── [OSC_OVERRIDE][TREND_CONFIRMED] ──────────────────────
-                m = _RE_OSC_TREND_OVERRIDE.search(line)
-                if m:
-                    osc_overrides += 1
-                    tags["OSC_OVERRIDE"] = tags.get("OSC_OVERRIDE", 0) + 1
-                    continue
-
-                # ── [OSC_RELIEF][S4/R4_BREAK] ────────────────────────────
-                m = _RE_OSC_RELIEF.search(line)
-                if m:
-                    osc_relief_count += 1
-                    tags["OSC_RELIEF"] = tags.get("OSC_RELIEF", 0) + 1
-                    continue
-
-                # ── [TREND_LOSS] ──────────────────────────────────────────
-                if "[TREND_LOSS]" in line:
-                    trend_loss_count += 1
-                    continue
-
-                # ── [CONTRACT_ROLL] ───────────────────────────────────────
-                m = _RE_CONTRACT_ROLL.search(line)
-                if m:
-                    expiry_roll_count += 1
-                    tags["CONTRACT_ROLL"] = tags.get("CONTRACT_ROLL", 0) + 1
-                    continue
-
-                # ── [CONTRACT_METADATA][LOT_MISMATCH] ─────────────────────
-                m = _RE_LOT_MISMATCH.search(line)
-                if m:
-                    lot_size_mismatch_count += 1
-                    tags["LOT_MISMATCH"] = tags.get("LOT_MISMATCH", 0) + 1
-                    continue
-
-                # ── [CONTRACT_FILTER] ... SKIPPED ─────────────────────────
-                m = _RE_CONTRACT_FILTER_SKIP.search(line)
-                if m:
-                    intrinsic_filter_count += 1
-                    tags["INTRINSIC_FILTER"] = tags.get("INTRINSIC_FILTER", 0) + 1
-                    continue
-
-                # ── [EXPIRY_ROLL][SCORE_BONUS] ────────────────────────────
-                m = _RE_EXPIRY_ROLL_BONUS.search(line)
-                if m:
-                    tags["EXPIRY_ROLL_BONUS"] = tags.get("EXPIRY_ROLL_BONUS", 0) + 1
-                    continue
-
-                # ── [LOT_SIZE] ────────────────────────────────────────────
-                m = _RE_LOT_SIZE.search(line)
-                if m:
-                    tags["LOT_SIZE"] = tags.get("LOT_SIZE", 0) + 1
-                    continue
-
-                # ── [CONFIG] DEFAULT_LOT_SIZE ─────────────────────────────
-                if "[CONFIG] DEFAULT_LOT_SIZE" in line:
-                    tags["CONFIG_LOT_SIZE"] = tags.get("CONFIG_LOT_SIZE", 0) + 1
-                    continue
-
-                # ── [VIX_CONTEXT] ─────────────────────────────────────────
-                m = _RE_VIX_CONTEXT.search(line)
-                if m:
-                    vix_tier_count += 1
-                    tags["VIX_CONTEXT"] = tags.get("VIX_CONTEXT", 0) + 1
-                    continue
-
-                # ── [GREEKS] ──────────────────────────────────────────────
-                m = _RE_GREEKS.search(line)
-                if m:
-                    greeks_usage_count += 1
-                    tags["GREEKS"] = tags.get("GREEKS", 0) + 1
-                    continue
-
-                # ── [VOL_CONTEXT][SCORE_ADJUST] ───────────────────────────
-                m = _RE_VOL_CONTEXT_ADJUST.search(line)
-                if m:
-                    tags["VOL_CONTEXT_ADJUST"] = tags.get("VOL_CONTEXT_ADJUST", 0) + 1
-                    _ta = m.group("theta_adj")
-                    if _ta is not None and int(_ta) < 0:
-                        theta_penalty_count += 1
-                    continue
-
-                # ── [POSITION_SIZE] (vol-adjusted) ────────────────────────
-                m = _RE_POSITION_SIZE_VOL.search(line)
-                if m:
-                    tags["POSITION_SIZE"] = tags.get("POSITION_SIZE", 0) + 1
-                    _vh = m.group("vega_high")
-                    if _vh is not None and _vh.lower() == "true":
-                        vega_penalty_count += 1
-                    continue
-
-                # ── [VOL_CONTEXT][ALIGN] ──────────────────────────────────
-                m = _RE_VOL_CONTEXT_ALIGN.search(line)
-                if m:
-                    vol_context_align_count += 1
-                    continue
-
-                # ── [GREEKS_ALIGN] ────────────────────────────────────────
-                m = _RE_GREEKS_ALIGN.search(line)
-                if m:
-                    greeks_align_count += 1
-                    continue
-
-                # ── [SCORE_MATRIX] ────────────────────────────────────────
-                m = _RE_SCORE_MATRIX.search(line)
-                if m:
-                    score_matrix_usage_count += 1
-                    continue
-
-                # ── [ENTRY BLOCKED][OSC_EXTREME] ──────────────────────────
-                # Tracked via blocked_counts; also mirror into osc_blocks
-                if "[ENTRY BLOCKED][OSC_EXTREME]" in line:
-                    osc_blocks += 1
-                    # Fall through to _RE_ENTRY_BLOCKED which handles it too
-
-                # ── [REGIME_CONTEXT] per-bar regime snapshot (Phase 5) ─────
-                m = _RE_REGIME_CONTEXT.search(line)
-                if m:
-                    regime_context_count += 1
-                    _ar = m.group("atr_regime")
-                    _at = m.group("adx_tier")
-                    _dt = m.group("day_type")
-                    _cw = m.group("cpr_width")
-                    if _ar:
-                        _last_regime["atr_regime"] = _ar.upper()
-                    if _at:
-                        _last_regime["adx_tier"] = _at.upper()
-                    if _dt:
-                        _last_regime["day_type"] = _dt.upper()
-                    if _cw:
-                        _last_regime["cpr_width"] = _cw.upper()
-                    tags["REGIME_CONTEXT"] = tags.get("REGIME_CONTEXT", 0) + 1
-                    continue
-
-                # ── [EXIT AUDIT][REGIME_ADAPTIVE] per-trade regime (Phase 5)
-                m = _RE_EXIT_AUDIT_REGIME.search(line)
-                if m:
-                    regime_adaptive_count += 1
-                    _dt = m.group("day_type")
-                    _at = m.group("adx_tier")
-                    _gt = m.group("gap_tag")
-                    if _dt:
-                        _last_regime["day_type"] = _dt.upper()
-                    if _at:
-                        _last_regime["adx_tier"] = _at.upper()
-                    tags["REGIME_ADAPTIVE"] = tags.get("REGIME_ADAPTIVE", 0) + 1
-                    continue
-
-                # ── Phase 6: Bias alignment & microstructure ────────────
-                m = _RE_BIAS_ALIGNMENT.search(line)
-                if m:
-                    bias_alignment_count += 1
-                    _last_bias_alignment = m.group("status").upper()
-                    tags["BIAS_ALIGNMENT"] = tags.get("BIAS_ALIGNMENT", 0) + 1
-                    continue
-
-                m = _RE_BAR_CLOSE_ALIGNMENT.search(line)
-                if m:
-                    bar_close_alignment_count += 1
-                    tags["BAR_CLOSE_ALIGNMENT"] = tags.get("BAR_CLOSE_ALIGNMENT", 0) + 1
-                    continue
-
-                if _RE_SLOPE_OVERRIDE_TIME.search(line):
-                    slope_override_time_count += 1
-                    tags["SLOPE_OVERRIDE_TIME"] = tags.get("SLOPE_OVERRIDE_TIME", 0) + 1
-                    continue
-
-                if _RE_CONFLICT_BLOCKED.search(line):
-                    conflict_blocked_count += 1
-                    tags["CONFLICT_BLOCKED"] = tags.get("CONFLICT_BLOCKED", 0) + 1
-                    continue
-
-                if _RE_PULSE_EXHAUSTION.search(line):
-                    pulse_exhaustion_count += 1
-                    tags["PULSE_EXHAUSTION"] = tags.get("PULSE_EXHAUSTION", 0) + 1
-                    continue
-
-                if _RE_ZONE_ABSORPTION.search(line):
-                    zone_absorption_count += 1
-                    tags["ZONE_ABSORPTION"] = tags.get("ZONE_ABSORPTION", 0) + 1
-                    continue
-
-                if _RE_SPREAD_NOISE.search(line):
-                    spread_noise_count += 1
-                    tags["SPREAD_NOISE"] = tags.get("SPREAD_NOISE", 0) + 1
-                    continue
-
-                # ── Phase 6.1: Tilt-based governance ─────────────────────
-                m = _RE_TILT_STATE.search(line)
-                if m:
-                    tilt_state_count += 1
-                    _last_tilt_state = m.group("tilt").upper()
-                    tags["TILT_STATE"] = tags.get("TILT_STATE", 0) + 1
-                    continue
-
-                if _RE_GOVERNANCE_EASY.search(line):
-                    governance_easy_count += 1
-                    tags["GOVERNANCE_EASY"] = tags.get("GOVERNANCE_EASY", 0) + 1
-                    # Phase 6.1.2: sub-count for bias misalignment bypass
-                    if _RE_TILT_BIAS_OVERRIDE.search(line):
-                        tilt_bias_override_count += 1
-                        tags["TILT_BIAS_OVERRIDE"] = tags.get("TILT_BIAS_OVERRIDE", 0) + 1
-                    continue
-
-                if _RE_GOVERNANCE_STRICT.search(line):
-                    governance_strict_count += 1
-                    tags["GOVERNANCE_STRICT"] = tags.get("GOVERNANCE_STRICT", 0) + 1
-                    continue
-
-                # ── Phase 6.2: Trend continuation ───────────────────────
-                m = _RE_TREND_CONT_ACTIVATED.search(line)
-                if m:
-                    trend_cont_activations += 1
-                    trend_cont_side = m.group("side")
-                    tags["TREND_CONTINUATION"] = tags.get("TREND_CONTINUATION", 0) + 1
-                    continue
-                m = _RE_TREND_CONT_ENTRY.search(line)
-                if m:
-                    trend_cont_entries += 1
-                    tags["TREND_CONTINUATION"] = tags.get("TREND_CONTINUATION", 0) + 1
+            self._scan_lines(st, fh, events=events_path is not None)
+        if events_path is not None:
+            events = list(read_events(events_path))
+            if self._events_stale(st, events):
+                logging.warning(f"[LOG PARSER] {events_path.name} trails {self.log_path.name}; "
+                                f"using the text tags")
+                st = _ScanState()
+                with self.log_path.open(encoding="utf-8", errors="replace") as fh:
+                    self._scan_lines(st, fh)
+            else:
+                self._apply_events(st, events)
+        return self._finalize(st)
+
+    def _events_stale(self, st: "_ScanState", events: List[dict]) -> bool:
+        """True when the log has event-described lines newer than the sidecar."""
+        line_ts = self._log_ts(st.last_event_line)
+        if not line_ts:
+            return False
+        last_ts = max((ev["ts"] for ev in events if ev.get("ts")), default=None)
+        if last_ts is None:
+            return True
+        # asctime and the event's time.time() can straddle a second boundary
+        return last_ts + 1.0 < time.mktime(time.strptime(line_ts, "%Y-%m-%d %H:%M:%S"))
+
+    def _bound_dispatch(self, events: bool = False) -> Dict[str, tuple]:
+        cache = getattr(self, "_dispatch", None)
+        if cache is None:
+            cache = self._dispatch = {}
+        dispatch = cache.get(events)
+        if dispatch is None:
+            dispatch = cache[events] = {
+                tag: tuple(getattr(self, name) for name in names)
+                for tag, names in (_EVENT_DISPATCH if events else _DISPATCH).items()
+            }
+        return dispatch
+
+    def _scan_lines(self, st: "_ScanState", lines, events: bool = False) -> None:
+        """Route each line to the handlers registered for its leading tag."""
+        get = self._bound_dispatch(events).get
+        for line in lines:
+            if "\x1b" in line:
+                line = _strip(line)
+            start = line.find("[")
+            if start < 0:
+                continue
+            end = line.find("]", start + 1)
+            if end < 0:
+                continue
+            tag = line[start + 1:end]
+            if events and tag in _EVENT_TAGS:
+                st.last_event_line = line
+            handlers = get(tag)
+            if handlers is None:
+                eq = tag.find("=")                  # [TILT_STATE=...]
+                if eq < 0:
                     continue
-                if _RE_TREND_CONT_DEACTIVATED.search(line):
-                    trend_cont_deactivations += 1
+                handlers = get(tag[:eq])
+                if handlers is None:
                     continue
+            for handler in handlers:
+                if handler(st, line, tag):
+                    break
+
+    # ── line handlers (return True when the line is consumed) ────────────────
+
+    def _on_trade_open_struct(self, st: "_ScanState", line: str, tag: str) -> bool:
+        # [TRADE OPEN][STRUCT] — structured format, exact option_name key
+        m = _RE_TRADE_OPEN_STRUCT.search(line)
+        if not m:
+            return False
+        d = m.groupdict()
+        log_ts = self._log_ts(line)
+        _oba = re.search(r"open_bias_aligned=(ALIGNED|MISALIGNED|NEUTRAL)", line)
+        _fb = re.search(r"\bfb=(0|1)\b", line)
+        _ema = re.search(r"\bema_stretch=(0|1)\b", line)
+        _zr = re.search(r"\bzone_revisit=(0|1)\b", line)
+        _zt = re.search(r"\bzone_type=([A-Z_]+)\b", line)
+        _za = re.search(r"\bzone_action=([A-Z_]+)\b", line)
+        _zage = re.search(r"\bzone_age=(\d+)\b", line)
+        st.open_queue_struct[d["option_name"]] = {
+            "side":        d["side"].upper(),
+            "bar_ts":      d["bar_ts"],
+            "log_ts":      log_ts,
+            "entry_prem":  float(d["entry"]),
+            "lot":         int(d["lots"]),
+            "option_name": d["option_name"],
+            "open_bias_aligned": _oba.group(1).upper() if _oba else "NEUTRAL",
+            "failed_breakout": bool(int(_fb.group(1))) if _fb else False,
+            "ema_stretch": bool(int(_ema.group(1))) if _ema else False,
+            "zone_revisit": bool(int(_zr.group(1))) if _zr else False,
+            "zone_revisit_type": _zt.group(1).upper() if _zt else "NONE",
+            "zone_revisit_action": _za.group(1).upper() if _za else "NONE",
+            "zone_age_bars": int(_zage.group(1)) if _zage else 0,
+            # Phase 5: regime at entry (snapshot of last-seen context)
+            "regime_at_entry": dict(st.last_regime),
+            # Phase 6: bias alignment at entry
+            "bias_alignment": st.last_bias_alignment,
+            "tilt_state": st.last_tilt_state,
+        }
+        return True
+
+    def _on_trade_exit_struct(self, st: "_ScanState", line: str, tag: str) -> bool:
+        # [TRADE EXIT][STRUCT] — structured format, matched by option_name
+        m = _RE_TRADE_EXIT_STRUCT.search(line)
+        if not m:
+            return False
+        d = m.groupdict()
+        exit_rec = {
+            "exit_bar_ts": d["bar_ts"],
+            "log_ts":      self._log_ts(line),
+            "option_name": d["option_name"],
+            "exit_prem":   float(d["exit_prem"]),
+            "pnl_pts":     float(d["pnl_pts"]),
+            "pnl_rs":      float(d["pnl_rs"]),
+            "bars_held":   int(d["bars_held"]),
+            "exit_reason": d["exit_reason"].upper(),
+        }
+        matched_open = st.open_queue_struct.pop(d["option_name"], None)
+        st.trades_struct.append({**matched_open, **exit_rec} if matched_open else exit_rec)
+        return True
+
+    def _on_exit_rich(self, st: "_ScanState", line: str, tag: str) -> bool:
+        # [EXIT][PAPER/LIVE ...] — rich self-contained record
+        m = _RE_EXIT_RICH.search(line)
+        if not m:
+            return False
+        d = m.groupdict()
+        log_ts = self._log_ts(line)
+        _mode = d.get("session_mode", "PAPER").upper()
+        st.session_types.add(_mode)
+        st.rich_exit_trades.append({
+            "session_type": _mode,
+            "side":         d["side"].upper(),
+            "bar_ts":       log_ts,
+            "log_ts":       log_ts,
+            "option_name":  d["option_name"],
+            "entry_prem":   float(d["entry_prem"]),
+            "exit_prem":    float(d["exit_prem"]),
+            "lot":          int(d["qty"]),
+            "pnl_pts":      float(d["pnl_pts"]),
+            "pnl_rs":       float(d["pnl_rs"]),
+            "bars_held":    int(d["bars_held"]),
+            "exit_reason":  d["exit_reason"].upper(),
+            "regime_at_entry": dict(st.last_regime),
+            "bias_alignment": st.last_bias_alignment,
+            "tilt_state": st.last_tilt_state,
+        })
+        return True
+
+    def _on_trade_open(self, st: "_ScanState", line: str, tag: str) -> bool:
+        m = _RE_TRADE_OPEN.search(line)
+        if not m:
+            return False
+        d = m.groupdict()
+        st.open_queue.append({
+            "session_type": d["session_type"].upper(),
+            "side":         d["side"].upper(),
+            "bar":          int(d["bar"]),
+            "bar_ts":       d["bar_ts"],
+            "log_ts":       self._log_ts(line),
+            "underlying":   float(d["underlying"]),
+            "entry_prem":   float(d["premium"]),
+            "score":        int(d["score"]),
+            "src":          d.get("src") or "",
+            "pivot":        d.get("pivot") or "",
+            "cpr":          d.get("cpr") or "",
+            "day_type":     d.get("day") or "",
+            "lot":          int(d["lot"]) if d.get("lot") else 0,
+            "option_name":  d.get("option_name") or "",
+            "regime_at_entry": dict(st.last_regime),
+            "bias_alignment": st.last_bias_alignment,
+            "tilt_state": st.last_tilt_state,
+        })
+        st.session_types.add(d["session_type"].upper())
+        return True
+
+    def _on_trade_exit(self, st: "_ScanState", line: str, tag: str) -> bool:
+        m = _RE_TRADE_EXIT.search(line)
+        if not m:
+            return False
+        d = m.groupdict()
+        # exit_reason: prefer the bracket tag (ST_FLIP_2 etc.),
+        # fall back to WIN/LOSS outcome string
+        reason = (d.get("exit_reason") or "").upper() or d["outcome"].upper()
+        exit_rec = {
+            "outcome":     d["outcome"].upper(),
+            "side":        d["side"].upper(),
+            "exit_bar":    int(d["bar"]),
+            "exit_bar_ts": d["bar_ts"],
+            "log_ts":      self._log_ts(line),
+            "exit_prem":   float(d["exit_prem"]),
+            "entry_prem":  float(d["entry_prem"]),
+            "pnl_pts":     float(d["pnl_pts"]),
+            "pnl_rs":      float(d["pnl_rs"]),
+            "peak":        float(d["peak"]),
+            "bars_held":   int(d["bars_held"]),
+            "exit_reason": reason,
+        }
+        # Merge with matching open record (FIFO on same side)
+        matched_open = self._pop_open(st.open_queue, d["side"].upper())
+        st.trades.append({**matched_open, **exit_rec} if matched_open else exit_rec)
+        return True
+
+    def _on_entry_blocked(self, st: "_ScanState", line: str, tag: str) -> bool:
+        m = _RE_ENTRY_BLOCKED.search(line)
+        if not m:
+            return False
+        _subtype = m.group("subtype").upper()
+        st.blocked[_subtype] += 1
+        if _subtype == "OSC_EXTREME":
+            st.osc_blocks += 1
+        return True
+
+    def _on_slope_conflict_3m(self, st: "_ScanState", line: str, tag: str) -> bool:
+        # [SLOPE_CONFLICT][3m] (P6 renamed tag)
+        if not _RE_SLOPE_CONFLICT_3M.search(line):
+            return False
+        st.blocked["ST_SLOPE_CONFLICT"] += 1
+        return True
+
+    def _on_entry_ok(self, st: "_ScanState", line: str, tag: str) -> bool:
+        if not _RE_ENTRY_OK.search(line):
+            return False
+        st.entry_ok_count += 1
+        # Phase 6: [BAR_CLOSE_ALIGNMENT] may appear inside [ENTRY OK] line
+        if _RE_BAR_CLOSE_ALIGNMENT.search(line):
+            st.bar_close_alignment_count += 1
+            st.tags["BAR_CLOSE_ALIGNMENT"] += 1
+        return True
+
+    def _on_signal_fired(self, st: "_ScanState", line: str, tag: str) -> bool:
+        if not _RE_SIGNAL_FIRED.search(line):
+            return False
+        st.signals_fired += 1
+        return True
+
+    def _on_open_position(self, st: "_ScanState", line: str, tag: str) -> bool:
+        # [OPEN_POSITION] (P5-A) — extract bias tag before generic check
+        m = _RE_OPEN_POSITION.search(line)
+        if not m:
+            return False
+        st.open_bias_tag = m.group("open_bias_tag").upper()
+        st.tags["OPEN_POSITION"] += 1
+        return True
+
+    def _on_open_vs_close(self, st: "_ScanState", line: str, tag: str) -> bool:
+        # [OPEN_ABOVE/BELOW_CLOSE / OPEN_CLOSE_EQUAL] (P5-B)
+        m = _RE_OPEN_VS_CLOSE.search(line)
+        if not m:
+            return False
+        st.vs_close_tag = m.group("vs_close_tag").upper()
+        st.tags[st.vs_close_tag] += 1
+        return True
+
+    def _on_gap(self, st: "_ScanState", line: str, tag: str) -> bool:
+        # [GAP_UP / GAP_DOWN / NO_GAP] (P5-C)
+        m = _RE_GAP.search(line)
+        if not m:
+            return False
+        st.gap_tag = m.group("gap_tag").upper()
+        st.tags[st.gap_tag] += 1
+        return True
+
+    def _on_balance_open(self, st: "_ScanState", line: str, tag: str) -> bool:
+        # [BALANCE_OPEN / OUTSIDE_BALANCE] (P5-D)
+        m = _RE_BALANCE_OPEN.search(line)
+        if not m:
+            return False
+        st.balance_tag = m.group("balance_tag").upper()
+        st.tags[st.balance_tag] += 1
+        return True
+
+    def _on_day_type_opening(self, st: "_ScanState", line: str, tag: str) -> bool:
+        m = _RE_DAY_TYPE_OPENING.search(line)
+        if not m:
+            return False
+        _gap = m.group("gap_tag").upper()
+        st.gap_tag = _gap if _gap in {"GAP_UP", "GAP_DOWN"} else "NO_GAP"
+        if st.day_type_tag in {"NEUTRAL_DAY", "UNKNOWN"}:
+            st.day_type_tag = "GAP_DAY" if _gap in {"GAP_UP", "GAP_DOWN"} else "NEUTRAL_DAY"
+        st.tags["DAY_TYPE"] += 1
+        return True
+
+    def _on_day_type(self, st: "_ScanState", line: str, tag: str) -> bool:
+        m = _RE_DAY_TYPE.search(line)
+        if not m:
+            return False
+        st.day_type_tag = m.group("day_type_tag").upper()
+        _cw = m.group("cpr_width_tag")
+        if _cw:
+            st.cpr_width_tag = _cw.upper()
+        st.tags["DAY_TYPE"] += 1
+        return True
+
+    def _on_day_type_dtc(self, st: "_ScanState", line: str, tag: str) -> bool:
+        # Replay DTC locked format: [DAY TYPE] TRENDING confidence=HIGH ...
+        m = _RE_DAY_TYPE_DTC.search(line)
+        if not m:
+            return False
+        _dtc_name = m.group("dtc_name").upper()
+        if _dtc_name != "UNKNOWN":
+            st.day_type_tag = _dtc_name + "_DAY"
+        st.tags["DAY_TYPE"] += 1
+        return True
+
+    def _on_reversal_signal(self, st: "_ScanState", line: str, tag: str) -> bool:
+        if not _RE_REVERSAL_SIGNAL.search(line):
+            return False
+        st.reversal_signal_count += 1
+        st.tags["REVERSAL_SIGNAL"] += 1
+        return True
+
+    def _on_reversal_override(self, st: "_ScanState", line: str, tag: str) -> bool:
+        if not _RE_REVERSAL_OVERRIDE.search(line):
+            return False
+        st.reversal_count += 1
+        st.tags["REVERSAL_OVERRIDE"] += 1
+        st.blocked["REVERSAL_OVERRIDE"] = st.blocked.get("REVERSAL_OVERRIDE", 0)  # ensure key exists
+        return True
+
+    def _on_st_slope_override(self, st: "_ScanState", line: str, tag: str) -> bool:
+        # [ENTRY ALLOWED][ST_SLOPE_OVERRIDE]
+        if not _RE_ST_SLOPE_OVERRIDE.search(line):
+            return False
+        st.slope_override_count += 1
+        st.tags["ST_SLOPE_OVERRIDE"] += 1
+        return True
+
+    def _on_entry_allowed_zone(self, st: "_ScanState", line: str, tag: str) -> bool:
+        # [ENTRY ALLOWED][ST_BIAS_OK] ... osc_context=ZoneX
+        m = _RE_ENTRY_ALLOWED_ZONE.search(line)
+        if not m:
+            return False
+        st.zone_entry_counts[m.group("zone")] += 1
+        return True
+
+    def _on_osc_trend_override(self, st: "_ScanState", line: str, tag: str) -> bool:
+        if not _RE_OSC_TREND_OVERRIDE.search(line):
+            return False
+        st.osc_overrides += 1
+        st.tags["OSC_OVERRIDE"] += 1
+        return True
+
+    def _on_osc_relief(self, st: "_ScanState", line: str, tag: str) -> bool:
+        if not _RE_OSC_RELIEF.search(line):
+            return False
+        st.osc_relief_count += 1
+        st.tags["OSC_RELIEF"] += 1
+        return True
+
+    def _on_trend_loss(self, st: "_ScanState", line: str, tag: str) -> bool:
+        st.trend_loss_count += 1
+        return True
+
+    def _on_contract_roll(self, st: "_ScanState", line: str, tag: str) -> bool:
+        st.expiry_roll_count += 1
+        st.tags["CONTRACT_ROLL"] += 1
+        return True
+
+    def _on_lot_mismatch(self, st: "_ScanState", line: str, tag: str) -> bool:
+        if not _RE_LOT_MISMATCH.search(line):
+            return False
+        st.lot_size_mismatch_count += 1
+        st.tags["LOT_MISMATCH"] += 1
+        return True
+
+    def _on_contract_filter_skip(self, st: "_ScanState", line: str, tag: str) -> bool:
+        if not _RE_CONTRACT_FILTER_SKIP.search(line):
+            return False
+        st.intrinsic_filter_count += 1
+        st.tags["INTRINSIC_FILTER"] += 1
+        return True
+
+    def _on_expiry_roll_bonus(self, st: "_ScanState", line: str, tag: str) -> bool:
+        if not _RE_EXPIRY_ROLL_BONUS.search(line):
+            return False
+        st.tags["EXPIRY_ROLL_BONUS"] += 1
+        return True
+
+    def _on_lot_size(self, st: "_ScanState", line: str, tag: str) -> bool:
+        st.tags["LOT_SIZE"] += 1
+        return True
+
+    def _on_config_lot_size(self, st: "_ScanState", line: str, tag: str) -> bool:
+        if "[CONFIG] DEFAULT_LOT_SIZE" not in line:
+            return False
+        st.tags["CONFIG_LOT_SIZE"] += 1
+        return True
+
+    def _on_vix_context(self, st: "_ScanState", line: str, tag: str) -> bool:
+        st.vix_tier_count += 1
+        st.tags["VIX_CONTEXT"] += 1
+        return True
+
+    def _on_greeks(self, st: "_ScanState", line: str, tag: str) -> bool:
+        st.greeks_usage_count += 1
+        st.tags["GREEKS"] += 1
+        return True
+
+    def _on_vol_context_adjust(self, st: "_ScanState", line: str, tag: str) -> bool:
+        m = _RE_VOL_CONTEXT_ADJUST.search(line)
+        if not m:
+            return False
+        st.tags["VOL_CONTEXT_ADJUST"] += 1
+        _ta = m.group("theta_adj")
+        if _ta is not None and int(_ta) < 0:
+            st.theta_penalty_count += 1
+        return True
+
+    def _on_position_size(self, st: "_ScanState", line: str, tag: str) -> bool:
+        m = _RE_POSITION_SIZE_VOL.search(line)
+        st.tags["POSITION_SIZE"] += 1
+        _vh = m.group("vega_high")
+        if _vh is not None and _vh.lower() == "true":
+            st.vega_penalty_count += 1
+        return True
+
+    def _on_vol_context_align(self, st: "_ScanState", line: str, tag: str) -> bool:
+        if not _RE_VOL_CONTEXT_ALIGN.search(line):
+            return False
+        st.vol_context_align_count += 1
+        return True
+
+    def _on_greeks_align(self, st: "_ScanState", line: str, tag: str) -> bool:
+        st.greeks_align_count += 1
+        return True
+
+    def _on_score_matrix(self, st: "_ScanState", line: str, tag: str) -> bool:
+        st.score_matrix_usage_count += 1
+        return True
+
+    def _on_regime_context(self, st: "_ScanState", line: str, tag: str) -> bool:
+        # [REGIME_CONTEXT] per-bar regime snapshot (Phase 5)
+        m = _RE_REGIME_CONTEXT.search(line)
+        st.regime_context_count += 1
+        for key in ("atr_regime", "adx_tier", "day_type", "cpr_width"):
+            value = m.group(key)
+            if value:
+                st.last_regime[key] = value.upper()
+        st.tags["REGIME_CONTEXT"] += 1
+        return True
+
+    def _on_exit_audit_regime(self, st: "_ScanState", line: str, tag: str) -> bool:
+        # [EXIT AUDIT][REGIME_ADAPTIVE] per-trade regime (Phase 5)
+        m = _RE_EXIT_AUDIT_REGIME.search(line)
+        if not m:
+            return False
+        st.regime_adaptive_count += 1
+        _dt = m.group("day_type")
+        _at = m.group("adx_tier")
+        if _dt:
+            st.last_regime["day_type"] = _dt.upper()
+        if _at:
+            st.last_regime["adx_tier"] = _at.upper()
+        st.tags["REGIME_ADAPTIVE"] += 1
+        return True
+
+    def _on_bias_alignment(self, st: "_ScanState", line: str, tag: str) -> bool:
+        m = _RE_BIAS_ALIGNMENT.search(line)
+        if not m:
+            return False
+        st.bias_alignment_count += 1
+        st.last_bias_alignment = m.group("status").upper()
+        st.tags["BIAS_ALIGNMENT"] += 1
+        return True
+
+    def _on_bar_close_alignment(self, st: "_ScanState", line: str, tag: str) -> bool:
+        if not _RE_BAR_CLOSE_ALIGNMENT.search(line):
+            return False
+        st.bar_close_alignment_count += 1
+        st.tags["BAR_CLOSE_ALIGNMENT"] += 1
+        return True
+
+    def _on_slope_override_time(self, st: "_ScanState", line: str, tag: str) -> bool:
+        st.slope_override_time_count += 1
+        st.tags["SLOPE_OVERRIDE_TIME"] += 1
+        return True
+
+    def _on_conflict_blocked(self, st: "_ScanState", line: str, tag: str) -> bool:
+        st.conflict_blocked_count += 1
+        st.tags["CONFLICT_BLOCKED"] += 1
+        return True
+
+    def _on_pulse_exhaustion(self, st: "_ScanState", line: str, tag: str) -> bool:
+        st.pulse_exhaustion_count += 1
+        st.tags["PULSE_EXHAUSTION"] += 1
+        return True
+
+    def _on_zone_absorption(self, st: "_ScanState", line: str, tag: str) -> bool:
+        st.zone_absorption_count += 1
+        st.tags["ZONE_ABSORPTION"] += 1
+        return True
+
+    def _on_spread_noise(self, st: "_ScanState", line: str, tag: str) -> bool:
+        st.spread_noise_count += 1
+        st.tags["SPREAD_NOISE"] += 1
+        return True
+
+    def _on_tilt_state(self, st: "_ScanState", line: str, tag: str) -> bool:
+        # Phase 6.1: Tilt-based governance
+        m = _RE_TILT_STATE.search(line)
+        if not m:
+            return False
+        st.tilt_state_count += 1
+        st.last_tilt_state = m.group("tilt").upper()
+        st.tags["TILT_STATE"] += 1
+        return True
+
+    def _on_governance_easy(self, st: "_ScanState", line: str, tag: str) -> bool:
+        st.governance_easy_count += 1
+        st.tags["GOVERNANCE_EASY"] += 1
+        # Phase 6.1.2: sub-count for bias misalignment bypass
+        if _RE_TILT_BIAS_OVERRIDE.search(line):
+            st.tilt_bias_override_count += 1
+            st.tags["TILT_BIAS_OVERRIDE"] += 1
+        return True
+
+    def _on_governance_strict(self, st: "_ScanState", line: str, tag: str) -> bool:
+        st.governance_strict_count += 1
+        st.tags["GOVERNANCE_STRICT"] += 1
+        return True
+
+    def _on_trend_continuation(self, st: "_ScanState", line: str, tag: str) -> bool:
+        # Phase 6.2: Trend continuation
+        m = _RE_TREND_CONT_ACTIVATED.search(line)
+        if m:
+            st.trend_cont_activations += 1
+            st.trend_cont_side = m.group("side")
+            st.tags["TREND_CONTINUATION"] += 1
+            return True
+        if _RE_TREND_CONT_ENTRY.search(line):
+            st.trend_cont_entries += 1
+            st.tags["TREND_CONTINUATION"] += 1
+            return True
+        if _RE_TREND_CONT_DEACTIVATED.search(line):
+            st.trend_cont_deactivations += 1
+            return True
+        return False
+
+    def _on_p_tag(self, st: "_ScanState", line: str, tag: str) -> bool:
+        # P1–P5 tags — the leading tag is the leftmost bracket, so it is
+        # what _RE_TAG_ANY would find first when it is itself a P tag.
+        if tag in _P_TAG_SET:
+            st.tags[tag] += 1
+            return True
+        m = _RE_TAG_ANY.search(line)
+        if not m:
+            return False
+        st.tags[m.group(1)] += 1
+        return True
+
+    def _on_exit_audit(self, st: "_ScanState", line: str, tag: str) -> bool:
+        # [EXIT AUDIT] (legacy)
+        m = _RE_EXIT_AUDIT.search(line)
+        if not m:
+            return False
+        d = m.groupdict()
+        st.audit_records.append({
+            "side":        (d.get("option_type") or "").upper(),
+            "exit_reason": d.get("reason") or "",
+            "bars_held":   int(d["bars_held"]) if d.get("bars_held") not in (None, "") else -1,
+            "pnl_pts":     float(d["premium_move"]) if d.get("premium_move") not in (None, "") else 0.0,
+            "pnl_rs":      0.0,
+        })
+        return True
+
+    # ── end of scan ──────────────────────────────────────────────────────────
+
+    # ── events sidecar (replaces the _EVENT_HANDLERS regex handlers) ─────────
+
+    def _apply_events(self, st: "_ScanState", events: Iterable[dict]) -> None:
+        """Fold sidecar events into ``st`` in emission order.
+
+        Trade attribution uses the context the events themselves carry: the
+        last REGIME_CONTEXT / REGIME_ADAPTIVE regime, and the bias alignment
+        and tilt state of the last SIGNAL FIRED (or of the trade_open event
+        when the signal dict carried them).
+        """
+        st.last_bias_alignment = "NEUTRAL"
+        st.last_tilt_state = "NEUTRAL"
+        apply = {
+            "trade_open":     self._ev_trade_open,
+            "trade_exit":     self._ev_trade_exit,
+            "exit":           self._ev_exit,
+            "entry_blocked":  self._ev_entry_blocked,
+            "entry_ok":       self._ev_entry_ok,
+            "signal_fired":   self._ev_signal_fired,
+            "regime_context": self._ev_regime_context,
+            "exit_regime":    self._ev_exit_regime,
+            "exit_audit":     self._ev_exit_audit,
+        }
+        for ev in events:
+            handler = apply.get(ev.get("t"))
+            if handler is not None:
+                try:
+                    handler(st, ev)
+                except (KeyError, TypeError, ValueError):
+                    continue                        # malformed event — skip
 
-                # ── P1–P5 tags ────────────────────────────────────────────
-                m = _RE_TAG_ANY.search(line)
-                if m:
-                    tags[m.group(1)] += 1
-                    continue
+    @staticmethod
+    def _event_log_ts(ev: dict) -> str:
+        ts = ev.get("ts")
+        return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts)) if ts else ""
+
+    def _ev_trade_open(self, st: "_ScanState", ev: dict) -> None:
+        st.open_queue_struct[ev["option_name"]] = {
+            "side":        str(ev["side"]).upper(),
+            "bar_ts":      ev["time"],
+            "log_ts":      self._event_log_ts(ev),
+            "entry_prem":  float(ev["entry"]),
+            "lot":         int(ev["lots"]),
+            "option_name": ev["option_name"],
+            "open_bias_aligned": str(ev.get("open_bias_aligned") or "NEUTRAL").upper(),
+            "failed_breakout": bool(ev.get("fb", False)),
+            "ema_stretch": bool(ev.get("ema_stretch", False)),
+            "zone_revisit": bool(ev.get("zone_revisit", False)),
+            "zone_revisit_type": str(ev.get("zone_type") or "NONE").upper(),
+            "zone_revisit_action": str(ev.get("zone_action") or "NONE").upper(),
+            "zone_age_bars": int(ev.get("zone_age") or 0),
+            "regime_at_entry": dict(st.last_regime),
+            "bias_alignment": str(ev.get("bias_alignment") or st.last_bias_alignment).upper(),
+            "tilt_state": str(ev.get("tilt_state") or st.last_tilt_state).upper(),
+        }
 
-                # ── [EXIT AUDIT] (legacy) ─────────────────────────────────
-                m = _RE_EXIT_AUDIT.search(line)
-                if m:
-                    d = m.groupdict()
-                    audit_records.append({
-                        "side":        (d.get("option_type") or "").upper(),
-                        "exit_reason": d.get("reason") or "",
-                        "bars_held":   int(d["bars_held"]) if d.get("bars_held") not in (None, "") else -1,
-                        "pnl_pts":     float(d["premium_move"]) if d.get("premium_move") not in (None, "") else 0.0,
-                        "pnl_rs":      0.0,
-                    })
+    def _ev_trade_exit(self, st: "_ScanState", ev: dict) -> None:
+        exit_rec = {
+            "exit_bar_ts": ev["time"],
+            "log_ts":      self._event_log_ts(ev),
+            "option_name": ev["option_name"],
+            "exit_prem":   float(ev["exit"]),
+            "pnl_pts":     float(ev["pnl_pts"]),
+            "pnl_rs":      float(ev["pnl_rs"]),
+            "bars_held":   int(ev["bars"]),
+            "exit_reason": str(ev["reason"]).upper(),
+        }
+        matched_open = st.open_queue_struct.pop(ev["option_name"], None)
+        st.trades_struct.append({**matched_open, **exit_rec} if matched_open else exit_rec)
+
+    def _ev_exit(self, st: "_ScanState", ev: dict) -> None:
+        mode = str(ev.get("mode", "PAPER")).upper()
+        if mode not in ("PAPER", "LIVE"):
+            return
+        log_ts = self._event_log_ts(ev)
+        st.session_types.add(mode)
+        st.rich_exit_trades.append({
+            "session_type": mode,
+            "side":         str(ev["side"]).upper(),
+            "bar_ts":       log_ts,
+            "log_ts":       log_ts,
+            "option_name":  ev["option_name"],
+            "entry_prem":   float(ev["entry"]),
+            "exit_prem":    float(ev["exit"]),
+            "lot":          int(ev["qty"]),
+            "pnl_pts":      float(ev["pnl_pts"]),
+            "pnl_rs":       float(ev["pnl_rs"]),
+            "bars_held":    int(ev["bars_held"]),
+            "exit_reason":  str(ev["reason"]).upper(),
+            "regime_at_entry": dict(st.last_regime),
+            "bias_alignment": st.last_bias_alignment,
+            "tilt_state": st.last_tilt_state,
+        })
+
+    def _ev_entry_blocked(self, st: "_ScanState", ev: dict) -> None:
+        subtype = str(ev["subtype"]).upper()
+        st.blocked[subtype] += 1
+        if subtype == "OSC_EXTREME":
+            st.osc_blocks += 1
+
+    def _ev_entry_ok(self, st: "_ScanState", ev: dict) -> None:
+        st.entry_ok_count += 1
+
+    def _ev_signal_fired(self, st: "_ScanState", ev: dict) -> None:
+        st.signals_fired += 1
+        if ev.get("bias_alignment"):
+            st.last_bias_alignment = str(ev["bias_alignment"]).upper()
+        if ev.get("tilt_state"):
+            st.last_tilt_state = str(ev["tilt_state"]).upper()
+
+    def _ev_regime_context(self, st: "_ScanState", ev: dict) -> None:
+        st.regime_context_count += 1
+        for key in ("atr_regime", "adx_tier", "day_type", "cpr_width"):
+            value = ev.get(key)
+            if value:
+                st.last_regime[key] = str(value).upper()
+        st.tags["REGIME_CONTEXT"] += 1
+
+    def _ev_exit_regime(self, st: "_ScanState", ev: dict) -> None:
+        st.regime_adaptive_count += 1
+        if ev.get("day_type"):
+            st.last_regime["day_type"] = str(ev["day_type"]).upper()
+        if ev.get("adx_tier"):
+            st.last_regime["adx_tier"] = str(ev["adx_tier"]).upper()
+        st.tags["REGIME_ADAPTIVE"] += 1
+
+    def _ev_exit_audit(self, st: "_ScanState", ev: dict) -> None:
+        side = str(ev.get("option_type") or "").upper()
+        reason = str(ev.get("reason") or "").split()
+        if side not in ("CALL", "PUT") or not reason:
+            return
+        bars_held = ev.get("bars_held")
+        premium_move = ev.get("premium_move")
+        st.audit_records.append({
+            "side":        side,
+            "exit_reason": reason[0],
+            "bars_held":   int(bars_held) if bars_held is not None else -1,
+            "pnl_pts":     float(premium_move) if premium_move is not None else 0.0,
+            "pnl_rs":      0.0,
+        })
+
+    def _finalize(self, st: "_ScanState", copy_trades: bool = False):
+        """Pick the effective trade list and build the ``_scan_file`` tuple.
+
+        ``copy_trades`` leaves the state's trade dicts untouched (the
+        open-bias annotation below depends on tags that a still-growing log
+        may change later).
+        """
+        open_bias_tag, gap_tag = st.open_bias_tag, st.gap_tag
+        regime_breakdown: Dict[str, Dict[str, list]] = {
+            "day_type": defaultdict(list), "adx_tier": defaultdict(list),
+            "atr_regime": defaultdict(list), "cpr_width": defaultdict(list),
+        }
 
         # Select best trade list: struct > rich_exit > V1 pairs > EXIT AUDIT fallback
         # struct:      new PositionManager format (option_name-keyed open+exit pair)
         # rich_exit:   [EXIT][PAPER/LIVE ...] self-contained records (entry+exit+pnl all in one line)
         # trades:      legacy [TRADE OPEN][MODE]/[TRADE EXIT] pairs
         # audit_records: EXIT AUDIT only (no entry data, pnl only when premium_move present)
-        if trades_struct:
-            effective_trades = trades_struct
-        elif rich_exit_trades:
-            effective_trades = rich_exit_trades
-        elif trades:
-            effective_trades = trades
-        elif audit_records:
-            effective_trades = audit_records
+        if st.trades_struct:
+            effective_trades = st.trades_struct
+        elif st.rich_exit_trades:
+            effective_trades = st.rich_exit_trades
+        elif st.trades:
+            effective_trades = st.trades
+        elif st.audit_records:
+            effective_trades = st.audit_records
         else:
             effective_trades = []
+        if copy_trades:
+            effective_trades = [dict(t) for t in effective_trades]
 
         # P5-F: annotate every trade with open_bias_aligned (extended P5-E logic)
         for trade in effective_trades:
@@ -1542,26 +1934,28 @@ class LogParser:
                 _label = _regime.get(dim, "UNKNOWN")
                 regime_breakdown[dim][_label].append(_pnl)
 
-        return (effective_trades, session_types, blocked, tags, signals_fired, entry_ok_count,
-                open_bias_tag, vs_close_tag, gap_tag, balance_tag,
-                day_type_tag, cpr_width_tag, reversal_count, slope_override_count,
-                osc_blocks, osc_overrides, osc_relief_count, trend_loss_count,
-                expiry_roll_count, lot_size_mismatch_count, intrinsic_filter_count,
-                vix_tier_count, greeks_usage_count, theta_penalty_count, vega_penalty_count,
-                vol_context_align_count, greeks_align_count, score_matrix_usage_count,
-                reversal_signal_count, dict(zone_entry_counts),
-                regime_context_count, regime_adaptive_count,
+        return (effective_trades, set(st.session_types), st.blocked, st.tags,
+                st.signals_fired, st.entry_ok_count,
+                open_bias_tag, st.vs_close_tag, gap_tag, st.balance_tag,
+                st.day_type_tag, st.cpr_width_tag, st.reversal_count, st.slope_override_count,
+                st.osc_blocks, st.osc_overrides, st.osc_relief_count, st.trend_loss_count,
+                st.expiry_roll_count, st.lot_size_mismatch_count, st.intrinsic_filter_count,
+                st.vix_tier_count, st.greeks_usage_count, st.theta_penalty_count,
+                st.vega_penalty_count,
+                st.vol_context_align_count, st.greeks_align_count, st.score_matrix_usage_count,
+                st.reversal_signal_count, dict(st.zone_entry_counts),
+                st.regime_context_count, st.regime_adaptive_count,
                 {dim: dict(labels) for dim, labels in regime_breakdown.items()},
                 # Phase 6
-                bias_alignment_count, bar_close_alignment_count,
-                slope_override_time_count, conflict_blocked_count,
-                pulse_exhaustion_count, zone_absorption_count, spread_noise_count,
+                st.bias_alignment_count, st.bar_close_alignment_count,
+                st.slope_override_time_count, st.conflict_blocked_count,
+                st.pulse_exhaustion_count, st.zone_absorption_count, st.spread_noise_count,
                 # Phase 6.1
-                tilt_state_count, governance_easy_count, governance_strict_count,
-                tilt_bias_override_count,
+                st.tilt_state_count, st.governance_easy_count, st.governance_strict_count,
+                st.tilt_bias_override_count,
                 # Phase 6.2
-                trend_cont_activations, trend_cont_entries,
-                trend_cont_deactivations, trend_cont_side)
+                st.trend_cont_activations, st.trend_cont_entries,
+                st.trend_cont_deactivations, st.trend_cont_side)
 
     @staticmethod
     def _log_ts(line: str) -> str:
@@ -1578,6 +1972,113 @@ class LogParser:
         return queue.pop(0) if queue else None
 
 
+# ── TailingLogParser ──────────────────────────────────────────────────────────
+
+class TailingLogParser(LogParser):
+    """Incremental LogParser for a log that is still being written.
+
+    ``poll()`` reads only the bytes appended since the previous call and
+    feeds them through the same tag dispatch as ``parse()``; the scan state
+    (open-trade queues, last-seen regime / bias / tilt, counters) lives on
+    the instance, so each poll costs O(new lines).  An unterminated last
+    line is held back until its newline arrives.
+
+    Rotation: if the path now names a different file, the rest of the old
+    file is read from its rotated name (``<name>.1`` etc.) when it can be
+    found, then the new file is followed from byte 0.  A file that shrank
+    in place (copytruncate) is re-read from byte 0.  Either way the session
+    state carries over; call ``reset()`` to start a fresh session.
+
+    The events sidecar is not tailed: the writer batches it, so it trails
+    the text log by up to a flush interval.  Every tag is read from the text.
+
+        tail = TailingLogParser("options_trade_engine_2026-03-05.log")
+        while True:
+            s = tail.poll()
+            print(s.total_trades, s.net_pnl_pts, s.blocked_counts)
+            time.sleep(5)
+    """
+
+    READ_SIZE = 1 << 20
+
+    def __init__(self, log_path: str | Path) -> None:
+        super().__init__(log_path, use_events=False)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget offset and scan state; the next poll re-reads from byte 0."""
+        self.offset = 0
+        self.lines_read = 0
+        self.rotations = 0
+        self._ident: Optional[Tuple[int, int]] = None
+        self._partial = b""
+        self._state = _ScanState()
+
+    def poll(self) -> SessionSummary:
+        """Consume newly appended lines and return the live SessionSummary."""
+        try:
+            st = self.log_path.stat()
+        except OSError:
+            return self.summary()
+        ident = (st.st_dev, st.st_ino)
+        if self._ident is not None and ident != self._ident:
+            self._drain_rotated()
+            self._restart()
+        elif st.st_size < self.offset:
+            self._restart()
+        self._ident = ident
+        if st.st_size > self.offset:
+            self._read(self.log_path)
+        return self.summary()
+
+    def summary(self) -> SessionSummary:
+        """Summary of everything consumed so far (no I/O)."""
+        return self._build_summary(self._extract_date_tag(),
+                                   self._finalize(self._state, copy_trades=True))
+
+    def _restart(self) -> None:
+        if self._partial:
+            self._scan_bytes(self._partial)
+            self._partial = b""
+        self.offset = 0
+        self.rotations += 1
+        logging.info(f"[LOG TAIL] {self.log_path.name} rotated/truncated; following from byte 0")
+
+    def _drain_rotated(self) -> None:
+        for candidate in sorted(self.log_path.parent.glob(self.log_path.name + ".*")):
+            try:
+                st = candidate.stat()
+            except OSError:
+                continue
+            if (st.st_dev, st.st_ino) == self._ident:
+                self._read(candidate)
+                return
+
+    def _read(self, path: Path) -> None:
+        with path.open("rb") as fh:
+            fh.seek(self.offset)
+            while True:
+                chunk = fh.read(self.READ_SIZE)
+                if not chunk:
+                    break
+                self.offset += len(chunk)
+                data = self._partial + chunk
+                cut = data.rfind(b"\n") + 1
+                self._partial = data[cut:]
+                if cut:
+                    self._scan_bytes(data[:cut])
+
+    def _scan_bytes(self, data: bytes) -> None:
+        text = data.decode("utf-8", errors="replace")
+        if "\r" in text:
+            text = text.replace("\r\n", "\n").replace("\r", "\n")
+        lines = text.split("\n")
+        if lines and not lines[-1]:
+            lines.pop()
+        self.lines_read += len(lines)
+        self._scan_lines(self._state, lines)
+
+
 # ── Convenience function ──────────────────────────────────────────────────────
 
 def parse_session(log_path: str | Path) -> SessionSummary:
@@ -1588,6 +2089,153 @@ def parse_session(log_path: str | Path) -> SessionSummary:
     return LogParser(log_path).parse()
 
 
-def parse_multiple(log_paths: List[str | Path]) -> List[SessionSummary]:
-    """Parse multiple log files and return a list of SessionSummary objects."""
-    return [parse_session(p) for p in log_paths]
+def _cache_key(path: Path) -> Optional[tuple]:
+    try:
+        st = path.stat()
+    except OSError:
+        return None
+    try:
+        ev = events_path_for(path).stat()
+        events = (ev.st_size, ev.st_mtime_ns)
+    except OSError:
+        events = None
+    return (str(path.resolve()), st.st_size, st.st_mtime_ns, events, PARSER_VERSION)
+
+
+def _trades_to_columns(trades: List[dict]) -> dict:
+    """Row dicts → {"n": rows, "columns": {key: values}, "present": {key: rows}}.
+
+    ``present`` lists the row indices only for keys some trades lack (the
+    trade formats carry different fields), so dense columns stay plain lists.
+    """
+    columns: Dict[str, list] = {}
+    present: Dict[str, list] = {}
+    for i, trade in enumerate(trades):
+        for key, value in trade.items():
+            col = columns.get(key)
+            if col is None:
+                col = columns[key] = []
+                present[key] = []
+            col.append(value)
+            present[key].append(i)
+    n = len(trades)
+    return {
+        "n": n,
+        "columns": columns,
+        "present": {k: rows for k, rows in present.items() if len(rows) != n},
+    }
+
+
+def _trades_from_columns(table: dict) -> List[dict]:
+    trades: List[dict] = [{} for _ in range(table["n"])]
+    present = table["present"]
+    for key, values in table["columns"].items():
+        rows = present.get(key) or range(len(values))
+        for i, value in zip(rows, values):
+            trades[i][key] = value
+    return trades
+
+
+class SummaryCache:
+    """On-disk SessionSummary cache keyed by (path, size, mtime, PARSER_VERSION).
+
+    One pickle per log file; trades are stored column-wise.  A log that has
+    been appended to, touched, or parsed by a different parser version misses
+    and is re-parsed.  Writes go through a temp file + ``os.replace``.
+
+    Take the ``key`` before parsing and store the summary under it: a log
+    still being written then misses next time instead of serving a summary
+    that predates its newest lines.
+    """
+
+    def __init__(self, cache_dir: str | Path) -> None:
+        self.cache_dir = Path(cache_dir)
+        self.hits = 0
+        self.misses = 0
+
+    def _entry(self, path: Path) -> Path:
+        digest = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+        return self.cache_dir / f"{path.stem}-{digest}.pkl"
+
+    @staticmethod
+    def key(log_path: str | Path) -> Optional[tuple]:
+        """Cache key of the log as it is now, or None when it is missing."""
+        return _cache_key(Path(log_path))
+
+    def get(self, log_path: str | Path, key: Optional[tuple] = None) -> Optional[SessionSummary]:
+        path = Path(log_path)
+        if key is None:
+            key = _cache_key(path)
+        entry = self._entry(path)
+        if key is None or not entry.exists():
+            self.misses += 1
+            return None
+        try:
+            with entry.open("rb") as fh:
+                blob = pickle.load(fh)
+            if blob.get("key") != key:
+                self.misses += 1
+                return None
+            fields = dict(blob["fields"])
+            fields["trades"] = _trades_from_columns(blob["trades"])
+            summary = SessionSummary(**fields)
+        except Exception as exc:            # corrupt / incompatible entry
+            logging.warning(f"[PARSE CACHE] dropping unreadable entry {entry.name}: {exc}")
+            self.misses += 1
+            return None
+        self.hits += 1
+        return summary
+
+    def put(self, log_path: str | Path, key: Optional[tuple], summary: SessionSummary) -> None:
+        """Store ``summary`` under ``key`` (taken with ``key()`` before parsing)."""
+        if key is None:
+            return
+        path = Path(log_path)
+        fields = {f.name: getattr(summary, f.name)
+                  for f in dataclasses.fields(summary) if f.name != "trades"}
+        blob = {"key": key, "fields": fields, "trades": _trades_to_columns(summary.trades)}
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entry = self._entry(path)
+        tmp = entry.with_suffix(".tmp")
+        with tmp.open("wb") as fh:
+            pickle.dump(blob, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, entry)
+
+
+def parse_multiple(
+    log_paths: List[str | Path],
+    workers: Optional[int] = None,
+    cache_dir: Optional[str | Path] = None,
+) -> List[SessionSummary]:
+    """Parse multiple log files and return a list of SessionSummary objects.
+
+    workers    process count for the files that need parsing (default: CPU
+               count); 0/1, or fewer than PARALLEL_MIN_FILES misses, parses
+               in-process
+    cache_dir  SummaryCache directory; unchanged logs are loaded from it and
+               fresh parses are written back.  None disables caching.
+
+    Results are returned in ``log_paths`` order.
+    """
+    paths = [Path(p) for p in log_paths]
+    cache = SummaryCache(cache_dir) if cache_dir is not None else None
+    keys = [cache.key(p) if cache is not None else None for p in paths]
+    results: List[Optional[SessionSummary]] = [
+        cache.get(p, k) if cache is not None else None for p, k in zip(paths, keys)
+    ]
+    todo = [i for i, r in enumerate(results) if r is None]
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    workers = min(workers, len(todo))
+    if workers > 1 and len(todo) >= PARALLEL_MIN_FILES:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            parsed = list(pool.map(parse_session, [paths[i] for i in todo]))
+    else:
+        parsed = [parse_session(paths[i]) for i in todo]
+    for i, summary in zip(todo, parsed):
+        results[i] = summary
+        if cache is not None:
+            cache.put(paths[i], keys[i], summary)
+    if cache is not None:
+        logging.info(f"[PARSE CACHE] {len(paths)} sessions: hits={cache.hits} "
+                     f"parsed={len(todo)} workers={max(1, workers)}")
+    return results
@@ -17,6 +17,9 @@ Live strategy loop (main_strategy_code):
   • New candle detected by comparing completed-candle count
   • On new candle → paper_order() / live_order() called → [NEW CANDLE] logged
   • Exit checks   → called every second regardless of candle boundary
+  • Orders        → order_tracker cache fed by on_orders; pending LIMIT orders
+                    chased from the cache, REST order book polled only as a
+                    reconciliation safety net (RECONCILE_INTERVAL_SEC)
 
 Data flow:
   WebSocket tick → data_feed.onmessage()
@@ -50,13 +53,17 @@ import pytz
 import warnings
 
 from config import time_zone, MODE, symbols, account_type, strategy_name
-from setup import fyers, fyers_async
+from setup import fyers, fyers_async, option_chain
 
 from market_data import MarketData
 import data_feed                            # wire data_feed.market_data after warmup
-from data_feed import fyers_socket, fyers_order_socket, chase_order, tick_db
+from data_feed import fyers_socket, fyers_order_socket, chase_pending, order_tracker, tick_db
 
 from execution import paper_order, live_order, run_strategy, risk_info
+from stage_profiler import stage, log_summary as log_stage_profile
+from broker_gateway import log_gateway_metrics
+from metrics import start_metrics_server
+from greeks_surface import start_greeks_surfaces
 from indicators import (
     calculate_cpr,
     calculate_traditional_pivots,
@@ -290,31 +297,40 @@ async def main_strategy_code(md: MarketData) -> None:
         # ── Session end ──────────────────────────────────────────────────────
         if ct > end_time.add(minutes=2):
             logging.info(f"{YELLOW}[MAIN] Session ended at {ct}. Shutting down.{RESET}")
+            log_stage_profile("STAGE PROFILE (session)")
+            order_tracker.shutdown(wait=False)
+            log_gateway_metrics()
             return
 
-        # ── Order management (every 5 seconds) ──────────────────────────────
-        if ct.second % 5 == 0:
-            try:
-                order_response = await fyers_async.orderbook()
-                order_df = (
-                    pd.DataFrame(order_response["orderBook"])
-                    if order_response.get("orderBook")
-                    else pd.DataFrame()
-                )
-                chase_order(order_df)
+        # ── Order management ────────────────────────────────────────────────
+        # Order state arrives through on_orders into order_tracker; pending
+        # LIMIT orders are chased from that cache every loop (modifies run in
+        # the tracker's pool).  The REST order book / positions poll is only a
+        # low-frequency reconciliation safety net.
+        try:
+            with stage("chase_order"):
+                chase_pending()
+            if order_tracker.reconcile_due():
+                with stage("orderbook_poll"):
+                    order_response = await fyers_async.orderbook()
+                order_tracker.reconcile(order_response.get("orderBook") or [])
 
                 pos1 = await fyers_async.positions()
                 pnl  = int(pos1.get("overall", {}).get("pl_total", 0))
                 logging.debug(f"{GRAY}[PnL] live_broker_pnl={pnl}{RESET}")
 
-            except Exception as exc:
-                logging.debug(f"[ORDERBOOK/PNL ERROR] {exc}")
-                
+        except Exception as exc:
+            logging.debug(f"[ORDERBOOK/PNL ERROR] {exc}")
+
         # ── Pulse Logging (every 30 seconds) ────────────────────────────────
         if ct.second % 30 == 0:
             from data_feed import pulse
             pulse.log_stats()
 
+        # ── Stage profile summary (every 15 minutes, STAGE_PROFILE=1 only) ──
+        if ct.minute % 15 == 0 and ct.second == 0:
+            log_stage_profile(f"STAGE PROFILE @ {ct.strftime('%H:%M')}")
+
         # ── Strategy ────────────────────────────────────────────────────────
         if MODE != "STRATEGY":
             await asyncio.sleep(1)
@@ -329,7 +345,8 @@ async def main_strategy_code(md: MarketData) -> None:
                     data_feed.spot_price = spot
 
                 # ── Indicator-enriched candles from in-memory aggregator ──────
-                df_3m, df_15m = md.get_candles(sym)
+                with stage("get_candles"):
+                    df_3m, df_15m = md.get_candles(sym)
 
                 n3 = len(df_3m) if df_3m is not None and not df_3m.empty else 0
                 n15 = len(df_15m) if df_15m is not None and not df_15m.empty else 0
@@ -387,7 +404,8 @@ async def main_strategy_code(md: MarketData) -> None:
 
                 # ── Call order function (entry + exit) ───────────────────────
                 # paper_order / live_order de-dupe entries per candle internally
-                _call_order_func(df_3m, df_15m, spot)
+                with stage("order_func"):
+                    _call_order_func(df_3m, df_15m, spot)
 
             except Exception as exc:
                 logging.error(f"[STRATEGY ERROR] {sym}: {exc}", exc_info=True)
@@ -431,8 +449,10 @@ def run() -> None:
     Full startup sequence:
       1. Warmup — Fyers historical fetch + indicator build + market_data wire
       2. Print daily pivot/ATR levels (from Fyers API for LIVE/PAPER, DB for REPLAY)
-      3. Connect WebSocket sockets
-      4. Start async strategy loop
+      3. Start the local metrics endpoint (METRICS_PORT, 0 disables)
+      4. Register the option chain's Greeks surfaces (GREEKS_SURFACE_HZ, 0 disables)
+      5. Connect WebSocket sockets
+      6. Start async strategy loop
     """
     # ── Warmup MUST happen before sockets connect so market_data is ready ────
     md = do_warmup()
@@ -443,6 +463,10 @@ def run() -> None:
     # ── Sanity check: Ensure pivots were validated before strategy starts ────
     logging.info(f"{GREEN}[STARTUP] Pivot validation complete. Ready to enter strategy loop.{RESET}")
 
+    start_metrics_server()
+
+    start_greeks_surfaces(option_chain)
+
     # ── Connect sockets ──────────────────────────────────────────────────────
     fyers_socket.connect()
     fyers_order_socket.connect()
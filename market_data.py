@@ -66,6 +66,7 @@ import numpy as np
 import pandas as pd
 import pytz
 
+from metrics import BAR_LAG_BUCKETS, histogram
 from orchestration import build_indicator_dataframe
 
 IST = pytz.timezone("Asia/Kolkata")
@@ -80,6 +81,14 @@ CYAN   = "\033[96m"
 RED    = "\033[91m"
 RESET  = "\033[0m"
 
+# Seconds from a bar boundary to the tick that closed the bar.
+TICK_TO_CANDLE = histogram("md_tick_to_candle_seconds", "Bar boundary to candle close",
+                           ("interval",), buckets=BAR_LAG_BUCKETS)
+CANDLE_REBUILD = histogram("md_get_candles_rebuild_seconds",
+                           "get_candles indicator rebuild time", ("interval",))
+_TICK_TO_CANDLE_3M  = TICK_TO_CANDLE.labels("3m")
+_TICK_TO_CANDLE_15M = TICK_TO_CANDLE.labels("15m")
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 #  Tick  — lightweight named tuple stored in RAM
@@ -182,6 +191,7 @@ class CandleAggregator:
         elif slot_3m != self._current_slot_3m:
             # Slot closed — emit completed candle
             self._candles_3m.append(self._acc_to_row(self._acc_3m, self.symbol))
+            _TICK_TO_CANDLE_3M.observe((ts - slot_3m).total_seconds())
             self._current_slot_3m = slot_3m
             self._acc_3m = self._new_acc(slot_3m, ltp)
         else:
@@ -193,6 +203,7 @@ class CandleAggregator:
             self._acc_15m = self._new_acc(slot_15m, ltp)
         elif slot_15m != self._current_slot_15m:
             self._candles_15m.append(self._acc_to_row(self._acc_15m, self.symbol))
+            _TICK_TO_CANDLE_15M.observe((ts - slot_15m).total_seconds())
             self._current_slot_15m = slot_15m
             self._acc_15m = self._new_acc(slot_15m, ltp)
         else:
@@ -503,7 +514,8 @@ class MarketData:
                 agg.get_completed_candles("3m"),
             )
             if not raw_3m.empty:
-                cached_df_3m = build_indicator_dataframe(symbol, raw_3m, interval="3m")
+                with CANDLE_REBUILD.labels("3m").time():
+                    cached_df_3m = build_indicator_dataframe(symbol, raw_3m, interval="3m")
             self._indicator_cache_3m[symbol] = (count_3m, cached_df_3m)
 
         # ── 15m indicators ───────────────────────────────────────────────────
@@ -514,7 +526,8 @@ class MarketData:
                 agg.get_completed_candles("15m"),
             )
             if not raw_15m.empty:
-                cached_df_15m = build_indicator_dataframe(symbol, raw_15m, interval="15m")
+                with CANDLE_REBUILD.labels("15m").time():
+                    cached_df_15m = build_indicator_dataframe(symbol, raw_15m, interval="15m")
             self._indicator_cache_15m[symbol] = (count_15m, cached_df_15m)
 
         return cached_df_3m, cached_df_15m
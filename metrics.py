@@ -0,0 +1,424 @@
+"""metrics.py — in-process metrics registry with a Prometheus text endpoint.
+
+Slow days used to surface only by grepping logs.  The hot paths now update
+counters, gauges and fixed-bucket histograms held in process memory, and a
+background HTTP thread serves them in the Prometheus text exposition format
+(``GET /metrics``) for a local Prometheus / Grafana agent or plain ``curl``.
+
+    from metrics import counter, histogram
+    TICKS = counter("feed_ticks_total", "Ticks received", ("symbol",))
+    TICKS.labels(sym).inc()                       # tick path: ~0.1-0.2 µs
+
+    REBUILD = histogram("md_get_candles_rebuild_seconds", "...", ("interval",))
+    with REBUILD.labels("3m").time():
+        ...
+
+Cost model
+----------
+Updates take no lock: ``inc`` / ``set`` / ``observe`` are a dict lookup for
+the label child plus an attribute add (histograms add one ``bisect`` over
+the fixed bounds).  CPython's GIL makes a lost update possible only when two
+threads update the *same* child at the same instant; every hot-path metric
+here is written by a single thread (websocket callback, strategy loop or a
+gateway lane), so the numbers are exact in practice.  Gauges registered with
+``set_function`` cost nothing until scraped (queue depths, pulse rate).
+
+Metric declarations are idempotent — calling ``counter(name, ...)`` again
+returns the existing metric — so modules declare theirs at import time.
+
+Environment:
+  METRICS_PORT=<port>   endpoint port for ``start_metrics_server`` (default
+                        9108; 0 disables)
+  METRICS_ADDR=<addr>   bind address (default 127.0.0.1, local only)
+
+Log tags
+--------
+[METRICS]  endpoint started / stopped / scrape callback failure
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_PORT = int(os.getenv("METRICS_PORT", "9108") or 0)
+DEFAULT_ADDR = os.getenv("METRICS_ADDR", "127.0.0.1")
+
+# Seconds; spans sub-millisecond handler work up to multi-second broker calls.
+LATENCY_BUCKETS: Tuple[float, ...] = (
+    0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+    0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0,
+)
+# Seconds after a bar boundary; candle closes and signal evaluation.
+BAR_LAG_BUCKETS: Tuple[float, ...] = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 180.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _fmt(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if value == -math.inf:
+        return "-Inf"
+    if value != value:
+        return "NaN"
+    if float(value).is_integer() and abs(value) < 1e15:
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _label_str(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+# ── children (one per label combination) ─────────────────────────────────────
+
+class _CounterChild:
+    __slots__ = ("value",)
+
+    def __init__(self) -> None:
+        self.value = 0.0
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+
+class _GaugeChild:
+    __slots__ = ("value", "fn")
+
+    def __init__(self) -> None:
+        self.value = 0.0
+        self.fn: Optional[Callable[[], float]] = None
+
+    def set(self, value: float) -> None:
+        self.value = value
+
+    def inc(self, amount: float = 1.0) -> None:
+        self.value += amount
+
+    def dec(self, amount: float = 1.0) -> None:
+        self.value -= amount
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        """Evaluate ``fn`` at scrape time instead of storing a value."""
+        self.fn = fn
+
+    def read(self) -> float:
+        return float(self.fn()) if self.fn is not None else self.value
+
+
+class _Timer:
+    __slots__ = ("child", "t0")
+
+    def __init__(self, child) -> None:
+        self.child = child
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc) -> bool:
+        self.child.observe(time.perf_counter() - self.t0)
+        return False
+
+
+class _HistogramChild:
+    __slots__ = ("bounds", "counts", "sum")
+
+    def __init__(self, bounds: Tuple[float, ...]) -> None:
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)     # last slot is +Inf
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.sum += value
+
+    def time(self) -> _Timer:
+        """Context manager observing the elapsed wall time in seconds."""
+        return _Timer(self)
+
+    @property
+    def count(self) -> int:
+        return sum(self.counts)
+
+
+# ── metric families ──────────────────────────────────────────────────────────
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[tuple, object] = {}
+        self._lock = threading.Lock()
+        if not self.labelnames:
+            self._default = self._children[()] = self._new_child()
+
+    def _new_child(self):
+        raise NotImplementedError
+
+    def labels(self, *values):
+        """Child for one label combination (created on first use)."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+            with self._lock:
+                child = self._children.setdefault(tuple(str(v) for v in values), self._new_child())
+                self._children[values] = child
+        return child
+
+    def _samples(self) -> Iterable[str]:
+        seen = set()
+        for key, child in list(self._children.items()):
+            if id(child) in seen:
+                continue
+            seen.add(id(child))
+            yield from self._child_samples(tuple(str(v) for v in key), child)
+
+    def _child_samples(self, values: tuple, child) -> Iterable[str]:
+        raise NotImplementedError
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(self._samples())
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonically increasing count (``rate()`` it in Prometheus)."""
+
+    kind = "counter"
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    @property
+    def value(self) -> float:
+        return self._default.value
+
+    def _child_samples(self, values, child):
+        yield f"{self.name}{_label_str(self.labelnames, values)} {_fmt(child.value)}"
+
+
+class Gauge(_Metric):
+    """Value that goes up and down; may be computed at scrape time."""
+
+    kind = "gauge"
+
+    def _new_child(self):
+        return _GaugeChild()
+
+    def set(self, value: float) -> None:
+        self._default.set(value)
+
+    def inc(self, amount: float = 1.0) -> None:
+        self._default.inc(amount)
+
+    def dec(self, amount: float = 1.0) -> None:
+        self._default.dec(amount)
+
+    def set_function(self, fn: Callable[[], float]) -> None:
+        self._default.set_function(fn)
+
+    @property
+    def value(self) -> float:
+        return self._default.read()
+
+    def _child_samples(self, values, child):
+        try:
+            value = child.read()
+        except Exception as exc:
+            logging.debug(f"[METRICS] {self.name} callback failed: {exc}")
+            return
+        yield f"{self.name}{_label_str(self.labelnames, values)} {_fmt(value)}"
+
+
+class Histogram(_Metric):
+    """Fixed-bucket distribution; buckets are upper bounds in ascending order."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = LATENCY_BUCKETS) -> None:
+        bounds = tuple(sorted(float(b) for b in buckets if b != math.inf))
+        if not bounds:
+            raise ValueError(f"{name}: histogram needs at least one finite bucket")
+        self.bounds = bounds
+        super().__init__(name, documentation, labelnames)
+
+    def _new_child(self):
+        return _HistogramChild(self.bounds)
+
+    def observe(self, value: float) -> None:
+        self._default.observe(value)
+
+    def time(self) -> _Timer:
+        return self._default.time()
+
+    def _child_samples(self, values, child):
+        cumulative = 0
+        counts = list(child.counts)
+        for bound, n in zip(self.bounds + (math.inf,), counts):
+            cumulative += n
+            le = f'le="{_fmt(bound)}"'
+            yield f"{self.name}_bucket{_label_str(self.labelnames, values, le)} {cumulative}"
+        labels = _label_str(self.labelnames, values)
+        yield f"{self.name}_sum{labels} {_fmt(child.sum)}"
+        yield f"{self.name}_count{labels} {cumulative}"
+
+
+# ── registry ─────────────────────────────────────────────────────────────────
+
+class MetricsRegistry:
+    """Named metric families, rendered together in registration order."""
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _get_or_create(self, cls, name: str, documentation: str, labelnames: Sequence[str], **kw):
+        metric = self._metrics.get(name)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(name)
+                if metric is None:
+                    metric = self._metrics[name] = cls(name, documentation, labelnames, **kw)
+        if not isinstance(metric, cls) or metric.labelnames != tuple(labelnames):
+            raise ValueError(f"metric {name} already registered as {metric.kind}{metric.labelnames}")
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(Counter, name, documentation, labelnames)
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self._get_or_create(Gauge, name, documentation, labelnames)
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        return self._get_or_create(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines: List[str] = []
+        for metric in list(self._metrics.values()):
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+_REGISTRY = MetricsRegistry()
+
+
+def get_registry() -> MetricsRegistry:
+    """Process-wide registry shared by every instrumented module."""
+    return _REGISTRY
+
+
+def counter(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+    return _REGISTRY.counter(name, documentation, labelnames)
+
+
+def gauge(name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+    return _REGISTRY.gauge(name, documentation, labelnames)
+
+
+def histogram(name: str, documentation: str, labelnames: Sequence[str] = (),
+              buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+    return _REGISTRY.histogram(name, documentation, labelnames, buckets)
+
+
+# ── HTTP endpoint ────────────────────────────────────────────────────────────
+
+class _Handler(BaseHTTPRequestHandler):
+    registry: MetricsRegistry = _REGISTRY
+
+    def do_GET(self) -> None:                    # noqa: N802 (http.server API)
+        if self.path.split("?", 1)[0] not in ("/metrics", "/"):
+            self.send_error(404)
+            return
+        body = self.registry.render().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, fmt, *args) -> None:   # scrapes would flood the engine log
+        pass
+
+
+class MetricsServer:
+    """``GET /metrics`` on a daemon thread; ``port=0`` picks a free port."""
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None,
+                 port: int = DEFAULT_PORT, addr: str = DEFAULT_ADDR) -> None:
+        handler = type("_BoundHandler", (_Handler,), {"registry": registry or _REGISTRY})
+        self._httpd = ThreadingHTTPServer((addr, port), handler)
+        self._httpd.daemon_threads = True
+        self.addr, self.port = self._httpd.server_address[:2]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        logging.info(f"[METRICS] serving http://{self.addr}:{self.port}/metrics")
+
+    def close(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        self._thread.join(timeout=5)
+        logging.info(f"[METRICS] stopped http://{self.addr}:{self.port}/metrics")
+
+
+_SERVER: Optional[MetricsServer] = None
+
+
+def start_metrics_server(port: Optional[int] = None, addr: Optional[str] = None) -> Optional[MetricsServer]:
+    """Start the process-wide endpoint once; None when disabled or the bind fails."""
+    global _SERVER
+    if _SERVER is not None:
+        return _SERVER
+    port = DEFAULT_PORT if port is None else port
+    if not port:
+        return None
+    try:
+        _SERVER = MetricsServer(port=port, addr=addr or DEFAULT_ADDR)
+    except OSError as exc:
+        logging.warning(f"[METRICS] endpoint not started on {addr or DEFAULT_ADDR}:{port}: {exc}")
+        return None
+    return _SERVER
+
+
+__all__ = [
+    "BAR_LAG_BUCKETS",
+    "Counter",
+    "Gauge",
+    "Histogram",
+    "LATENCY_BUCKETS",
+    "MetricsRegistry",
+    "MetricsServer",
+    "counter",
+    "gauge",
+    "get_registry",
+    "histogram",
+    "start_metrics_server",
+]
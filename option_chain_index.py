@@ -0,0 +1,203 @@
+"""option_chain_index.py — strike-indexed view of the option chain.
+
+``get_option_by_moneyness`` used to filter, copy and sort the whole
+``option_chain`` DataFrame on every entry and then walk it with
+``iterrows()``.  OptionChainIndex is built once per loaded chain: one
+StrikeBook per (underlying, expiry, side) holding a sorted strike array and
+the matching symbols, plus a liquidity bitmap refreshed from the quote book.
+Strike selection is a bisect and an outward neighbour scan, so its cost no
+longer grows with ``strike_count``.
+
+Log tags
+--------
+[CHAIN_INDEX] books=... contracts=...   (index built)
+"""
+
+from __future__ import annotations
+
+import heapq
+import logging
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Chain option_type values accepted for each side.
+SIDE_ALIASES = {
+    "CE": ("CE", "CALL"),
+    "PE": ("PE", "PUT"),
+}
+
+
+def normalise_side(side: str) -> str:
+    """Map CALL/CE → "CE" and everything else → "PE" (as the order paths do)."""
+    return "CE" if str(side).upper() in ("CALL", "CE") else "PE"
+
+
+@dataclass
+class StrikeBook:
+    """Contracts of one underlying / expiry / side, ordered by strike."""
+
+    underlying: str
+    expiry: str
+    side: str
+    strikes: np.ndarray                       # float64, ascending
+    symbols: List[str]
+    rows: np.ndarray                          # chain row order, tie-breaker
+    liquid: np.ndarray = field(default=None)  # bool bitmap, same order
+
+    def __post_init__(self):
+        if self.liquid is None:
+            self.liquid = np.zeros(len(self.symbols), dtype=bool)
+
+    def __len__(self) -> int:
+        return len(self.symbols)
+
+    def nearest(self, strike: float) -> Iterator[Tuple[float, int, int]]:
+        """Yield ``(distance, row, pos)`` in order of distance from ``strike``.
+
+        Bisect to the insertion point and expand outwards; on equal distance
+        the contract listed first in the chain wins.
+        """
+        strikes = self.strikes
+        n = len(strikes)
+        hi = bisect_left(strikes, strike)
+        lo = hi - 1
+        while lo >= 0 or hi < n:
+            d_lo = strike - strikes[lo] if lo >= 0 else np.inf
+            d_hi = strikes[hi] - strike if hi < n else np.inf
+            if d_lo < d_hi or (d_lo == d_hi and self.rows[lo] < self.rows[hi]):
+                yield float(d_lo), int(self.rows[lo]), lo
+                lo -= 1
+            else:
+                yield float(d_hi), int(self.rows[hi]), hi
+                hi += 1
+
+
+def _tagged(scan, i):
+    for d, row, pos in scan:
+        yield d, row, i, pos
+
+
+class OptionChainIndex:
+    """Per-(underlying, expiry, side) strike books built from ``option_chain``."""
+
+    def __init__(self, books: Dict[Tuple[str, str, str], StrikeBook], source=None):
+        self.books = books
+        self.source = source
+        self._quote_key = None
+
+    @classmethod
+    def from_frame(cls, chain) -> "OptionChainIndex":
+        """Build the index from a Fyers option-chain DataFrame.
+
+        Rows need ``symbol``, ``strike_price`` and ``option_type``; ``underlying``
+        and ``expiry`` are used when present.  Anything else (an empty frame, a
+        placeholder dict) gives an empty index.
+        """
+        books: Dict[Tuple[str, str, str], StrikeBook] = {}
+        if not isinstance(chain, pd.DataFrame) or chain.empty or not {
+            "symbol", "strike_price", "option_type"
+        }.issubset(chain.columns):
+            return cls(books, source=chain)
+
+        alias = {a: side for side, names in SIDE_ALIASES.items() for a in names}
+        frame = pd.DataFrame({
+            "symbol": chain["symbol"].to_numpy(),
+            "strike": pd.to_numeric(chain["strike_price"], errors="coerce").to_numpy(dtype=float),
+            "side": chain["option_type"].map(alias).to_numpy(),
+            "underlying": (chain["underlying"].astype(str).to_numpy()
+                           if "underlying" in chain.columns else ""),
+            "expiry": chain["expiry"].astype(str).to_numpy() if "expiry" in chain.columns else "",
+            "row": np.arange(len(chain)),
+        })
+        frame = frame[frame["side"].notna() & np.isfinite(frame["strike"])]
+        for (und, exp, side), grp in frame.groupby(["underlying", "expiry", "side"], sort=False):
+            grp = grp.sort_values(["strike", "row"], kind="mergesort")
+            books[(und, exp, side)] = StrikeBook(
+                underlying=und, expiry=exp, side=side,
+                strikes=grp["strike"].to_numpy(dtype=float),
+                symbols=grp["symbol"].tolist(),
+                rows=grp["row"].to_numpy(),
+            )
+        logging.info(
+            f"[CHAIN_INDEX] books={len(books)} "
+            f"contracts={sum(len(b) for b in books.values())}"
+        )
+        return cls(books, source=chain)
+
+    def __len__(self) -> int:
+        return sum(len(b) for b in self.books.values())
+
+    # ── liquidity ─────────────────────────────────────────────────────────
+
+    def refresh_liquidity(self, quotes) -> None:
+        """Mark contracts present in the quote book ``quotes`` (index = symbol).
+
+        Skipped while the quote book's index object is unchanged, which is the
+        normal case: the live ``df`` is indexed by subscribed symbol once.
+        """
+        index = getattr(quotes, "index", None)
+        key = (id(quotes), id(index), len(index)) if index is not None else None
+        if key == self._quote_key:
+            return
+        self._quote_key = key
+        for book in self.books.values():
+            if index is None or len(index) == 0:
+                book.liquid[:] = False
+            else:
+                book.liquid = np.asarray(pd.Index(book.symbols).isin(index), dtype=bool)
+
+    # ── selection ─────────────────────────────────────────────────────────
+
+    def _books_for(self, side: str, underlying: Optional[str], expiry: Optional[str]):
+        return [
+            b for (und, exp, sd), b in self.books.items()
+            if sd == side
+            and (underlying is None or und == underlying)
+            and (expiry is None or exp == expiry)
+        ]
+
+    def select(
+        self,
+        side: str,
+        strike: float,
+        quotes=None,
+        underlying: Optional[str] = None,
+        expiry: Optional[str] = None,
+    ) -> Tuple[Optional[str], Optional[float], bool]:
+        """Closest contract to ``strike``, preferring ones in the quote book.
+
+        ``quotes`` is the live quote DataFrame indexed by symbol (``df``).
+        Returns ``(symbol, strike, liquid)``.  When ``quotes`` is empty or has
+        none of the candidates, the closest contract overall is returned with
+        ``liquid=False``; ``(None, None, False)`` when the side has no books.
+        """
+        books = self._books_for(normalise_side(side), underlying, expiry)
+        if not books:
+            return None, None, False
+        check = quotes is not None and not quotes.empty
+        if check:
+            self.refresh_liquidity(quotes)
+
+        scans = [_tagged(book.nearest(strike), i) for i, book in enumerate(books)]
+        best = None
+        for d, row, i, pos in heapq.merge(*scans):
+            book = books[i]
+            if best is None:
+                best = (book.symbols[pos], float(book.strikes[pos]))
+                if not check:
+                    break
+            if book.liquid[pos]:
+                return book.symbols[pos], float(book.strikes[pos]), True
+        return best[0], best[1], False
+
+
+__all__ = [
+    "OptionChainIndex",
+    "StrikeBook",
+    "SIDE_ALIASES",
+    "normalise_side",
+]
@@ -7,14 +7,30 @@ where all calculations are done in option premium space (e.g., 200-400 range).
 from __future__ import annotations
 
 import logging
+import math
 from collections import deque
 from dataclasses import dataclass
-from typing import Deque, Optional
+from typing import Deque, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
 
+_NS_PER_MIN = 60_000_000_000
+_RESYNC_TICKS = 4096      # exact re-summation cadence for the rolling moments
+
+
+def _to_ns(timestamp) -> int:
+    """Tick time as int64 nanoseconds (UTC for tz-aware inputs)."""
+    if isinstance(timestamp, pd.Timestamp):
+        return timestamp.value
+    if isinstance(timestamp, (int, np.integer)):
+        return int(timestamp)
+    if isinstance(timestamp, np.datetime64):
+        return int(timestamp.astype("datetime64[ns]").astype(np.int64))
+    return pd.Timestamp(timestamp).value
+
+
 @dataclass
 class OptionExitConfig:
     """Configuration for high-frequency exit algorithms.
@@ -108,8 +124,10 @@ class OptionExitManager:
 
     Notes:
     - All prices are option premiums; no spot/index values are used.
-    - ``check_exit`` is O(window) on tiny windows and non-blocking for
-      sub-second loops.
+    - ``check_exit`` is O(1) per tick: ``update_tick`` maintains the rolling
+      mean / variance (sliding Welford), reads ROC straight off the price
+      buffer, and folds each tick into an incrementally built list of
+      1-minute bars.  Timestamps are kept as int64 nanoseconds.
     """
 
     def __init__(
@@ -125,9 +143,19 @@ class OptionExitManager:
         self.cfg = config or OptionExitConfig()
 
         max_points = max(120, self.cfg.ma_window * 6)
+        self._max_points = max_points
         self._prices: Deque[float] = deque(maxlen=max_points)
         self._volumes: Deque[float] = deque(maxlen=max_points)
-        self._timestamps: Deque[pd.Timestamp] = deque(maxlen=max_points)
+        self._ts_ns: Deque[int] = deque(maxlen=max_points)
+        self._seq = 0                     # ticks ingested so far
+        # Rolling moments over the last ma_window prices (sliding Welford)
+        self._ma_n = 0
+        self._ma_mean = 0.0
+        self._ma_m2 = 0.0
+        # 1-minute bars over the buffered ticks: [minute, n_ticks, max-deque]
+        # where max-deque holds (seq, price) with decreasing prices, so the
+        # bar high survives the oldest ticks leaving the buffer.
+        self._bars_1m: Deque[list] = deque()
         self._roc_peak = 0.0
         self._peak_price = self.entry_price
         self.last_reason: str = ""
@@ -151,14 +179,114 @@ class OptionExitManager:
             Tick time used for 1-minute bar reconstruction.
         """
         px = float(price)
-        ts = pd.Timestamp(timestamp)
+        ts_ns = _to_ns(timestamp)
         vol = 0.0 if volume is None else float(volume)
 
+        if len(self._prices) == self._max_points:
+            self._evict_1m(self._ts_ns[0], self._seq - self._max_points)
+        self._push_moment(px)
+
         self._prices.append(px)
         self._volumes.append(max(0.0, vol))
-        self._timestamps.append(ts)
+        self._ts_ns.append(ts_ns)
+        self._push_1m(ts_ns // _NS_PER_MIN, self._seq, px)
+        self._seq += 1
         self._peak_price = max(self._peak_price, px)
 
+    # ------------------------------------------------------------------
+    # Incremental state
+    # ------------------------------------------------------------------
+
+    def _push_moment(self, px: float) -> None:
+        """Slide the ma_window mean / M2 by one price (call before append)."""
+        window = self.cfg.ma_window
+        if self._ma_n < window:
+            self._ma_n += 1
+            d = px - self._ma_mean
+            self._ma_mean += d / self._ma_n
+            self._ma_m2 += d * (px - self._ma_mean)
+        else:
+            old = self._prices[-window]
+            mean_old = self._ma_mean
+            self._ma_mean += (px - old) / window
+            self._ma_m2 += (px - old) * (px - self._ma_mean + old - mean_old)
+            if self._seq % _RESYNC_TICKS == 0:
+                self._resync_moment(px)
+
+    def _resync_moment(self, px: Optional[float] = None) -> None:
+        """Recompute mean / M2 exactly (bounds floating-point drift)."""
+        window = self.cfg.ma_window
+        tail = list(self._prices)[-window:]
+        if px is not None:
+            tail = (tail + [px])[-window:]
+        self._ma_n = len(tail)
+        self._ma_mean = math.fsum(tail) / self._ma_n if tail else 0.0
+        self._ma_m2 = math.fsum((x - self._ma_mean) ** 2 for x in tail)
+
+    def _ma_stats(self) -> Tuple[float, float]:
+        """(mean, population std) of the last ma_window prices."""
+        n = self._ma_n
+        var = self._ma_m2 / n
+        if var <= 1e-12 * self._ma_mean * self._ma_mean:
+            # Near-flat window: re-sum exactly so sigma is 0.0 when it is 0.0
+            self._resync_moment()
+            var = self._ma_m2 / n
+        return self._ma_mean, math.sqrt(var) if var > 0 else 0.0
+
+    def _roc(self) -> Optional[float]:
+        """ROC over roc_window_ticks, or None when not enough ticks."""
+        n = self.cfg.roc_window_ticks
+        if len(self._prices) < (n + 1):
+            return None
+        base = self._prices[-(n + 1)]
+        if base <= 0:
+            return None
+        return (self._prices[-1] / base) - 1.0
+
+    def _push_1m(self, minute: int, seq: int, px: float) -> None:
+        bars = self._bars_1m
+        if bars and bars[-1][0] == minute:
+            bar = bars[-1]
+        elif not bars or minute > bars[-1][0]:
+            bar = [minute, 0, deque()]
+            bars.append(bar)
+        else:
+            # Late tick for an earlier minute: fold into (or insert) that bar
+            pos = len(bars) - 1
+            while pos >= 0 and bars[pos][0] > minute:
+                pos -= 1
+            if pos >= 0 and bars[pos][0] == minute:
+                bar = bars[pos]
+            else:
+                bar = [minute, 0, deque()]
+                bars.insert(pos + 1, bar)
+        bar[1] += 1
+        maxq = bar[2]
+        while maxq and maxq[-1][1] <= px:
+            maxq.pop()
+        maxq.append((seq, px))
+
+    def _evict_1m(self, ts_ns: int, seq: int) -> None:
+        """Drop tick ``seq`` (leaving the buffer) from its 1-minute bar."""
+        minute = ts_ns // _NS_PER_MIN
+        bars = self._bars_1m
+        for pos, bar in enumerate(bars):
+            if bar[0] == minute:
+                break
+        else:
+            return
+        maxq = bar[2]
+        while maxq and maxq[0][0] <= seq:
+            maxq.popleft()
+        bar[1] -= 1
+        if bar[1] == 0:
+            del bars[pos]
+
+    def _bar_highs(self, count: int) -> List[float]:
+        """Highs of the last ``count`` 1-minute bars (oldest first)."""
+        bars = self._bars_1m
+        return [bars[k][2][0][1] for k in range(len(bars) - count, len(bars))]
+
     def check_exit(
         self,
         current_price: float,
@@ -244,7 +372,7 @@ class OptionExitManager:
         if premium_move >= 0:
             return False
 
-        ts = pd.Timestamp(timestamp)
+        ts = timestamp if hasattr(timestamp, "hour") else pd.Timestamp(timestamp)
         cutoff_minutes = (
             self.cfg.theta_decay_cutoff_hour * 60 + self.cfg.theta_decay_cutoff_min
         )
@@ -265,22 +393,16 @@ class OptionExitManager:
             span = self.cfg.dynamic_trail_lo - self.cfg.dynamic_trail_hi
             tighten = profit_frac / max(self.cfg.trail_tighten_profit_frac, 1e-9)
             trail_frac = self.cfg.dynamic_trail_lo - (span * tighten)
-            trail_frac = float(np.clip(trail_frac, self.cfg.dynamic_trail_hi, self.cfg.dynamic_trail_lo))
+            trail_frac = min(max(trail_frac, self.cfg.dynamic_trail_hi), self.cfg.dynamic_trail_lo)
 
         trail_stop = self._peak_price * (1.0 - trail_frac)
         return price <= (trail_stop - self.risk_buffer)
 
     def _momentum_exhaustion(self) -> bool:
-        n = self.cfg.roc_window_ticks
-        if len(self._prices) < (n + 1):
+        roc = self._roc()
+        if roc is None:
             return False
 
-        arr = np.asarray(self._prices, dtype=np.float64)
-        base = arr[-(n + 1)]
-        if base <= 0:
-            return False
-
-        roc = (arr[-1] / base) - 1.0
         self._roc_peak = max(self._roc_peak, roc)
         if self._roc_peak <= 0:
             return False
@@ -306,10 +428,7 @@ class OptionExitManager:
         if len(self._prices) < window:
             return False
 
-        s = pd.Series(self._prices, dtype="float64")
-        tail = s.iloc[-window:]
-        mu = float(tail.mean())
-        sigma = float(tail.std(ddof=0))
+        mu, sigma = self._ma_stats()
         if not np.isfinite(mu) or not np.isfinite(sigma) or sigma <= 0:
             return False
 
@@ -317,26 +436,22 @@ class OptionExitManager:
         if not stretched:
             return False
 
-        ticks = pd.DataFrame(
-            {"price": list(self._prices), "ts": pd.to_datetime(list(self._timestamps))}
-        ).set_index("ts")
-        one_min = ticks["price"].resample("1min").ohlc().dropna()
         required_bars = max(self.cfg.vol_reversion_lower_high_bars + 1,
                             self.cfg.min_1m_bars_for_structure)
-        if len(one_min) < required_bars:
+        if len(self._bars_1m) < required_bars:
             return False
 
         # Require N consecutive lower highs (default 3) for structure confirmation
-        highs = one_min["high"].iloc[-(self.cfg.vol_reversion_lower_high_bars + 1):]
+        highs = self._bar_highs(self.cfg.vol_reversion_lower_high_bars + 1)
         lower_high_streak = all(
-            float(highs.iloc[k + 1]) < (float(highs.iloc[k]) - self.risk_buffer)
+            highs[k + 1] < (highs[k] - self.risk_buffer)
             for k in range(len(highs) - 1)
         )
         if lower_high_streak:
             logging.debug(
                 f"[VOL_REVERSION_REFINED] bars_held={self._bars_held} "
                 f"lower_high_bars={self.cfg.vol_reversion_lower_high_bars} "
-                f"price={float(highs.iloc[-1]):.2f} structure=confirmed"
+                f"price={highs[-1]:.2f} structure=confirmed"
             )
         return lower_high_streak
 
@@ -385,25 +500,17 @@ class OptionExitManager:
         maturity_pts = min(15, self._bars_held * 2)
 
         momentum_pts = 0
-        n = self.cfg.roc_window_ticks
-        if len(self._prices) >= n + 1:
-            arr  = np.asarray(self._prices, dtype=np.float64)
-            base = arr[-(n + 1)]
-            if base > 0:
-                roc = (arr[-1] / base) - 1.0
-                if self._roc_peak > 0:
-                    if roc < self._roc_peak * 0.50:
-                        momentum_pts = 20   # ROC dropped >50% from peak
-                    elif roc < self._roc_peak * 0.70:
-                        momentum_pts = 10   # ROC dropped >30% from peak
+        roc = self._roc()
+        if roc is not None and self._roc_peak > 0:
+            if roc < self._roc_peak * 0.50:
+                momentum_pts = 20   # ROC dropped >50% from peak
+            elif roc < self._roc_peak * 0.70:
+                momentum_pts = 10   # ROC dropped >30% from peak
 
         vol_pts = 0
         window  = self.cfg.ma_window
         if len(self._prices) >= window:
-            s     = pd.Series(self._prices, dtype="float64")
-            tail  = s.iloc[-window:]
-            mu    = float(tail.mean())
-            sigma = float(tail.std(ddof=0))
+            mu, sigma = self._ma_stats()
             if np.isfinite(mu) and np.isfinite(sigma) and sigma > 0:
                 if price > mu + 2.0 * sigma:
                     vol_pts = 25
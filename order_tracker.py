@@ -0,0 +1,308 @@
+"""order_tracker.py — event-driven order lifecycle cache.
+
+The live loop used to poll ``fyers_async.orderbook()`` and ``positions()``
+every 5 seconds, rebuild a DataFrame and let ``chase_order`` call
+``fyers.modify_order`` synchronously for each pending order.  OrderTracker
+keeps a local order cache driven by the order websocket (``on_orders``):
+
+  * ``on_order(msg)``   — apply one websocket/REST order dict through the
+                          state machine (terminal states are sticky, stale
+                          updates are ignored)
+  * ``reconcile(book)`` — low-frequency REST safety net over the order book
+  * ``chase(...)``      — re-price pending LIMIT orders toward LTP from the
+                          cache; modifies are submitted to a small thread
+                          pool behind a token bucket, so the strategy loop
+                          never waits on a modify round-trip
+
+Fyers order status codes: 1 cancelled, 2 traded, 4 transit, 5 rejected,
+6 pending, 7 expired.
+
+Log tags
+--------
+[ORDER STATE]  status transition
+[RECONCILE]    REST order-book reconciliation summary
+[CHASE]        limit-price modification submitted / failed
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional
+
+ORDER_STATUS = {
+    1: "CANCELLED",
+    2: "FILLED",
+    4: "TRANSIT",
+    5: "REJECTED",
+    6: "PENDING",
+    7: "EXPIRED",
+}
+PENDING = 6
+TERMINAL = frozenset({1, 2, 5, 7})
+LIMIT_ORDER = 1
+
+RECONCILE_INTERVAL_SEC = 60.0
+CHASE_INTERVAL_SEC = 5.0
+CHASE_TICK = 0.1
+MODIFY_RATE_PER_SEC = 10.0
+MODIFY_WORKERS = 4
+
+
+def status_name(code) -> str:
+    try:
+        return ORDER_STATUS.get(int(code), f"UNKNOWN({code})")
+    except (TypeError, ValueError):
+        return f"UNKNOWN({code})"
+
+
+class TokenBucket:
+    """Non-blocking token bucket: ``try_acquire`` returns False when empty."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None, clock=time.monotonic):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._tokens = self.capacity
+        self._clock = clock
+        self._stamp = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, n: float = 1.0) -> bool:
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            if self._tokens >= n:
+                self._tokens -= n
+                return True
+            return False
+
+
+@dataclass
+class TrackedOrder:
+    """Latest known state of one broker order."""
+
+    id: str
+    symbol: Optional[str] = None
+    status: int = 0
+    type: Optional[int] = None
+    qty: int = 0
+    filled_qty: int = 0
+    limit_price: float = 0.0
+    traded_price: float = 0.0
+    updated_at: float = 0.0
+    source: str = ""
+    last_chase_at: float = 0.0
+    chase_count: int = 0
+    chase_in_flight: bool = False
+
+    @property
+    def status_name(self) -> str:
+        return status_name(self.status)
+
+    @property
+    def is_terminal(self) -> bool:
+        return self.status in TERMINAL
+
+    @property
+    def is_pending(self) -> bool:
+        return self.status == PENDING
+
+
+def _num(value, cast=float, default=0):
+    try:
+        return cast(value)
+    except (TypeError, ValueError):
+        return default
+
+
+class OrderTracker:
+    """Local order cache fed by ``on_orders`` with REST reconciliation."""
+
+    def __init__(
+        self,
+        reconcile_interval: float = RECONCILE_INTERVAL_SEC,
+        chase_interval: float = CHASE_INTERVAL_SEC,
+        modify_rate: float = MODIFY_RATE_PER_SEC,
+        workers: int = MODIFY_WORKERS,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.orders: Dict[str, TrackedOrder] = {}
+        self.reconcile_interval = reconcile_interval
+        self.chase_interval = chase_interval
+        self.bucket = TokenBucket(modify_rate, clock=clock)
+        self._workers = workers
+        self._pool: Optional[ThreadPoolExecutor] = None
+        self._clock = clock
+        self._lock = threading.RLock()
+        self._last_reconcile: Optional[float] = None
+        self.stats = {"ws_updates": 0, "rest_updates": 0, "reconciles": 0,
+                      "modifies": 0, "modify_errors": 0, "rate_limited": 0}
+
+    # ── state machine ─────────────────────────────────────────────────────
+
+    def on_order(self, msg: dict, source: str = "ws") -> Optional[TrackedOrder]:
+        """Apply one order dict (websocket ``orders`` payload or order-book row)."""
+        order_id = msg.get("id")
+        if not order_id:
+            return None
+        status = _num(msg.get("status"), int, 0)
+        filled = _num(msg.get("filledQty"), int, 0)
+        with self._lock:
+            o = self.orders.get(order_id)
+            if o is None:
+                o = self.orders[order_id] = TrackedOrder(id=order_id)
+            elif o.is_terminal and status != o.status:
+                logging.debug(
+                    f"[ORDER STATE] {order_id} ignoring {status_name(status)} after "
+                    f"terminal {o.status_name} ({source})"
+                )
+                return o
+            elif status == o.status and filled < o.filled_qty:
+                return o  # stale partial-fill update
+            prev = o.status
+            o.status = status
+            o.symbol = msg.get("symbol", o.symbol)
+            o.type = _num(msg.get("type"), int, o.type)
+            o.qty = _num(msg.get("qty"), int, o.qty)
+            o.filled_qty = max(filled, o.filled_qty) if status == prev else filled
+            o.limit_price = _num(msg.get("limitPrice"), float, o.limit_price)
+            o.traded_price = _num(msg.get("tradedPrice"), float, o.traded_price)
+            o.updated_at = self._clock()
+            o.source = source
+            self.stats["ws_updates" if source == "ws" else "rest_updates"] += 1
+        if prev != status:
+            logging.info(
+                f"[ORDER STATE] {order_id} {o.symbol} {status_name(prev) if prev else 'NEW'}"
+                f" → {o.status_name} filled={o.filled_qty}/{o.qty} "
+                f"price={o.traded_price or o.limit_price} src={source}"
+            )
+        return o
+
+    def get(self, order_id) -> Optional[TrackedOrder]:
+        return self.orders.get(order_id)
+
+    def pending(self) -> List[TrackedOrder]:
+        with self._lock:
+            return [o for o in self.orders.values() if o.is_pending]
+
+    # ── REST safety net ───────────────────────────────────────────────────
+
+    def reconcile_due(self) -> bool:
+        return (
+            self._last_reconcile is None
+            or self._clock() - self._last_reconcile >= self.reconcile_interval
+        )
+
+    def reconcile(self, order_book: Optional[Iterable[dict]]) -> int:
+        """Apply a REST order-book snapshot; returns the number of changed orders."""
+        self._last_reconcile = self._clock()
+        changed = 0
+        for row in order_book or []:
+            before = self.orders.get(row.get("id"))
+            before = (before.status, before.filled_qty) if before else None
+            o = self.on_order(row, source="rest")
+            if o is not None and before != (o.status, o.filled_qty):
+                changed += 1
+        self.stats["reconciles"] += 1
+        level = logging.INFO if changed else logging.DEBUG
+        logging.log(level, f"[RECONCILE] orders={len(self.orders)} changed={changed} "
+                           f"pending={len(self.pending())}")
+        return changed
+
+    # ── chasing ───────────────────────────────────────────────────────────
+
+    def chase(
+        self,
+        ltp_of: Callable[[str], Optional[float]],
+        modify: Callable[[dict], object],
+    ) -> List[Future]:
+        """Step pending LIMIT orders 0.1 toward LTP; modifies run concurrently.
+
+        Each order is chased at most once per ``chase_interval`` and never
+        while its previous modify is in flight.  Orders that find the token
+        bucket empty are retried on a later call.  Returns the submitted
+        futures (resolved with the broker response).
+        """
+        now = self._clock()
+        futures: List[Future] = []
+        for o in self.pending():
+            if o.type != LIMIT_ORDER or o.chase_in_flight:
+                continue
+            if o.last_chase_at and now - o.last_chase_at < self.chase_interval:
+                continue
+            current_price = ltp_of(o.symbol)
+            if current_price is None or current_price != current_price:
+                logging.warning(f"[CHASE] No LTP for {o.symbol}, skipping")
+                continue
+            if not self.bucket.try_acquire():
+                self.stats["rate_limited"] += 1
+                break
+            new_price = (
+                round(o.limit_price + CHASE_TICK, 2)
+                if current_price > o.limit_price
+                else round(o.limit_price - CHASE_TICK, 2)
+            )
+            logging.info(f"[CHASE] {o.symbol}: old={o.limit_price} new={new_price} qty={o.qty}")
+            payload = {"id": o.id, "type": LIMIT_ORDER, "limitPrice": new_price, "qty": o.qty}
+            o.last_chase_at = now
+            o.chase_count += 1
+            o.chase_in_flight = True
+            futures.append(self._submit(o, payload, new_price, modify))
+        return futures
+
+    def _submit(self, o: TrackedOrder, payload: dict, new_price: float, modify) -> Future:
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self._workers, thread_name_prefix="chase")
+
+        def _run():
+            try:
+                resp = modify(payload)
+                ok = not (isinstance(resp, dict) and resp.get("s") not in (None, "ok"))
+                with self._lock:
+                    if ok and not o.is_terminal:
+                        o.limit_price = new_price
+                    self.stats["modifies"] += 1
+                    if not ok:
+                        self.stats["modify_errors"] += 1
+                if not ok:
+                    logging.error(f"[CHASE ERROR] {o.id} {resp}")
+                return resp
+            except Exception as exc:
+                with self._lock:
+                    self.stats["modify_errors"] += 1
+                logging.error(f"[CHASE ERROR] {exc}")
+                return None
+            finally:
+                o.chase_in_flight = False
+
+        return self._pool.submit(_run)
+
+    def shutdown(self, wait: bool = True) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=wait)
+            self._pool = None
+
+
+_TRACKER: Optional[OrderTracker] = None
+
+
+def get_order_tracker() -> OrderTracker:
+    """Process-wide OrderTracker shared by data_feed and main."""
+    global _TRACKER
+    if _TRACKER is None:
+        _TRACKER = OrderTracker()
+    return _TRACKER
+
+
+__all__ = [
+    "ORDER_STATUS",
+    "OrderTracker",
+    "TokenBucket",
+    "TrackedOrder",
+    "get_order_tracker",
+    "status_name",
+]
@@ -0,0 +1,554 @@
+"""Parallel parameter-sweep engine for exit-threshold tuning.
+
+Loads candle/indicator data ONCE, places the numeric columns in a single
+shared-memory block, and evaluates many parameter sets across a process
+pool.  Every worker attaches to the same block (zero-copy numpy views), so
+the per-configuration cost is only the exit simulation itself — no SQLite
+reads, no indicator rebuilds.
+
+Building blocks (generic — usable by any sweep):
+  ParamRange / sample_params   grid, random or Latin-hypercube parameter sets
+  SharedArrays                 named numpy arrays in one SharedMemory block
+  run_sweep                    process-pool fan-out → one results DataFrame
+  write_results_table          single columnar results table (parquet / CSV)
+
+PositionManager sweep (trail step, max-hold, hard stop, partial levels):
+  load_pm_dataset              3m bars + indicators + fixed entries, all days
+  evaluate_pm_params           replays every entry through a configured PM
+  PM_SWEEP_SPACE               default search space
+
+Entries are taken from the signals/trades CSVs written by
+run_offline_replay, so the sweep isolates exit behaviour: entry decisions
+are held fixed while exit thresholds vary.  Indicators are computed once on
+the full day frame — every indicator in build_indicator_dataframe is causal
+(rolling / EWM / forward supertrend), so row i matches the bar-by-bar
+replay value.
+
+Usage:
+    python param_sweep.py --db-glob "C:\\SQLite\\ticks\\*.db" \\
+        --entries-glob "signals_NSE_NIFTY50-INDEX_*.csv" \\
+        --method lhs --n 1000 --workers 8 --out pm_sweep_results.parquet
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import itertools
+import logging
+import math
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from position_manager import PositionManager
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Parameter spaces
+# ─────────────────────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class ParamRange:
+    """Continuous (or integer) parameter range.
+
+    ``steps`` is the grid resolution; random / LHS sampling draw from the
+    full [low, high] interval.
+    """
+
+    low: float
+    high: float
+    integer: bool = False
+    steps: int = 5
+
+    def grid(self) -> list:
+        vals = np.linspace(self.low, self.high, max(1, self.steps))
+        if self.integer:
+            return sorted({int(round(v)) for v in vals})
+        return [round(float(v), 6) for v in vals]
+
+    def scale(self, u: float):
+        v = self.low + (self.high - self.low) * float(u)
+        return int(round(v)) if self.integer else round(v, 6)
+
+
+# Plain sequences are treated as categorical choices.
+ParamSpace = Dict[str, Any]
+
+
+def _dim_values(dim: Any) -> list:
+    return dim.grid() if isinstance(dim, ParamRange) else list(dim)
+
+
+def _dim_scale(dim: Any, u: float):
+    if isinstance(dim, ParamRange):
+        return dim.scale(u)
+    choices = list(dim)
+    return choices[min(len(choices) - 1, int(u * len(choices)))]
+
+
+def sample_params(
+    space: ParamSpace,
+    method: str = "grid",
+    n: Optional[int] = None,
+    seed: int = 0,
+) -> List[Dict[str, Any]]:
+    """Return parameter sets drawn from ``space``.
+
+    method  "grid"   — full cartesian product (``n`` truncates)
+            "random" — ``n`` independent uniform draws
+            "lhs"    — ``n``-point Latin hypercube (one draw per stratum
+                       per dimension, strata shuffled independently)
+    """
+    names = list(space.keys())
+    method = method.lower()
+
+    if method == "grid":
+        combos = itertools.product(*[_dim_values(space[k]) for k in names])
+        if n:
+            combos = itertools.islice(combos, n)
+        return [dict(zip(names, c)) for c in combos]
+
+    if not n or n <= 0:
+        raise ValueError(f"[SWEEP] method={method} requires n > 0")
+    rng = np.random.default_rng(seed)
+
+    if method == "random":
+        u = rng.random((n, len(names)))
+    elif method == "lhs":
+        u = np.empty((n, len(names)))
+        for j in range(len(names)):
+            u[:, j] = (rng.permutation(n) + rng.random(n)) / n
+    else:
+        raise ValueError(f"[SWEEP] unknown sampling method: {method}")
+
+    return [
+        {k: _dim_scale(space[k], u[i, j]) for j, k in enumerate(names)}
+        for i in range(n)
+    ]
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Shared-memory column store
+# ─────────────────────────────────────────────────────────────────────────────
+
+class SharedArrays:
+    """Named numpy arrays packed into one SharedMemory block.
+
+    The owner creates the block; workers call ``attach(spec)`` with the
+    picklable ``spec`` and get read-only views without copying.
+    """
+
+    def __init__(self, arrays: Dict[str, np.ndarray]):
+        layout = []
+        offset = 0
+        for name, arr in arrays.items():
+            arr = np.ascontiguousarray(arr)
+            offset = (offset + 7) & ~7          # 8-byte alignment per column
+            layout.append((name, arr.dtype.str, arr.shape, offset))
+            offset += arr.nbytes
+        self._shm = shared_memory.SharedMemory(create=True, size=max(offset, 8))
+        for (name, dtype, shape, off), arr in zip(layout, arrays.values()):
+            view = np.ndarray(shape, dtype=dtype, buffer=self._shm.buf, offset=off)
+            view[...] = arr
+        self.spec = (self._shm.name, tuple(layout))
+        self.arrays = self._views(self._shm, layout)
+
+    @staticmethod
+    def _views(shm, layout) -> Dict[str, np.ndarray]:
+        out = {}
+        for name, dtype, shape, off in layout:
+            view = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=off)
+            view.flags.writeable = False
+            out[name] = view
+        return out
+
+    @staticmethod
+    def attach(spec):
+        """Attach to an existing block → (SharedMemory handle, {name: view})."""
+        shm_name, layout = spec
+        shm = shared_memory.SharedMemory(name=shm_name)
+        return shm, SharedArrays._views(shm, layout)
+
+    def close(self) -> None:
+        self.arrays = {}
+        try:
+            self._shm.close()
+        except BufferError:
+            pass        # caller still holds a view; the mapping dies with it
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> "SharedArrays":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Process-pool runner
+# ─────────────────────────────────────────────────────────────────────────────
+
+_WORKER_SHM = None
+_WORKER_ARRAYS: Dict[str, np.ndarray] = {}
+
+
+def _init_worker(spec) -> None:
+    global _WORKER_SHM, _WORKER_ARRAYS
+    # Exit engines log every decision at INFO — far too chatty for 1000s of runs.
+    logging.getLogger().setLevel(logging.WARNING)
+    if spec is not None:
+        _WORKER_SHM, _WORKER_ARRAYS = SharedArrays.attach(spec)
+
+
+def _call_worker(job) -> Dict[str, Any]:
+    evaluate, params = job
+    return evaluate(params, _WORKER_ARRAYS)
+
+
+def run_sweep(
+    evaluate: Callable[[Dict[str, Any], Dict[str, np.ndarray]], Dict[str, Any]],
+    param_sets: Sequence[Dict[str, Any]],
+    shared: Optional[SharedArrays] = None,
+    workers: Optional[int] = None,
+    chunksize: Optional[int] = None,
+    merge_params: bool = True,
+) -> pd.DataFrame:
+    """Evaluate every parameter set and return one results DataFrame.
+
+    evaluate      top-level (picklable) fn(params, arrays) → metrics dict
+    shared        SharedArrays handed to every worker as ``arrays``
+    workers       process count; 0/1 runs in-process (debugging, tests)
+    merge_params  prefix each row with its parameter values
+    """
+    param_sets = list(param_sets)
+    if not param_sets:
+        return pd.DataFrame()
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    jobs = [(evaluate, p) for p in param_sets]
+    t0 = time.perf_counter()
+
+    if workers <= 1:
+        arrays = shared.arrays if shared is not None else {}
+        metrics = [evaluate(p, arrays) for p in param_sets]
+    else:
+        chunksize = chunksize or max(1, len(jobs) // (workers * 4))
+        spec = shared.spec if shared is not None else None
+        with ProcessPoolExecutor(
+            max_workers=workers, initializer=_init_worker, initargs=(spec,)
+        ) as pool:
+            metrics = list(pool.map(_call_worker, jobs, chunksize=chunksize))
+
+    elapsed = time.perf_counter() - t0
+    logging.info(
+        f"[SWEEP] {len(param_sets)} configs evaluated in {elapsed:.1f}s "
+        f"workers={max(1, workers)} ({elapsed / len(param_sets) * 1000:.1f}ms/config)"
+    )
+    if merge_params:
+        rows = [{**p, **m} for p, m in zip(param_sets, metrics)]
+    else:
+        rows = metrics
+    return pd.DataFrame(rows)
+
+
+def write_results_table(df: pd.DataFrame, path: str) -> str:
+    """Write sweep results as one columnar table.
+
+    ``.parquet`` is used when pyarrow/fastparquet is installed; otherwise the
+    table falls back to CSV next to the requested path.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    if path.endswith(".parquet"):
+        try:
+            df.to_parquet(path, index=False)
+            return path
+        except ImportError:
+            path = path[: -len(".parquet")] + ".csv"
+            logging.warning(f"[SWEEP] parquet engine not installed; writing {path}")
+    df.to_csv(path, index=False)
+    return path
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  PositionManager sweep
+# ─────────────────────────────────────────────────────────────────────────────
+
+PM_SWEEP_SPACE: ParamSpace = {
+    "TRAIL_STEP_NORM": ParamRange(0.06, 0.20, steps=4),
+    "TRAIL_MIN_NORM": ParamRange(15.0, 35.0, steps=3),
+    "MAX_HOLD": ParamRange(10, 30, integer=True, steps=5),
+    "HARD_STOP_FRAC": ParamRange(0.30, 0.60, steps=4),
+    "PARTIAL_MIN_PTS": ParamRange(15.0, 40.0, steps=3),
+}
+
+# Numeric feature columns shipped to workers (string columns are coded below).
+_PM_FLOAT_COLS = (
+    "open", "high", "low", "close",
+    "ema9", "ema13", "rsi14", "cci20", "adx14", "atr14", "adx14_15m",
+)
+_BIAS_CODES = {"UP": 1, "DOWN": -1}
+_BIAS_NAMES = {1: "UP", -1: "DOWN", 0: "NEUTRAL"}
+_SLOPE_NAMES = {1: "UP", -1: "DOWN", 0: "FLAT"}
+
+
+class _ArrayRow:
+    """Row adapter over shared columns — quacks like the Series PM.update reads."""
+
+    __slots__ = ("_a", "_i")
+
+    def __init__(self, arrays: Dict[str, np.ndarray], i: int):
+        self._a = arrays
+        self._i = i
+
+    def __getitem__(self, key: str):
+        if key == "supertrend_bias":
+            return _BIAS_NAMES[int(self._a["st_code"][self._i])]
+        if key == "st_bias_15m":
+            return _BIAS_NAMES[int(self._a["st15_code"][self._i])]
+        if key == "st_slope_15m":
+            return _SLOPE_NAMES[int(self._a["st15_slope_code"][self._i])]
+        return float(self._a[key][self._i])
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+
+def _load_day_candles(db_path: str, table: str, symbol: str) -> pd.DataFrame:
+    query = f"""
+        SELECT trade_date || ' ' || ist_slot AS time,
+               open, high, low, close, COALESCE(volume, 0) AS volume
+        FROM {table}
+        WHERE symbol = ?
+        ORDER BY trade_date, ist_slot
+    """
+    try:
+        with sqlite3.connect(db_path) as con:
+            df = pd.read_sql_query(query, con, params=(symbol,))
+    except Exception as e:
+        logging.warning(f"[SWEEP] {os.path.basename(db_path)} {table}: {e}")
+        return pd.DataFrame()
+    if df.empty:
+        return df
+    df["date"] = pd.to_datetime(df["time"]).dt.tz_localize("Asia/Kolkata")
+    return df
+
+
+def _load_entries(entries_glob: str) -> pd.DataFrame:
+    """Normalise run_offline_replay signals_/trades_ CSVs → time, side, premium."""
+    frames = []
+    for path in sorted(glob.glob(entries_glob)):
+        raw = pd.read_csv(path)
+        tcol = "time" if "time" in raw.columns else "entry_time"
+        pcol = "est_premium" if "est_premium" in raw.columns else "entry_premium"
+        if tcol not in raw.columns or pcol not in raw.columns or "side" not in raw.columns:
+            logging.warning(f"[SWEEP] {path}: no entry columns — skipped")
+            continue
+        frames.append(pd.DataFrame({
+            "time": pd.to_datetime(raw[tcol].astype(str).str[:19]),
+            "side": raw["side"].astype(str).str.upper(),
+            "premium": pd.to_numeric(raw[pcol], errors="coerce"),
+        }))
+    if not frames:
+        return pd.DataFrame(columns=["time", "side", "premium"])
+    out = pd.concat(frames, ignore_index=True).dropna()
+    return out.drop_duplicates(subset=["time", "side"]).sort_values("time")
+
+
+def load_pm_dataset(
+    db_glob: str,
+    entries_glob: str,
+    symbol: str = "NSE:NIFTY50-INDEX",
+) -> Dict[str, np.ndarray]:
+    """Build the column arrays evaluated by ``evaluate_pm_params``.
+
+    One pass over every day DB: 3m + 15m candles → indicators → 15m context
+    aligned onto 3m bars (last 15m bar whose time ≤ 3m bar time, as in the
+    replay loop).  Entries are matched to bars by timestamp.
+    """
+    from orchestration import build_indicator_dataframe
+
+    entries = _load_entries(entries_glob)
+    days = []
+    for db_path in sorted(glob.glob(db_glob)):
+        m = re.search(r"ticks_(\d{4}-\d{2}-\d{2})\.db$", db_path)
+        df3 = _load_day_candles(db_path, "candles_3m_ist", symbol)
+        if df3.empty:
+            continue
+        if m:
+            df3 = df3[df3["time"].str.startswith(m.group(1))]
+        if len(df3) < 20:
+            continue
+        df3 = build_indicator_dataframe(symbol, df3.reset_index(drop=True), interval="3m")
+        df15 = _load_day_candles(db_path, "candles_15m_ist", symbol)
+        if not df15.empty:
+            df15 = build_indicator_dataframe(symbol, df15, interval="15m")
+            ctx = df15[["date", "supertrend_bias", "supertrend_slope", "adx14"]].rename(
+                columns={
+                    "supertrend_bias": "st_bias_15m",
+                    "supertrend_slope": "st_slope_15m",
+                    "adx14": "adx14_15m",
+                }
+            )
+            df3 = pd.merge_asof(df3.sort_values("date"), ctx.sort_values("date"), on="date")
+        for col, fill in (("st_bias_15m", "NEUTRAL"), ("st_slope_15m", "FLAT")):
+            df3[col] = df3[col].fillna(fill) if col in df3.columns else fill
+        if "adx14_15m" not in df3.columns:
+            df3["adx14_15m"] = np.nan
+        days.append(df3)
+
+    if not days:
+        raise ValueError(f"[SWEEP] no 3m candles found for {symbol} in {db_glob}")
+
+    bars = pd.concat(days, ignore_index=True)
+    ts = pd.to_datetime(bars["time"])
+    day_id = pd.factorize(ts.dt.normalize())[0].astype(np.int32)
+    day_end = bars.groupby(day_id).cumcount(ascending=False).to_numpy() + np.arange(len(bars))
+
+    arrays: Dict[str, np.ndarray] = {
+        c: pd.to_numeric(bars[c], errors="coerce").to_numpy(np.float64)
+        for c in _PM_FLOAT_COLS
+    }
+    arrays["minute"] = (ts.dt.hour * 60 + ts.dt.minute).to_numpy(np.int16)
+    arrays["day_end"] = day_end.astype(np.int32)
+    arrays["st_code"] = bars["supertrend_bias"].map(_BIAS_CODES).fillna(0).to_numpy(np.int8)
+    arrays["st15_code"] = bars["st_bias_15m"].map(_BIAS_CODES).fillna(0).to_numpy(np.int8)
+    arrays["st15_slope_code"] = bars["st_slope_15m"].map(_BIAS_CODES).fillna(0).to_numpy(np.int8)
+
+    # Match entries to bars on exact bar timestamp.
+    bar_pos = pd.Series(np.arange(len(bars)), index=ts.to_numpy())
+    bar_pos = bar_pos[~bar_pos.index.duplicated()]
+    rows = bar_pos.reindex(entries["time"].to_numpy()).to_numpy()
+    ok = ~np.isnan(rows)
+    arrays["entry_row"] = rows[ok].astype(np.int32)
+    arrays["entry_side"] = np.where(entries["side"].to_numpy()[ok] == "PUT", -1, 1).astype(np.int8)
+    arrays["entry_premium"] = entries["premium"].to_numpy(np.float64)[ok]
+
+    logging.info(
+        f"[SWEEP] dataset: {len(days)} days {len(bars)} bars "
+        f"{int(ok.sum())}/{len(entries)} entries matched"
+    )
+    return arrays
+
+
+def _max_drawdown(pnl: np.ndarray) -> float:
+    if pnl.size == 0:
+        return 0.0
+    equity = np.cumsum(pnl)
+    return float(np.max(np.maximum.accumulate(np.maximum(equity, 0.0)) - equity))
+
+
+def evaluate_pm_params(
+    params: Dict[str, Any],
+    arrays: Dict[str, np.ndarray],
+) -> Dict[str, Any]:
+    """Replay every fixed entry through a PositionManager configured by ``params``.
+
+    ``params`` keys are PositionManager class constants (overridden on the
+    instance, exactly like apply_day_type_to_pm).  Entries that fall inside
+    a still-open trade are skipped — PM allows one position at a time.
+    """
+    close = arrays["close"]
+    minute = arrays["minute"]
+    day_end = arrays["day_end"]
+    pnl: List[float] = []
+    bars_held: List[int] = []
+    reasons: Dict[str, int] = {}
+    busy_until = -1
+
+    for row, side_code, prem in zip(
+        arrays["entry_row"], arrays["entry_side"], arrays["entry_premium"]
+    ):
+        row = int(row)
+        if row <= busy_until:
+            continue
+        pm = PositionManager(mode="REPLAY")
+        for k, v in params.items():
+            setattr(pm, k, v)
+        atr = float(arrays["atr14"][row])
+        pm.open(row, _bar_label(minute[row]), float(close[row]), float(prem), {
+            "side": "CALL" if side_code > 0 else "PUT",
+            "atr": atr if math.isfinite(atr) else None,
+        })
+        last = int(day_end[row])
+        record = None
+        for i in range(row + 1, last + 1):
+            decision = pm.update(i, _bar_label(minute[i]), float(close[i]), _ArrayRow(arrays, i))
+            if decision.should_exit:
+                record = pm.close(i, _bar_label(minute[i]), float(close[i]),
+                                  decision.exit_px, decision.reason)
+                break
+        if record is None:
+            record = pm.force_close_eod(last, _bar_label(minute[last]), float(close[last]))
+        busy_until = int(record["exit_bar"])
+        pnl.append(record["pnl_points"])
+        bars_held.append(record["bars_held"])
+        tag = record["exit_reason"].split()[0] if record["exit_reason"] else "UNKNOWN"
+        reasons[tag] = reasons.get(tag, 0) + 1
+
+    p = np.asarray(pnl, dtype=np.float64)
+    gains, losses = p[p > 0].sum(), -p[p < 0].sum()
+    return {
+        "trades": int(p.size),
+        "win_rate": float((p > 0).mean() * 100.0) if p.size else 0.0,
+        "avg_pnl_pts": float(p.mean()) if p.size else 0.0,
+        "total_pnl_pts": float(p.sum()),
+        "profit_factor": float(gains / losses) if losses > 0 else float("inf") if gains > 0 else 0.0,
+        "max_dd_pts": _max_drawdown(p),
+        "avg_bars_held": float(np.mean(bars_held)) if bars_held else 0.0,
+        "exit_reasons": "; ".join(f"{k}:{v}" for k, v in sorted(reasons.items())),
+    }
+
+
+def _bar_label(minute_of_day) -> str:
+    m = int(minute_of_day)
+    return f"{m // 60:02d}:{m % 60:02d}"
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  CLI
+# ─────────────────────────────────────────────────────────────────────────────
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Parallel PositionManager exit-threshold sweep")
+    parser.add_argument("--db-glob", default=r"C:\SQLite\ticks\ticks_*.db")
+    parser.add_argument("--entries-glob", default="signals_*.csv",
+                        help="signals_/trades_ CSVs from run_offline_replay (fixed entries)")
+    parser.add_argument("--symbol", default="NSE:NIFTY50-INDEX")
+    parser.add_argument("--method", choices=["grid", "random", "lhs"], default="lhs")
+    parser.add_argument("--n", type=int, default=1000, help="configs for random/lhs (grid cap)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out", default="pm_sweep_results.parquet")
+    return parser.parse_args()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    args = parse_args()
+    arrays = load_pm_dataset(args.db_glob, args.entries_glob, args.symbol)
+    params = sample_params(PM_SWEEP_SPACE, args.method, n=args.n, seed=args.seed)
+    logging.getLogger().setLevel(logging.WARNING)
+    with SharedArrays(arrays) as shared:
+        results = run_sweep(evaluate_pm_params, params, shared=shared, workers=args.workers)
+    results.sort_values(["total_pnl_pts", "win_rate"], ascending=False, inplace=True)
+    path = write_results_table(results, args.out)
+    print(results.head(10).to_string(index=False))
+    print(f"\nSweep results ({len(results)} configs) → {path}")
+
+
+if __name__ == "__main__":
+    main()
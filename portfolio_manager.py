@@ -0,0 +1,597 @@
+# ============================================================
+#  portfolio_manager.py — Multi-position exit engine
+#  N concurrent option positions on top of PositionManager rules
+# ============================================================
+"""
+PositionManager tracks exactly one trade (``self._t``), so running a scalp
+next to a trend position — or several underlyings — meant one PM per leg
+and duplicated global state.  PortfolioManager manages N positions keyed by
+an id and evaluates ALL open positions in one vectorized pass per bar/tick.
+
+Layout
+──────
+Hot per-position state lives in a struct-of-arrays (one numpy array per
+field, one slot per position): entry / peak / stops / bars held / trail
+state / momentum + ATR memory / breakout-hold counters.  Cold, per-trade
+descriptive fields (entry time, option name, source, ...) stay in a plain
+dict per slot and are only touched on open/close.  Freed slots are reused;
+arrays double in capacity when full.
+
+Rules
+─────
+update() applies PositionManager.update() rule-for-rule, in the same order
+and with the same first-match semantics, using boolean masks instead of
+early returns:
+
+  TIER 1   HARD_STOP · HARD_STOP_UL · TRAIL_STOP · EOD_EXIT · EOD_PRE_EXIT
+           · MAX_HOLD · (MIN_HOLD gate)
+  v7-v9    LOSS_CUT · QUICK_PROFIT · TIME_QUICK_PROFIT · DRAWDOWN_EXIT
+           · STALE_TRADE · BREAKOUT_HOLD (state only)
+
+Tunable constants are read from a PositionManager instance (``self.pm``),
+so per-session overrides such as apply_day_type_to_pm(pm, ...) apply to
+the whole portfolio.
+
+The per-update cost is a fixed number of numpy operations over the open
+slots, so it stays flat from 1 to ~50 positions; exits come back as one
+batch of (position_id, ExitDecision) pairs.
+
+Usage
+─────
+    book = PortfolioManager(mode="REPLAY", lot_size=130)
+    book.open("trend-1", i, bar_time, close, premium, signal)
+    book.open("scalp-1", i, bar_time, close, premium, scalp_signal)
+    for pos_id, decision in book.update(i, bar_time, close, row):
+        trade_log.append(book.close(pos_id, i, bar_time, close,
+                                    decision.exit_px, decision.reason))
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from position_manager import BarRecord, ExitDecision, PositionManager
+
+GREEN  = "\033[92m"
+YELLOW = "\033[93m"
+CYAN   = "\033[96m"
+RED    = "\033[91m"
+RESET  = "\033[0m"
+
+DEFAULT_SYMBOL = "NSE:NIFTY50-INDEX"
+
+# Hot state: field → (dtype, initial value)
+_FIELDS: Dict[str, Tuple[Any, Any]] = {
+    "active"        : (np.bool_,   False),
+    "sym"           : (np.int32,   -1),
+    "sign"          : (np.float64, 1.0),      # +1 CALL, -1 PUT
+    "entry_ul"      : (np.float64, np.nan),
+    "entry_px"      : (np.float64, np.nan),
+    "peak_px"       : (np.float64, np.nan),
+    "peak_ul"       : (np.float64, np.nan),
+    "bars_held"     : (np.int32,   0),
+    "hard_stop"     : (np.float64, np.nan),
+    "hard_stop_ul"  : (np.float64, np.nan),   # NaN until partial exit
+    "trail_active"  : (np.bool_,   False),
+    "trail_stop"    : (np.float64, np.nan),
+    "trail_step"    : (np.float64, np.nan),
+    "trail_min"     : (np.float64, np.nan),
+    "trail_updates" : (np.int32,   0),
+    "max_hold"      : (np.int32,   0),
+    "mom_fail_bars" : (np.int32,   0),
+    "prev_ema_gap"  : (np.float64, np.nan),
+    "prev_close"    : (np.float64, np.nan),
+    "half_qty"      : (np.bool_,   False),
+    "r4"            : (np.float64, np.nan),
+    "s4"            : (np.float64, np.nan),
+    "sustain_bars"  : (np.int32,   0),
+    "hold_active"   : (np.bool_,   False),
+    "peak_cci"      : (np.float64, 0.0),
+}
+
+
+class PortfolioManager:
+    """
+    N concurrent long-option positions (CALL / PUT) keyed by id, evaluated
+    together each bar.  Exit rules and constants are PositionManager's.
+    """
+
+    def __init__(
+        self,
+        mode           : str                = "REPLAY",
+        lot_size       : int                = 50,
+        broker_exit_fn : Optional[Callable] = None,
+        capacity       : int                = 16,
+    ):
+        """
+        Parameters
+        ──────────
+        mode            "REPLAY" | "PAPER" | "LIVE"
+        lot_size        NSE lot size (default 50 for NIFTY)
+        broker_exit_fn  Callable(symbol, qty, reason) → (bool, order_id)
+        capacity        initial slot count (grows by doubling)
+        """
+        self.pm             = PositionManager(mode=mode, lot_size=lot_size)
+        self.mode           = self.pm.mode
+        self.lot_size       = lot_size
+        self.broker_exit_fn = broker_exit_fn
+        self._cap           = 0
+        self._s       : Dict[str, np.ndarray]     = {}
+        self._free    : List[int]                 = []
+        self._slot_of : Dict[str, int]            = {}
+        self._meta    : Dict[int, Dict[str, Any]] = {}
+        self._sym_ids : Dict[str, int]            = {}
+        self._grow(max(1, capacity))
+
+    # ── Capacity ──────────────────────────────────────────────────────────────
+
+    def _grow(self, new_cap: int) -> None:
+        for name, (dtype, init) in _FIELDS.items():
+            arr = np.full(new_cap, init, dtype=dtype)
+            if name in self._s:
+                arr[: self._cap] = self._s[name]
+            self._s[name] = arr
+        self._free.extend(range(new_cap - 1, self._cap - 1, -1))
+        self._cap = new_cap
+
+    def _alloc(self) -> int:
+        if not self._free:
+            self._grow(self._cap * 2)
+        return self._free.pop()
+
+    # ── Queries ───────────────────────────────────────────────────────────────
+
+    def __len__(self) -> int:
+        return len(self._slot_of)
+
+    def is_open(self, pos_id: Optional[str] = None) -> bool:
+        """True when ``pos_id`` is open (or, with no id, when any position is)."""
+        return bool(self._slot_of) if pos_id is None else pos_id in self._slot_of
+
+    def open_ids(self, symbol: Optional[str] = None) -> List[str]:
+        if symbol is None:
+            return list(self._slot_of)
+        return [p for p, k in self._slot_of.items() if self._meta[k]["symbol"] == symbol]
+
+    def state(self, pos_id: str) -> Dict[str, Any]:
+        """Hot + cold state of one position as a dict (PositionManager._t style)."""
+        k = self._slot_of[pos_id]
+        out = {name: arr[k].item() for name, arr in self._s.items()}
+        out.update(self._meta[k])
+        return out
+
+    # ── Lifecycle ─────────────────────────────────────────────────────────────
+
+    def open(
+        self,
+        pos_id        : str,
+        bar_idx       : int,
+        bar_time      : Any,
+        underlying    : float,
+        entry_premium : float,
+        signal        : Dict[str, Any],
+        symbol        : str = DEFAULT_SYMBOL,
+    ) -> None:
+        """
+        Record a new entry under ``pos_id``.  Raises RuntimeError if the id is
+        already open.  ``signal`` is the PositionManager.open() signal dict;
+        optional 'r4' / 's4' arm the BREAKOUT_HOLD rule.
+        """
+        if pos_id in self._slot_of:
+            raise RuntimeError(f"[PORTFOLIO] open() called for already-open id={pos_id}")
+
+        side = signal["side"].upper()
+        assert side in ("CALL", "PUT"), f"Invalid side: {side}"
+
+        pm       = self.pm
+        atr_val  = signal.get("atr") or signal.get("atr14")
+        cpr_w    = signal.get("cpr_width", "NORMAL")
+        day_type = signal.get("day_type",  "UNKNOWN")
+
+        k = self._alloc()
+        s = self._s
+        for name, (_, init) in _FIELDS.items():
+            s[name][k] = init
+        s["active"][k]     = True
+        s["sym"][k]        = self._sym_ids.setdefault(symbol, len(self._sym_ids))
+        s["sign"][k]       = 1.0 if side == "CALL" else -1.0
+        s["entry_ul"][k]   = underlying
+        s["entry_px"][k]   = entry_premium
+        s["peak_px"][k]    = entry_premium
+        s["peak_ul"][k]    = underlying
+        s["hard_stop"][k]  = entry_premium * pm.HARD_STOP_FRAC
+        s["trail_step"][k] = pm._trail_step_for_atr(atr_val)
+        s["trail_min"][k]  = pm._trail_min_for_context(atr_val, cpr_w, day_type)
+        s["max_hold"][k]   = pm._max_hold_for_context(cpr_w, day_type)
+        s["r4"][k]         = float(signal.get("r4", float("nan")) or float("nan"))
+        s["s4"][k]         = float(signal.get("s4", float("nan")) or float("nan"))
+
+        self._meta[k] = {
+            "id"          : pos_id,
+            "symbol"      : symbol,
+            "side"        : side,
+            "entry_bar"   : bar_idx,
+            "entry_time"  : bar_time,
+            "score"       : signal.get("score",       0),
+            "source"      : signal.get("source",      "?"),
+            "pivot_reason": signal.get("pivot_reason", signal.get("pivot", "")),
+            "option_name" : signal.get("option_name", ""),
+            "entry_type"  : signal.get("entry_type",  "?"),
+            "day_type"    : day_type,
+            "cpr_width"   : cpr_w,
+        }
+        self._slot_of[pos_id] = k
+
+        logging.info(
+            f"{GREEN}[PORTFOLIO OPEN][{self.mode}] id={pos_id} {symbol} {side} "
+            f"bar={bar_idx} {bar_time} underlying={underlying:.2f} "
+            f"premium={entry_premium:.2f} max_hold={int(s['max_hold'][k])}bars "
+            f"trail_min={s['trail_min'][k]:.0f}pts open={len(self._slot_of)}{RESET}"
+        )
+
+    def update(
+        self,
+        bar_idx    : int,
+        bar_time   : Any,
+        underlying : float,
+        row        : Any,
+        symbol     : str = DEFAULT_SYMBOL,
+        ltp        : Optional[Mapping[str, float]] = None,
+    ) -> List[Tuple[str, ExitDecision]]:
+        """
+        Evaluate exit conditions for every open position on ``symbol``.
+
+        underlying  spot close (REPLAY) or option LTP (LIVE/PAPER), as for
+                    PositionManager.update()
+        row         BarRecord (or Series / dict, adapted) shared by the
+                    symbol's positions
+        ltp         LIVE/PAPER only: per-position option LTP by id; overrides
+                    ``underlying`` for those positions
+
+        Returns the batch of (pos_id, ExitDecision) for positions that should
+        exit this bar (QUICK_PROFIT / TIME_QUICK_PROFIT are 50% exits: the
+        position stays open with its stop moved to breakeven).
+        """
+        sym_id = self._sym_ids.get(symbol)
+        if sym_id is None:
+            return []
+        s   = self._s
+        idx = np.flatnonzero(s["active"] & (s["sym"] == sym_id))
+        if idx.size == 0:
+            return []
+
+        pm      = self.pm
+        sign    = s["sign"][idx]
+        ep      = s["entry_px"][idx]
+        e_ul    = s["entry_ul"][idx]
+        u       = np.full(idx.size, float(underlying))
+        if ltp and self.mode != "REPLAY":
+            for j, k in enumerate(idx):
+                px = ltp.get(self._meta[k]["id"])
+                if px is not None:
+                    u[j] = px
+
+        bar     = BarRecord.from_row(row)
+        cci     = bar.cci20 if math.isfinite(bar.cci20) else 0.0
+        bar_min = pm._bar_minutes(bar_time)
+
+        # ATR-adaptive trail step (same value for every position on the symbol)
+        atr = bar.atr14
+        if math.isfinite(atr) and atr > 0:
+            s["trail_step"][idx] = pm._trail_step_for_atr(atr)
+        trail_step = s["trail_step"][idx]
+
+        # Adaptive delta + option LTP simulation
+        ul_move = (u - e_ul) * sign
+        delta   = np.clip(pm.DELTA_ENTRY + pm.DELTA_PER_POINT * ul_move, pm.DELTA_MIN, pm.DELTA_MAX)
+        if self.mode == "REPLAY":
+            cur = np.maximum(0.1, ep + delta * ul_move)
+        else:
+            cur = np.maximum(0.1, u)
+
+        bars_held = s["bars_held"][idx] + 1
+        s["bars_held"][idx] = bars_held
+        peak_px = np.maximum(s["peak_px"][idx], cur)
+        s["peak_px"][idx] = peak_px
+        peak_ul = np.where(sign > 0, np.maximum(s["peak_ul"][idx], u),
+                           np.minimum(s["peak_ul"][idx], u))
+        s["peak_ul"][idx] = peak_ul
+
+        peak_gain    = peak_px - ep
+        cur_gain     = cur - ep
+        ul_peak_move = (peak_ul - e_ul) * sign
+        if math.isfinite(cci):
+            s["peak_cci"][idx] = np.maximum(s["peak_cci"][idx], abs(cci))
+
+        n      = idx.size
+        tag    = np.full(n, "", dtype=object)
+        live   = np.ones(n, dtype=bool)          # still being evaluated
+
+        def _fire(mask: np.ndarray, name: str) -> None:
+            hit = live & mask
+            tag[hit] = name
+            live[hit] = False
+
+        # ── TIER 1 ────────────────────────────────────────────────────────────
+        _fire(cur <= s["hard_stop"][idx], "HARD_STOP")
+
+        hs_ul = s["hard_stop_ul"][idx]
+        with np.errstate(invalid="ignore"):
+            _fire(~np.isnan(hs_ul) & ((u - hs_ul) * sign < 0), "HARD_STOP_UL")
+
+        trail_active = s["trail_active"][idx]
+        trail_min    = s["trail_min"][idx]
+        arm = live & ~trail_active & (ul_peak_move >= trail_min)
+        if arm.any():
+            trail_active = trail_active | arm
+            s["trail_active"][idx[arm]] = True
+            first = np.maximum(ep * 0.50, ep + delta * ul_peak_move * (1.0 - trail_step))
+            s["trail_stop"][idx[arm]] = first[arm]
+
+        trailing = live & trail_active
+        if trailing.any():
+            mom_ok = self._momentum_ok(idx, trailing, bar, sign)
+            mfb = np.where(mom_ok, 0, s["mom_fail_bars"][idx] + 1)
+            s["mom_fail_bars"][idx[trailing]] = mfb[trailing]
+            step = np.where(mfb >= pm.MOM_FAIL_BARS,
+                            np.maximum(trail_step * 0.80, pm.TRAIL_STEP_LOW), trail_step)
+            new_trail = np.maximum(ep * 0.50, ep + delta * ul_peak_move * (1.0 - step))
+            trail_stop = s["trail_stop"][idx]
+            raise_it = trailing & (new_trail > trail_stop)
+            s["trail_stop"][idx[raise_it]] = new_trail[raise_it]
+            s["trail_updates"][idx[raise_it]] += 1
+            trail_stop = np.where(raise_it, new_trail, trail_stop)
+            _fire(trailing & (cur <= trail_stop), "TRAIL_STOP")
+
+        if bar_min >= pm.EOD_MIN:
+            _fire(live, "EOD_EXIT")
+        if bar_min >= pm.EOD_MIN - pm.PRE_EOD_BARS * 3:
+            _fire(cur_gain < 0, "EOD_PRE_EXIT")
+
+        max_cap = s["max_hold"][idx] + np.where(
+            trail_active & (cur_gain >= ep * 0.40), pm.MAX_HOLD_EXT, 0
+        )
+        _fire(bars_held >= max_cap, "MAX_HOLD")
+
+        live &= bars_held >= pm.MIN_HOLD
+        loss_cut = np.full(n, float(pm.LOSS_CUT_PTS_BASE))
+
+        # ── v7-v9 strategic rules ─────────────────────────────────────────────
+        if live.any():
+            atr_val = self._bar_atr(idx, live, bar)
+            sustain_required = np.maximum(
+                pm.BREAKOUT_SUSTAIN_BASE,
+                pm.BREAKOUT_SUSTAIN_BASE + np.ceil(atr_val / pm.BREAKOUT_SUSTAIN_SCALE),
+            )
+            loss_cut[:] = np.where(
+                atr_val > 0,
+                np.maximum(pm.LOSS_CUT_PTS_CAP, np.minimum(pm.LOSS_CUT_PTS_BASE, -pm.LOSS_CUT_SCALE * atr_val)),
+                pm.LOSS_CUT_PTS_BASE,
+            )
+            quick_profit = np.where(
+                atr_val > 0, np.minimum(pm.QUICK_PROFIT_UL_PTS_BASE, pm.QUICK_PROFIT_SCALE * atr_val),
+                pm.QUICK_PROFIT_UL_PTS_BASE,
+            )
+
+            _fire((bars_held <= pm.LOSS_CUT_MAX_BARS) & (cur_gain < loss_cut), "LOSS_CUT")
+
+            half = s["half_qty"][idx]
+            _fire(~half & (ul_peak_move >= quick_profit), "QUICK_PROFIT")
+            _fire(~half & (bars_held >= pm.TIME_QUICK_PROFIT_MAX)
+                  & (cur_gain >= pm.TIME_QUICK_PROFIT_MIN_GAIN), "TIME_QUICK_PROFIT")
+            partial = (tag == "QUICK_PROFIT") | (tag == "TIME_QUICK_PROFIT")
+            if partial.any():
+                ks = idx[partial]
+                s["half_qty"][ks]     = True
+                s["hard_stop"][ks]    = s["entry_px"][ks]
+                s["hard_stop_ul"][ks] = s["entry_ul"][ks]
+
+            drawdown = np.where(peak_gain > 0, peak_gain - cur_gain, 0.0)
+            _fire((peak_gain >= pm.DRAWDOWN_MIN_PEAK) & (drawdown >= pm.DRAWDOWN_THRESHOLD_BASE),
+                  "DRAWDOWN_EXIT")
+            _fire((bars_held >= pm.STALE_TRADE_BARS) & (peak_gain < pm.STALE_TRADE_MIN_PEAK)
+                  & (cur_gain <= pm.STALE_TRADE_CUR_LOSS), "STALE_TRADE")
+
+            # BREAKOUT_HOLD — state only; never exits
+            if live.any():
+                r4, s4 = s["r4"][idx], s["s4"][idx]
+                with np.errstate(invalid="ignore"):
+                    beyond = np.where(sign > 0, np.isfinite(r4) & (u >= r4),
+                                      np.isfinite(s4) & (u <= s4))
+                ks_in, ks_out = idx[live & beyond], idx[live & ~beyond]
+                s["sustain_bars"][ks_in] += 1
+                s["hold_active"][ks_in] |= (
+                    s["sustain_bars"][ks_in] >= sustain_required[live & beyond]
+                )
+                s["sustain_bars"][ks_out] = 0
+                s["hold_active"][ks_out]  = False
+
+        # ── Exit batch ────────────────────────────────────────────────────────
+        out: List[Tuple[str, ExitDecision]] = []
+        for j in np.flatnonzero(tag != ""):
+            name, k = tag[j], idx[j]
+            cg, pg, bh, px = float(cur_gain[j]), float(peak_gain[j]), int(bars_held[j]), float(cur[j])
+            if name == "QUICK_PROFIT":
+                reason = (
+                    f"QUICK_PROFIT | ul_peak=+{ul_peak_move[j]:.1f}pts | "
+                    f"50% booked at {px:.2f} | stop->BE"
+                )
+                bd = {"rule": "QUICK_PROFIT", "action": "50%_booked"}
+            elif name == "TIME_QUICK_PROFIT":
+                reason = (
+                    f"TIME_EXIT | bars_held={bh}(>={pm.TIME_QUICK_PROFIT_MAX}) | "
+                    f"gain={cg:.2f}pts(>={pm.TIME_QUICK_PROFIT_MIN_GAIN}) | "
+                    f"capital release at {px:.2f}"
+                )
+                bd = {"rule": "TIME_QUICK_PROFIT", "action": "capital_urgency"}
+            else:
+                detail = self._hard_detail(
+                    name, k, px, float(u[j]), float(ep[j]), float(ul_peak_move[j]),
+                    float(trail_step[j]), bar_min, int(max_cap[j]), cg, pg, bh,
+                    float(loss_cut[j]) if name == "LOSS_CUT" else 0.0,
+                )
+                reason = f"{name} | {detail} | gain={cg:+.1f}pts peak=+{pg:.1f}pts"
+                bd = {"HARD": name}
+            out.append((self._meta[k]["id"], ExitDecision(
+                should_exit=True, reason=reason, exit_px=px, cur_gain=cg,
+                peak_gain=pg, bars_held=bh, exit_score=0, exit_bd=bd,
+            )))
+        if out:
+            logging.info(
+                f"{CYAN}[PORTFOLIO EXITS] bar={bar_idx} {bar_time} {symbol} "
+                f"open={n} exits={len(out)} "
+                + " ".join(f"{p}:{d.reason.split(' |')[0]}" for p, d in out)
+                + RESET
+            )
+        return out
+
+    def close(
+        self,
+        pos_id    : str,
+        bar_idx   : int,
+        bar_time  : Any,
+        underlying: float,
+        exit_px   : float,
+        reason    : str,
+        qty       : Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Close ``pos_id`` and return a PositionManager.close()-style record."""
+        if pos_id not in self._slot_of:
+            raise RuntimeError(f"[PORTFOLIO] close() called for unknown id={pos_id}")
+        k    = self._slot_of.pop(pos_id)
+        s    = self._s
+        meta = self._meta.pop(k)
+        ep   = float(s["entry_px"][k])
+        qty  = qty or self.lot_size
+
+        pnl_pts = exit_px - ep
+        pnl_val = pnl_pts * qty
+
+        if self.mode in ("LIVE", "PAPER") and self.broker_exit_fn is not None:
+            opt_name = meta.get("option_name", "?")
+            ok, order_id = self.broker_exit_fn(opt_name, qty, reason)
+            if not ok:
+                logging.error(f"{RED}[PORTFOLIO] broker_exit_fn failed: {opt_name}{RESET}")
+
+        logging.info(
+            f"{GREEN if pnl_pts >= 0 else RED}[PORTFOLIO EXIT] id={pos_id} "
+            f"{meta['symbol']} {meta['side']} bar={bar_idx} {bar_time} "
+            f"prem {ep:.2f}->{exit_px:.2f} P&L={pnl_pts:+.2f}pts ({pnl_val:+.0f}Rs) "
+            f"held={int(s['bars_held'][k])}bars reason={(reason or 'UNKNOWN').split()[0]}{RESET}"
+        )
+
+        record = {
+            "mode"          : self.mode,
+            "position_id"   : pos_id,
+            "symbol"        : meta["symbol"],
+            "side"          : meta["side"],
+            "source"        : meta["source"],
+            "score"         : meta["score"],
+            "pivot_reason"  : meta["pivot_reason"],
+            "option_name"   : meta["option_name"],
+            "entry_type"    : meta["entry_type"],
+            "day_type"      : meta["day_type"],
+            "cpr_width"     : meta["cpr_width"],
+            "entry_bar"     : meta["entry_bar"],
+            "entry_time"    : meta["entry_time"],
+            "exit_bar"      : bar_idx,
+            "exit_time"     : bar_time,
+            "bars_held"     : int(s["bars_held"][k]),
+            "entry_ul"      : float(s["entry_ul"][k]),
+            "exit_ul"       : underlying,
+            "entry_premium" : ep,
+            "exit_premium"  : exit_px,
+            "peak_premium"  : float(s["peak_px"][k]),
+            "exit_reason"   : reason[:100],
+            "partial_done"  : bool(s["half_qty"][k]),
+            "half_qty_done" : bool(s["half_qty"][k]),
+            "trail_active"  : bool(s["trail_active"][k]),
+            "trail_updates" : int(s["trail_updates"][k]),
+            "peak_cci"      : float(s["peak_cci"][k]),
+            "pnl_points"    : round(pnl_pts, 2),
+            "pnl_value"     : round(pnl_val, 2),
+            "pnl_pct"       : round(pnl_pts / ep * 100, 1) if ep else 0,
+            "lot_size"      : qty,
+        }
+        s["active"][k] = False
+        self._free.append(k)
+        return record
+
+    # ── Vectorized helpers ────────────────────────────────────────────────────
+
+    def _hard_detail(
+        self, name: str, k: int, cur: float, underlying: float, ep: float,
+        ul_peak_move: float, trail_step: float, bar_min: int, max_cap: int,
+        cur_gain: float, peak_gain: float, bars_held: int, loss_cut: float,
+    ) -> str:
+        """Detail text of PositionManager._hard_exit() for rule ``name``."""
+        pm, s = self.pm, self._s
+        eod = f"{pm.EOD_MIN//60:02d}:{pm.EOD_MIN%60:02d}"
+        if name == "HARD_STOP":
+            return (f"LTP={cur:.1f} ≤ hard_stop={s['hard_stop'][k]:.1f} "
+                    f"(entry={ep:.1f}×{pm.HARD_STOP_FRAC:.0%})")
+        if name == "HARD_STOP_UL":
+            return (f"UL={underlying:.1f} breached breakeven "
+                    f"hard_stop_ul={s['hard_stop_ul'][k]:.1f} "
+                    f"(post-partial breakeven guard)")
+        if name == "TRAIL_STOP":
+            return (f"LTP={cur:.1f} ≤ trail={s['trail_stop'][k]:.1f} "
+                    f"ul_peak=+{ul_peak_move:.1f}pts step={trail_step:.0%} "
+                    f"mom_fail_bars={s['mom_fail_bars'][k]} "
+                    f"updates={s['trail_updates'][k]}")
+        if name == "EOD_EXIT":
+            return f"Time={bar_min//60:02d}:{bar_min%60:02d} ≥ EOD {eod}"
+        if name == "EOD_PRE_EXIT":
+            return (f"Pre-EOD safety: {pm.PRE_EOD_BARS} bars to EOD {eod}, "
+                    f"cur_gain={cur_gain:.1f}pts")
+        if name == "MAX_HOLD":
+            meta = self._meta[k]
+            return (f"bars_held={bars_held} ≥ max_cap={max_cap} "
+                    f"(cpr={meta['cpr_width']} day={meta['day_type']})")
+        if name == "LOSS_CUT":
+            return (f"Loss cut: gain={cur_gain:.2f}pts < {loss_cut:.2f}pts (ATR-scaled) "
+                    f"within {bars_held} bars (prevents further deterioration)")
+        if name == "DRAWDOWN_EXIT":
+            return (f"Drawdown protection: peak={peak_gain:.2f}pts -> cur={cur_gain:.2f}pts "
+                    f"(drawdown={peak_gain - cur_gain:.2f}pts >= {pm.DRAWDOWN_THRESHOLD_BASE}pts threshold)")
+        return (f"Stale trade: never profitable after {bars_held} bars "
+                f"(peak={peak_gain:.2f}pts, cur={cur_gain:.2f}pts)")
+
+    def _momentum_ok(
+        self, idx: np.ndarray, mask: np.ndarray, bar: BarRecord, sign: np.ndarray
+    ) -> np.ndarray:
+        """PositionManager._momentum_ok_from_row for the ``mask`` slots."""
+        e9, e13, cl = bar.ema9, bar.ema13, bar.close
+        if not (math.isfinite(e9) and math.isfinite(e13) and math.isfinite(cl)):
+            return np.ones(idx.size, dtype=bool)
+
+        gap      = e9 - e13
+        gap_prev = self._s["prev_ema_gap"][idx]
+        self._s["prev_ema_gap"][idx[mask]] = gap
+        call = sign > 0
+        aligned  = np.where(call, e9 > e13, e9 < e13)
+        close_ok = np.where(call, cl > e9 and cl > e13, cl < e9 and cl < e13)
+        with np.errstate(invalid="ignore"):
+            widening = np.where(
+                np.isnan(gap_prev), True, np.where(call, gap > gap_prev, gap < gap_prev)
+            )
+        return aligned & close_ok & widening
+
+    def _bar_atr(self, idx: np.ndarray, mask: np.ndarray, bar: BarRecord) -> np.ndarray:
+        """PositionManager._calculate_atr (per-position prev_close) for ``mask`` slots."""
+        h, l, c = bar.high, bar.low, bar.close
+        prev = self._s["prev_close"][idx]
+        rng  = h - l
+        no_prev = rng if rng > 0 else 10.0
+        with np.errstate(invalid="ignore"):
+            tr = np.where(
+                np.isfinite(prev),
+                np.maximum(rng, np.maximum(np.abs(h - prev), np.abs(l - prev))),
+                no_prev,
+            )
+        self._s["prev_close"][idx[mask]] = c
+        return np.maximum(tr, 5.0)
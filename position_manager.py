@@ -62,6 +62,8 @@ v3 fixes vs v2:
  FIX 2 [CRITICAL] Adaptive delta replaces DELTA_APPROX=0.50 constant.
         delta(ul_move) = 0.50 + 0.002×ul_move, capped [0.25, 0.85].
         Prevents undervaluing ITM options → fewer false HARD_STOP triggers.
+        When the live Greeks surface (greeks_surface) has the traded
+        contract, its delta is used instead (see _adaptive_delta).
  FIX 3 [HIGH]     TRAIL_MIN_PTS raised and made adaptive:
         NORMAL=25, HIGH-vol=20, LOW-vol=30, NARROW-CPR/TREND=35.
         Old value 15 was too tight — trail fired within 1-2 bars of entry.
@@ -101,6 +103,10 @@ import math
 from dataclasses import dataclass, field
 from typing import Any, Callable, Dict, List, Optional
 
+from event_stream import emit_event
+from greeks_surface import get_greeks_surfaces
+from trade_store import get_trade_store
+
 # ── ANSI colour helpers ────────────────────────────────────────────────────────
 GREEN  = "\033[92m"
 YELLOW = "\033[93m"
@@ -130,6 +136,130 @@ class ExitDecision:
         return self.exit_px > 0 and self.should_exit and self.cur_gain > 0
 
 
+# ─────────────────────────────────────────────────────────────────────────────
+#  BarRecord — typed per-bar indicator snapshot consumed by update()
+# ─────────────────────────────────────────────────────────────────────────────
+
+_NAN = float("nan")
+
+
+def _num(v: Any) -> float:
+    try:
+        return float(v)
+    except (TypeError, ValueError):
+        return _NAN
+
+
+class BarRecord:
+    """
+    One bar of indicator values, read by attribute.
+
+    Built once per bar (BarRecord.from_row) instead of going through a pandas
+    Series lookup + float() + try/except for every indicator on every exit
+    check.  Numeric fields are floats (NaN when missing); bias fields are
+    upper-case strings.  The 15m context (st_bias_15m / st_slope_15m /
+    adx14_15m) travels in the same record, so callers no longer copy and
+    enrich the 3m row.
+
+    ``rec[k]`` / ``rec.get(k)`` keep dict-style readers working.
+    """
+
+    __slots__ = (
+        "open", "high", "low", "close",
+        "rsi14", "cci20", "ema9", "ema13", "adx14", "atr14", "williams_r",
+        "supertrend_bias", "st_bias_15m", "st_slope_15m", "adx14_15m",
+    )
+
+    def __init__(
+        self,
+        open            : float = _NAN,
+        high            : float = _NAN,
+        low             : float = _NAN,
+        close           : float = _NAN,
+        rsi14           : float = _NAN,
+        cci20           : float = _NAN,
+        ema9            : float = _NAN,
+        ema13           : float = _NAN,
+        adx14           : float = _NAN,
+        atr14           : float = _NAN,
+        williams_r      : float = _NAN,
+        supertrend_bias : str   = "?",
+        st_bias_15m     : str   = "NEUTRAL",
+        st_slope_15m    : str   = "FLAT",
+        adx14_15m       : float = _NAN,
+    ):
+        self.open            = open
+        self.high            = high
+        self.low             = low
+        self.close           = close
+        self.rsi14           = rsi14
+        self.cci20           = cci20
+        self.ema9            = ema9
+        self.ema13           = ema13
+        self.adx14           = adx14
+        self.atr14           = atr14
+        self.williams_r      = williams_r
+        self.supertrend_bias = supertrend_bias
+        self.st_bias_15m     = st_bias_15m
+        self.st_slope_15m    = st_slope_15m
+        self.adx14_15m       = adx14_15m
+
+    @classmethod
+    def from_row(cls, row: Any, row_15m: Any = None) -> "BarRecord":
+        """
+        Adapter for a pandas Series / dict indicator row.
+
+        row_15m  latest 15m indicator row; supplies st_bias_15m (from its
+                 supertrend_bias), st_slope_15m (supertrend_slope) and
+                 adx14_15m.  When omitted, those fields are taken from
+                 ``row`` itself if present.
+        """
+        if isinstance(row, BarRecord):
+            return row
+        if hasattr(row, "index") and hasattr(row, "values"):
+            row = dict(zip(row.index, row.values))   # one pass over a Series
+        elif not hasattr(row, "get"):
+            row = {k: getattr(row, k) for k in cls.__slots__ if hasattr(row, k)}
+        g = row.get
+
+        atr = g("atr14")
+        if atr is None:
+            atr = g("atr")
+        wr = g("williams_r")
+        if wr is None:
+            wr = g("wr")
+
+        if row_15m is not None:
+            st15       = row_15m.get("supertrend_bias", "NEUTRAL")
+            st15_slope = row_15m.get("supertrend_slope", "FLAT")
+            adx15      = row_15m.get("adx14", _NAN)
+        else:
+            st15       = g("st_bias_15m", "NEUTRAL")
+            st15_slope = g("st_slope_15m", "FLAT")
+            adx15      = g("adx14_15m", _NAN)
+
+        return cls(
+            _num(g("open")), _num(g("high")), _num(g("low")), _num(g("close")),
+            _num(g("rsi14")), _num(g("cci20")), _num(g("ema9")), _num(g("ema13")),
+            _num(g("adx14")), _num(atr), _num(wr),
+            str(g("supertrend_bias", "?")).upper(),
+            str(st15).upper(), str(st15_slope).upper(), _num(adx15),
+        )
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return getattr(self, key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key, default)
+
+    def __repr__(self) -> str:
+        body = " ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__)
+        return f"BarRecord({body})"
+
+
 # ─────────────────────────────────────────────────────────────────────────────
 #  PositionManager  v3
 # ─────────────────────────────────────────────────────────────────────────────
@@ -211,6 +341,26 @@ class PositionManager:
     REVERSAL_MIN     : int   = 3       # consecutive candles against side
     ADX_TREND_MIN    : float = 25.0    # ADX above this → reversal suppressed
 
+    # ── v7-v9: Strategic exit rules (BASE values, scaled by ATR(10)) ─────────
+    LOSS_CUT_PTS_BASE          : int   = -10   # exit if loss < -10 pts (low-vol floor)
+    LOSS_CUT_PTS_CAP           : int   = -20   # max room even in high vol (prevents runaway losses)
+    LOSS_CUT_MAX_BARS          : int   = 5     # only in the first 5 bars
+    LOSS_CUT_SCALE             : float = 0.5   # LOSS_CUT scales with 0.5 × ATR(10)
+    QUICK_PROFIT_UL_PTS_BASE   : int   = 10    # UL move ≥ 10 pts (≈₹1300 lot=130)
+    QUICK_PROFIT_SCALE         : float = 1.0   # QUICK_PROFIT scales with 1.0 × ATR(10)
+    DRAWDOWN_THRESHOLD_BASE    : int   = 9     # exit if peak_gain - cur_gain ≥ 9 pts
+    DRAWDOWN_MIN_PEAK          : float = 5.0   # ...once the peak gain reached 5 pts
+    # Stale trade exit — catches trades that never become profitable
+    STALE_TRADE_BARS           : int   = 10    # check after 10 bars
+    STALE_TRADE_MIN_PEAK       : float = 5.0   # peak must have reached at least 5 pts
+    STALE_TRADE_CUR_LOSS       : float = -3.0  # current must be negative (at least -3 pts)
+    # v9: breakout sustain scales with volatility (1 bar per 10 pts ATR)
+    BREAKOUT_SUSTAIN_BASE      : int   = 2
+    BREAKOUT_SUSTAIN_SCALE     : int   = 10
+    # v9: time-based quick profit (urgency exit if capital locked too long)
+    TIME_QUICK_PROFIT_MAX      : int   = 10    # max bars to wait for QUICK_PROFIT
+    TIME_QUICK_PROFIT_MIN_GAIN : float = 3.0   # minimum gain pts to exit on timeout
+
     def __init__(
         self,
         mode           : str                = "REPLAY",
@@ -346,6 +496,7 @@ class PositionManager:
             "pivot_reason" : signal.get("pivot_reason", signal.get("pivot", "")),
             "entry_st"     : str(signal.get("st_bias",  "?")),
             "option_name"  : signal.get("option_name",  ""),
+            "entry_delta"  : self._live_delta(signal.get("option_name", "")),
             "entry_type"   : signal.get("entry_type",   "?"),
             "day_type"     : day_type,
             "cpr_width"    : cpr_w,
@@ -432,6 +583,24 @@ class PositionManager:
             f"zone_action={signal.get('zone_revisit_action', 'NONE')} "
             f"zone_age={signal.get('zone_age_bars', 0)}"
         )
+        emit_event(
+            "trade_open",
+            mode=self.mode,
+            time=str(bar_time)[:19],
+            side=side,
+            option_name=signal.get("option_name", "N/A"),
+            entry=round(entry_premium, 2),
+            lots=self.lot_size,
+            open_bias_aligned=signal.get("open_bias_aligned", "NEUTRAL"),
+            fb=bool(signal.get("failed_breakout", False)),
+            ema_stretch=bool(signal.get("ema_stretch", False)),
+            zone_revisit=bool(signal.get("zone_revisit", False)),
+            zone_type=signal.get("zone_revisit_type", "NONE"),
+            zone_action=signal.get("zone_revisit_action", "NONE"),
+            zone_age=signal.get("zone_age_bars", 0),
+            bias_alignment=signal.get("bias_alignment"),
+            tilt_state=signal.get("tilt_state"),
+        )
         
         # Log detailed score breakdown for audit trail (v6 entry score framework)
         self._log_entry_score_breakdown(signal, side)
@@ -454,47 +623,22 @@ class PositionManager:
         bar_idx     Current bar index
         bar_time    Current bar timestamp
         underlying  NIFTY spot close (REPLAY) or option LTP (LIVE/PAPER)
-        row         Pandas Series / dict with indicator columns:
-                    Required: rsi14, cci20, supertrend_bias, ema9, ema13,
-                              open, close, high, low
-                    Optional: adx14, williams_r, st_bias_15m, atr14
+        row         BarRecord (fast path), or a pandas Series / dict with
+                    indicator columns, adapted via BarRecord.from_row():
+                    Required: cci20, ema9, ema13, open, close, high, low
+                    Optional: atr14, st_bias_15m, st_slope_15m, adx14_15m
         """
         if not self._t:
             return ExitDecision()
 
+        if type(row) is not BarRecord:
+            row = BarRecord.from_row(row)
+
         t    = self._t
         ep   = t["entry_px"]
         side = t["side"]
-        atr  = self._get_atr(row)
-
-        # ── Safe indicator reads ──────────────────────────────────────────────
-        def _f(k: str, default: float = float("nan")) -> float:
-            try:
-                v = float(row[k] if hasattr(row, "__getitem__") else getattr(row, k))
-                return v if math.isfinite(v) else default
-            except Exception:
-                return default
-
-        def _s(k: str, default: str = "?") -> str:
-            try:
-                return str(
-                    row[k] if hasattr(row, "__getitem__") else getattr(row, k)
-                ).upper()
-            except Exception:
-                return default
-
-        rsi   = _f("rsi14",  50.0)
-        cci   = _f("cci20",   0.0)
-        ema9  = _f("ema9",  float("nan"))
-        ema13 = _f("ema13", float("nan"))
-        adx   = _f("adx14", float("nan"))
-        o_bar = _f("open",  float("nan"))
-        c_bar = _f("close", float("nan"))
-        h_bar = _f("high",  float("nan"))
-        l_bar = _f("low",   float("nan"))
-        st    = _s("supertrend_bias", "?")
-        st15  = _s("st_bias_15m", "")
-        st15_slope = _s("st_slope_15m", "FLAT")
+        atr  = row.atr14
+        cci  = row.cci20 if math.isfinite(row.cci20) else 0.0
 
         bar_min = self._bar_minutes(bar_time)
 
@@ -669,54 +813,20 @@ class PositionManager:
         #   3) DRAWDOWN_EXIT — protect peak gains
         #   4) BREAKOUT_HOLD (lowest priority) — extend hold on breakouts
         
-        # ═══════════════════════════════════════════════════════════════
-        # v8: DYNAMIC THRESHOLDS (scaled by ATR / volatility)
-        # ═══════════════════════════════════════════════════════════════
-        # Rule constants (BASE values - will be scaled by ATR)
-        LOSS_CUT_PTS_BASE        = -10   # BASE: exit if loss < -10 pts (low-vol floor)
-        LOSS_CUT_PTS_CAP         = -20   # CAP: max room even in high-vol (prevents runaway losses)
-        LOSS_CUT_MAX_BARS        = 5     # only in first 5 bars
-        QUICK_PROFIT_UL_PTS_BASE = 10    # BASE: UL move >= 10 pts (≈₹1300 lot=130)
-        DRAWDOWN_THRESHOLD_BASE  = 9     # BASE: exit if peak_gain - cur_gain >= 9 pts
-
-        # Stale trade exit — catches trades that never become profitable
-        STALE_TRADE_BARS         = 10    # check after 10 bars
-        STALE_TRADE_MIN_PEAK     = 5.0   # peak must have reached at least 5pts
-        STALE_TRADE_CUR_LOSS     = -3.0  # current must be negative (at least -3pts)
-
-        # v8: Dynamic scaling factors
-        LOSS_CUT_SCALE         = 0.5  # LOSS_CUT scales with 0.5 × ATR(10)
-        QUICK_PROFIT_SCALE     = 1.0  # QUICK_PROFIT scales with 1.0 × ATR(10)
-        BREAKOUT_SUSTAIN_MIN   = 3    # Require 3+ bars at R4/S4 before hold (v8 refinement)
-        
-        # ═══════════════════════════════════════════════════════════════
-        # v9: ADAPTIVE RULES (new enhancements)
-        # ═══════════════════════════════════════════════════════════════
-        # Dynamic breakout sustain (scales with volatility)
-        BREAKOUT_SUSTAIN_BASE  = 2      # v9: Base sustain bars (low volatility)
-        BREAKOUT_SUSTAIN_SCALE = 10     # v9: ATR divisor for scaling (1 bar per 10 pts ATR)
-        
-        # Time-based quick profit (urgency exit if capital locked too long)
-        TIME_QUICK_PROFIT_MAX  = 10     # v9: Max bars to wait for QUICK_PROFIT
-        TIME_QUICK_PROFIT_MIN_GAIN = 3.0  # v9: Minimum gain pts to exit on timeout
-        
-        # Capital utilization tracking (efficiency metrics)
-        CAPITAL_TRACKING_ENABLED = True  # v9: Enable per-trade capital metrics
-        
         # Calculate ATR(10) for dynamic scaling
         atr_val = self._calculate_atr(row, period=10)
         
         # v9: Calculate dynamic sustain requirement (scales with volatility)
-        sustain_required = max(BREAKOUT_SUSTAIN_BASE, 
-                              BREAKOUT_SUSTAIN_BASE + math.ceil(atr_val / BREAKOUT_SUSTAIN_SCALE))
+        sustain_required = max(self.BREAKOUT_SUSTAIN_BASE, 
+                              self.BREAKOUT_SUSTAIN_BASE + math.ceil(atr_val / self.BREAKOUT_SUSTAIN_SCALE))
         
         # Dynamic threshold: wider in high-vol (ATR-scaled), capped to prevent runaway
         # Low ATR (<20): stays at BASE (-10); High ATR (40+): scales to -20 max
-        loss_cut_threshold = max(LOSS_CUT_PTS_CAP, min(LOSS_CUT_PTS_BASE, -LOSS_CUT_SCALE * atr_val)) if atr_val > 0 else LOSS_CUT_PTS_BASE
+        loss_cut_threshold = max(self.LOSS_CUT_PTS_CAP, min(self.LOSS_CUT_PTS_BASE, -self.LOSS_CUT_SCALE * atr_val)) if atr_val > 0 else self.LOSS_CUT_PTS_BASE
         
         # Dynamic threshold = min(BASE, SCALE × ATR) for quick profit
         # (smaller = tighter, more filters in high vol)
-        quick_profit_threshold = min(QUICK_PROFIT_UL_PTS_BASE, QUICK_PROFIT_SCALE * atr_val) if atr_val > 0 else QUICK_PROFIT_UL_PTS_BASE
+        quick_profit_threshold = min(self.QUICK_PROFIT_UL_PTS_BASE, self.QUICK_PROFIT_SCALE * atr_val) if atr_val > 0 else self.QUICK_PROFIT_UL_PTS_BASE
         
         # Store thresholds and metrics for capital efficiency tracking
         if self._t is not None:
@@ -726,21 +836,22 @@ class PositionManager:
             self._t["sustain_required"] = sustain_required  # v9: dynamic sustain
             self._t["capital_deployed_at_profit"] = -1  # v9: set when profit triggered
         
-        logging.debug(
-            f"[DYNAMIC THRESHOLDS v8] atr={atr_val:.2f}pts | "
-            f"loss_cut={loss_cut_threshold:.2f}pts (scale={LOSS_CUT_SCALE}) | "
-            f"quick_profit={quick_profit_threshold:.2f}pts (scale={QUICK_PROFIT_SCALE})"
-        )
-        
-        logging.debug(
-            f"[DYNAMIC SUSTAIN v9] sustain_required={sustain_required} bars | "
-            f"atr={atr_val:.2f}pts | regime={'tight' if atr_val<10 else 'normal' if atr_val<20 else 'wide'}"
-        )
+        # Per-bar debug lines: only format them when DEBUG is actually on
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug(
+                f"[DYNAMIC THRESHOLDS v8] atr={atr_val:.2f}pts | "
+                f"loss_cut={loss_cut_threshold:.2f}pts (scale={self.LOSS_CUT_SCALE}) | "
+                f"quick_profit={quick_profit_threshold:.2f}pts (scale={self.QUICK_PROFIT_SCALE})"
+            )
+            logging.debug(
+                f"[DYNAMIC SUSTAIN v9] sustain_required={sustain_required} bars | "
+                f"atr={atr_val:.2f}pts | regime={'tight' if atr_val<10 else 'normal' if atr_val<20 else 'wide'}"
+            )
         
         # ────────────────────────────────────────────────────────────────────
         # RULE 1: LOSS_CUT (exit quickly on early losses) - v8: ATR-scaled
         # ────────────────────────────────────────────────────────────────────
-        if t["bars_held"] <= LOSS_CUT_MAX_BARS and cur_gain < loss_cut_threshold:
+        if t["bars_held"] <= self.LOSS_CUT_MAX_BARS and cur_gain < loss_cut_threshold:
             logging.info(
                 f"[LOSS CUT] gain={cur_gain:.2f}pts < {loss_cut_threshold:.2f}pts (ATR-scaled, atr={atr_val:.2f}) | "
                 f"bar={bar_idx} held={t['bars_held']}bars | "
@@ -800,8 +911,8 @@ class PositionManager:
         # Triggers when: bars_held >= TIME_QUICK_PROFIT_MAX and cur_gain >= min_gain
         # Prevents capital lockup in sideways markets; ensures turnover
         if (not t.get("half_qty", False) and 
-            t["bars_held"] >= TIME_QUICK_PROFIT_MAX and 
-            cur_gain >= TIME_QUICK_PROFIT_MIN_GAIN):
+            t["bars_held"] >= self.TIME_QUICK_PROFIT_MAX and 
+            cur_gain >= self.TIME_QUICK_PROFIT_MIN_GAIN):
             
             t["partial_done"] = True
             t["half_qty"]     = True
@@ -813,8 +924,8 @@ class PositionManager:
             time_exit_gain_pct = (cur_gain / abs(quick_profit_threshold)) * 100 if quick_profit_threshold != 0 else 0
             
             logging.info(
-                f"[TIME EXIT v9] bars_elapsed={t['bars_held']} >= max={TIME_QUICK_PROFIT_MAX} | "
-                f"gain={cur_gain:.2f}pts >= min={TIME_QUICK_PROFIT_MIN_GAIN}pts | "
+                f"[TIME EXIT v9] bars_elapsed={t['bars_held']} >= max={self.TIME_QUICK_PROFIT_MAX} | "
+                f"gain={cur_gain:.2f}pts >= min={self.TIME_QUICK_PROFIT_MIN_GAIN}pts | "
                 f"exit_premium={cur:.2f} | Releasing capital"
             )
             logging.info(
@@ -824,8 +935,8 @@ class PositionManager:
             return ExitDecision(
                 should_exit  = True,
                 reason       = (
-                    f"TIME_EXIT | bars_held={t['bars_held']}(>={TIME_QUICK_PROFIT_MAX}) | "
-                    f"gain={cur_gain:.2f}pts(>={TIME_QUICK_PROFIT_MIN_GAIN}) | "
+                    f"TIME_EXIT | bars_held={t['bars_held']}(>={self.TIME_QUICK_PROFIT_MAX}) | "
+                    f"gain={cur_gain:.2f}pts(>={self.TIME_QUICK_PROFIT_MIN_GAIN}) | "
                     f"capital release at {cur:.2f}"
                 ),
                 exit_px      = cur,
@@ -842,10 +953,10 @@ class PositionManager:
         # Only applies if we've captured at least 5 pts gain (meaningful profit)
         drawdown_amount = peak_gain - cur_gain if peak_gain > 0 else 0
         
-        if peak_gain >= 5 and drawdown_amount >= DRAWDOWN_THRESHOLD_BASE:
+        if peak_gain >= self.DRAWDOWN_MIN_PEAK and drawdown_amount >= self.DRAWDOWN_THRESHOLD_BASE:
             logging.info(
                 f"[DRAWDOWN EXIT] peak={peak_gain:.2f}pts - cur={cur_gain:.2f}pts = "
-                f"drawdown={drawdown_amount:.2f}pts >= {DRAWDOWN_THRESHOLD}pts | "
+                f"drawdown={drawdown_amount:.2f}pts >= {self.DRAWDOWN_THRESHOLD_BASE}pts | "
                 f"bar={bar_idx} held={t['bars_held']}bars | "
                 f"locking in {cur_gain:.2f}pts before further reversal"
             )
@@ -856,7 +967,7 @@ class PositionManager:
             return self._hard_exit(
                 cur, "DRAWDOWN_EXIT",
                 f"Drawdown protection: peak={peak_gain:.2f}pts -> cur={cur_gain:.2f}pts "
-                f"(drawdown={drawdown_amount:.2f}pts >= {DRAWDOWN_THRESHOLD}pts threshold)",
+                f"(drawdown={drawdown_amount:.2f}pts >= {self.DRAWDOWN_THRESHOLD_BASE}pts threshold)",
                 cur_gain, peak_gain, t["bars_held"]
             )
 
@@ -865,13 +976,13 @@ class PositionManager:
         # ────────────────────────────────────────────────────────────────────
         # Catches: entered on a valid signal but price never moved in our favor.
         # If after STALE_TRADE_BARS bars the peak was minimal AND currently losing → exit.
-        if (t["bars_held"] >= STALE_TRADE_BARS
-            and peak_gain < STALE_TRADE_MIN_PEAK
-            and cur_gain <= STALE_TRADE_CUR_LOSS):
+        if (t["bars_held"] >= self.STALE_TRADE_BARS
+            and peak_gain < self.STALE_TRADE_MIN_PEAK
+            and cur_gain <= self.STALE_TRADE_CUR_LOSS):
             logging.info(
-                f"[STALE TRADE] bars_held={t['bars_held']} >= {STALE_TRADE_BARS} | "
-                f"peak={peak_gain:.2f}pts < {STALE_TRADE_MIN_PEAK}pts | "
-                f"cur_gain={cur_gain:.2f}pts <= {STALE_TRADE_CUR_LOSS}pts | "
+                f"[STALE TRADE] bars_held={t['bars_held']} >= {self.STALE_TRADE_BARS} | "
+                f"peak={peak_gain:.2f}pts < {self.STALE_TRADE_MIN_PEAK}pts | "
+                f"cur_gain={cur_gain:.2f}pts <= {self.STALE_TRADE_CUR_LOSS}pts | "
                 f"bar={bar_idx} — never became profitable, exiting"
             )
             logging.info(
@@ -1014,6 +1125,17 @@ class PositionManager:
             f"zone_action={t.get('zone_revisit_action', 'NONE')} "
             f"zone_age={t.get('zone_age_bars', 0)}"
         )
+        emit_event(
+            "trade_exit",
+            mode=self.mode,
+            time=str(bar_time)[:19],
+            option_name=t.get("option_name", "N/A"),
+            exit=round(exit_px, 2),
+            pnl_pts=round(pnl_pts, 2),
+            pnl_rs=round(pnl_val),
+            bars=t["bars_held"],
+            reason=_r_tag,
+        )
         logging.info(
             f"{color}[TRADE EXIT] {outcome} {side} "
             f"bar={bar_idx} {bar_time} "
@@ -1146,10 +1268,28 @@ class PositionManager:
         but eliminates the systematic bias of a fixed 0.50 in replay.
 
         ul_move: underlying move in TRADE direction (positive = favourable).
+
+        With a fresh Greeks-surface snapshot for the open contract the
+        live |delta| replaces the linear estimate — averaged with the
+        delta recorded at entry, since callers multiply it by the whole
+        move since entry.
         """
+        live = self._live_delta(self._t.get("option_name")) if self._t else None
+        if live is not None:
+            entry = self._t.get("entry_delta")
+            return live if entry is None else 0.5 * (entry + live)
         delta = self.DELTA_ENTRY + self.DELTA_PER_POINT * ul_move
         return max(self.DELTA_MIN, min(self.DELTA_MAX, delta))
 
+    @staticmethod
+    def _live_delta(option_name: Optional[str]) -> Optional[float]:
+        """|delta| of ``option_name`` from the live Greeks surface, if fresh."""
+        if not option_name:
+            return None
+        snap = get_greeks_surfaces().snapshot_for(option_name)
+        delta = snap.delta(option_name) if snap is not None else None
+        return abs(delta) if delta else None
+
     def _trail_step_for_atr(self, atr_val: Any) -> float:
         """ATR-adaptive trail step fraction."""
         try:
@@ -1238,8 +1378,11 @@ class PositionManager:
         Returns: ATR value, or 10.0 (default min) if calc fails
         """
         try:
-            h = float(row["high"] if hasattr(row, "__getitem__") else row.high)
-            l = float(row["low"] if hasattr(row, "__getitem__") else row.low)
+            if type(row) is BarRecord:
+                h, l = row.high, row.low
+            else:
+                h = float(row["high"] if hasattr(row, "__getitem__") else row.high)
+                l = float(row["low"] if hasattr(row, "__getitem__") else row.low)
             
             # Try to get previous close from position state
             prev_c = self._t.get("prev_close") if self._t else None
@@ -1251,7 +1394,8 @@ class PositionManager:
             
             # Update prev_close for next bar
             if self._t is not None:
-                c = float(row["close"] if hasattr(row, "__getitem__") else row.close)
+                c = row.close if type(row) is BarRecord else \
+                    float(row["close"] if hasattr(row, "__getitem__") else row.close)
                 self._t["prev_close"] = c
                 
                 # For full ATR, maintain rolling window (simplified: just current TR for now)
@@ -1273,12 +1417,15 @@ class PositionManager:
 
         Returns True if can't determine (NaN) — avoids false exits.
         """
-        try:
-            e9  = float(row["ema9"]  if hasattr(row, "__getitem__") else row.ema9)
-            e13 = float(row["ema13"] if hasattr(row, "__getitem__") else row.ema13)
-            cl  = float(row["close"] if hasattr(row, "__getitem__") else row.close)
-        except Exception:
-            return True
+        if type(row) is BarRecord:
+            e9, e13, cl = row.ema9, row.ema13, row.close
+        else:
+            try:
+                e9  = float(row["ema9"]  if hasattr(row, "__getitem__") else row.ema9)
+                e13 = float(row["ema13"] if hasattr(row, "__getitem__") else row.ema13)
+                cl  = float(row["close"] if hasattr(row, "__getitem__") else row.close)
+            except Exception:
+                return True
 
         if not (math.isfinite(e9) and math.isfinite(e13) and math.isfinite(cl)):
             return True
@@ -1365,30 +1512,6 @@ class PositionManager:
 
         return (0, "")
 
-    def _get_atr(self, row: Any) -> float:
-        """Extract ATR from indicator row."""
-        try:
-            v = row.get("atr14", None) if hasattr(row, "get") else None
-            if v is None:
-                v = row.get("atr", None) if hasattr(row, "get") else None
-            if v is not None and math.isfinite(float(v)):
-                return float(v)
-        except Exception:
-            pass
-        return float("nan")
-
-    def _get_wr(self, row: Any) -> float:
-        """Extract Williams %R from indicator row."""
-        try:
-            v = row.get("williams_r", None) if hasattr(row, "get") else None
-            if v is None:
-                v = row.get("wr", None) if hasattr(row, "get") else None
-            if v is not None and math.isfinite(float(v)):
-                return float(v)
-        except Exception:
-            pass
-        return float("nan")
-
     def _build_reason(
         self,
         trigger    : str,
@@ -1514,6 +1637,8 @@ class PositionManager:
     @staticmethod
     def _bar_minutes(bar_time: Any) -> int:
         """Convert bar_time to minutes since midnight (for EOD gate)."""
+        if hasattr(bar_time, "hour"):          # datetime / pd.Timestamp
+            return bar_time.hour * 60 + bar_time.minute
         try:
             s = str(bar_time).split(" ")[-1]
             h, m = int(s[:2]), int(s[3:5])
@@ -1603,6 +1728,17 @@ class TradeLogger:
         except Exception as e:
             logging.error(f"[TradeLogger] CSV write failed: {e}")
 
+    def to_store(self, mode: str, date_str: Optional[str] = None, store=None) -> int:
+        """Append the records to the partitioned trade store (see trade_store)."""
+        store = store or get_trade_store()
+        if store is None or not self.records:
+            return 0
+        try:
+            return store.record_session(mode, self.symbol, trades=self.records, date=date_str)
+        except Exception as e:
+            logging.error(f"[TradeLogger] Trade store append failed: {e}")
+            return 0
+
 
 # ─────────────────────────────────────────────────────────────────────────────
 #  Convenience constructors
@@ -1,5 +1,5 @@
 # ============================================================
-#  pulse_module.py  — v1.0  (Tick-Rate Momentum Module)
+#  pulse_module.py  — v2.0  (Tick-Rate Momentum Module)
 # ============================================================
 """
 ARCHITECTURE
@@ -14,18 +14,30 @@ Signals generated:
   - [MOMENTUM_TICK_RATE][UP]   — bullish burst
   - [MOMENTUM_TICK_RATE][DOWN] — bearish burst
 
+v2.0 — per symbol, several windows, O(1) reads:
+  - PulseEngine keeps one PulseModule per symbol, so NIFTY and BANKNIFTY
+    ticks no longer mix into one rate / drift / burst state
+  - each PulseModule stores ticks once in a numpy ring buffer
+    (timestamps + prices) and tracks every window (default 5s / 30s /
+    120s) as a tail index into it; on_tick advances the tails (amortised
+    O(1) per window) and updates the per-window burst state
+  - get_pulse() reads the (tail, head) pair and two ring slots — no copy,
+    no trimming, no side effects, so any thread may call it; if time has
+    passed since the last tick the tail is found by bisecting the ring
+
 Integration:
-  - Data Engine: feeds tick data to Pulse
+  - Data Engine: feeds tick data to Pulse (data_feed.onmessage, per symbol)
   - Decision Engine: uses Pulse for scalp entry signals
 """
 
 import logging
+import threading
 import time
-from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import Callable, Dict, Iterable, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 import pytz
 
@@ -38,9 +50,20 @@ YELLOW = "\033[93m"
 CYAN   = "\033[96m"
 
 # ── Configuration ───────────────────────────────────────────────────────────
-# Rolling window for tick rate calculation (seconds)
+# Rolling window for tick rate calculation (seconds) — the primary window
+# behind get_pulse(), burst counting and exhaustion detection
 PULSE_WINDOW_SECONDS = 30
 
+# Windows maintained side by side over the same ring buffer (seconds)
+PULSE_WINDOWS_SECONDS: Tuple[int, ...] = (5, 30, 120)
+
+# Ticks retained per symbol (rounded up to a power of two); the oldest tick
+# is overwritten first, like the former deque(maxlen=1000)
+RING_CAPACITY = 4096
+
+# Symbol served by get_pulse_module() when the caller names none
+DEFAULT_PULSE_SYMBOL = "NSE:NIFTY50-INDEX"
+
 # Burst detection threshold (ticks per second)
 # Above this rate = burst detected
 BURST_THRESHOLD_TICKS_PER_SEC = 15.0
@@ -72,109 +95,104 @@ class PulseMetrics:
 
 class PulseModule:
     """
-    Tick-rate momentum calculator.
-    
-    Maintains a rolling window of ticks and calculates:
+    Tick-rate momentum calculator for one symbol.
+
+    Ticks live in a numpy ring buffer shared by every window; each window
+    is a tail index into it.  Calculates per window:
     - Tick rate (ticks/sec)
     - Burst detection
     - Direction drift
-    
+
     Usage:
         pulse = PulseModule()
         pulse.on_tick(timestamp_ms, price)
-        metrics = pulse.get_pulse()
+        metrics = pulse.get_pulse()            # primary (window_seconds) window
+        fast = pulse.get_pulse(window=5)       # any window in ``windows``
         if metrics.burst_flag:
             print(f"Burst detected: {metrics.to_tag()}")
     """
-    
+
     def __init__(
         self,
         window_seconds: int = PULSE_WINDOW_SECONDS,
         burst_threshold: float = BURST_THRESHOLD_TICKS_PER_SEC,
         min_ticks: int = MIN_TICKS_FOR_RATE,
         direction_threshold_pct: float = DIRECTION_DRIFT_THRESHOLD_PCT,
+        windows: Iterable[int] = PULSE_WINDOWS_SECONDS,
+        capacity: int = RING_CAPACITY,
+        symbol: str = "",
     ):
+        self.symbol = symbol
         self.window_ms = window_seconds * 1000
         self.burst_threshold = burst_threshold
         self.min_ticks = min_ticks
         self.direction_threshold = direction_threshold_pct
-        
-        # Rolling buffer: (timestamp_ms, price)
-        self._tick_buffer: deque = deque(maxlen=1000)
-        
-        # Price at start of window
-        self._window_start_price: Optional[float] = None
-        
-        # Last calculated metrics (cached)
-        self._cached_metrics: Optional[PulseMetrics] = None
-        self._last_calc_time_ms: float = 0
-        
+
+        self.windows: Tuple[int, ...] = tuple(sorted(set(windows) | {window_seconds}))
+        self._win_ms = [w * 1000 for w in self.windows]
+        self._primary = self.windows.index(window_seconds)
+
+        # Ring buffer: absolute tick index i lives in slot i & _mask
+        cap = 1 << max(1, int(capacity) - 1).bit_length()
+        self._mask = cap - 1
+        self._ts = np.zeros(cap, dtype=np.float64)
+        self._px = np.zeros(cap, dtype=np.float64)
+        self._head = 0                                   # ticks ingested so far
+        self._tails = [0] * len(self.windows)            # first tick inside each window
+        self._burst = [False] * len(self.windows)        # burst state per window
+        self._in_burst = False                           # primary window, counted burst
+
         # Counters for dashboard
         self.burst_count: int = 0
         self.upward_bursts: int = 0
         self.downward_bursts: int = 0
-        
+        self._peak_tick_rate: float = 0.0
+        self._exhaustion_count: int = 0
+        self._sustained_count: int = 0
+
         logging.info(
-            f"[PULSE] Initialized: window={window_seconds}s "
+            f"[PULSE] Initialized: {f'symbol={symbol} ' if symbol else ''}"
+            f"window={window_seconds}s windows={list(self.windows)} "
             f"burst_threshold={burst_threshold} ticks/sec"
         )
-    
+
+    # ── ingest ───────────────────────────────────────────────────────────────
+
     def on_tick(self, timestamp_ms: float, price: float) -> None:
         """
-        Process a new tick and update internal buffers.
-        
+        Process a new tick: store it and advance every window incrementally.
+
         Args:
             timestamp_ms: Unix timestamp in milliseconds
             price: Tick price (LTP)
         """
-        # Initialize window start price on first tick
-        if self._window_start_price is None:
-            self._window_start_price = price
-        
-        # Add tick to buffer
-        self._tick_buffer.append((timestamp_ms, price))
-        
-        # Invalidate cached metrics (will be recalculated on next get_pulse)
-        self._cached_metrics = None
-    
-    def get_pulse(self, current_time_ms: Optional[float] = None) -> PulseMetrics:
-        """
-        Calculate pulse metrics from the rolling tick buffer.
-        
-        Args:
-            current_time_ms: Current timestamp (default: now)
-            
-        Returns:
-            PulseMetrics with calculated values
-        """
-        # Use current time if not provided
-        if current_time_ms is None:
-            current_time_ms = time.time() * 1000
-        
-        # Return cached if calculated recently (within 100ms)
-        if (self._cached_metrics is not None and 
-            current_time_ms - self._last_calc_time_ms < 100):
-            return self._cached_metrics
-        
-        # Clean old ticks outside window
-        cutoff_ms = current_time_ms - self.window_ms
-        while self._tick_buffer and self._tick_buffer[0][0] < cutoff_ms:
-            self._tick_buffer.popleft()
-        
-        # Need minimum ticks for reliable calculation
-        if len(self._tick_buffer) < self.min_ticks:
-            self._cached_metrics = PulseMetrics()
-            self._last_calc_time_ms = current_time_ms
-            return self._cached_metrics
-        
-        # Calculate metrics
-        metrics = self._calculate_metrics(current_time_ms)
-        
-        # Check for new burst
-        if metrics.burst_flag and metrics.direction_drift != "NEUTRAL":
-            # Check if this is a new burst (previous wasn't burst)
-            if (self._cached_metrics is None or 
-                not self._cached_metrics.burst_flag):
+        ts, mask = self._ts, self._mask
+        head = self._head
+        ts[head & mask] = timestamp_ms
+        self._px[head & mask] = price
+        head += 1
+        self._head = head
+        floor = head - mask - 1                          # oldest tick still in the ring
+
+        min_ticks, threshold = self.min_ticks, self.burst_threshold
+        for k, win_ms in enumerate(self._win_ms):
+            t = self._tails[k]
+            if t < floor:
+                t = floor
+            cutoff = timestamp_ms - win_ms
+            while ts[t & mask] < cutoff:                 # stops at head - 1 at the latest
+                t += 1
+            self._tails[k] = t
+            count = head - t
+            span = timestamp_ms - float(ts[t & mask])
+            self._burst[k] = count >= min_ticks and span > 0 and count * 1000.0 / span >= threshold
+
+        # Burst bookkeeping on the primary window (once per burst, per symbol)
+        burst = self._burst[self._primary]
+        if burst and not self._in_burst:
+            metrics = self._metrics(self._tails[self._primary], head)
+            if metrics.direction_drift != "NEUTRAL":
+                self._in_burst = True
                 self.burst_count += 1
                 if metrics.direction_drift == "UP":
                     self.upward_bursts += 1
@@ -182,71 +200,110 @@ class PulseModule:
                     self.downward_bursts += 1
                 logging.info(
                     f"[PULSE][BURST] {metrics.direction_drift} "
+                    f"{f'symbol={self.symbol} ' if self.symbol else ''}"
                     f"tick_rate={metrics.tick_rate:.1f} ticks/sec "
                     f"price_change={metrics.price_change_pct:+.3f}%"
                 )
-        
-        self._cached_metrics = metrics
-        self._last_calc_time_ms = current_time_ms
-        
-        return metrics
-    
-    def _calculate_metrics(self, current_time_ms: float) -> PulseMetrics:
-        """Calculate all pulse metrics from the tick buffer."""
-        ticks = list(self._tick_buffer)
-        
-        if not ticks:
+        elif not burst:
+            self._in_burst = False
+
+    # ── reads (no side effects; safe from any thread) ───────────────────────
+
+    def _tail_at(self, k: int, head: int, current_time_ms: float) -> int:
+        """Tail of window ``k`` as of ``current_time_ms`` (bisects if time moved on)."""
+        ts, mask = self._ts, self._mask
+        lo = max(self._tails[k], head - mask - 1)
+        cutoff = current_time_ms - self._win_ms[k]
+        if lo >= head or ts[lo & mask] >= cutoff:
+            return lo
+        hi = head
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if ts[mid & mask] < cutoff:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _metrics(self, tail: int, head: int) -> PulseMetrics:
+        count = head - tail
+        if count < self.min_ticks:
             return PulseMetrics()
-        
-        # Tick rate calculation
-        time_span_ms = ticks[-1][0] - ticks[0][0]
-        tick_count = len(ticks)
-        
+        first, last = tail & self._mask, (head - 1) & self._mask
+        time_span_ms = float(self._ts[last] - self._ts[first])
         if time_span_ms > 0:
-            tick_rate = (tick_count / time_span_ms) * 1000  # ticks per second
-            avg_interval_ms = time_span_ms / (tick_count - 1) if tick_count > 1 else 0
+            tick_rate = (count / time_span_ms) * 1000      # ticks per second
+            avg_interval_ms = time_span_ms / (count - 1)
         else:
             tick_rate = 0
             avg_interval_ms = 0
-        
-        # Burst detection
-        burst_flag = tick_rate >= self.burst_threshold
-        
-        # Direction drift calculation
-        start_price = ticks[0][1]
-        end_price = ticks[-1][1]
-        
+
+        start_price, end_price = float(self._px[first]), float(self._px[last])
         if start_price > 0:
             price_change_pct = ((end_price - start_price) / start_price) * 100
         else:
             price_change_pct = 0
-        
-        # Determine direction drift
+
         if price_change_pct > self.direction_threshold:
             direction_drift = "UP"
         elif price_change_pct < -self.direction_threshold:
             direction_drift = "DOWN"
         else:
             direction_drift = "NEUTRAL"
-        
+
         return PulseMetrics(
             tick_rate=round(tick_rate, 2),
             avg_interval_ms=round(avg_interval_ms, 2),
-            burst_flag=burst_flag,
+            burst_flag=tick_rate >= self.burst_threshold,
             direction_drift=direction_drift,
-            last_tick_time_ms=ticks[-1][0],
+            last_tick_time_ms=float(self._ts[last]),
             price_change_pct=round(price_change_pct, 4),
-            tick_count=tick_count,
+            tick_count=count,
         )
-    
+
+    def get_pulse(
+        self,
+        current_time_ms: Optional[float] = None,
+        window: Optional[int] = None,
+    ) -> PulseMetrics:
+        """
+        Pulse metrics for one window (default: the primary window).
+
+        Args:
+            current_time_ms: Current timestamp (default: now)
+            window: Window length in seconds; must be one of ``windows``
+
+        Returns:
+            PulseMetrics with calculated values
+        """
+        if current_time_ms is None:
+            current_time_ms = time.time() * 1000
+        k = self._primary if window is None else self.windows.index(window)
+        head = self._head
+        return self._metrics(self._tail_at(k, head, current_time_ms), head)
+
+    def get_windows(self, current_time_ms: Optional[float] = None) -> Dict[int, PulseMetrics]:
+        """PulseMetrics for every maintained window, keyed by seconds."""
+        if current_time_ms is None:
+            current_time_ms = time.time() * 1000
+        return {w: self.get_pulse(current_time_ms, w) for w in self.windows}
+
+    def burst_state(self) -> Dict[int, bool]:
+        """Burst flag per window as of the last tick (updated on ingest)."""
+        return dict(zip(self.windows, self._burst))
+
+    def current_tick_rate(self, current_time_ms: Optional[float] = None) -> float:
+        """Ticks/sec over the primary window (the metrics endpoint's gauge)."""
+        return self.get_pulse(current_time_ms).tick_rate
+
     def reset(self) -> None:
         """Reset the pulse module (e.g., at start of new trading session)."""
-        self._tick_buffer.clear()
-        self._window_start_price = None
-        self._cached_metrics = None
-        self._last_calc_time_ms = 0
-        logging.info("[PULSE] Module reset")
-    
+        self._head = 0
+        self._tails = [0] * len(self.windows)
+        self._burst = [False] * len(self.windows)
+        self._in_burst = False
+        logging.info(f"[PULSE] Module reset{f' symbol={self.symbol}' if self.symbol else ''}")
+
     def detect_exhaustion(self, current_time_ms: Optional[float] = None) -> Optional[str]:
         """Detect burst exhaustion: tick-rate spike followed by decay.
 
@@ -260,11 +317,6 @@ class PulseModule:
 
         metrics = self.get_pulse(current_time_ms)
 
-        if not hasattr(self, "_peak_tick_rate"):
-            self._peak_tick_rate = 0.0
-            self._exhaustion_count = 0
-            self._sustained_count = 0
-
         if metrics.burst_flag:
             if metrics.tick_rate > self._peak_tick_rate:
                 self._peak_tick_rate = metrics.tick_rate
@@ -292,54 +344,135 @@ class PulseModule:
             "burst_count": self.burst_count,
             "upward_bursts": self.upward_bursts,
             "downward_bursts": self.downward_bursts,
-            "exhaustion_count": getattr(self, "_exhaustion_count", 0),
-            "sustained_count": getattr(self, "_sustained_count", 0),
+            "exhaustion_count": self._exhaustion_count,
+            "sustained_count": self._sustained_count,
         }
-    
+
     def log_stats(self) -> None:
         """Log current pulse statistics."""
         stats = self.get_stats()
         logging.info(
-            f"[PULSE][STATS] total_bursts={stats['burst_count']} "
+            f"[PULSE][STATS] {f'symbol={self.symbol} ' if self.symbol else ''}"
+            f"total_bursts={stats['burst_count']} "
             f"up={stats['upward_bursts']} down={stats['downward_bursts']}"
         )
 
 
+class PulseEngine:
+    """
+    One PulseModule per symbol, created on the symbol's first tick.
+
+    Usage:
+        engine = get_pulse_engine()
+        engine.on_tick("NSE:NIFTY50-INDEX", timestamp_ms, price)
+        metrics = engine.get_pulse("NSE:NIFTY50-INDEX", window=5)
+    """
+
+    def __init__(
+        self,
+        window_seconds: int = PULSE_WINDOW_SECONDS,
+        burst_threshold: float = BURST_THRESHOLD_TICKS_PER_SEC,
+        **module_kwargs,
+    ):
+        self._kwargs = dict(window_seconds=window_seconds, burst_threshold=burst_threshold, **module_kwargs)
+        self._modules: Dict[str, PulseModule] = {}
+        self._lock = threading.Lock()
+        # Called as on_new_symbol(symbol, module) when a symbol first ticks
+        self.on_new_symbol: Optional[Callable[[str, PulseModule], None]] = None
+
+    def get(self, symbol: str) -> PulseModule:
+        module = self._modules.get(symbol)
+        if module is None:
+            with self._lock:
+                module = self._modules.get(symbol)
+                if module is None:
+                    module = self._modules[symbol] = PulseModule(symbol=symbol, **self._kwargs)
+                    if self.on_new_symbol is not None:
+                        self.on_new_symbol(symbol, module)
+        return module
+
+    def on_tick(self, symbol: str, timestamp_ms: float, price: float) -> None:
+        module = self._modules.get(symbol) or self.get(symbol)
+        module.on_tick(timestamp_ms, price)
+
+    def get_pulse(
+        self,
+        symbol: str,
+        current_time_ms: Optional[float] = None,
+        window: Optional[int] = None,
+    ) -> PulseMetrics:
+        return self.get(symbol).get_pulse(current_time_ms, window)
+
+    def symbols(self) -> Tuple[str, ...]:
+        return tuple(self._modules)
+
+    def reset(self) -> None:
+        for module in list(self._modules.values()):
+            module.reset()
+
+    def get_stats(self) -> Dict[str, dict]:
+        return {sym: m.get_stats() for sym, m in list(self._modules.items())}
+
+    def log_stats(self) -> None:
+        for module in list(self._modules.values()):
+            module.log_stats()
+
+
 # ── Singleton instance for global access ─────────────────────────────────────
-_pulse_instance: Optional[PulseModule] = None
+_pulse_engine: Optional[PulseEngine] = None
+
+
+def get_pulse_engine(
+    window_seconds: int = PULSE_WINDOW_SECONDS,
+    burst_threshold: float = BURST_THRESHOLD_TICKS_PER_SEC,
+) -> PulseEngine:
+    """Get or create the global per-symbol PulseEngine singleton."""
+    global _pulse_engine
+
+    if _pulse_engine is None:
+        _pulse_engine = PulseEngine(
+            window_seconds=window_seconds,
+            burst_threshold=burst_threshold,
+        )
+        logging.info("[PULSE] Global PulseEngine singleton created")
+
+    return _pulse_engine
 
 
 def get_pulse_module(
     window_seconds: int = PULSE_WINDOW_SECONDS,
     burst_threshold: float = BURST_THRESHOLD_TICKS_PER_SEC,
+    symbol: Optional[str] = None,
 ) -> PulseModule:
     """
-    Get or create the global PulseModule singleton.
-    
+    Get the global PulseModule for ``symbol`` (default DEFAULT_PULSE_SYMBOL).
+
     Args:
         window_seconds: Rolling window size in seconds
         burst_threshold: Burst detection threshold (ticks/sec)
-        
+        symbol: Underlying whose ticks the module tracks
+
     Returns:
         PulseModule instance
     """
-    global _pulse_instance
-    
-    if _pulse_instance is None:
-        _pulse_instance = PulseModule(
-            window_seconds=window_seconds,
-            burst_threshold=burst_threshold,
-        )
-        logging.info("[PULSE] Global PulseModule singleton created")
-    
-    return _pulse_instance
+    return get_pulse_engine(window_seconds, burst_threshold).get(symbol or DEFAULT_PULSE_SYMBOL)
 
 
 def reset_pulse_module() -> None:
-    """Reset the global PulseModule singleton."""
-    global _pulse_instance
-    
-    if _pulse_instance is not None:
-        _pulse_instance.reset()
-        logging.info("[PULSE] Global PulseModule reset")
+    """Reset every symbol in the global PulseEngine."""
+    if _pulse_engine is not None:
+        _pulse_engine.reset()
+        logging.info("[PULSE] Global PulseEngine reset")
+
 
+__all__ = [
+    "DEFAULT_PULSE_SYMBOL",
+    "PULSE_WINDOWS_SECONDS",
+    "PULSE_WINDOW_SECONDS",
+    "PulseEngine",
+    "PulseMetrics",
+    "PulseModule",
+    "get_pulse_engine",
+    "get_pulse_module",
+    "reset_pulse_module",
+]
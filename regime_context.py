@@ -39,6 +39,8 @@ import math
 from dataclasses import dataclass, field
 from typing import Optional, Tuple
 
+from event_stream import emit_event
+
 # ── ANSI colours (mirror execution.py) ──────────────────────────────────────
 CYAN = "\033[96m"
 RESET = "\033[0m"
@@ -391,6 +393,17 @@ def log_regime_context(rc: RegimeContext) -> None:
         f"{CYAN}[REGIME_CONTEXT] {rc.bar_timestamp} {rc.symbol} "
         f"{rc.to_log_tag()}{RESET}"
     )
+    emit_event(
+        "regime_context",
+        bar_ts=rc.bar_timestamp,
+        symbol=rc.symbol,
+        atr_regime=rc.atr_regime,
+        adx_tier=rc.adx_tier,
+        day_type=rc.day_type,
+        cpr_width=rc.cpr_width,
+        atr=round(rc.atr_value, 1),
+        adx=round(rc.adx_value, 1),
+    )
 
 
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -5,6 +5,8 @@ Comprehensive Exit Logic v8 Replay Analyzer (Updated from v7)
 Tests position_manager.py exit logic against all available *.db files.
 Tracks dynamic thresholds (ATR-scaled) and capital efficiency metrics.
 Identifies convertible losses (trades that could have been winners).
+Trades come from one scan of the trade store (trade_store.py), falling back
+to the per-day trades_<sym>_<date>.csv files for dates not in the store.
 Generates detailed CSV report and debug logs.
 """
 
@@ -19,6 +21,8 @@ from pathlib import Path
 import sys
 import math
 
+from trade_store import get_trade_store
+
 # Setup logging
 logging_handler = logging.StreamHandler(sys.stdout)
 logging_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
@@ -29,6 +33,7 @@ logger.setLevel(logging.INFO)
 # Configuration
 DB_DIR = r"C:\SQLite\ticks"
 WORKSPACE_DIR = r"c:\Users\mohan\trading_engine"
+SYMBOL = "NSE:NIFTY50-INDEX"
 LOT_SIZE = 130
 RS_PER_PT = 130
 
@@ -60,6 +65,7 @@ class ReplayAnalyzer:
             'convertible_by_reason': defaultdict(int)
         })
         self.all_trades_df = None
+        self._store_trades = None
         
     def find_db_files(self):
         """Find all valid .db files in DB_DIR"""
@@ -109,9 +115,24 @@ class ReplayAnalyzer:
             logger.warning(f"  DB integrity check failed: {e}")
             return False, None
     
+    def load_store_trades(self):
+        """One scan of the trade store; returns {date: trades_df}"""
+        if self._store_trades is None:
+            self._store_trades = {}
+            store = get_trade_store()
+            if store is not None:
+                df = store.scan("trades", modes="REPLAY", filters={"symbol": SYMBOL})
+                self._store_trades = {d: g.reset_index(drop=True) for d, g in df.groupby("date")}
+                logger.info(f"Trade store: {len(df)} trades over {len(self._store_trades)} dates")
+        return self._store_trades
+
     def extract_trades_from_csv(self, date_str):
-        """Extract trades from generated CSV for a specific date"""
-        csv_pattern = os.path.join(WORKSPACE_DIR, f"trades_NSE_NIFTY50-INDEX_{date_str}.csv")
+        """Trades for a date: trade store first, per-day CSV as fallback"""
+        stored = self.load_store_trades().get(date_str)
+        if stored is not None and len(stored) > 0:
+            return stored
+
+        csv_pattern = os.path.join(WORKSPACE_DIR, f"trades_{SYMBOL.replace(':', '_')}_{date_str}.csv")
         
         try:
             if os.path.exists(csv_pattern):
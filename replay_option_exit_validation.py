@@ -17,8 +17,10 @@ from __future__ import annotations
 import argparse
 import glob
 import itertools
+import math
 import os
 import sqlite3
+from collections import deque
 from dataclasses import dataclass
 from typing import Any
 
@@ -26,6 +28,7 @@ import numpy as np
 import pandas as pd
 
 from option_exit_manager import OptionExitConfig, OptionExitManager
+from param_sweep import run_sweep
 
 
 @dataclass
@@ -61,6 +64,160 @@ SWEEP_TRAIL_PAIRS = [(0.12, 0.05), (0.10, 0.03)]
 SWEEP_STD_THRESHOLD = [1.5, 2.0, 2.5]
 
 
+class TickContext:
+    """Streaming entry context over the last ``WINDOW`` option ticks.
+
+    Produces the same fields as the former per-attempt pandas rebuild
+    (EMA5/13 slope agreement, ADX-style DX average, RSI14, CCI20 on tick
+    prices) but updates in O(1) per tick with ring buffers and running sums.
+
+    The original computed every statistic on ``prices[i-80:i+1]`` only.  The
+    rolling windows (14/20/39 ticks) never reach the window start, and the
+    EMAs are restarted at it: ``ema_win[i] = ema[i] - (1-a)^(i-s) * (ema[s] - p[s])``
+    recovers the restarted value exactly from the running EMA.
+    """
+
+    WINDOW = 81
+    MIN_TICKS = 25
+    DX_PERIOD = 14
+    RSI_PERIOD = 14
+    CCI_PERIOD = 20
+
+    def __init__(self) -> None:
+        self._n = 0
+        self._a_fast = 2.0 / (5 + 1)
+        self._a_slow = 2.0 / (13 + 1)
+        self._px: deque[float] = deque(maxlen=self.WINDOW)
+        self._ema_fast: deque[float] = deque(maxlen=self.WINDOW)
+        self._ema_slow: deque[float] = deque(maxlen=self.WINDOW)
+        # diff windows: d[0] of the stream is 0 (DX) / missing (RSI)
+        self._d: deque[float] = deque(maxlen=self.DX_PERIOD)
+        self._d_sum = 0.0
+        self._d_abs = 0.0
+        self._d_nz = 0
+        self._dx: deque[float] = deque(maxlen=self.DX_PERIOD)
+        self._dx_sum = 0.0
+        self._dx_nan = 0
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        self._loss_nz = 0
+        self._ma_px: deque[float] = deque(maxlen=self.CCI_PERIOD)
+        self._ma_sum = 0.0
+        self._dev: deque[float] = deque(maxlen=self.CCI_PERIOD)
+        self._dev_sum = 0.0
+        self._ma20 = float("nan")
+        self._last_dev = float("nan")
+
+    def update(self, price: float) -> None:
+        """Ingest one tick price."""
+        px = float(price)
+        prev = self._px[-1] if self._px else None
+        self._px.append(px)
+
+        if prev is None:
+            self._ema_fast.append(px)
+            self._ema_slow.append(px)
+        else:
+            ef, es = self._ema_fast[-1], self._ema_slow[-1]
+            self._ema_fast.append(ef + self._a_fast * (px - ef))
+            self._ema_slow.append(es + self._a_slow * (px - es))
+
+        # DX / RSI windows share the diff ring.
+        d = 0.0 if prev is None else px - prev
+        if len(self._d) == self.DX_PERIOD:
+            old = self._d[0]
+            self._d_sum -= old
+            self._d_abs -= abs(old)
+            self._d_nz -= old != 0.0
+            self._gain_sum -= max(old, 0.0)
+            self._loss_sum -= max(-old, 0.0)
+            self._loss_nz -= old < 0.0
+        self._d.append(d)
+        self._d_sum += d
+        self._d_abs += abs(d)
+        self._d_nz += d != 0.0
+        self._gain_sum += max(d, 0.0)
+        self._loss_sum += max(-d, 0.0)
+        self._loss_nz += d < 0.0
+
+        if len(self._d) == self.DX_PERIOD:
+            dx = (100.0 * abs(self._d_sum) / self._d_abs) if self._d_nz else float("nan")
+            if len(self._dx) == self.DX_PERIOD:
+                old_dx = self._dx[0]
+                if math.isnan(old_dx):
+                    self._dx_nan -= 1
+                else:
+                    self._dx_sum -= old_dx
+            self._dx.append(dx)
+            if math.isnan(dx):
+                self._dx_nan += 1
+            else:
+                self._dx_sum += dx
+
+        # CCI: mean deviation of price from its own MA20, averaged over 20.
+        if len(self._ma_px) == self.CCI_PERIOD:
+            self._ma_sum -= self._ma_px[0]
+        self._ma_px.append(px)
+        self._ma_sum += px
+        if len(self._ma_px) == self.CCI_PERIOD:
+            self._ma20 = self._ma_sum / self.CCI_PERIOD
+            dev = abs(px - self._ma20)
+            if len(self._dev) == self.CCI_PERIOD:
+                self._dev_sum -= self._dev[0]
+            self._dev.append(dev)
+            self._dev_sum += dev
+        self._n += 1
+
+    def _ema_windowed(self, ema: deque[float], alpha: float, back: int) -> float:
+        """EMA at ``-1-back`` as if restarted at the first tick in the window."""
+        cur = ema[-1 - back]
+        if self._n <= self.WINDOW:
+            return cur
+        steps = len(ema) - 1 - back
+        return cur - (1.0 - alpha) ** steps * (ema[0] - self._px[0])
+
+    def snapshot(self) -> dict[str, float | bool]:
+        """Return the entry context for the latest tick."""
+        nan = float("nan")
+        if len(self._px) < self.MIN_TICKS:
+            return {
+                "adx14": nan,
+                "rsi14": nan,
+                "cci20": nan,
+                "slope_agreement": False,
+                "osc_extreme": False,
+            }
+
+        fast = self._ema_windowed(self._ema_fast, self._a_fast, 0)
+        slow = self._ema_windowed(self._ema_slow, self._a_slow, 0)
+        gap = fast - slow
+        slope = fast - self._ema_windowed(self._ema_fast, self._a_fast, 3)
+        slope_agreement = bool((gap >= 0 and slope > 0) or (gap < 0 and slope < 0))
+
+        full_dx = len(self._dx) == self.DX_PERIOD and self._dx_nan == 0
+        adx14 = self._dx_sum / self.DX_PERIOD if full_dx else nan
+        if self._loss_nz:
+            rs = (self._gain_sum / self.RSI_PERIOD) / (self._loss_sum / self.RSI_PERIOD)
+            rsi14 = 100.0 - (100.0 / (1.0 + rs))
+        else:
+            rsi14 = nan
+        md20 = self._dev_sum / self.CCI_PERIOD if len(self._dev) == self.CCI_PERIOD else 0.0
+        # Running sums leave float residue on flat stretches; treat as zero.
+        cci20 = (self._px[-1] - self._ma20) / (0.015 * md20) if md20 > 1e-9 else nan
+
+        osc_extreme = bool(
+            (np.isfinite(rsi14) and (rsi14 < 35.0 or rsi14 > 65.0))
+            or (np.isfinite(cci20) and (cci20 < -120.0 or cci20 > 120.0))
+        )
+        return {
+            "adx14": adx14,
+            "rsi14": rsi14,
+            "cci20": cci20,
+            "slope_agreement": slope_agreement,
+            "osc_extreme": osc_extreme,
+        }
+
+
 def _has_ticks_table(cur: sqlite3.Cursor) -> bool:
     tables = {
         row[0] for row in cur.execute("SELECT name FROM sqlite_master WHERE type='table'")
@@ -149,7 +306,6 @@ def _replay_symbol(
     manager: OptionExitManager | None = None
     entry_idx: int | None = None
     entry_px: float | None = None
-    entry_ts: pd.Timestamp | None = None
     entry_ctx: dict[str, Any] = {}
 
     diag = {
@@ -159,63 +315,21 @@ def _replay_symbol(
         "blocked_osc": 0,
     }
 
-    def _tick_context(prices: list[float]) -> dict[str, float | bool]:
-        s = pd.Series(prices, dtype="float64")
-        if len(s) < 25:
-            return {
-                "adx14": float("nan"),
-                "rsi14": float("nan"),
-                "cci20": float("nan"),
-                "slope_agreement": False,
-                "osc_extreme": False,
-            }
-
-        ema_fast = s.ewm(span=5, adjust=False).mean()
-        ema_slow = s.ewm(span=13, adjust=False).mean()
-        gap = float(ema_fast.iloc[-1] - ema_slow.iloc[-1])
-        slope = float(ema_fast.iloc[-1] - ema_fast.iloc[-4]) if len(ema_fast) >= 4 else 0.0
-        slope_agreement = bool((gap >= 0 and slope > 0) or (gap < 0 and slope < 0))
+    # One vectorised pass: prices as float64, timestamps as int64 ns.
+    prices = np.fromiter((r[1] for r in rows), dtype=np.float64, count=len(rows))
+    volumes = np.fromiter((r[2] or 0.0 for r in rows), dtype=np.float64, count=len(rows))
+    ts_dt = pd.to_datetime([r[0] for r in rows]).to_numpy("datetime64[ns]")
+    ts_ns = ts_dt.astype(np.int64)
+    tick_ctx = TickContext()
 
-        d = s.diff().fillna(0.0)
-        plus = d.clip(lower=0.0)
-        minus = -d.clip(upper=0.0)
-        atr = d.abs().rolling(14).mean().replace(0, np.nan)
-        plus_di = 100.0 * plus.rolling(14).mean() / atr
-        minus_di = 100.0 * minus.rolling(14).mean() / atr
-        dx = 100.0 * (plus_di - minus_di).abs() / (plus_di + minus_di).replace(0, np.nan)
-        adx14 = float(dx.rolling(14).mean().iloc[-1]) if len(dx) > 0 else float("nan")
-
-        diff = s.diff()
-        gain = diff.clip(lower=0).rolling(14).mean()
-        loss = (-diff.clip(upper=0)).rolling(14).mean().replace(0, np.nan)
-        rs = gain / loss
-        rsi14 = float((100 - (100 / (1 + rs))).iloc[-1]) if len(rs) > 0 else float("nan")
-
-        ma20 = s.rolling(20).mean()
-        md20 = (s - ma20).abs().rolling(20).mean().replace(0, np.nan)
-        cci20 = float(((s - ma20) / (0.015 * md20)).iloc[-1]) if len(ma20) > 0 else float("nan")
-
-        osc_extreme = bool(
-            (np.isfinite(rsi14) and (rsi14 < 35.0 or rsi14 > 65.0))
-            or (np.isfinite(cci20) and (cci20 < -120.0 or cci20 > 120.0))
-        )
-        return {
-            "adx14": adx14,
-            "rsi14": rsi14,
-            "cci20": cci20,
-            "slope_agreement": slope_agreement,
-            "osc_extreme": osc_extreme,
-        }
-
-    for i, (ts_raw, px_raw, vol_raw) in enumerate(rows):
-        px = float(px_raw)
-        vol = float(vol_raw or 0.0)
-        ts = pd.Timestamp(ts_raw)
+    for i in range(len(rows)):
+        px = float(prices[i])
+        tick_ctx.update(px)
 
         if manager is None:
             if i % cfg.entry_stride_ticks == 0 and cfg.min_premium <= px <= cfg.max_premium:
                 diag["entry_attempts"] += 1
-                ctx = _tick_context([float(r[1]) for r in rows[max(0, i - 80): i + 1]])
+                ctx = tick_ctx.snapshot()
                 if not bool(ctx["slope_agreement"]):
                     diag["blocked_slope"] += 1
                     continue
@@ -234,11 +348,12 @@ def _replay_symbol(
                 )
                 entry_idx = i
                 entry_px = px
-                entry_ts = ts
                 entry_ctx = ctx
             continue
 
         # Explicit sequential stream into update_tick() for replay fidelity.
+        vol = float(volumes[i])
+        ts = ts_dt[i]
         manager.update_tick(px, vol, ts)
         should_exit = manager.check_exit(
             px,
@@ -251,15 +366,15 @@ def _replay_symbol(
         if should_exit or ticks_held >= cfg.max_hold_ticks:
             exit_reason = manager.last_reason if should_exit else "TIMEOUT"
             pnl = px - float(entry_px)
-            bars_held = max(1, int((ts - entry_ts).total_seconds() // 60))
+            bars_held = max(1, int((ts_ns[i] - ts_ns[entry_idx]) // 60_000_000_000))
 
             trades.append(
                 {
                     "profile": cfg.profile_name,
                     "db": db_name,
                     "symbol": symbol,
-                    "entry_time": entry_ts,
-                    "exit_time": ts,
+                    "entry_time": pd.Timestamp(ts_dt[entry_idx]),
+                    "exit_time": pd.Timestamp(ts),
                     "entry_price": round(float(entry_px), 2),
                     "exit_price": round(px, 2),
                     "ticks_held": ticks_held,
@@ -279,7 +394,6 @@ def _replay_symbol(
             manager = None
             entry_idx = None
             entry_px = None
-            entry_ts = None
             entry_ctx = {}
 
     return trades, diag
@@ -391,6 +505,12 @@ def parse_args() -> argparse.Namespace:
         default=0,
         help="Optional cap on number of parameter combinations (0 = all).",
     )
+    parser.add_argument(
+        "--sweep-workers",
+        type=int,
+        default=os.cpu_count() or 1,
+        help="Worker processes for --sweep (1 = serial).",
+    )
     parser.add_argument(
         "--func-check",
         action="store_true",
@@ -641,6 +761,18 @@ def _build_sweep_row(df: pd.DataFrame, params: dict[str, Any], tag: str) -> dict
     }
 
 
+def _evaluate_sweep_set(job: dict[str, Any], _arrays: dict) -> dict[str, Any]:
+    """Sweep worker: replay one parameter set and export its ledger."""
+    params = job["params"]
+    cfg = job["cfg"]
+    tag = _build_sweep_tag(params)
+    trades = run_replay(cfg, risk_buffer=cfg.risk_buffer)
+    df = pd.DataFrame(trades)
+    df.to_csv(cfg.out_csv, index=False)
+    print(f"[SWEEP] done {tag}")
+    return _build_sweep_row(df, params, tag)
+
+
 def _run_parameter_sweep(args: argparse.Namespace, out_dir: str) -> None:
     """Run parameter sensitivity sweep and export comparative summary."""
     grid = _sweep_param_grid()
@@ -650,17 +782,18 @@ def _run_parameter_sweep(args: argparse.Namespace, out_dir: str) -> None:
     print(f"\n=== PARAMETER SWEEP START ===")
     print(f"total_param_sets: {len(grid)}")
 
-    rows: list[dict[str, Any]] = []
-    for idx, params in enumerate(grid, start=1):
-        tag = _build_sweep_tag(params)
-        print(f"[SWEEP] {idx}/{len(grid)} {tag}")
-        cfg = _build_sweep_cfg(args, out_dir, params)
-        trades = run_replay(cfg, risk_buffer=cfg.risk_buffer)
-        df = pd.DataFrame(trades)
-        df.to_csv(cfg.out_csv, index=False)
-        rows.append(_build_sweep_row(df, params, tag))
-
-    summary_df = pd.DataFrame(rows)
+    print(f"sweep_workers: {args.sweep_workers}")
+
+    jobs = [
+        {"params": params, "cfg": _build_sweep_cfg(args, out_dir, params)}
+        for params in grid
+    ]
+    summary_df = run_sweep(
+        _evaluate_sweep_set,
+        jobs,
+        workers=args.sweep_workers,
+        merge_params=False,
+    )
     summary_df.sort_values(["avg_pnl", "win_rate"], ascending=[False, False], inplace=True)
 
     top_n = summary_df.head(5)
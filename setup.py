@@ -67,6 +67,8 @@ for sym in symbols:
         response = fyers.optionchain(data=data)['data']
         df_chain = pd.DataFrame(response['optionsChain'])
         df_chain['underlying'] = sym
+        if 'expiry' not in df_chain.columns:
+            df_chain['expiry'] = expiry_e   # epoch seconds; keys the Greeks surface
         option_chain_list.append(df_chain)
 
         symbols_from_chain = df_chain['symbol'].to_list()
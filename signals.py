@@ -26,6 +26,8 @@ from indicators import (
     classify_cpr_width,
 )
 from entry_logic import check_entry_condition
+from event_stream import emit_event
+from stage_profiler import stage
 
 # ANSI COLORS
 RESET   = "\033[0m"
@@ -471,7 +473,8 @@ def detect_signal(candles_3m, candles_15m,
                   osc_relief_active=False,  # NEW: S4/R4 relief override from gate
                   zone_signal=None,      # Phase 4A: zone_detector output
                   pulse_metrics=None,    # Phase 4B: pulse_module metrics dict
-                  daily_camarilla_levels=None):  # Fixed daily S4/R4 for RSI bypass
+                  daily_camarilla_levels=None,   # Fixed daily S4/R4 for RSI bypass
+                  symbol=None):          # underlying, for its live Greeks surface
     """
     Unified signal detection with VWAP, ORB, and volume confirmation.
 
@@ -649,18 +652,20 @@ def detect_signal(candles_3m, candles_15m,
     )
 
     # --- Scoring engine ---
-    lz_signal = check_entry_condition(
-        candle=last_3m,
-        indicators=indicators,
-        bias_15m=st_bias,
-        pivot_signal=pivot_signal,
-        current_time=current_time,
-        day_type_result=day_type_result,
-        osc_relief_active=osc_relief_active,
-        zone_signal=zone_signal,
-        pulse_metrics=pulse_metrics,
-        daily_camarilla_levels=daily_camarilla_levels,
-    )
+    with stage("check_entry_condition"):
+        lz_signal = check_entry_condition(
+            candle=last_3m,
+            indicators=indicators,
+            bias_15m=st_bias,
+            pivot_signal=pivot_signal,
+            current_time=current_time,
+            day_type_result=day_type_result,
+            osc_relief_active=osc_relief_active,
+            zone_signal=zone_signal,
+            pulse_metrics=pulse_metrics,
+            daily_camarilla_levels=daily_camarilla_levels,
+            symbol=symbol,
+        )
 
     # ── [SIGNAL CHECK] — emitted for every bar regardless of outcome ──────────
     _sc  = lz_signal.get("score",     0)  or 0
@@ -764,6 +769,19 @@ def detect_signal(candles_3m, candles_15m,
         f"bias15m={st_bias} bias3m={st_bias_3m} "
         f"pivot={pivot_reason} {vwap_pos}{_ba_tag} | {reason}{RESET}"
     )
+    emit_event(
+        "signal_fired",
+        side=side,
+        source=source,
+        score=state["score"],
+        strength=state["strength"],
+        bias15m=st_bias,
+        bias3m=st_bias_3m,
+        pivot=pivot_reason,
+        bias_alignment=_bias_align,
+        bias_alignment_tf=_bias_tf,
+        tilt_state=_tilt_state,
+    )
     return state
 
 
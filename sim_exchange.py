@@ -0,0 +1,625 @@
+"""sim_exchange.py — local matching-engine exchange speaking the Fyers client API.
+
+PAPER mode fills instantly at LTP, so it says nothing about how the live
+order path (send_live_entry_order / check_order_status / chase / the order
+tracker) behaves under delayed acks, partial fills or rejects.  SimExchange
+replays recorded ticks from ``ticks_*.db`` and matches orders against them;
+SimFyersClient exposes the calls execution.py makes on ``fyers`` so the live
+path can run unmodified against it (``execution.use_sim_exchange(client)``
+routes live_order / send_live_*_order / check_order_status to it):
+
+    place_order / modify_order / cancel_order / orderbook / positions / quotes
+
+Models (all seeded, all in simulated feed time):
+  LatencyModel      — order-entry latency (mean + uniform jitter, ms); an
+                      order reaches the book only once the feed passes its
+                      arrival time
+  SlippageModel     — market orders fill at the touch plus ``ticks`` price
+                      ticks and ``bps`` basis points against the taker
+  PartialFillRule   — per-tick fill cap at the touch, in whole lots
+  reject rules      — unknown symbol, bad qty / lot multiple, non-positive
+                      limit, unsupported type, plus a random ``reject_rate``
+
+Resting limit orders sit in per-symbol price heaps (lazy deletion on
+modify / cancel), so each tick only touches marketable orders and
+placement is O(log n) — thousands of orders per second on one core.
+
+Usage (soak / throughput benchmark):
+    python sim_exchange.py --db "C:\\SQLite\\ticks\\ticks_2026-03-03.db" --orders 20000
+
+Log tags
+--------
+[SIM EXCHANGE]  feed loading and soak summary
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import heapq
+import itertools
+import logging
+import random
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Fyers order constants
+BUY, SELL = 1, -1
+LIMIT, MARKET = 1, 2
+ST_CANCELLED, ST_FILLED, ST_TRANSIT, ST_REJECTED, ST_PENDING = 1, 2, 4, 5, 6
+TICK_SIZE = 0.05
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Models
+# ─────────────────────────────────────────────────────────────────────────────
+
+@dataclass
+class LatencyModel:
+    """Order-entry latency in ms: ``mean_ms`` ± uniform ``jitter_ms``."""
+
+    mean_ms: float = 25.0
+    jitter_ms: float = 10.0
+
+    def sample(self, rng: random.Random) -> float:
+        if self.jitter_ms <= 0:
+            return max(0.0, self.mean_ms) / 1000.0
+        return max(0.0, self.mean_ms + rng.uniform(-self.jitter_ms, self.jitter_ms)) / 1000.0
+
+
+@dataclass
+class SlippageModel:
+    """Market-order slippage against the taker: whole ticks plus basis points."""
+
+    ticks: int = 1
+    bps: float = 0.0
+    tick_size: float = TICK_SIZE
+
+    def apply(self, price: float, side: int) -> float:
+        slip = self.ticks * self.tick_size + price * self.bps / 1e4
+        px = price + slip if side == BUY else price - slip
+        return max(self.tick_size, round(round(px / self.tick_size) * self.tick_size, 2))
+
+
+@dataclass
+class PartialFillRule:
+    """Fill cap per tick at the touch, in whole lots (None → unlimited)."""
+
+    lot_size: int = 1
+    max_lots_per_tick: Optional[int] = None
+
+    def cap(self, remaining: int) -> int:
+        if self.max_lots_per_tick is None:
+            return remaining
+        return min(remaining, self.max_lots_per_tick * self.lot_size)
+
+
+@dataclass
+class SimOrder:
+    id: str
+    symbol: str
+    side: int
+    type: int
+    qty: int
+    limit_price: float
+    tag: str
+    placed_at: float
+    arrival: float
+    status: int = ST_TRANSIT
+    filled_qty: int = 0
+    traded_value: float = 0.0
+    message: str = ""
+    version: int = 0
+    updated_at: float = 0.0
+
+    @property
+    def avg_price(self) -> float:
+        return round(self.traded_value / self.filled_qty, 2) if self.filled_qty else 0.0
+
+    def as_fyers(self) -> dict:
+        return {
+            "id": self.id,
+            "symbol": self.symbol,
+            "side": self.side,
+            "type": self.type,
+            "qty": self.qty,
+            "filledQty": self.filled_qty,
+            "remainingQuantity": self.qty - self.filled_qty,
+            "limitPrice": self.limit_price,
+            "tradedPrice": self.avg_price,
+            "status": self.status,
+            "orderTag": self.tag,
+            "message": self.message,
+            "orderDateTime": self.placed_at,
+        }
+
+
+@dataclass
+class _Position:
+    net_qty: int = 0
+    avg_price: float = 0.0
+    realized: float = 0.0
+    buy_qty: int = 0
+    sell_qty: int = 0
+
+    def apply(self, side: int, qty: int, price: float) -> None:
+        signed = side * qty
+        if side == BUY:
+            self.buy_qty += qty
+        else:
+            self.sell_qty += qty
+        if self.net_qty == 0 or (self.net_qty > 0) == (signed > 0):
+            total = abs(self.net_qty) + qty
+            self.avg_price = (self.avg_price * abs(self.net_qty) + price * qty) / total
+            self.net_qty += signed
+            return
+        closing = min(qty, abs(self.net_qty))
+        direction = 1 if self.net_qty > 0 else -1
+        self.realized += closing * (price - self.avg_price) * direction
+        self.net_qty += signed
+        if self.net_qty == 0:
+            self.avg_price = 0.0
+        elif (self.net_qty > 0) != (direction > 0):
+            self.avg_price = price          # flipped through flat
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Tick feed
+# ─────────────────────────────────────────────────────────────────────────────
+
+def load_ticks(db_paths, symbols: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """Ticks from ``ticks`` tables as columns ts (epoch s), symbol, bid, ask, ltp, volume.
+
+    ``db_paths`` is a path, a glob or a list of either.  Sorted by time.
+    """
+    if isinstance(db_paths, str):
+        db_paths = [db_paths]
+    files = sorted({f for p in db_paths for f in (glob.glob(p) or [p])})
+    frames = []
+    wanted = set(symbols) if symbols else None
+    for path in files:
+        with sqlite3.connect(path) as conn:
+            cols = [r[1] for r in conn.execute("PRAGMA table_info(ticks)").fetchall()]
+            if not cols:
+                logging.warning(f"[SIM EXCHANGE] {path}: no ticks table")
+                continue
+            tcol = next(c for c in ("timestamp", "time") if c in cols)
+            pcol = next(c for c in ("last_price", "ltp", "price") if c in cols)
+            sel = {
+                "ts": tcol, "symbol": "symbol", "ltp": pcol,
+                "bid": "bid" if "bid" in cols else pcol,
+                "ask": "ask" if "ask" in cols else pcol,
+                "volume": "volume" if "volume" in cols else "0",
+            }
+            query = "SELECT " + ", ".join(f"{v} AS {k}" for k, v in sel.items()) + " FROM ticks"
+            frames.append(pd.read_sql_query(query, conn))
+    if not frames:
+        return pd.DataFrame(columns=["ts", "symbol", "bid", "ask", "ltp", "volume"])
+    ticks = pd.concat(frames, ignore_index=True)
+    if wanted is not None:
+        ticks = ticks[ticks["symbol"].isin(wanted)]
+    # tickdb stores UTC ISO strings with an offset; naive stamps are read as UTC.
+    stamps = pd.to_datetime(ticks["ts"], utc=True, format="ISO8601")
+    ticks["ts"] = (stamps - pd.Timestamp(0, tz="UTC")) / pd.Timedelta(seconds=1)
+    for col in ("bid", "ask", "ltp", "volume"):
+        ticks[col] = pd.to_numeric(ticks[col], errors="coerce")
+    # Missing / crossed quotes fall back to LTP on both sides.
+    bad = ~(ticks["bid"] > 0) | ~(ticks["ask"] > 0) | (ticks["bid"] > ticks["ask"])
+    ticks.loc[bad, "bid"] = ticks.loc[bad, "ltp"]
+    ticks.loc[bad, "ask"] = ticks.loc[bad, "ltp"]
+    ticks = ticks.dropna(subset=["ltp"])
+    logging.info(f"[SIM EXCHANGE] loaded {len(ticks)} ticks, {ticks['symbol'].nunique()} symbols "
+                 f"from {len(files)} file(s)")
+    return ticks.sort_values("ts", kind="mergesort").reset_index(drop=True)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Exchange
+# ─────────────────────────────────────────────────────────────────────────────
+
+class SimExchange:
+    """Tick-driven matching engine with latency, slippage and partial fills."""
+
+    def __init__(
+        self,
+        ticks: Optional[pd.DataFrame] = None,
+        latency: Optional[LatencyModel] = None,
+        slippage: Optional[SlippageModel] = None,
+        fills: Optional[PartialFillRule] = None,
+        reject_rate: float = 0.0,
+        seed: int = 7,
+    ):
+        self.latency = latency or LatencyModel()
+        self.slippage = slippage or SlippageModel()
+        self.fills = fills or PartialFillRule()
+        self.reject_rate = reject_rate
+        self.rng = random.Random(seed)
+        self.now = 0.0
+        self.quotes: Dict[str, Tuple[float, float, float]] = {}   # symbol → (bid, ask, ltp)
+        self.orders: Dict[str, SimOrder] = {}
+        self.positions: Dict[str, _Position] = {}
+        self.listeners: List[Callable[[dict], None]] = []
+        self._arrivals: List[Tuple[float, int, str]] = []
+        self._bids: Dict[str, List[Tuple[float, int, str, int]]] = {}
+        self._asks: Dict[str, List[Tuple[float, int, str, int]]] = {}
+        self._seq = itertools.count(1)
+        self._ticks = ticks if ticks is not None else pd.DataFrame(
+            columns=["ts", "symbol", "bid", "ask", "ltp", "volume"])
+        self._cursor = 0
+        self._symbols = frozenset(self._ticks["symbol"]) if len(self._ticks) else frozenset()
+        self.stats = {"placed": 0, "filled": 0, "partial_fills": 0, "rejected": 0,
+                      "cancelled": 0, "modified": 0, "ticks": 0}
+        if len(self._ticks):
+            self.now = float(self._ticks["ts"].iat[0])
+            self._tick_arrays = (
+                self._ticks["ts"].to_numpy(float), self._ticks["symbol"].to_numpy(object),
+                self._ticks["bid"].to_numpy(float), self._ticks["ask"].to_numpy(float),
+                self._ticks["ltp"].to_numpy(float),
+            )
+
+    @classmethod
+    def from_db(cls, db_paths, symbols=None, **kwargs) -> "SimExchange":
+        return cls(load_ticks(db_paths, symbols), **kwargs)
+
+    # ── events ────────────────────────────────────────────────────────────
+
+    def _emit(self, o: SimOrder) -> None:
+        o.updated_at = self.now
+        if self.listeners:
+            msg = {"orders": o.as_fyers()}
+            for cb in self.listeners:
+                cb(msg)
+
+    def set_quote(self, symbol: str, bid: float, ask: float, ltp: Optional[float] = None) -> None:
+        """Apply one quote (used by the feed and directly by tests)."""
+        self.quotes[symbol] = (bid, ask, ltp if ltp is not None else (bid + ask) / 2)
+        self._match_resting(symbol)
+
+    def advance_to(self, ts: float) -> int:
+        """Replay feed ticks and order arrivals up to ``ts``; returns ticks applied."""
+        applied = 0
+        if len(self._ticks):
+            t_arr, s_arr, b_arr, a_arr, l_arr = self._tick_arrays
+            n = len(t_arr)
+            while self._cursor < n and t_arr[self._cursor] <= ts:
+                i = self._cursor
+                self._process_arrivals(t_arr[i])
+                self.now = t_arr[i]
+                self.set_quote(s_arr[i], b_arr[i], a_arr[i], l_arr[i])
+                self._cursor += 1
+                applied += 1
+        self._process_arrivals(ts)
+        self.now = max(self.now, ts)
+        self.stats["ticks"] += applied
+        return applied
+
+    def advance(self, seconds: float) -> int:
+        return self.advance_to(self.now + seconds)
+
+    def run_feed(self) -> int:
+        """Replay the remaining feed."""
+        if not len(self._ticks):
+            return 0
+        return self.advance_to(float(self._tick_arrays[0][-1]))
+
+    @property
+    def feed_done(self) -> bool:
+        return self._cursor >= len(self._ticks)
+
+    def _process_arrivals(self, ts: float) -> None:
+        while self._arrivals and self._arrivals[0][0] <= ts:
+            arrival, _, oid = heapq.heappop(self._arrivals)
+            self.now = max(self.now, arrival)
+            o = self.orders[oid]
+            if o.status == ST_TRANSIT:
+                self._accept(o)
+
+    # ── order entry ───────────────────────────────────────────────────────
+
+    def place(self, symbol: str, qty: int, side: int, type_: int = MARKET,
+              limit_price: float = 0.0, tag: str = "") -> SimOrder:
+        oid = f"SIM{next(self._seq):09d}"
+        o = SimOrder(id=oid, symbol=symbol, side=side, type=type_, qty=int(qty),
+                     limit_price=float(limit_price or 0.0), tag=str(tag or ""),
+                     placed_at=self.now, arrival=self.now + self.latency.sample(self.rng))
+        self.orders[oid] = o
+        self.stats["placed"] += 1
+        reason = self._validate(o)
+        if reason:
+            self._reject(o, reason)
+        else:
+            heapq.heappush(self._arrivals, (o.arrival, next(self._seq), oid))
+            self._emit(o)
+        return o
+
+    def _validate(self, o: SimOrder) -> str:
+        if o.type not in (LIMIT, MARKET):
+            return f"unsupported order type {o.type}"
+        if o.side not in (BUY, SELL):
+            return f"invalid side {o.side}"
+        if o.qty <= 0 or o.qty % self.fills.lot_size:
+            return f"qty {o.qty} is not a multiple of lot {self.fills.lot_size}"
+        if o.type == LIMIT and o.limit_price <= 0:
+            return "limit price must be positive"
+        if self._symbols and o.symbol not in self._symbols and o.symbol not in self.quotes:
+            return f"unknown symbol {o.symbol}"
+        if self.reject_rate and self.rng.random() < self.reject_rate:
+            return "RMS: simulated reject"
+        return ""
+
+    def _reject(self, o: SimOrder, reason: str) -> None:
+        o.status, o.message = ST_REJECTED, reason
+        self.stats["rejected"] += 1
+        self._emit(o)
+
+    def _accept(self, o: SimOrder) -> None:
+        o.status = ST_PENDING
+        quote = self.quotes.get(o.symbol)
+        if o.type == MARKET:
+            if quote is None:
+                self._reject(o, "no market for symbol")
+                return
+            self._fill_at_touch(o, quote, market=True)
+            if o.status == ST_PENDING:
+                self._rest(o)      # remaining lots keep taking on later ticks
+            return
+        self._emit(o)
+        if quote is not None and self._marketable(o, quote):
+            self._fill_at_touch(o, quote, market=False)
+        if o.status == ST_PENDING:
+            self._rest(o)
+
+    def _rest(self, o: SimOrder) -> None:
+        o.version += 1
+        if o.side == BUY:
+            heapq.heappush(self._bids.setdefault(o.symbol, []), (-self._rest_price(o), next(self._seq), o.id, o.version))
+        else:
+            heapq.heappush(self._asks.setdefault(o.symbol, []), (self._rest_price(o), next(self._seq), o.id, o.version))
+
+    @staticmethod
+    def _rest_price(o: SimOrder) -> float:
+        # Market remainders rest at an "any price" level.
+        if o.type == MARKET:
+            return 1e18 if o.side == BUY else 0.0
+        return o.limit_price
+
+    @staticmethod
+    def _marketable(o: SimOrder, quote) -> bool:
+        bid, ask, _ = quote
+        if o.type == MARKET:
+            return True
+        return ask <= o.limit_price if o.side == BUY else bid >= o.limit_price
+
+    def _fill_at_touch(self, o: SimOrder, quote, market: bool) -> None:
+        bid, ask, _ = quote
+        touch = ask if o.side == BUY else bid
+        if market:
+            price = self.slippage.apply(touch, o.side)
+        else:
+            price = min(touch, o.limit_price) if o.side == BUY else max(touch, o.limit_price)
+        qty = self.fills.cap(o.qty - o.filled_qty)
+        if qty <= 0:
+            return
+        o.filled_qty += qty
+        o.traded_value += qty * price
+        self.positions.setdefault(o.symbol, _Position()).apply(o.side, qty, price)
+        if o.filled_qty >= o.qty:
+            o.status = ST_FILLED
+            self.stats["filled"] += 1
+        else:
+            self.stats["partial_fills"] += 1
+        self._emit(o)
+
+    def _match_resting(self, symbol: str) -> None:
+        quote = self.quotes[symbol]
+        bid, ask, _ = quote
+        for book, better in ((self._bids.get(symbol), lambda p: -p >= ask),
+                             (self._asks.get(symbol), lambda p: p <= bid)):
+            if not book:
+                continue
+            deferred = []
+            while book and better(book[0][0]):
+                key, seq, oid, version = heapq.heappop(book)
+                o = self.orders[oid]
+                if o.status != ST_PENDING or version != o.version:
+                    continue                       # stale heap entry
+                self._fill_at_touch(o, quote, market=o.type == MARKET)
+                if o.status == ST_PENDING:
+                    deferred.append((key, seq, oid, version))   # capped this tick
+            for entry in deferred:
+                heapq.heappush(book, entry)
+
+    # ── modify / cancel ───────────────────────────────────────────────────
+
+    def modify(self, order_id: str, limit_price: Optional[float] = None,
+               qty: Optional[int] = None) -> Tuple[bool, str]:
+        o = self.orders.get(order_id)
+        if o is None:
+            return False, "order not found"
+        if o.status not in (ST_PENDING, ST_TRANSIT) or o.type != LIMIT:
+            return False, f"order not modifiable (status={o.status})"
+        if limit_price is not None:
+            if limit_price <= 0:
+                return False, "limit price must be positive"
+            o.limit_price = float(limit_price)
+        if qty is not None:
+            if qty < o.filled_qty or qty % self.fills.lot_size:
+                return False, f"invalid qty {qty}"
+            o.qty = int(qty)
+        self.stats["modified"] += 1
+        if o.status == ST_PENDING:
+            quote = self.quotes.get(o.symbol)
+            if o.filled_qty >= o.qty:
+                o.status = ST_FILLED
+                self.stats["filled"] += 1
+            elif quote is not None and self._marketable(o, quote):
+                self._fill_at_touch(o, quote, market=False)
+            if o.status == ST_PENDING:
+                self._rest(o)
+                self._emit(o)
+        return True, "modified"
+
+    def cancel(self, order_id: str) -> Tuple[bool, str]:
+        o = self.orders.get(order_id)
+        if o is None or o.status not in (ST_PENDING, ST_TRANSIT):
+            return False, "order not cancellable"
+        o.status = ST_CANCELLED
+        self.stats["cancelled"] += 1
+        self._emit(o)
+        return True, "cancelled"
+
+    # ── views ─────────────────────────────────────────────────────────────
+
+    def position_rows(self) -> Tuple[List[dict], dict]:
+        rows, realized, unrealized = [], 0.0, 0.0
+        for sym, p in self.positions.items():
+            ltp = self.quotes.get(sym, (0, 0, p.avg_price))[2]
+            unrl = p.net_qty * (ltp - p.avg_price) if p.net_qty else 0.0
+            realized += p.realized
+            unrealized += unrl
+            rows.append({
+                "symbol": sym, "netQty": p.net_qty, "netAvg": round(p.avg_price, 2),
+                "buyQty": p.buy_qty, "sellQty": p.sell_qty, "ltp": ltp,
+                "realized_profit": round(p.realized, 2), "unrealized_profit": round(unrl, 2),
+                "pl": round(p.realized + unrl, 2),
+            })
+        overall = {"pl_realized": round(realized, 2), "pl_unrealized": round(unrealized, 2),
+                   "pl_total": round(realized + unrealized, 2),
+                   "count_total": len(rows), "count_open": sum(1 for r in rows if r["netQty"])}
+        return rows, overall
+
+
+class SimFyersClient:
+    """The subset of ``fyersModel.FyersModel`` used by execution / data_feed."""
+
+    def __init__(self, exchange: SimExchange):
+        self.exchange = exchange
+
+    def place_order(self, data: dict) -> dict:
+        o = self.exchange.place(
+            data.get("symbol"), int(data.get("qty", 0)), int(data.get("side", 0)),
+            int(data.get("type", MARKET)), float(data.get("limitPrice") or 0.0),
+            data.get("orderTag", ""),
+        )
+        if o.status == ST_REJECTED:
+            return {"s": "error", "code": -50, "message": o.message, "id": o.id}
+        return {"s": "ok", "code": 1101, "message": "Order submitted successfully", "id": o.id}
+
+    def modify_order(self, data: dict) -> dict:
+        ok, msg = self.exchange.modify(
+            data.get("id"),
+            float(data["limitPrice"]) if data.get("limitPrice") is not None else None,
+            int(data["qty"]) if data.get("qty") is not None else None,
+        )
+        return {"s": "ok" if ok else "error", "code": 1102 if ok else -52, "message": msg,
+                "id": data.get("id")}
+
+    def cancel_order(self, data: dict) -> dict:
+        ok, msg = self.exchange.cancel(data.get("id"))
+        return {"s": "ok" if ok else "error", "code": 1103 if ok else -52, "message": msg,
+                "id": data.get("id")}
+
+    def orderbook(self, data: Optional[dict] = None) -> dict:
+        orders = self.exchange.orders
+        if data and data.get("id"):
+            o = orders.get(data["id"])
+            return {"s": "ok", "code": 200, "orderBook": [o.as_fyers()] if o else []}
+        return {"s": "ok", "code": 200, "orderBook": [o.as_fyers() for o in orders.values()]}
+
+    def positions(self) -> dict:
+        rows, overall = self.exchange.position_rows()
+        return {"s": "ok", "code": 200, "netPositions": rows, "overall": overall}
+
+    def quotes(self, data: dict) -> dict:
+        out = []
+        for sym in str(data.get("symbols", "")).split(","):
+            sym = sym.strip()
+            q = self.exchange.quotes.get(sym)
+            if q is None:
+                out.append({"n": sym, "s": "error", "v": {}})
+            else:
+                bid, ask, ltp = q
+                out.append({"n": sym, "s": "ok", "v": {"lp": ltp, "bid": bid, "ask": ask}})
+        return {"s": "ok", "code": 200, "d": out}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Soak / throughput benchmark
+# ─────────────────────────────────────────────────────────────────────────────
+
+def soak(exchange: SimExchange, n_orders: int, seed: int = 1, lot: int = 1) -> dict:
+    """Spray ``n_orders`` random orders across the feed; returns throughput stats."""
+    client = SimFyersClient(exchange)
+    rng = random.Random(seed)
+    syms = sorted(exchange._symbols)
+    if not syms:
+        raise ValueError("soak needs a tick feed")
+    t_first, t_last = float(exchange._tick_arrays[0][0]), float(exchange._tick_arrays[0][-1])
+    times = np.sort(np.array([rng.uniform(t_first, t_last) for _ in range(n_orders)]))
+    place_s = 0.0
+    wall0 = time.perf_counter()
+    for ts in times:
+        exchange.advance_to(float(ts))
+        sym = rng.choice(syms)
+        q = exchange.quotes.get(sym)
+        ref = q[2] if q else 100.0
+        is_limit = rng.random() < 0.7
+        t0 = time.perf_counter()
+        client.place_order({
+            "symbol": sym, "qty": lot * rng.randint(1, 4), "side": rng.choice((BUY, SELL)),
+            "type": LIMIT if is_limit else MARKET,
+            "limitPrice": round(ref + rng.uniform(-2, 2), 1) if is_limit else 0,
+        })
+        place_s += time.perf_counter() - t0
+    exchange.run_feed()
+    wall = time.perf_counter() - wall0
+    return dict(exchange.stats, orders=n_orders, wall_s=round(wall, 3),
+                orders_per_sec=round(n_orders / wall, 1) if wall else float("inf"),
+                place_us=round(1e6 * place_s / max(n_orders, 1), 2))
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Soak-test the simulated exchange on recorded ticks")
+    parser.add_argument("--db", required=True, help="ticks_*.db path or glob")
+    parser.add_argument("--orders", type=int, default=10000)
+    parser.add_argument("--latency-ms", type=float, default=25.0)
+    parser.add_argument("--slippage-ticks", type=int, default=1)
+    parser.add_argument("--max-lots-per-tick", type=int, default=None)
+    parser.add_argument("--lot", type=int, default=1)
+    parser.add_argument("--reject-rate", type=float, default=0.0)
+    return parser.parse_args()
+
+
+def main() -> None:
+    args = parse_args()
+    ex = SimExchange.from_db(
+        args.db,
+        latency=LatencyModel(args.latency_ms, args.latency_ms / 2),
+        slippage=SlippageModel(ticks=args.slippage_ticks),
+        fills=PartialFillRule(args.lot, args.max_lots_per_tick),
+        reject_rate=args.reject_rate,
+    )
+    result = soak(ex, args.orders, lot=args.lot)
+    logging.info("[SIM EXCHANGE] " + " ".join(f"{k}={v}" for k, v in result.items()))
+    print(result)
+
+
+__all__ = [
+    "LatencyModel",
+    "PartialFillRule",
+    "SimExchange",
+    "SimFyersClient",
+    "SlippageModel",
+    "load_ticks",
+    "soak",
+]
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    main()
@@ -53,6 +53,8 @@ from typing import Callable, Dict, Optional, Tuple, Union
 import numpy as np
 import pandas as pd
 
+from event_stream import emit_event
+
 # ---------------------------------------------------------------------------
 # Optional pandas_ta import (used for CCI if the column is absent).
 # Falls back to a pure-pandas implementation if pandas_ta is not installed.
@@ -615,6 +617,7 @@ def check_entry_signal(
             f"ST15m_bias={bias_15m} ST3m_bias={bias_3m} "
             "reason=One or both biases are NEUTRAL, entry suppressed."
         )
+        emit_event("entry_blocked", subtype="ST_CONFLICT", bar_ts=str(ts), symbol=symbol)
         tracker.reset_on_bias_change(bias_3m)
         return None
 
@@ -625,6 +628,7 @@ def check_entry_signal(
             f"ST15m_bias={bias_15m} ST3m_bias={bias_3m} "
             "reason=15m vs 3m bias conflict, entry suppressed."
         )
+        emit_event("entry_blocked", subtype="ST_CONFLICT", bar_ts=str(ts), symbol=symbol)
         tracker.reset_on_bias_change(bias_3m)
         return None
 
@@ -643,6 +647,7 @@ def check_entry_signal(
             f"ST3m_bias={bias_3m} ST3m_slope={slope_3m} "
             "reason=3m slope does not confirm bias direction, entry suppressed."
         )
+        emit_event("entry_blocked", subtype="ST_SLOPE_CONFLICT", bar_ts=str(ts), symbol=symbol)
         tracker.reset_on_bias_change(bias_3m)
         return None
 
@@ -670,6 +675,7 @@ def check_entry_signal(
             f"timestamp={ts} symbol={symbol} atr={atr} "
             "reason=ATR unavailable or zero, cannot size SL/PT."
         )
+        emit_event("entry_blocked", subtype="INVALID_ATR", bar_ts=str(ts), symbol=symbol)
         return None
 
     # ------------------------------------------------------------------
@@ -703,6 +709,7 @@ def check_entry_signal(
             f"cci14={cci14:.1f} tracker={tracker.state_dict} "
             "reason=Gate passed but neither pullback nor CCI trigger active."
         )
+        emit_event("entry_blocked", subtype="NO_TRIGGER", bar_ts=str(ts), symbol=symbol)
         return None
 
     # ------------------------------------------------------------------
@@ -917,8 +924,14 @@ class BrokerAdapter(ABC):
 
     Concrete subclasses must implement ``place_entry`` and ``place_exit``.
     Both return ``(success: bool, order_id: str | None)``.
+
+    Adapters that accept ``client_order_id`` tag the order with it; those
+    that can also look an order up by that tag set ``supports_lookup`` and
+    implement ``find_order`` so broker_gateway can retry idempotently.
     """
 
+    supports_lookup: bool = False
+
     @abstractmethod
     def place_entry(
         self,
@@ -928,6 +941,7 @@ class BrokerAdapter(ABC):
         limit_price: float = 0.0,
         stop: float = 0.0,
         target: float = 0.0,
+        client_order_id: Optional[str] = None,
     ) -> Tuple[bool, Optional[str]]:
         """Place an entry order.
 
@@ -937,6 +951,7 @@ class BrokerAdapter(ABC):
         limit_price: 0.0 → market order; >0 → limit order.
         stop       : Stop-loss price (informational; included in audit log).
         target     : Take-profit price (informational; included in audit log).
+        client_order_id: Order tag used for idempotent retries (optional).
         """
 
     @abstractmethod
@@ -945,9 +960,28 @@ class BrokerAdapter(ABC):
         symbol: str,
         qty: int,
         reason: str,
+        client_order_id: Optional[str] = None,
     ) -> Tuple[bool, Optional[str]]:
         """Place a market exit (square-off) order."""
 
+    def find_order(self, client_order_id: str) -> Optional[Tuple[str, str]]:
+        """``(order_id, status)`` of the live or filled order tagged ``client_order_id``.
+
+        ``status`` is ``"OPEN"`` or ``"FILLED"``.  Rejected, cancelled and
+        expired orders are not returned: for the gateway they are failed
+        attempts, not placed orders.
+        """
+        return None
+
+    def modify_order(
+        self,
+        order_id: str,
+        limit_price: float,
+        qty: int,
+    ) -> Tuple[bool, Optional[str]]:
+        """Modify the limit price / quantity of a pending order."""
+        raise NotImplementedError(f"{type(self).__name__} does not support modify_order")
+
 
 class FyersAdapter(BrokerAdapter):
     """Fyers API v3 adapter.
@@ -963,6 +997,8 @@ class FyersAdapter(BrokerAdapter):
                                        mode="LIVE", broker_fn=adapter)
     """
 
+    supports_lookup = True
+
     def __init__(self, fyers_client) -> None:
         self._fyers = fyers_client
 
@@ -974,6 +1010,7 @@ class FyersAdapter(BrokerAdapter):
         limit_price: float = 0.0,
         stop: float = 0.0,
         target: float = 0.0,
+        client_order_id: Optional[str] = None,
     ) -> Tuple[bool, Optional[str]]:
         try:
             logging.info(
@@ -992,7 +1029,7 @@ class FyersAdapter(BrokerAdapter):
                 "offlineOrder": False,
                 "disclosedQty": 0,
                 "isSliceOrder": False,
-                "orderTag":     "ST_PULLBACK",
+                "orderTag":     client_order_id or "ST_PULLBACK",
             }
             resp = self._fyers.place_order(data=order_data)
             if resp.get("s") == "ok":
@@ -1008,6 +1045,7 @@ class FyersAdapter(BrokerAdapter):
         symbol: str,
         qty: int,
         reason: str,
+        client_order_id: Optional[str] = None,
     ) -> Tuple[bool, Optional[str]]:
         try:
             order_data = {
@@ -1022,7 +1060,7 @@ class FyersAdapter(BrokerAdapter):
                 "offlineOrder": False,
                 "disclosedQty": 0,
                 "isSliceOrder": False,
-                "orderTag":     str(reason),
+                "orderTag":     client_order_id or str(reason),
             }
             resp = self._fyers.place_order(data=order_data)
             if resp.get("s") == "ok":
@@ -1033,6 +1071,42 @@ class FyersAdapter(BrokerAdapter):
             logging.error(f"[FYERS EXIT ERROR] symbol={symbol} error={exc}")
             return False, None
 
+    # Fyers order status codes: 2 traded, 4 transit, 6 pending (1 cancelled,
+    # 5 rejected, 7 expired are failures).
+    _FYERS_LIVE_STATUS = {2: "FILLED", 4: "OPEN", 6: "OPEN"}
+
+    def find_order(self, client_order_id: str) -> Optional[Tuple[str, str]]:
+        resp = self._fyers.orderbook()
+        for order in resp.get("orderBook") or []:
+            if order.get("orderTag") != client_order_id:
+                continue
+            status = self._FYERS_LIVE_STATUS.get(order.get("status"))
+            if status is not None:
+                return order.get("id"), status
+            logging.warning(
+                f"[FYERS ORDER] tag={client_order_id} id={order.get('id')} "
+                f"status={order.get('status')} message={order.get('message')}"
+            )
+        return None
+
+    def modify_order(
+        self,
+        order_id: str,
+        limit_price: float,
+        qty: int,
+    ) -> Tuple[bool, Optional[str]]:
+        try:
+            resp = self._fyers.modify_order(data={
+                "id": order_id, "type": 1, "limitPrice": limit_price, "qty": qty,
+            })
+            if resp.get("s") == "ok":
+                return True, order_id
+            logging.error(f"[FYERS MODIFY FAILED] id={order_id} response={resp}")
+            return False, None
+        except Exception as exc:
+            logging.error(f"[FYERS MODIFY ERROR] id={order_id} error={exc}")
+            return False, None
+
 
 class ZerodhaKiteAdapter(BrokerAdapter):
     """Zerodha Kite Connect v3 adapter.
@@ -1047,6 +1121,8 @@ class ZerodhaKiteAdapter(BrokerAdapter):
     adapter = ZerodhaKiteAdapter(kite)
     """
 
+    supports_lookup = True
+
     def __init__(self, kite_client) -> None:
         self._kite = kite_client
 
@@ -1058,6 +1134,7 @@ class ZerodhaKiteAdapter(BrokerAdapter):
         limit_price: float = 0.0,
         stop: float = 0.0,
         target: float = 0.0,
+        client_order_id: Optional[str] = None,
     ) -> Tuple[bool, Optional[str]]:
         try:
             txn = "BUY" if side_int == 1 else "SELL"
@@ -1074,7 +1151,7 @@ class ZerodhaKiteAdapter(BrokerAdapter):
                 product="MIS",
                 order_type="LIMIT" if limit_price > 0 else "MARKET",
                 price=limit_price if limit_price > 0 else None,
-                tag="ST_PULLBACK",
+                tag=client_order_id or "ST_PULLBACK",
             )
             return True, str(order_id)
         except Exception as exc:
@@ -1086,6 +1163,7 @@ class ZerodhaKiteAdapter(BrokerAdapter):
         symbol: str,
         qty: int,
         reason: str,
+        client_order_id: Optional[str] = None,
     ) -> Tuple[bool, Optional[str]]:
         try:
             order_id = self._kite.place_order(
@@ -1096,13 +1174,43 @@ class ZerodhaKiteAdapter(BrokerAdapter):
                 quantity=qty,
                 product="MIS",
                 order_type="MARKET",
-                tag=f"EXIT_{reason[:18]}",
+                tag=client_order_id or f"EXIT_{reason[:18]}",
             )
             return True, str(order_id)
         except Exception as exc:
             logging.error(f"[KITE EXIT ERROR] symbol={symbol} error={exc}")
             return False, None
 
+    _KITE_FAILED_STATUS = frozenset({"REJECTED", "CANCELLED"})
+
+    def find_order(self, client_order_id: str) -> Optional[Tuple[str, str]]:
+        for order in self._kite.orders() or []:
+            if order.get("tag") != client_order_id:
+                continue
+            status = str(order.get("status") or "").upper()
+            if status not in self._KITE_FAILED_STATUS:
+                return str(order.get("order_id")), "FILLED" if status == "COMPLETE" else "OPEN"
+            logging.warning(
+                f"[KITE ORDER] tag={client_order_id} id={order.get('order_id')} "
+                f"status={status} message={order.get('status_message')}"
+            )
+        return None
+
+    def modify_order(
+        self,
+        order_id: str,
+        limit_price: float,
+        qty: int,
+    ) -> Tuple[bool, Optional[str]]:
+        try:
+            self._kite.modify_order(
+                variety="regular", order_id=order_id, price=limit_price, quantity=qty,
+            )
+            return True, order_id
+        except Exception as exc:
+            logging.error(f"[KITE MODIFY ERROR] id={order_id} error={exc}")
+            return False, None
+
 
 class AngelOneAdapter(BrokerAdapter):
     """Angel One Smart API adapter.
@@ -1128,6 +1236,7 @@ class AngelOneAdapter(BrokerAdapter):
         limit_price: float = 0.0,
         stop: float = 0.0,
         target: float = 0.0,
+        client_order_id: Optional[str] = None,
     ) -> Tuple[bool, Optional[str]]:
         try:
             txn = "BUY" if side_int == 1 else "SELL"
@@ -1148,7 +1257,7 @@ class AngelOneAdapter(BrokerAdapter):
                 "squareoff":       "0",
                 "stoploss":        "0",
                 "quantity":        str(qty),
-                "ordertag":        "ST_PULLBACK",
+                "ordertag":        client_order_id or "ST_PULLBACK",
             }
             resp = self._client.placeOrder(params)
             if resp and resp.get("status"):
@@ -1164,6 +1273,7 @@ class AngelOneAdapter(BrokerAdapter):
         symbol: str,
         qty: int,
         reason: str,
+        client_order_id: Optional[str] = None,
     ) -> Tuple[bool, Optional[str]]:
         try:
             params = {
@@ -1179,7 +1289,7 @@ class AngelOneAdapter(BrokerAdapter):
                 "squareoff":       "0",
                 "stoploss":        "0",
                 "quantity":        str(qty),
-                "ordertag":        f"EXIT_{reason[:18]}",
+                "ordertag":        client_order_id or f"EXIT_{reason[:18]}",
             }
             resp = self._client.placeOrder(params)
             if resp and resp.get("status"):
@@ -1218,6 +1328,7 @@ class CcxtAdapter(BrokerAdapter):
         limit_price: float = 0.0,
         stop: float = 0.0,
         target: float = 0.0,
+        client_order_id: Optional[str] = None,
     ) -> Tuple[bool, Optional[str]]:
         try:
             ccxt_side  = "buy" if side_int == 1 else "sell"
@@ -1233,7 +1344,7 @@ class CcxtAdapter(BrokerAdapter):
                 side=ccxt_side,
                 amount=qty,
                 price=price,
-                params={"clientOrderId": "ST_PULLBACK"},
+                params={"clientOrderId": client_order_id or "ST_PULLBACK"},
             )
             return True, order.get("id")
         except Exception as exc:
@@ -1245,6 +1356,7 @@ class CcxtAdapter(BrokerAdapter):
         symbol: str,
         qty: int,
         reason: str,
+        client_order_id: Optional[str] = None,
     ) -> Tuple[bool, Optional[str]]:
         try:
             order = self._exchange.create_order(
@@ -1252,7 +1364,7 @@ class CcxtAdapter(BrokerAdapter):
                 type="market",
                 side="sell",
                 amount=qty,
-                params={"clientOrderId": f"EXIT_{reason[:18]}"},
+                params={"clientOrderId": client_order_id or f"EXIT_{reason[:18]}"},
             )
             return True, order.get("id")
         except Exception as exc:
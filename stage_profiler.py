@@ -0,0 +1,203 @@
+"""Per-stage wall-clock profiling for the replay / paper / live loops.
+
+Disabled by default.  Set STAGE_PROFILE=1 to time every ``stage(...)`` block
+in run_offline_replay, paper_order / live_order and main_strategy_code.
+When disabled, ``stage()`` returns a shared no-op context manager, so an
+instrumented call site costs one function call and a flag check.
+
+    from stage_profiler import stage
+    with stage("indicators"):
+        df = build_indicator_dataframe(...)
+
+Per stage the profiler keeps every duration (ns) and reports call count,
+total, mean, p50/p95/p99 and max via ``summary()`` / ``log_summary()``.
+Stages may nest; each block's self-time is also accumulated under its
+nesting path ("replay_bar;indicators") and ``dump()`` writes it as
+collapsed stacks — the input format of flamegraph.pl and speedscope.
+
+Environment:
+  STAGE_PROFILE=1                 enable stage timers
+  STAGE_PROFILE_CPROFILE=<prefix> also run cProfile; ``dump()`` writes
+                                  <prefix>.pstats (snakeviz / flameprof)
+  STAGE_PROFILE_OUT=<prefix>      default prefix for ``dump()`` / exit dump
+"""
+
+from __future__ import annotations
+
+import atexit
+import cProfile
+import logging
+import os
+import threading
+import time
+from array import array
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import numpy as np
+
+
+def _env_flag(name: str) -> bool:
+    return os.getenv(name, "0").strip().lower() in ("1", "true", "yes", "on")
+
+
+ENABLED = _env_flag("STAGE_PROFILE")
+CPROFILE_PREFIX = os.getenv("STAGE_PROFILE_CPROFILE", "")
+OUT_PREFIX = os.getenv("STAGE_PROFILE_OUT", "stage_profile")
+
+_samples: Dict[str, array] = defaultdict(lambda: array("q"))
+_folded: Dict[str, int] = defaultdict(int)
+_local = threading.local()
+_cprofile: Optional[cProfile.Profile] = None
+_exit_registered = False
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("name", "t0", "child_ns")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.child_ns = 0
+
+    def __enter__(self):
+        stack = getattr(_local, "stack", None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self)
+        self.t0 = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        elapsed = time.perf_counter_ns() - self.t0
+        stack = _local.stack
+        path = ";".join(s.name for s in stack)
+        stack.pop()
+        if stack:
+            stack[-1].child_ns += elapsed
+        _samples[self.name].append(elapsed)
+        _folded[path] += elapsed - self.child_ns
+        return False
+
+
+def stage(name: str):
+    """Context manager timing one pipeline stage (no-op unless enabled)."""
+    if not ENABLED:
+        return _NULL_STAGE
+    return _Stage(name)
+
+
+def enable(cprofile_prefix: Optional[str] = None) -> None:
+    """Turn profiling on at runtime (e.g. from a notebook or test)."""
+    global ENABLED, CPROFILE_PREFIX, _cprofile, _exit_registered
+    ENABLED = True
+    if cprofile_prefix:
+        CPROFILE_PREFIX = cprofile_prefix
+    if CPROFILE_PREFIX and _cprofile is None:
+        _cprofile = cProfile.Profile()
+        _cprofile.enable()
+    if not _exit_registered:
+        atexit.register(_at_exit)
+        _exit_registered = True
+
+
+def disable() -> None:
+    global ENABLED, _cprofile
+    ENABLED = False
+    if _cprofile is not None:
+        _cprofile.disable()
+
+
+def reset() -> None:
+    """Drop all collected samples."""
+    _samples.clear()
+    _folded.clear()
+
+
+def summary() -> List[dict]:
+    """One row per stage, slowest total first (times in ms)."""
+    rows = []
+    for name, buf in _samples.items():
+        if not buf:
+            continue
+        ms = np.frombuffer(buf, dtype=np.int64) / 1e6
+        p50, p95, p99 = np.percentile(ms, (50, 95, 99))
+        rows.append({
+            "stage": name,
+            "calls": int(ms.size),
+            "total_ms": round(float(ms.sum()), 2),
+            "mean_ms": round(float(ms.mean()), 3),
+            "p50_ms": round(float(p50), 3),
+            "p95_ms": round(float(p95), 3),
+            "p99_ms": round(float(p99), 3),
+            "max_ms": round(float(ms.max()), 3),
+        })
+    rows.sort(key=lambda r: r["total_ms"], reverse=True)
+    return rows
+
+
+def format_summary(rows: Optional[List[dict]] = None) -> str:
+    rows = summary() if rows is None else rows
+    header = (
+        f"{'stage':<28}{'calls':>9}{'total_ms':>12}{'mean':>9}"
+        f"{'p50':>9}{'p95':>9}{'p99':>9}{'max':>9}"
+    )
+    lines = [header, "-" * len(header)]
+    for r in rows:
+        lines.append(
+            f"{r['stage']:<28}{r['calls']:>9}{r['total_ms']:>12.1f}{r['mean_ms']:>9.3f}"
+            f"{r['p50_ms']:>9.3f}{r['p95_ms']:>9.3f}{r['p99_ms']:>9.3f}{r['max_ms']:>9.3f}"
+        )
+    return "\n".join(lines)
+
+
+def log_summary(title: str = "STAGE PROFILE") -> None:
+    """Log the summary table (no-op when disabled or nothing recorded)."""
+    if not ENABLED or not _samples:
+        return
+    logging.info(f"[PROFILE] {title}\n{format_summary()}")
+
+
+def dump(prefix: Optional[str] = None) -> List[str]:
+    """Write collapsed stacks (<prefix>.folded) and, if cProfile ran, <prefix>.pstats."""
+    prefix = prefix or CPROFILE_PREFIX or OUT_PREFIX
+    written = []
+    if _folded:
+        path = f"{prefix}.folded"
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, ns in sorted(_folded.items()):
+                f.write(f"{stack} {max(ns, 0) // 1000}\n")   # µs weights
+        written.append(path)
+    if _cprofile is not None:
+        path = f"{prefix}.pstats"
+        _cprofile.dump_stats(path)
+        written.append(path)
+    for path in written:
+        logging.info(f"[PROFILE] wrote {path}")
+    return written
+
+
+def _at_exit() -> None:
+    if ENABLED and _samples:
+        log_summary("STAGE PROFILE (exit)")
+        try:
+            dump()
+        except OSError as e:
+            logging.warning(f"[PROFILE] dump failed: {e}")
+
+
+if ENABLED:
+    ENABLED = False
+    enable()
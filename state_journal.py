@@ -0,0 +1,241 @@
+"""state_journal.py — append-only, checksummed state journal.
+
+``execution.store()`` used to unpickle the whole day's ledger, append one
+snapshot and re-pickle the list, so every save cost more than the last and
+a crash mid-write could corrupt the entire file.  The journal appends one
+record per snapshot instead:
+
+    record = MAGIC (4s) | kind (B) | length (I) | crc32 (I) | payload
+    payload = zlib(pickle(obj))
+
+``kind`` is REC_SNAPSHOT for a single ``{"timestamp", "state"}`` snapshot or
+REC_BATCH for a list of them written by compaction.  Readers walk the
+headers, stop at the first incomplete or mismatched one (a torn write) and
+verify the CRC of every record they decode; ``last()`` only decodes the
+newest valid record.  Before its first append a process truncates any torn
+tail so new records stay reachable.  Every ``compact_every`` appends the
+journal is folded into a single batch record, written to a temp file and
+swapped in with ``os.replace``.
+
+Log tags
+--------
+[STATE JOURNAL] torn tail / compaction / legacy import
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pickle
+import struct
+import zlib
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+MAGIC = b"SJRN"
+REC_SNAPSHOT = 1
+REC_BATCH = 2
+COMPACT_EVERY = 256
+
+_HEADER = struct.Struct("<4sBII")
+
+
+def _encode(obj: Any) -> bytes:
+    return zlib.compress(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL), 1)
+
+
+def _pack(kind: int, obj: Any) -> bytes:
+    payload = _encode(obj)
+    return _HEADER.pack(MAGIC, kind, len(payload), zlib.crc32(payload)) + payload
+
+
+class StateJournal:
+    """Append-only snapshot journal at ``path``."""
+
+    def __init__(self, path, compact_every: int = COMPACT_EVERY, fsync: bool = False):
+        self.path = Path(path)
+        self.compact_every = compact_every
+        self.fsync = fsync
+        self._checked = False
+        self._appends = 0
+
+    # ── scanning ──────────────────────────────────────────────────────────
+
+    def _index(self) -> Tuple[List[Tuple[int, int, int, int]], int]:
+        """Headers of the complete records as ``(offset, kind, length, crc)``.
+
+        Also returns the byte offset where the valid prefix ends.  Payloads
+        are skipped, not read.
+        """
+        entries: List[Tuple[int, int, int, int]] = []
+        end = 0
+        try:
+            size = self.path.stat().st_size
+            fh = self.path.open("rb")
+        except OSError:
+            return entries, 0
+        with fh:
+            while end + _HEADER.size <= size:
+                fh.seek(end)
+                magic, kind, length, crc = _HEADER.unpack(fh.read(_HEADER.size))
+                if magic != MAGIC or kind not in (REC_SNAPSHOT, REC_BATCH):
+                    break
+                nxt = end + _HEADER.size + length
+                if nxt > size:
+                    break
+                entries.append((end, kind, length, crc))
+                end = nxt
+        return entries, end
+
+    def _decode(self, fh, entry) -> Optional[Any]:
+        offset, _kind, length, crc = entry
+        fh.seek(offset + _HEADER.size)
+        payload = fh.read(length)
+        if len(payload) != length or zlib.crc32(payload) != crc:
+            return None
+        try:
+            return pickle.loads(zlib.decompress(payload))
+        except Exception:
+            return None
+
+    @staticmethod
+    def _snapshots(kind: int, obj: Any) -> List[Dict]:
+        if kind == REC_BATCH:
+            return list(obj) if isinstance(obj, list) else []
+        return [obj]
+
+    # ── readers ───────────────────────────────────────────────────────────
+
+    def exists(self) -> bool:
+        return self.path.exists()
+
+    def snapshots(self) -> Iterator[Dict]:
+        """All snapshots in order, up to the first damaged record."""
+        entries, _ = self._index()
+        if not entries:
+            return
+        with self.path.open("rb") as fh:
+            for entry in entries:
+                obj = self._decode(fh, entry)
+                if obj is None:
+                    logging.warning(
+                        f"[STATE JOURNAL] {self.path.name}: bad record at byte {entry[0]}, "
+                        f"ignoring the rest"
+                    )
+                    return
+                yield from self._snapshots(entry[1], obj)
+
+    def last(self) -> Optional[Dict]:
+        """The newest snapshot, decoding only the last valid record."""
+        entries, _ = self._index()
+        if not entries:
+            return None
+        with self.path.open("rb") as fh:
+            for entry in reversed(entries):
+                obj = self._decode(fh, entry)
+                if obj is None:
+                    continue
+                snaps = self._snapshots(entry[1], obj)
+                if snaps:
+                    return snaps[-1]
+        return None
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self.snapshots())
+
+    # ── writers ───────────────────────────────────────────────────────────
+
+    def _repair_tail(self) -> None:
+        """Drop a torn tail left by a crash so the next append is reachable."""
+        self._checked = True
+        if not self.path.exists():
+            return
+        _, end = self._index()
+        size = self.path.stat().st_size
+        if end < size:
+            logging.warning(
+                f"[STATE JOURNAL] {self.path.name}: dropping {size - end} torn bytes at {end}"
+            )
+            with self.path.open("r+b") as fh:
+                fh.truncate(end)
+
+    def append(self, snapshot: Dict) -> None:
+        """Append one snapshot record (O(1) in the journal size)."""
+        self._write(REC_SNAPSHOT, snapshot)
+        self._appends += 1
+        if self.compact_every and self._appends >= self.compact_every:
+            self.compact()
+
+    def append_batch(self, snapshots: List[Dict]) -> None:
+        self._write(REC_BATCH, list(snapshots))
+
+    def _write(self, kind: int, obj: Any) -> None:
+        if not self._checked:
+            self._repair_tail()
+        record = _pack(kind, obj)
+        with self.path.open("ab") as fh:
+            fh.write(record)
+            fh.flush()
+            if self.fsync:
+                os.fsync(fh.fileno())
+
+    def compact(self) -> int:
+        """Fold all valid records into one batch record; returns the snapshot count.
+
+        The new file is written beside the journal and swapped in atomically,
+        so a crash leaves either the old journal or the compacted one.
+        """
+        snaps = list(self.snapshots())
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with tmp.open("wb") as fh:
+            fh.write(_pack(REC_BATCH, snaps))
+            fh.flush()
+            os.fsync(fh.fileno())
+        os.replace(tmp, self.path)
+        self._appends = 0
+        self._checked = True
+        logging.debug(f"[STATE JOURNAL] {self.path.name}: compacted {len(snaps)} snapshots")
+        return len(snaps)
+
+
+_JOURNALS: Dict[str, StateJournal] = {}
+
+
+def get_journal(path, **kwargs) -> StateJournal:
+    """Process-wide StateJournal for ``path`` (keeps append/compaction counters)."""
+    key = str(path)
+    journal = _JOURNALS.get(key)
+    if journal is None:
+        journal = _JOURNALS[key] = StateJournal(path, **kwargs)
+    return journal
+
+
+def import_legacy_ledger(journal: StateJournal, legacy_path) -> int:
+    """Seed an empty journal from a pickled ledger list (or single dict).
+
+    Returns the number of snapshots imported; 0 when there is nothing to do.
+    """
+    legacy_path = Path(legacy_path)
+    if journal.exists() or not legacy_path.exists():
+        return 0
+    try:
+        with legacy_path.open("rb") as fh:
+            ledger = pickle.load(fh)
+    except Exception as e:
+        logging.warning(f"[STATE JOURNAL] legacy ledger {legacy_path.name} unreadable: {e}")
+        return 0
+    if isinstance(ledger, dict):
+        ledger = [ledger]
+    if not isinstance(ledger, list) or not ledger:
+        return 0
+    journal.append_batch(ledger)
+    logging.info(f"[STATE JOURNAL] imported {len(ledger)} snapshots from {legacy_path.name}")
+    return len(ledger)
+
+
+__all__ = [
+    "COMPACT_EVERY",
+    "StateJournal",
+    "get_journal",
+    "import_legacy_ledger",
+]
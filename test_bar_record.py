@@ -0,0 +1,76 @@
+"""Tests for position_manager.BarRecord — Series adapter and update() parity."""
+
+import logging
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from position_manager import BarRecord, PositionManager
+from test_portfolio_manager import _bars, _entries
+
+
+class BarRecordAdapterTests(unittest.TestCase):
+    def test_from_series_with_15m_row(self):
+        row = pd.Series({"close": 22000.5, "high": 22010, "low": 21990, "cci20": np.nan,
+                         "atr": 42.0, "wr": -80.0, "supertrend_bias": "bullish",
+                         "vwap": 21999.0})
+        row_15m = pd.Series({"supertrend_bias": "Bearish", "supertrend_slope": "down",
+                             "adx14": 27.5})
+        rec = BarRecord.from_row(row, row_15m)
+        self.assertEqual(rec.close, 22000.5)
+        self.assertTrue(np.isnan(rec.cci20))
+        self.assertEqual(rec.atr14, 42.0)           # falls back to "atr"
+        self.assertEqual(rec.williams_r, -80.0)     # falls back to "wr"
+        self.assertEqual(rec.supertrend_bias, "BULLISH")
+        self.assertEqual((rec.st_bias_15m, rec.st_slope_15m, rec.adx14_15m),
+                         ("BEARISH", "DOWN", 27.5))
+
+    def test_defaults_and_mapping_access(self):
+        rec = BarRecord.from_row({"close": 1.0})
+        self.assertEqual((rec.st_bias_15m, rec.st_slope_15m), ("NEUTRAL", "FLAT"))
+        self.assertTrue(np.isnan(rec["ema9"]))
+        self.assertIsNone(rec.get("vwap"))
+        self.assertIs(BarRecord.from_row(rec), rec)
+        with self.assertRaises(KeyError):
+            rec["vwap"]
+
+
+class BarRecordUpdateParityTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def _run(self, seed, as_record):
+        times, close, rows = _bars(seed)
+        decisions = []
+        for pos_id, bar, signal, prem in _entries(seed, len(times), 4):
+            pm = PositionManager(mode="REPLAY")
+            pm.open(bar, times[bar], close[bar], prem, signal)
+            for i in range(bar + 1, len(times)):
+                row = pd.Series(rows[i])
+                if as_record:
+                    row = BarRecord.from_row(row)
+                d = pm.update(i, times[i], close[i], row)
+                decisions.append((pos_id, i, d.should_exit, d.reason,
+                                  round(d.exit_px, 6), d.bars_held))
+                if d.should_exit and d.exit_bd.get("HARD"):
+                    break
+        return decisions
+
+    def test_record_and_series_inputs_agree(self):
+        for seed in range(4):
+            self.assertEqual(self._run(seed, True), self._run(seed, False))
+
+    def test_bar_minutes_accepts_timestamps(self):
+        ts = pd.Timestamp("2026-03-02 15:12:00")
+        self.assertEqual(PositionManager._bar_minutes(ts), 15 * 60 + 12)
+        self.assertEqual(PositionManager._bar_minutes(str(ts)), 15 * 60 + 12)
+
+
+if __name__ == "__main__":
+    unittest.main()
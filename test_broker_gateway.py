@@ -0,0 +1,150 @@
+"""Tests for broker_gateway — lanes, rate limiting, idempotent retry, metrics."""
+
+import asyncio
+import threading
+import time
+import unittest
+from unittest import mock
+
+from broker_gateway import AsyncRateLimiter, BrokerGateway, FakeBrokerAdapter, rate_limits_for
+from st_pullback_cci import BrokerAdapter, FyersAdapter
+
+
+class _LegacyAdapter(BrokerAdapter):
+    """Adapter without client_order_id support (pre-gateway signature)."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def place_entry(self, symbol, qty, side_int, limit_price=0.0, stop=0.0, target=0.0):
+        self.calls += 1
+        return False, None
+
+    def place_exit(self, symbol, qty, reason):
+        self.calls += 1
+        return True, "LEGACY1"
+
+
+class GatewayTests(unittest.TestCase):
+    def _gateway(self, broker, **kw):
+        kw.setdefault("limits", [(100, 1.0)])
+        kw.setdefault("backoff", 0.0)
+        gw = BrokerGateway(broker, **kw).start()
+        self.addCleanup(gw.close)
+        return gw
+
+    def test_place_entry_and_exit(self):
+        broker = FakeBrokerAdapter()
+        gw = self._gateway(broker)
+        ok, oid = gw.place_entry_sync("NSE:X", 65, 1, 101.5, tag="E1")
+        self.assertTrue(ok)
+        self.assertEqual(broker.orders[oid]["limit_price"], 101.5)
+        self.assertTrue(broker.orders[oid]["tag"].startswith("E1"))
+        ok, xid = gw.place_exit_sync("NSE:X", 65, "TG_PARTIAL_EXIT")
+        self.assertTrue(ok)
+        self.assertTrue(broker.orders[xid]["tag"].startswith("TGPART"))
+        self.assertTrue(broker.orders[xid]["tag"].isalnum())
+
+    def test_retry_after_connection_error(self):
+        broker = FakeBrokerAdapter(fail_next=2)
+        gw = self._gateway(broker)
+        ok, oid = gw.place_exit_sync("NSE:X", 65, "SL")
+        self.assertTrue(ok)
+        self.assertEqual(len(broker.orders), 1)
+        row = {r["op"]: r for r in gw.metrics()}["place_exit"]
+        self.assertEqual((row["calls"], row["errors"], row["retries"]), (3, 2, 2))
+
+    def test_lost_ack_is_recovered_without_duplicate(self):
+        broker = FakeBrokerAdapter(lose_ack=1)
+        gw = self._gateway(broker)
+        ok, oid = gw.place_exit_sync("NSE:X", 65, "EOD")
+        self.assertTrue(ok)
+        self.assertEqual(list(broker.orders), [oid])
+        self.assertEqual({r["op"]: r for r in gw.metrics()}["place_exit"]["recovered"], 1)
+
+    def test_rejected_order_is_retried_not_recovered(self):
+        broker = FakeBrokerAdapter(reject_next=1)
+        gw = self._gateway(broker)
+        ok, oid = gw.place_entry_sync("NSE:X", 65, 1, 100.0, tag="E1")
+        self.assertTrue(ok)
+        self.assertEqual([o["status"] for o in broker.orders.values()], [5, 6])
+        self.assertEqual(broker.orders[oid]["status"], 6)
+        row = {r["op"]: r for r in gw.metrics()}["place_entry"]
+        self.assertEqual((row["retries"], row["recovered"]), (1, 0))
+
+    def test_fyers_find_order_skips_failed_orders(self):
+        book = [{"id": "1", "orderTag": "E1X", "status": 5, "message": "margin"},
+                {"id": "2", "orderTag": "E1X", "status": 1},
+                {"id": "3", "orderTag": "E1X", "status": 2},
+                {"id": "4", "orderTag": "E2X", "status": 6}]
+        fyers = mock.Mock()
+        fyers.orderbook.return_value = {"orderBook": book}
+        adapter = FyersAdapter(fyers)
+        with self.assertLogs(level="WARNING"):
+            self.assertEqual(adapter.find_order("E1X"), ("3", "FILLED"))
+        self.assertEqual(adapter.find_order("E2X"), ("4", "OPEN"))
+        fyers.orderbook.return_value = {"orderBook": book[:2]}
+        with self.assertLogs(level="WARNING"):
+            self.assertIsNone(adapter.find_order("E1X"))
+
+    def test_bounded_wait_hands_result_to_callback(self):
+        gw = self._gateway(FakeBrokerAdapter(latency=0.3))
+        late = []
+        done = threading.Event()
+        result = gw.place_exit_sync("NSE:X", 65, "SL", wait=0.05,
+                                    on_late=lambda ok, oid: (late.append((ok, oid)), done.set()))
+        self.assertEqual(result, (None, None))
+        self.assertTrue(done.wait(5))
+        self.assertTrue(late[0][0])
+        with self.assertRaises(TimeoutError):
+            gw.place_exit_sync("NSE:X", 65, "SL", wait=0.05)
+
+    def test_no_retry_without_lookup(self):
+        legacy = _LegacyAdapter()
+        gw = self._gateway(legacy)
+        self.assertFalse(gw.supports_lookup)
+        self.assertEqual(gw.place_entry_sync("NSE:X", 1, 1), (False, None))
+        self.assertEqual(legacy.calls, 1)
+        self.assertEqual(gw.place_exit_sync("NSE:X", 1, "EOD"), (True, "LEGACY1"))
+
+    def test_exit_not_blocked_by_slow_modifies(self):
+        broker = FakeBrokerAdapter(modify_latency=0.5)
+        gw = self._gateway(broker, pool_size=1)
+        _, oid = gw.place_entry_sync("NSE:X", 65, 1, 100.0)
+        modifies = [gw.submit(gw.modify(oid, 100.1 + i, 65)) for i in range(3)]
+        time.sleep(0.05)
+        t0 = time.monotonic()
+        ok, _ = gw.place_exit_sync("NSE:X", 65, "SL")
+        self.assertTrue(ok)
+        self.assertLess(time.monotonic() - t0, 0.3)
+        self.assertTrue(all(f.result(5)[0] for f in modifies))
+
+    def test_modify_and_latency_metrics(self):
+        gw = self._gateway(FakeBrokerAdapter(latency=0.01))
+        _, oid = gw.place_entry_sync("NSE:X", 65, 1, 100.0)
+        self.assertEqual(gw.modify_sync(oid, 100.1, 65), (True, oid))
+        self.assertEqual(gw.modify_sync("missing", 1.0, 1), (False, None))
+        rows = {r["op"]: r for r in gw.metrics()}
+        self.assertGreaterEqual(rows["place_entry"]["p50_ms"], 10.0)
+        self.assertEqual(rows["modify_order"]["calls"], 2)
+        self.assertEqual(rows["modify_order"]["errors"], 1)
+
+    def test_rate_limits_for_known_brokers(self):
+        self.assertEqual(rate_limits_for(FyersAdapter(None)), [(10, 1.0), (200, 60.0)])
+
+
+class RateLimiterTests(unittest.TestCase):
+    def test_reserve_leaves_headroom_and_waits(self):
+        async def run():
+            lim = AsyncRateLimiter([(3, 1.0)])
+            self.assertEqual(await lim.acquire(reserve=2), 0.0)     # 3 → 2
+            t0 = time.monotonic()
+            waited = await lim.acquire(reserve=2)                  # must refill to 3
+            self.assertGreater(waited, 0.0)
+            self.assertGreaterEqual(time.monotonic() - t0, 0.25)
+            self.assertEqual(await lim.acquire(reserve=0), 0.0)    # exit still served
+        asyncio.run(run())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -936,6 +936,202 @@ class TestLogParserModule(unittest.TestCase):
         self.assertEqual(len(summaries), 2)
         self.assertEqual(summaries[0].total_trades, 2)
 
+    def test_untracked_tags_do_not_change_summary(self):
+        """[TICK] / [INDICATOR DF] noise is skipped by the tag dispatch."""
+        noise = (
+            "2026-02-20 09:45:01,000 - INFO - [TICK] NSE:NIFTY50-INDEX ltp=25497.75\n"
+            "2026-02-20 09:45:01,000 - INFO - \x1b[36m[INDICATOR DF] close=25497.75 "
+            "[ENTRY OK] CALL score=99/50 NORMAL HIGH\x1b[0m\n"
+            "no brackets at all\n"
+        ) * 50
+        path = _make_log_file(noise + _new_format_log())
+        try:
+            noisy, clean = parse_session(path), parse_session(self._log_path)
+        finally:
+            os.unlink(path)
+        self.assertEqual(noisy.trades, clean.trades)
+        self.assertEqual(noisy.blocked_counts, clean.blocked_counts)
+        self.assertEqual(noisy.tag_counts, clean.tag_counts)
+        self.assertEqual(noisy.entry_ok_count, clean.entry_ok_count)
+        self.assertEqual(noisy.signals_fired, clean.signals_fired)
+
+    def test_dispatch_covers_every_handler(self):
+        from log_parser import _DISPATCH, _HANDLER_CHAIN, _P_TAGS
+        routed = {name for names in _DISPATCH.values() for name in names}
+        self.assertEqual(routed, {name for name, _ in _HANDLER_CHAIN})
+        for name in routed:
+            self.assertTrue(callable(getattr(LogParser, name)), name)
+        for tag in _P_TAGS:
+            self.assertIn("_on_p_tag", _DISPATCH[tag])
+        # chain order is preserved within a tag
+        self.assertEqual(_DISPATCH["ENTRY OK"][:2], ("_on_entry_ok", "_on_bar_close_alignment"))
+
+    def test_keyed_tag_and_ansi_wrapped_tag(self):
+        path = _make_log_file(
+            "2026-03-07 10:00:00 [TILT_STATE=BEARISH_TILT] side=PUT close=22500.00\n"
+            "2026-03-07 10:00:01 \x1b[93m[ENTRY BLOCKED][COOLDOWN] 0s < 120s\x1b[0m\n"
+        )
+        try:
+            s = parse_session(path)
+        finally:
+            os.unlink(path)
+        self.assertEqual(s.tilt_state_count, 1)
+        self.assertEqual(s.blocked_counts, {"COOLDOWN": 1})
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TestParseCache  — SummaryCache + parallel parse_multiple
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestParseCache(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._cache = os.path.join(self._tmp.name, "cache")
+        self._logs = []
+        for i in range(4):
+            path = Path(self._tmp.name) / f"options_trade_engine_2026-02-2{i}.log"
+            path.write_text(_new_format_log(), encoding="utf-8")
+            self._logs.append(path)
+        # one rich-exit log so mixed trade schemas go through the columnar store
+        self._logs[3].write_text(_rich_exit_log(), encoding="utf-8")
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_round_trip_matches_fresh_parse(self):
+        from log_parser import SummaryCache
+        cache = SummaryCache(self._cache)
+        for path in self._logs:
+            fresh = parse_session(path)
+            cache.put(path, cache.key(path), fresh)
+            cached = cache.get(path)
+            self.assertEqual(cached.trades, fresh.trades)
+            self.assertEqual(cached.to_dict(), fresh.to_dict())
+        self.assertEqual(cache.hits, len(self._logs))
+
+    def test_changed_log_or_parser_version_misses(self):
+        import log_parser
+        cache = log_parser.SummaryCache(self._cache)
+        path = self._logs[0]
+        cache.put(path, cache.key(path), parse_session(path))
+        with path.open("a", encoding="utf-8") as fh:
+            fh.write("2026-02-26 10:00:00,000 - INFO - [ENTRY BLOCKED][COOLDOWN] 0s < 120s\n")
+        self.assertIsNone(cache.get(path))
+        cache.put(path, cache.key(path), parse_session(path))
+        self.assertEqual(cache.get(path).blocked_counts["COOLDOWN"], 2)
+        with patch.object(log_parser, "PARSER_VERSION", log_parser.PARSER_VERSION + 1):
+            self.assertIsNone(cache.get(path))
+
+    def test_parse_multiple_parallel_and_cached(self):
+        serial = parse_multiple(self._logs, workers=1)
+        parallel = parse_multiple(self._logs, workers=2, cache_dir=self._cache)
+        self.assertEqual([s.to_dict() for s in parallel], [s.to_dict() for s in serial])
+        self.assertEqual(len(os.listdir(self._cache)), len(self._logs))
+        with patch("log_parser.parse_session", side_effect=AssertionError("re-parsed")):
+            warm = parse_multiple(self._logs, cache_dir=self._cache)
+        self.assertEqual([s.to_dict() for s in warm], [s.to_dict() for s in serial])
+
+    def test_log_growing_during_parse_is_not_cached_as_current(self):
+        path = self._logs[0]
+        real = parse_session
+
+        def parse_then_append(p):
+            summary = real(p)
+            with Path(p).open("a", encoding="utf-8") as fh:   # engine still writing
+                fh.write("2026-02-26 10:00:00,000 - INFO - [ENTRY BLOCKED][COOLDOWN] 0s < 120s\n")
+            return summary
+
+        with patch("log_parser.parse_session", side_effect=parse_then_append):
+            (first,) = parse_multiple([path], workers=1, cache_dir=self._cache)
+        (second,) = parse_multiple([path], workers=1, cache_dir=self._cache)
+        self.assertEqual(second.blocked_counts["COOLDOWN"], first.blocked_counts["COOLDOWN"] + 1)
+
+    def test_missing_file_not_cached(self):
+        missing = Path(self._tmp.name) / "missing.log"
+        (s,) = parse_multiple([missing], cache_dir=self._cache)
+        self.assertEqual(s.session_type, "UNKNOWN")
+        self.assertFalse(os.path.exists(self._cache))
+
+
+# ═══════════════════════════════════════════════════════════════════════════════
+# TestTailingLogParser  — incremental intraday parsing
+# ═══════════════════════════════════════════════════════════════════════════════
+
+class TestTailingLogParser(unittest.TestCase):
+
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._path = Path(self._tmp.name) / "options_trade_engine_2026-02-24.log"
+        self._path.write_text("", encoding="utf-8")
+        self._lines = _new_format_log().splitlines(keepends=True)
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def _append(self, text: str) -> None:
+        with self._path.open("a", encoding="utf-8") as fh:
+            fh.write(text)
+
+    def test_incremental_matches_full_parse(self):
+        from log_parser import TailingLogParser
+        tail = TailingLogParser(self._path)
+        for line in self._lines:
+            self._append(line[:20])            # partial line: held back
+            tail.poll()
+            self._append(line[20:])
+            tail.poll()
+        self.assertEqual(tail.poll().to_dict(), parse_session(self._path).to_dict())
+        self.assertEqual(tail.lines_read, len(self._lines))
+
+    def test_open_trade_survives_between_polls(self):
+        from log_parser import TailingLogParser
+        tail = TailingLogParser(self._path)
+        self._append("".join(self._lines[:3]))         # ENTRY OK, SIGNAL, TRADE OPEN
+        self.assertEqual(tail.poll().total_trades, 0)
+        offset = tail.offset
+        self._append(self._lines[3])                   # TRADE EXIT
+        s = tail.poll()
+        self.assertEqual(s.total_trades, 1)
+        self.assertEqual(s.trades[0]["score"], 83)     # merged with the earlier open
+        self.assertEqual(tail.offset, offset + len(self._lines[3].encode("utf-8")))
+        self.assertEqual(tail.poll().total_trades, 1)  # nothing new, nothing re-read
+
+    def test_rotation_drains_old_file_and_keeps_state(self):
+        from log_parser import TailingLogParser
+        tail = TailingLogParser(self._path)
+        self._append("".join(self._lines[:3]))
+        tail.poll()
+        self._append(self._lines[3])                   # written before rotation…
+        os.replace(self._path, str(self._path) + ".1")
+        self._path.write_text("".join(self._lines[4:]), encoding="utf-8")
+        s = tail.poll()                                # …still picked up
+        self.assertEqual(tail.rotations, 1)
+        self.assertEqual(s.total_trades, 2)
+        self.assertEqual(s.blocked_counts["ST_CONFLICT"], 2)
+
+    def test_truncation_restarts_and_reset_clears(self):
+        from log_parser import TailingLogParser
+        tail = TailingLogParser(self._path)
+        self._append("".join(self._lines))
+        self.assertEqual(tail.poll().total_trades, 2)
+        self._path.write_text(self._lines[-1], encoding="utf-8")   # copytruncate
+        s = tail.poll()
+        self.assertEqual(tail.rotations, 1)
+        self.assertEqual(s.blocked_counts["ST_CONFLICT"], 3)
+        tail.reset()
+        self.assertEqual(tail.poll().to_dict()["blocked_counts"], {"ST_CONFLICT": 1})
+
+    def test_watch_session_emits_status(self):
+        from dashboard import watch_session
+        self._append("".join(self._lines))
+        out = []
+        s = watch_session(self._path, interval=0, iterations=2, emit=out.append)
+        self.assertEqual(len(out), 2)
+        self.assertIn("trades=2", out[-1])
+        self.assertIn("ST_CONFLICT=2", out[-1])
+        self.assertEqual(s.total_trades, 2)
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # TestGenerateFullReport
@@ -0,0 +1,93 @@
+"""Tests for entry_context — per-candle caching of entry-time levels."""
+
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import entry_context
+from entry_context import EntryContext, get_entry_context, open_bias_context, reset_entry_contexts
+from indicators import resolve_atr
+
+
+def _candles(n, start="09:15"):
+    rng = np.random.default_rng(7)
+    close = 22000 + np.cumsum(rng.normal(0, 8, n))
+    t0 = pd.Timestamp(f"2026-03-03 {start}")
+    return pd.DataFrame({
+        "date": [(t0 + pd.Timedelta(minutes=3 * i)).strftime("%Y-%m-%d %H:%M:%S") for i in range(n)],
+        "open": close - 2,
+        "high": close + 6,
+        "low": close - 6,
+        "close": close,
+    })
+
+
+class PivotCacheTests(unittest.TestCase):
+    def test_pivots_rebuilt_only_when_source_bar_changes(self):
+        ctx = EntryContext("T")
+        df = _candles(10)
+        with mock.patch.object(entry_context, "calculate_cpr", wraps=entry_context.calculate_cpr) as cpr:
+            p1 = ctx.pivots(df.iloc[:5])
+            p2 = ctx.pivots(df.iloc[:5])
+            self.assertIs(p1, p2)
+            self.assertEqual(cpr.call_count, 1)
+            p3 = ctx.pivots(df.iloc[:6])
+            self.assertEqual(cpr.call_count, 2)
+        self.assertEqual(p3.close, df["close"].iat[4])
+
+    def test_single_bar_uses_last_row(self):
+        df = _candles(1)
+        self.assertEqual(EntryContext("T").pivots(df).close, df["close"].iat[0])
+
+
+class AtrTests(unittest.TestCase):
+    def test_tail_atr_matches_full_frame(self):
+        ctx = EntryContext("T")
+        df = _candles(60)
+        for n in (2, 10, 15, 16, 40, 60):
+            full, _ = resolve_atr(df.iloc[:n], period=14)
+            got = ctx.atr(df.iloc[:n])
+            if full is None or (isinstance(full, float) and np.isnan(full)):
+                self.assertTrue(got is None or np.isnan(got))
+            else:
+                self.assertEqual(got, full)
+
+
+class OpeningRangeTests(unittest.TestCase):
+    def test_frozen_after_opening_window_and_reset_by_day(self):
+        ctx = EntryContext("T")
+        df = _candles(20, start="09:30")
+        ctx.begin_day("2026-03-03")
+        hi, lo = ctx.opening_range(df.iloc[:6])
+        self.assertEqual(hi, df["high"].iloc[:5].max())
+        self.assertEqual(lo, df["low"].iloc[:5].min())
+        with mock.patch.object(entry_context, "get_opening_range") as orb:
+            self.assertEqual(ctx.opening_range(df.iloc[:12]), (hi, lo))
+            orb.assert_not_called()
+        self.assertFalse(ctx.begin_day("2026-03-03"))
+        self.assertTrue(ctx.begin_day("2026-03-04"))
+        self.assertIsNone(ctx.classifier)
+        self.assertFalse(ctx._orb_final)
+
+
+class HelperTests(unittest.TestCase):
+    def test_open_bias_context_tags(self):
+        cam = {"r3": 110.0, "r4": 120.0, "s3": 90.0, "s4": 80.0}
+        self.assertEqual(open_bias_context(125.0, cam)["open_bias"], "Above R4, continuation likely")
+        self.assertEqual(open_bias_context(115.0, cam)["gap_tag"], "GAP_UP")
+        self.assertEqual(open_bias_context(85.0, cam)["bias"], "Negative")
+        self.assertEqual(open_bias_context(100.0, cam),
+                         {"gap_tag": "NO_GAP", "bias": "Neutral", "open_bias": "Inside S3-R3, balanced open"})
+        self.assertEqual(open_bias_context(float("nan"), cam)["open_bias"], "UNKNOWN")
+
+    def test_registry_is_per_symbol(self):
+        reset_entry_contexts()
+        self.assertIs(get_entry_context("A"), get_entry_context("A"))
+        self.assertIsNot(get_entry_context("A"), get_entry_context("B"))
+        reset_entry_contexts()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -54,6 +54,7 @@ def _load_functions(*names: str):
         "dt": datetime,
         "time_zone": None,
         "logging": logger,
+        "emit_event": lambda *_args, **_kwargs: None,
         "calculate_cci": lambda _df: pd.Series([0.0]),
         "williams_r": lambda _df: 0.0,
         "momentum_ok": lambda _df, _side: (True, 0.0),
@@ -195,7 +196,7 @@ class TestEMAStretchGate(unittest.TestCase):
 
 class ExitPrematureSafeguardTests(unittest.TestCase):
     def test_momentum_exhaustion_suppressed_before_three_bars(self):
-        funcs, logger = _load_functions("check_exit_condition")
+        funcs, logger = _load_functions("check_exit_condition", "compile_exit_plan")
         fn = funcs["check_exit_condition"]
         df_slice = pd.DataFrame(
             {
@@ -0,0 +1,99 @@
+"""Tests for equity_curve — LTTB decimation, incremental curve and cached rendering."""
+
+import json
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import equity_curve
+from dashboard import plot_equity_curve
+from equity_curve import EquityCurve, downsample, lttb, render_equity_curve
+
+
+class DownsampleTests(unittest.TestCase):
+    def test_lttb_keeps_endpoints_and_budget(self):
+        y = np.sin(np.linspace(0, 20, 10_000))
+        idx = lttb(np.arange(len(y)), y, 500)
+        self.assertEqual(len(idx), 500)
+        self.assertEqual((idx[0], idx[-1]), (0, len(y) - 1))
+        self.assertTrue(np.all(np.diff(idx) > 0))
+        self.assertTrue(np.array_equal(lttb(np.arange(10), np.arange(10), 50), np.arange(10)))
+
+    def test_downsample_preserves_peak_and_trough(self):
+        rng = np.random.default_rng(7)
+        y = np.cumsum(rng.normal(size=50_000))
+        y[12_345] = y.max() + 50          # single-point spike
+        y[33_333] = y.min() - 50
+        x, ys = downsample(np.arange(len(y)), y, 300)
+        self.assertLessEqual(len(ys), 300)
+        self.assertEqual(ys.max(), y.max())
+        self.assertEqual(ys.min(), y.min())
+        self.assertIn(12_345, x)
+
+
+class EquityCurveTests(unittest.TestCase):
+    def test_incremental_matches_full_cumsum(self):
+        pnl = [10.0, -5.0, float("nan"), 15.0, -30.0, 4.0]
+        curve = EquityCurve()
+        curve.extend(pnl[:2])
+        curve.extend(pnl[2:])
+        full = EquityCurve.from_pnl(pnl)
+        self.assertTrue(np.allclose(curve.cumulative, np.nancumsum(pnl)))
+        self.assertEqual(curve.digest, full.digest)
+        self.assertEqual((curve.total, curve.peak, curve.max_drawdown), (-6.0, 20.0, 30.0))
+
+    def test_sync_appends_tail_or_rebuilds(self):
+        curve = EquityCurve.from_pnl([1.0, 2.0])
+        self.assertEqual(curve.sync([1.0, 2.0, 3.0]), 1)
+        self.assertEqual(len(curve), 3)
+        self.assertEqual(curve.sync([1.0, 2.0, 3.0]), 0)
+        self.assertEqual(curve.sync([9.0, 2.0]), 2)              # history edited
+        self.assertEqual(curve.cumulative.tolist(), [9.0, 11.0])
+
+
+class RenderTests(unittest.TestCase):
+    def setUp(self):
+        if not equity_curve._MPL_AVAILABLE:
+            self.skipTest("matplotlib not installed")
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.png = Path(self.tmp.name) / "equity_curve_all.png"
+
+    def test_cached_until_new_trades(self):
+        curve = EquityCurve.from_pnl([5.0, -2.0, 7.0])
+        self.assertEqual(render_equity_curve(curve, self.png), self.png)
+        meta = json.loads(self.png.with_name(self.png.name + ".json").read_text())
+        self.assertEqual(meta["n"], 3)
+        with mock.patch.object(equity_curve.plt, "subplots") as subplots:
+            render_equity_curve(curve, self.png)
+            subplots.assert_not_called()
+        curve.extend([1.0])
+        with mock.patch.object(equity_curve.plt, "subplots", wraps=equity_curve.plt.subplots) as subplots:
+            render_equity_curve(curve, self.png)
+            subplots.assert_called_once()
+
+    def test_long_history_plots_pixel_budget(self):
+        rng = np.random.default_rng(3)
+        df = pd.DataFrame({"pnl_points": rng.normal(0.5, 10, 200_000)})
+        plotted = []
+        real = equity_curve.downsample
+
+        def _record(*args):
+            out = real(*args)
+            plotted.append(len(out[0]))
+            return out
+
+        with mock.patch.object(equity_curve, "downsample", side_effect=_record):
+            self.assertEqual(plot_equity_curve(df, output_path=self.png), self.png)
+        self.assertLessEqual(plotted[0], equity_curve.PIXEL_BUDGET)
+        mtime = self.png.stat().st_mtime_ns
+        self.assertEqual(plot_equity_curve(df, output_path=self.png), self.png)
+        self.assertEqual(self.png.stat().st_mtime_ns, mtime)
+
+
+if __name__ == "__main__":
+    unittest.main()
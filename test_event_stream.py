@@ -0,0 +1,207 @@
+"""Tests for event_stream — batched JSONL sidecar and LogParser consumption."""
+
+import json
+import logging
+import os
+import tempfile
+import time
+import unittest
+
+import event_stream
+from event_stream import EventStream, emit_event, events_path_for, get_event_stream, read_events
+from log_parser import LogParser
+from position_manager import PositionManager
+from regime_context import RegimeContext, log_regime_context
+
+CE = "NSE:NIFTY2631022500CE"
+PE = "NSE:NIFTY2631022400PE"
+
+
+def _wait_for(path, timeout=2.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if os.path.exists(path) and os.path.getsize(path):
+            return True
+        time.sleep(0.01)
+    return False
+
+
+class EventStreamTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.path = os.path.join(self.tmp.name, "engine_2026-03-07.events.jsonl")
+
+    def _stream(self, **kw):
+        stream = EventStream(self.path, **kw)
+        self.addCleanup(stream.close)
+        return stream
+
+    def test_events_path_for(self):
+        self.assertEqual(events_path_for("/x/engine_2026-03-07.log").name, "engine_2026-03-07.events.jsonl")
+        self.assertEqual(events_path_for("/x/engine.log.1").name, "engine.log.1.events.jsonl")
+
+    def test_batch_size_triggers_write(self):
+        stream = self._stream(batch_size=3, flush_interval=60.0)
+        stream.emit("entry_blocked", subtype="ST_CONFLICT")
+        stream.emit("entry_blocked", subtype="WEAK_ADX")
+        time.sleep(0.05)
+        self.assertFalse(os.path.exists(self.path))
+        stream.emit("entry_ok", side="CALL", score=71)
+        self.assertTrue(_wait_for(self.path))
+        stream.flush()
+        with open(self.path, encoding="utf-8") as fh:
+            lines = fh.read().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertNotIn(", ", lines[1])
+        header = json.loads(lines[0])
+        self.assertEqual((header["t"], header["v"]), ("header", event_stream.SCHEMA_VERSION))
+        self.assertEqual([json.loads(x)["t"] for x in lines[1:]], ["entry_blocked", "entry_blocked", "entry_ok"])
+
+    def test_flush_close_and_round_trip(self):
+        stream = self._stream(batch_size=1000, flush_interval=60.0)
+        for i in range(10):
+            stream.emit("signal_fired", side="PUT", score=60 + i, bar_ts=time.time())
+        stream.flush()
+        self.assertEqual(stream.written, 10)
+        stream.close()
+        stream.emit("signal_fired", side="CALL")          # ignored after close
+        events = list(read_events(self.path))
+        self.assertEqual([e["score"] for e in events], list(range(60, 70)))
+        self.assertTrue(all(isinstance(e["ts"], float) for e in events))
+
+    def test_read_events_skips_torn_lines_and_newer_schema(self):
+        with open(self.path, "w", encoding="utf-8") as fh:
+            fh.write('{"t":"header","v":1}\n{"t":"entry_ok","ts":1.0}\n')
+            fh.write('{"t":"header","v":99}\n{"t":"entry_ok","ts":2.0}\n')
+            fh.write('{"t":"header","v":1}\n{"t":"entry_ok","ts":3.0}\n{"t":"entry_o')
+        self.assertEqual([e["ts"] for e in read_events(self.path)], [1.0, 3.0])
+        self.assertEqual(list(read_events(self.path + ".missing")), [])
+
+    def test_process_stream_follows_root_file_handler(self):
+        self.addCleanup(setattr, event_stream, "_STREAM", None)
+        event_stream._STREAM = None
+        self.assertIsNone(get_event_stream().path)
+        emit_event("entry_ok", side="CALL")                # no-op without a log file
+        log = os.path.join(self.tmp.name, "engine_2026-03-07.log")
+        handler = logging.FileHandler(log)
+        root = logging.getLogger()
+        root.addHandler(handler)
+        try:
+            stream = get_event_stream()
+            self.assertEqual(stream.path, events_path_for(log))
+            emit_event("entry_ok", side="CALL")
+            stream.close()
+        finally:
+            root.removeHandler(handler)
+            handler.close()
+        self.assertEqual([e["t"] for e in read_events(stream.path)], ["entry_ok"])
+
+
+class LogParserEventsTests(unittest.TestCase):
+    """The engine's text lines and events must yield the same SessionSummary."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        cls.log = os.path.join(cls.tmp.name, "options_trade_engine_2026-03-07.log")
+        root = logging.getLogger()
+        level = root.level
+        handler = logging.FileHandler(cls.log)
+        handler.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+        root.setLevel(logging.INFO)
+        root.addHandler(handler)
+        event_stream._STREAM = None
+        try:
+            cls._session()
+            event_stream.get_event_stream().close()
+        finally:
+            event_stream._STREAM = None
+            root.removeHandler(handler)
+            root.setLevel(level)
+            handler.close()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    @staticmethod
+    def _signal(side, bias, tilt):
+        # What signals.detect_signal logs / emits right before an entry.
+        logging.info(f"[BIAS_ALIGNMENT] side={side} status={bias} tf=3m bias15m=UP bias3m=UP")
+        logging.info(f"[TILT_STATE={tilt}] side={side} close=22500.00")
+        logging.info(f"[SIGNAL FIRED] {side} source=PIVOT score=72 strength=HIGH bias15m=UP bias3m=UP")
+        emit_event("signal_fired", side=side, score=72, strength="HIGH",
+                   bias_alignment=bias, tilt_state=tilt)
+
+    @staticmethod
+    def _blocked(subtype):
+        logging.info(f"[ENTRY BLOCKED][{subtype}] timestamp=2026-03-07 10:00:00 symbol=NSE:NIFTY50-INDEX")
+        emit_event("entry_blocked", subtype=subtype)
+
+    @classmethod
+    def _session(cls):
+        log_regime_context(RegimeContext(
+            atr_value=80.0, atr_regime="LOW", adx_value=32.0, adx_tier="ADX_DEFAULT",
+            day_type="TREND_DAY", cpr_width="NARROW",
+            bar_timestamp="2026-03-07 09:42:00", symbol="NSE:NIFTY50-INDEX",
+        ))
+        cls._blocked("ST_CONFLICT")
+        cls._blocked("OSC_EXTREME")
+        pm = PositionManager(mode="REPLAY", lot_size=65)
+        cls._signal("CALL", "ALIGNED", "BULLISH_TILT")
+        pm.open(10, "2026-03-07 09:45:00", 22500.0, 150.0, {"side": "CALL", "option_name": CE, "score": 72})
+        pm.close(14, "2026-03-07 09:57:00", 22540.0, 162.35, "TG_HIT target")
+        cls._blocked("ST_CONFLICT")
+        cls._signal("PUT", "MISALIGNED", "BEARISH_TILT")
+        pm.open(30, "2026-03-07 10:45:00", 22450.0, 120.0, {"side": "PUT", "option_name": PE, "score": 72})
+        pm.close(33, "2026-03-07 10:54:00", 22470.0, 111.1, "SL_HIT")
+
+    def test_sidecar_written_next_to_log(self):
+        kinds = [e["t"] for e in read_events(events_path_for(self.log))]
+        self.assertEqual(kinds.count("trade_open"), 2)
+        self.assertEqual(kinds.count("entry_blocked"), 3)
+        self.assertIn("regime_context", kinds)
+
+    def test_events_and_text_agree(self):
+        text = LogParser(self.log, use_events=False).parse()
+        events = LogParser(self.log).parse()
+        self.assertEqual(LogParser(self.log).events_path, events_path_for(self.log))
+        self.assertEqual(events.trades, text.trades)
+        self.assertEqual(events.blocked_counts, text.blocked_counts)
+        # _RE_SIGNAL_FIRED predates the source= field signals.py now logs
+        # first, so only the event path counts these lines.
+        self.assertEqual((events.signals_fired, text.signals_fired), (2, 0))
+        self.assertEqual(events.oscillator_blocks, text.oscillator_blocks)
+        self.assertEqual(events.tag_counts, text.tag_counts)
+        self.assertEqual(len(events.trades), 2)
+        self.assertEqual(events.trades[0]["bias_alignment"], "ALIGNED")
+        self.assertEqual(events.trades[1]["tilt_state"], "BEARISH_TILT")
+        self.assertEqual(events.trades[0]["regime_at_entry"]["day_type"], "TREND_DAY")
+
+    def test_events_replace_regex_handlers(self):
+        with open(events_path_for(self.log), encoding="utf-8") as fh:
+            original = fh.read()
+        self.addCleanup(lambda: open(events_path_for(self.log), "w", encoding="utf-8").write(original))
+        with open(events_path_for(self.log), "a", encoding="utf-8") as fh:
+            fh.write('{"t":"entry_blocked","ts":1.0,"subtype":"WEAK_ADX"}\n')
+        self.assertEqual(LogParser(self.log).parse().blocked_counts.get("WEAK_ADX"), 1)
+        self.assertNotIn("WEAK_ADX", LogParser(self.log, use_events=False).parse().blocked_counts)
+
+    def test_stale_sidecar_falls_back_to_text(self):
+        with open(self.log, encoding="utf-8") as fh:
+            original = fh.read()
+        self.addCleanup(lambda: open(self.log, "w", encoding="utf-8").write(original))
+        late = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(time.time() + 60))
+        with open(self.log, "a", encoding="utf-8") as fh:           # writer died before flushing
+            fh.write(f"{late},000 - INFO - [ENTRY BLOCKED][LATE_GATE] timestamp=2026-03-07 11:00:00\n")
+        with self.assertLogs(level="WARNING"):
+            summary = LogParser(self.log).parse()
+        text = LogParser(self.log, use_events=False).parse()
+        self.assertEqual(summary.blocked_counts, text.blocked_counts)
+        self.assertEqual(summary.blocked_counts.get("LATE_GATE"), 1)
+        self.assertEqual(summary.trades, text.trades)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -14,9 +14,11 @@ Coverage:
   TestScalpCooldownGate  – _can_enter_scalp cooldown and burst deduplication
 """
 
+import pickle
 import sys
 import types
 import unittest
+from unittest import mock
 from unittest.mock import MagicMock
 
 import numpy as np
@@ -151,6 +153,7 @@ import execution  # noqa: E402
 from execution import (  # noqa: E402
     check_exit_condition,
     cleanup_trade_exit,
+    compile_exit_plan,
     _can_enter_scalp,
     _is_startup_suppression_active,
     SCALP_PT_POINTS,
@@ -348,6 +351,41 @@ class TestOptionExitManager(unittest.TestCase):
             mgr.update_tick(float(p), 0, ts)
         self.assertFalse(mgr._volatility_mean_reversion(109.0))
 
+    # ── incremental statistics ────────────────────────────────────────────────
+
+    def test_rolling_stats_match_full_recompute(self):
+        mgr = self._mgr(100.0, ma_window=20, roc_window_ticks=8)
+        rng = np.random.default_rng(3)
+        prices = 100.0 + np.cumsum(rng.normal(0, 0.7, 500))
+        t0 = pd.Timestamp("2026-03-02 10:00:00")
+        for k, p in enumerate(prices):
+            mgr.update_tick(float(p), 1.0, t0 + pd.Timedelta(seconds=k))
+        mu, sigma = mgr._ma_stats()
+        self.assertAlmostEqual(mu, prices[-20:].mean(), places=9)
+        self.assertAlmostEqual(sigma, prices[-20:].std(ddof=0), places=9)
+        self.assertAlmostEqual(mgr._roc(), prices[-1] / prices[-9] - 1.0, places=12)
+
+    def test_flat_window_has_zero_sigma(self):
+        mgr = self._mgr(100.0, ma_window=20)
+        t0 = pd.Timestamp("2026-03-02 10:00:00")
+        for k, p in enumerate([101.3, 99.7] * 10 + [100.1] * 20):
+            mgr.update_tick(p, 0, t0 + pd.Timedelta(seconds=k))
+        self.assertEqual(mgr._ma_stats()[1], 0.0)
+
+    def test_1m_bars_match_resample_of_buffered_ticks(self):
+        """Bars cover only buffered ticks; an evicted bar's high is re-derived."""
+        mgr = self._mgr(100.0, ma_window=20)          # buffer = 120 ticks
+        rng = np.random.default_rng(5)
+        t0 = pd.Timestamp("2026-03-02 10:00:00")
+        offsets = np.cumsum(rng.integers(1, 9, 400))
+        prices = 100.0 + np.cumsum(rng.normal(0, 0.5, 400))
+        for off, p in zip(offsets, prices):
+            mgr.update_tick(float(p), 0, t0 + pd.Timedelta(seconds=int(off)))
+        buf = pd.Series(prices[-120:], index=t0 + pd.to_timedelta(offsets[-120:], unit="s"))
+        ref = buf.resample("1min").ohlc().dropna()["high"].tolist()
+        self.assertEqual(len(mgr._bars_1m), len(ref))
+        self.assertEqual(mgr._bar_highs(len(ref)), ref)
+
 
 # ═══════════════════════════════════════════════════════════════════════════════
 # TestExitSL
@@ -737,6 +775,77 @@ class TestExitConflict(unittest.TestCase):
         self.assertEqual(reason, "SL_HIT")
 
 
+class TestExitRulePlan(unittest.TestCase):
+    """ExitPlan is compiled once per position and selects the applicable rules."""
+
+    def test_plan_reused_across_ticks(self):
+        state = _base_state(side="CALL", entry_candle=0, close=250.0, stop=200.0)
+        check_exit_condition(_make_df(2), state, option_price=251.0, timestamp=_ts())
+        plan = state["_exit_plan"]
+        check_exit_condition(_make_df(3), state, option_price=252.0, timestamp=_ts())
+        self.assertIs(state["_exit_plan"], plan)
+
+    def test_rule_table_compiled_at_entry_and_reused(self):
+        state = _base_state(side="CALL", entry_candle=0, close=250.0, stop=200.0)
+        plan = compile_exit_plan(state)
+        self.assertEqual(tuple(name for name, _ in plan["table"]), plan["rules"])
+        check_exit_condition(_make_df(2), state, option_price=251.0, timestamp=_ts())
+        spec = plan["bar_spec"]
+        check_exit_condition(_make_df(3), state, option_price=252.0, timestamp=_ts())
+        self.assertIs(state["_exit_plan"], plan)
+        self.assertIs(plan["bar_spec"], spec)
+        self.assertIs(compile_exit_plan(state), plan)
+
+    def test_store_persists_leg_after_plan_compiled(self):
+        state = _base_state(side="CALL", entry_candle=0, close=250.0, stop=200.0)
+        compile_exit_plan(state)
+        check_exit_condition(_make_df(2), state, option_price=251.0, timestamp=_ts())
+        records = []
+        journal = MagicMock(append=lambda rec: records.append(pickle.dumps(rec)))
+        with mock.patch.object(execution, "_state_journal", return_value=journal), \
+                mock.patch.object(execution, "_save_restart_state") as restart:
+            execution.store({"call_buy": state, "total_pnl": 0.0}, "paper")
+        self.assertEqual(len(records), 1)
+        restart.assert_called_once()
+        self.assertIn("_exit_plan", state)                      # live leg untouched
+        leg = pickle.loads(records[0])["state"]["call_buy"]
+        self.assertNotIn("_exit_plan", leg)
+        self.assertEqual(leg["position_id"], state["position_id"])
+        check_exit_condition(_make_df(3), leg, option_price=252.0, timestamp=_ts())
+        self.assertIn("_exit_plan", leg)                        # recompiled after load
+
+    def test_new_entry_on_reused_leg_recompiles(self):
+        state = _base_state(side="CALL", entry_candle=0, close=250.0, stop=200.0)
+        check_exit_condition(_make_df(2), state, option_price=251.0, timestamp=_ts())
+        plan = state["_exit_plan"]
+        state.update({"position_id": "TEST-002", "entry_candle": 1, "scalp_mode": True})
+        check_exit_condition(_make_df(3), state, option_price=251.0, timestamp=_ts())
+        self.assertIsNot(state["_exit_plan"], plan)
+        self.assertIn("SCALP_PT", state["_exit_plan"]["rules"])
+        self.assertNotIn("SCALP_PT", plan["rules"])
+
+    def test_contextual_rules_selected_by_source(self):
+        state = _base_state(side="CALL", entry_candle=0, close=250.0)
+        check_exit_condition(_make_df(2), state, option_price=250.0, timestamp=_ts())
+        self.assertNotIn("CPR", state["_exit_plan"]["rules"])
+        state["source"] = "CPR_BREAK"
+        check_exit_condition(_make_df(2), state, option_price=250.0, timestamp=_ts())
+        plan = state["_exit_plan"]
+        self.assertIn("CPR", plan["rules"])
+        self.assertEqual(plan["contextual_exit_type"], "CPR")
+        self.assertEqual(plan["rules"][:2], ("HFT", "SL"))
+
+    def test_rule_metrics_count_decisions(self):
+        from exit_rules import reset_rule_metrics, rule_metrics
+        reset_rule_metrics()
+        state = _base_state(side="CALL", entry_candle=0, close=200.0, stop=190.0)
+        triggered, reason = check_exit_condition(_make_df(4), state, option_price=185.0, timestamp=_ts())
+        self.assertEqual((triggered, reason), (True, "SL_HIT"))
+        rows = {r["rule"]: r for r in rule_metrics()}
+        self.assertEqual(rows["SL"]["hits"], 1)
+        self.assertNotIn("PREMATURE", rows)
+
+
 # ═══════════════════════════════════════════════════════════════════════════════
 # TestExitBrokerDispatch  –  real OptionExitManager wired into check_exit_condition
 # ═══════════════════════════════════════════════════════════════════════════════
@@ -58,6 +58,7 @@ def _load_functions(*names):
         "dt": datetime,
         "time_zone": None,
         "logging": test_logger,
+        "emit_event": lambda *_args, **_kwargs: None,
         "calculate_cci": lambda _df: pd.Series([0.0]),
         "williams_r": lambda _df: 0.0,
         "momentum_ok": lambda _df, _side: (True, 0.0),
@@ -90,7 +91,7 @@ def _mk_df() -> pd.DataFrame:
 class ExitPrecedenceSafeguardTests(unittest.TestCase):
     def test_hft_overrides_sl_when_both_true(self):
         """If HFT and SL are both true, HFT must win by precedence."""
-        funcs, logger = _load_functions("check_exit_condition")
+        funcs, logger = _load_functions("check_exit_condition", "compile_exit_plan")
         fn = funcs["check_exit_condition"]
         state = {
             "side": "CALL",
@@ -123,7 +124,7 @@ class ExitPrecedenceSafeguardTests(unittest.TestCase):
 
     def test_closed_position_rejects_exit(self):
         """Duplicate/stale exits must be rejected when is_open is False."""
-        funcs, _logger = _load_functions("check_exit_condition")
+        funcs, _logger = _load_functions("check_exit_condition", "compile_exit_plan")
         fn = funcs["check_exit_condition"]
         state = {
             "side": "CALL",
@@ -152,7 +153,7 @@ class ExitPrecedenceSafeguardTests(unittest.TestCase):
 
     def test_scalp_exit_fires_pt_without_min_bar(self):
         """Scalp trades must exit immediately on PT even before min bars."""
-        funcs, _logger = _load_functions("check_exit_condition")
+        funcs, _logger = _load_functions("check_exit_condition", "compile_exit_plan")
         fn = funcs["check_exit_condition"]
         state = {
             "side": "CALL",
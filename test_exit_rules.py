@@ -0,0 +1,70 @@
+"""Tests for exit_rules — ordering, short-circuit and per-rule metrics."""
+
+import csv
+import tempfile
+import unittest
+from pathlib import Path
+
+from exit_rules import (
+    NO_EXIT,
+    evaluate_rules,
+    format_rule_metrics,
+    reset_rule_metrics,
+    rule_metrics,
+    save_rule_metrics_csv,
+)
+
+
+class EvaluateRulesTests(unittest.TestCase):
+    def setUp(self):
+        reset_rule_metrics()
+        self.calls = []
+
+    def _rule(self, name, result=None):
+        def fn(*args):
+            self.calls.append((name,) + args)
+            return result
+        return name, fn
+
+    def test_first_decision_wins(self):
+        rules = [
+            self._rule("T_A"),
+            self._rule("T_B", (True, "B_HIT")),
+            self._rule("T_C", (True, "C_HIT")),
+        ]
+        self.assertEqual(evaluate_rules(rules, "ctx"), (True, "B_HIT"))
+        self.assertEqual(self.calls, [("T_A", "ctx"), ("T_B", "ctx")])
+
+    def test_hold_decision_short_circuits(self):
+        rules = [self._rule("T_GATE", (False, None)), self._rule("T_LATE", (True, "X"))]
+        self.assertEqual(evaluate_rules(rules), (False, None))
+        self.assertEqual(self.calls, [("T_GATE",)])
+
+    def test_no_decision_returns_no_exit(self):
+        self.assertEqual(evaluate_rules([self._rule("T_A"), self._rule("T_B")]), NO_EXIT)
+        self.assertEqual(len(self.calls), 2)
+
+    def test_metrics_accumulate_by_name(self):
+        evaluate_rules([self._rule("T_A"), self._rule("T_B", (True, "B"))])
+        evaluate_rules([self._rule("T_B", (True, "B"))])
+        rows = {r["rule"]: r for r in rule_metrics()}
+        self.assertEqual((rows["T_A"]["evals"], rows["T_A"]["hits"]), (1, 0))
+        self.assertEqual((rows["T_B"]["evals"], rows["T_B"]["hits"]), (2, 2))
+        self.assertEqual(rows["T_B"]["hit_rate_pct"], 100.0)
+        self.assertIn("T_B", format_rule_metrics())
+
+        reset_rule_metrics()
+        self.assertEqual(rule_metrics(), [])
+
+    def test_save_csv(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            self.assertIsNone(save_rule_metrics_csv(Path(tmp) / "none.csv"))
+            evaluate_rules([self._rule("T_A", (True, "A"))])
+            path = save_rule_metrics_csv(Path(tmp) / "sub" / "rules.csv")
+            with path.open(newline="") as fh:
+                rows = list(csv.DictReader(fh))
+        self.assertEqual([(r["rule"], r["evals"], r["hits"]) for r in rows], [("T_A", "1", "1")])
+
+
+if __name__ == "__main__":
+    unittest.main()
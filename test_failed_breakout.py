@@ -58,6 +58,7 @@ class FailedBreakoutGateIntegrationTests(unittest.TestCase):
             "pd": pd,
             "np": np,
             "logging": type("L", (), {"info": lambda *a, **k: None, "debug": lambda *a, **k: None})(),
+            "emit_event": lambda *_args, **_kwargs: None,
             "resolve_atr": lambda c: (float(c["atr14"].iloc[-1]), "atr14"),
         }
         exec(compile(ast.Module(body=body, type_ignores=[]), "<fb_gate>", "exec"), ns)
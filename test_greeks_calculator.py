@@ -0,0 +1,125 @@
+"""Tests for greeks_calculator — vectorised chain IV/Greeks and the per-contract cache."""
+
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+import greeks_calculator
+from greeks_calculator import ChainGreeksCache, chain_greeks, get_greeks
+
+SPOT = 22500.0
+R, Q = greeks_calculator._RISK_FREE_RATE, greeks_calculator._DIVIDEND_YIELD
+
+
+def _chain(spot=SPOT, days=5.0, n_strikes=61):
+    """Synthetic CE+PE chain priced off a known smile."""
+    strikes = np.repeat(spot - 1500 + 50 * np.arange(n_strikes), 2)
+    is_call = np.tile([True, False], n_strikes)
+    vols = 0.14 + np.abs(strikes - spot) / 1e5
+    price, _ = greeks_calculator._bsm_price_vega(
+        np.full(len(strikes), spot), strikes, np.full(len(strikes), days / 365.0),
+        vols, is_call, R, Q)
+    symbols = [f"NSE:NIFTY26310{int(k)}{'CE' if c else 'PE'}" for k, c in zip(strikes, is_call)]
+    return symbols, strikes, is_call, vols, price
+
+
+class ChainGreeksTests(unittest.TestCase):
+    def test_recovers_iv_across_the_chain(self):
+        symbols, strikes, is_call, vols, price = _chain()
+        g = chain_greeks(SPOT, strikes, 5, is_call, price, symbols=symbols)
+        self.assertTrue(g.ok.all())
+        np.testing.assert_allclose(g.iv, vols, atol=1e-6)
+        atm_ce = g.get("NSE:NIFTY2631022500CE")
+        atm_pe = g.get("NSE:NIFTY2631022500PE")
+        self.assertAlmostEqual(atm_ce.delta - atm_pe.delta, np.exp(-Q * 5 / 365), places=3)
+        self.assertEqual(atm_ce.gamma, atm_pe.gamma)
+        self.assertEqual((atm_ce.option_type, atm_pe.option_type), ("c", "p"))
+        self.assertIsNone(g.get("NSE:UNKNOWN"))
+
+    def test_matches_single_contract_greeks(self):
+        if not greeks_calculator._VOLLIB_AVAILABLE:
+            self.skipTest("py_vollib not installed")
+        symbols, strikes, is_call, _, price = _chain(n_strikes=11)
+        g = chain_greeks(SPOT, strikes, 5, ["CE" if c else "PE" for c in is_call], price,
+                         symbols=symbols)
+        for i in (0, 9, 10, 21):
+            ref = get_greeks(symbols[i], SPOT, strikes[i], 5, "CE" if is_call[i] else "PE", price[i])
+            got = g.get(symbols[i])
+            for field in ("delta", "gamma", "theta", "vega", "iv"):
+                self.assertAlmostEqual(getattr(got, field), getattr(ref, field), places=3, msg=field)
+
+    def test_single_contract_falls_back_to_batch_engine(self):
+        _, strikes, is_call, _, price = _chain()
+        self.assertEqual((strikes[60], is_call[60]), (SPOT, True))
+        with mock.patch.object(greeks_calculator, "_VOLLIB_AVAILABLE", False):
+            res = get_greeks("ATM", SPOT, strikes[60], 5, "CE", price[60])
+        self.assertAlmostEqual(res.iv, 0.14, places=4)
+        self.assertEqual(res.option_type, "c")
+
+    def test_out_of_bounds_premium_is_nan(self):
+        g = chain_greeks(SPOT, [22000.0, 23000.0, 22500.0], 5, ["CE", "PE", "CE"], [100.0, 0.0, 150.0])
+        self.assertEqual(g.ok.tolist(), [False, False, True])     # below intrinsic / zero
+        self.assertTrue(np.isnan(g.delta[:2]).all())
+        with self.assertRaises(ValueError):
+            chain_greeks(SPOT, 22500.0, 5, "XX", 150.0)
+
+    def test_unconverged_rows_are_nan(self):
+        _, strikes, is_call, _, price = _chain(n_strikes=11)
+        with mock.patch.object(greeks_calculator, "_IV_MAX_ITER", 1):
+            g = chain_greeks(SPOT, strikes, 5, is_call, price)
+        self.assertFalse(g.ok.all())
+        self.assertTrue(np.isnan(g.delta[~g.ok]).all())
+        self.assertTrue(chain_greeks(SPOT, strikes, 5, is_call, price).ok.all())
+
+    def test_full_chain_under_budget(self):
+        symbols, strikes, is_call, _, price = _chain(n_strikes=201)
+        chain_greeks(SPOT, strikes, 5, is_call, price)                  # warm-up
+        best = min(self._timed(chain_greeks, SPOT, strikes, 5, is_call, price) for _ in range(5))
+        self.assertLess(best, 0.010)
+
+    @staticmethod
+    def _timed(fn, *args):
+        start = time.perf_counter()
+        fn(*args)
+        return time.perf_counter() - start
+
+
+class ChainGreeksCacheTests(unittest.TestCase):
+    def test_refreshes_only_moved_quotes(self):
+        symbols, strikes, is_call, _, price = _chain()
+        price = np.round(price / greeks_calculator.PRICE_BUCKET) * greeks_calculator.PRICE_BUCKET
+        cache = ChainGreeksCache()
+        first = cache.update(symbols, SPOT, strikes, 5, is_call, price)
+        self.assertEqual(cache.last_refreshed, len(symbols))
+
+        moved = price.copy()
+        moved[[3, 40]] += 1.0                      # two quotes moved a full point
+        moved[58] += 0.01                          # inside one price bucket
+        second = cache.update(symbols, SPOT, strikes, 5, is_call, moved)
+        self.assertEqual(cache.last_refreshed, 2)
+        self.assertEqual(second.iv[58], first.iv[58])
+        self.assertNotEqual(second.iv[3], first.iv[3])
+        np.testing.assert_allclose(second.iv[[3, 40]],
+                                   chain_greeks(SPOT, strikes[[3, 40]], 5, is_call[[3, 40]],
+                                                moved[[3, 40]]).iv)
+
+        cache.update(symbols, SPOT + 10, strikes, 5, is_call, moved)
+        self.assertEqual(cache.last_refreshed, len(symbols))           # spot move touches all
+
+    def test_subset_updates_and_new_contracts(self):
+        symbols, strikes, is_call, _, price = _chain(n_strikes=5)
+        cache = ChainGreeksCache()
+        cache.update(symbols[:4], SPOT, strikes[:4], 5, is_call[:4], price[:4])
+        g = cache.update(symbols[2:], SPOT, strikes[2:], 5, is_call[2:], price[2:])
+        self.assertEqual(cache.last_refreshed, len(symbols) - 4)
+        self.assertEqual(g.symbols, tuple(symbols[2:]))
+        self.assertEqual(len(cache), len(symbols))
+        self.assertTrue(g.ok.all())
+        cache.clear()
+        self.assertEqual(len(cache), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
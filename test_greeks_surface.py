@@ -0,0 +1,188 @@
+"""Tests for greeks_surface — incremental refresh, snapshot reads and consumers."""
+
+import time
+import unittest
+from datetime import date, timedelta
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import entry_logic
+import greeks_calculator
+import position_manager
+from greeks_surface import GreeksSurface, GreeksSurfaceBook
+from position_manager import PositionManager
+
+UND = "NSE:NIFTY50-INDEX"
+SPOT = 22500.0
+TODAY = date(2026, 3, 5)
+EXPIRY = TODAY + timedelta(days=5)
+
+
+def _chain(spot=SPOT, n=41):
+    strikes = np.repeat(spot - 1000 + 50 * np.arange(n), 2)
+    types = ["CE", "PE"] * n
+    is_call = np.array([t == "CE" for t in types])
+    price, _ = greeks_calculator._bsm_price_vega(
+        np.full(len(strikes), spot), strikes, np.full(len(strikes), 5 / 365.0),
+        np.full(len(strikes), 0.14), is_call, greeks_calculator._RISK_FREE_RATE,
+        greeks_calculator._DIVIDEND_YIELD)
+    symbols = [f"NSE:NIFTY26310{int(k)}{t}" for k, t in zip(strikes, types)]
+    return symbols, strikes, types, price
+
+
+def _surface(band_pts=1000.0):
+    symbols, strikes, types, price = _chain()
+    surface = GreeksSurface(UND, EXPIRY, symbols, strikes, types, band_pts=band_pts)
+    for sym, px in zip(symbols, price):
+        surface.on_quote(sym, px)
+    surface.on_spot(SPOT)
+    surface.refresh(TODAY)
+    return surface, symbols, price
+
+
+class GreeksSurfaceTests(unittest.TestCase):
+    def test_quotes_wait_for_spot_then_solve(self):
+        symbols, strikes, types, price = _chain()
+        surface = GreeksSurface(UND, EXPIRY, symbols, strikes, types)
+        surface.on_quote(symbols[40], price[40])
+        self.assertIsNone(surface.refresh(TODAY))
+        self.assertTrue(surface.dirty)
+        surface.on_spot(SPOT)
+        snap = surface.refresh(TODAY)
+        self.assertAlmostEqual(snap.get(symbols[40]).iv, 0.14, places=4)
+        self.assertFalse(surface.dirty)
+
+    def test_refresh_touches_only_affected_strikes(self):
+        surface, symbols, price = _surface(band_pts=200.0)
+        first = surface.snapshot
+        self.assertEqual(surface.last_refreshed, len(symbols))
+
+        surface.on_quote(symbols[0], price[0] + 1.0)       # far OTM put, outside band
+        second = surface.refresh(TODAY)
+        self.assertEqual(surface.last_refreshed, 1)
+        self.assertIsNot(second, first)
+        self.assertNotEqual(second.greeks.iv[0], first.greeks.iv[0])
+        self.assertEqual(second.greeks.iv[1], first.greeks.iv[1])
+
+        surface.on_spot(SPOT + 5)                          # 8 strikes x 2 inside ±200
+        surface.refresh(TODAY)
+        self.assertEqual(surface.last_refreshed, 16)
+        self.assertIs(surface.refresh(TODAY), surface.snapshot)   # nothing dirty
+
+    def test_snapshots_are_not_mutated_by_later_refreshes(self):
+        surface, symbols, price = _surface()
+        first = surface.snapshot
+        iv_before = first.greeks.iv.copy()
+        surface.on_quote(symbols[40], price[40] + 5.0)
+        surface.refresh(TODAY)
+        np.testing.assert_array_equal(first.greeks.iv, iv_before)
+
+    def test_nearest_and_delta_lookups(self):
+        surface, symbols, _ = _surface()
+        snap = surface.snapshot
+        ce, pe = snap.nearest("CALL"), snap.nearest("PE")
+        self.assertEqual((ce.symbol, pe.symbol), ("NSE:NIFTY2631022500CE", "NSE:NIFTY2631022500PE"))
+        self.assertAlmostEqual(ce.delta, 0.52, delta=0.02)
+        self.assertLess(snap.delta("NSE:NIFTY2631022500PE"), 0)
+        self.assertIsNone(snap.delta("NSE:UNKNOWN"))
+        self.assertEqual(snap.nearest("CE", 23000).symbol, "NSE:NIFTY2631023000CE")
+
+
+class GreeksSurfaceBookTests(unittest.TestCase):
+    def setUp(self):
+        self.book = GreeksSurfaceBook(hz=50, max_age_s=30)
+        self.addCleanup(self.book.stop)
+        symbols, strikes, types, price = _chain()
+        self.symbols, self.price = symbols, price
+        chain = pd.DataFrame({"symbol": symbols, "strike_price": strikes, "option_type": types,
+                              "underlying": UND, "expiry": str(EXPIRY)})
+        self.assertEqual(self.book.register_chain(chain), 1)
+
+    def _feed(self):
+        for sym, px in zip(self.symbols, self.price):
+            self.book.on_quote(sym, px)
+        self.book.on_spot(UND, SPOT)
+        self.book.on_spot("NSE:BANKNIFTY-INDEX", 48000.0)  # no surface: ignored
+
+    def test_routes_ticks_and_serves_fresh_snapshots(self):
+        self._feed()
+        self.assertIsNone(self.book.snapshot(UND))
+        self.assertEqual(self.book.refresh(), 1)
+        snap = self.book.snapshot(UND)
+        self.assertEqual((snap.underlying, snap.expiry, snap.spot), (UND, EXPIRY, SPOT))
+        self.assertIs(self.book.snapshot_for(self.symbols[0]), snap)
+        self.assertIsNone(self.book.snapshot(None))                    # no guessing
+        self.assertIsNone(self.book.snapshot("NSE:BANKNIFTY-INDEX"))
+        with mock.patch("greeks_surface.time.time", return_value=snap.updated_at + 31):
+            self.assertIsNone(self.book.snapshot(UND))
+
+    def test_worker_coalesces_bursts(self):
+        calls = []
+        real = GreeksSurface.refresh
+        with mock.patch.object(GreeksSurface, "refresh", autospec=True,
+                               side_effect=lambda s, *a: calls.append(1) or real(s, *a)):
+            self.assertTrue(self.book.start())
+            for _ in range(20):
+                self._feed()
+            deadline = time.time() + 2
+            while self.book.snapshot(UND) is None and time.time() < deadline:
+                time.sleep(0.01)
+        self.assertIsNotNone(self.book.snapshot_for(self.symbols[0]))
+        self.assertLess(len(calls), 20)
+        self.assertFalse(GreeksSurfaceBook(hz=0).start())
+
+
+class ConsumerTests(unittest.TestCase):
+    def setUp(self):
+        self.book = GreeksSurfaceBook(hz=0, max_age_s=0)
+        symbols, strikes, types, price = _chain()
+        surface = self.book.register(UND, EXPIRY, symbols, strikes, types)
+        for sym, px in zip(symbols, price):
+            surface.on_quote(sym, px)
+        surface.on_spot(SPOT)
+        surface.refresh(TODAY)
+        self.surface, self.symbols, self.price = surface, symbols, price
+
+    def test_entry_scoring_reads_surface_only_when_enabled(self):
+        candle = {"rsi14": 55.0, "cci20": 120.0, "close": 22100.0, "open": 22050.0,
+                  "high": 22150.0, "low": 22000.0}
+        indicators = {"atr": 80.0, "st_bias_3m": "BULLISH", "st_bias_15m": "BULLISH",
+                      "momentum_ok_call": True, "momentum_ok_put": False, "cpr_width": "NARROW",
+                      "adx14": 30.0, "open_bias": "NONE", "gap_tag": "NO_GAP", "rsi_prev": 52.0}
+
+        def penalty(**kw):
+            res = entry_logic.check_entry_condition(candle, indicators, "BULLISH", **kw)
+            return res["breakdown"].get("theta_penalty")
+
+        with mock.patch.object(entry_logic, "get_greeks_surfaces", return_value=self.book):
+            off = penalty(symbol=UND)                                   # replay parity
+            with mock.patch.object(entry_logic, "GREEKS_SURFACE_SCORING", True):
+                no_symbol = penalty()
+                on = penalty(symbol=UND)
+                with mock.patch.object(entry_logic, "_SURFACE_THETA_PENALTY_THRESHOLD", 5.0):
+                    strict = penalty(symbol=UND)
+        theta = abs(self.surface.snapshot.nearest("CE").theta)
+        self.assertTrue(5.0 < theta < entry_logic._SURFACE_THETA_PENALTY_THRESHOLD)  # ATM weekly
+        self.assertEqual((off, no_symbol, on, strict), (0, 0, 0, -8))
+
+    def test_adaptive_delta_uses_live_delta(self):
+        pm = PositionManager(mode="PAPER")
+        fallback = pm._adaptive_delta(40.0)
+        self.assertAlmostEqual(fallback, 0.58)
+        atm = "NSE:NIFTY2631022500CE"
+        with mock.patch.object(position_manager, "get_greeks_surfaces", return_value=self.book):
+            pm.open(1, "2026-03-05 10:00", SPOT, 150.0, {"side": "CALL", "option_name": atm})
+            entry = pm._t["entry_delta"]
+            self.assertAlmostEqual(entry, self.surface.snapshot.delta(atm))
+            self.surface.on_spot(SPOT + 100)
+            self.surface.refresh(TODAY)
+            now = self.surface.snapshot.delta(atm)
+            self.assertGreater(now, entry)
+            self.assertAlmostEqual(pm._adaptive_delta(100.0), 0.5 * (entry + now))
+        self.assertAlmostEqual(pm._adaptive_delta(100.0), 0.70)     # surface gone → linear
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+"""Tests for metrics — registry, Prometheus text rendering and the HTTP endpoint."""
+
+import time
+import unittest
+import urllib.error
+import urllib.request
+from datetime import datetime
+
+import metrics
+from broker_gateway import BrokerGateway, FakeBrokerAdapter
+from market_data import CandleAggregator
+from metrics import MetricsRegistry, MetricsServer
+from pulse_module import PulseModule
+
+
+class RegistryTests(unittest.TestCase):
+    def setUp(self):
+        self.reg = MetricsRegistry()
+
+    def test_counter_and_labels(self):
+        ticks = self.reg.counter("feed_ticks_total", "Ticks", ("symbol",))
+        ticks.labels("NSE:NIFTY50-INDEX").inc()
+        ticks.labels("NSE:NIFTY50-INDEX").inc(2)
+        ticks.labels('we"ird').inc()
+        self.assertIs(self.reg.counter("feed_ticks_total", "Ticks", ("symbol",)), ticks)
+        text = self.reg.render()
+        self.assertIn("# TYPE feed_ticks_total counter", text)
+        self.assertIn('feed_ticks_total{symbol="NSE:NIFTY50-INDEX"} 3', text)
+        self.assertIn('feed_ticks_total{symbol="we\\"ird"} 1', text)
+        with self.assertRaises(ValueError):
+            ticks.labels("a", "b")
+        with self.assertRaises(ValueError):
+            self.reg.gauge("feed_ticks_total", "Ticks", ("symbol",))
+
+    def test_gauge_value_and_function(self):
+        depth = self.reg.gauge("queue_depth", "Depth")
+        depth.inc(3)
+        depth.dec()
+        self.assertEqual(depth.value, 2)
+        items = [1, 2, 3, 4]
+        self.reg.gauge("pending", "Pending").set_function(lambda: len(items))
+        self.reg.gauge("broken", "Broken").set_function(lambda: 1 / 0)
+        text = self.reg.render()
+        self.assertIn("queue_depth 2\n", text)
+        self.assertIn("pending 4\n", text)
+        self.assertNotIn("\nbroken ", text)
+
+    def test_histogram_buckets_are_cumulative(self):
+        lat = self.reg.histogram("call_seconds", "Latency", ("op",), buckets=(0.1, 1.0))
+        for v in (0.05, 0.1, 0.5, 3.0):
+            lat.labels("place").observe(v)
+        text = self.reg.render()
+        self.assertIn('call_seconds_bucket{op="place",le="0.1"} 2', text)
+        self.assertIn('call_seconds_bucket{op="place",le="1"} 3', text)
+        self.assertIn('call_seconds_bucket{op="place",le="+Inf"} 4', text)
+        self.assertIn('call_seconds_count{op="place"} 4', text)
+        self.assertIn('call_seconds_sum{op="place"} 3.65', text)
+        with lat.labels("modify").time():
+            pass
+        self.assertEqual(lat.labels("modify").count, 1)
+
+    def test_tick_path_cost_under_a_microsecond(self):
+        ticks = self.reg.counter("cost_ticks_total", "Ticks", ("symbol",))
+        n = 200_000
+        t0 = time.perf_counter()
+        for _ in range(n):
+            ticks.labels("NSE:NIFTY50-INDEX").inc()
+        per_call = (time.perf_counter() - t0) / n
+        self.assertEqual(ticks.labels("NSE:NIFTY50-INDEX").value, n)
+        self.assertLess(per_call, 1e-6)
+
+
+class EndpointTests(unittest.TestCase):
+    def test_scrape_over_http(self):
+        reg = MetricsRegistry()
+        reg.counter("scrape_total", "Scrapes").inc(5)
+        server = MetricsServer(reg, port=0)
+        self.addCleanup(server.close)
+        url = f"http://{server.addr}:{server.port}"
+        with urllib.request.urlopen(url + "/metrics", timeout=5) as resp:
+            self.assertIn("text/plain", resp.headers["Content-Type"])
+            self.assertIn("scrape_total 5", resp.read().decode())
+        with self.assertRaises(urllib.error.HTTPError):
+            urllib.request.urlopen(url + "/nope", timeout=5)
+
+    def test_start_disabled_with_port_zero(self):
+        self.assertIsNone(metrics.start_metrics_server(port=0))
+
+
+class InstrumentationTests(unittest.TestCase):
+    def test_candle_close_observes_tick_to_candle(self):
+        child = metrics.get_registry().get("md_tick_to_candle_seconds").labels("3m")
+        before, before_sum = child.count, child.sum
+        agg = CandleAggregator("NSE:NIFTY50-INDEX")
+        agg.on_tick(22500.0, datetime(2026, 3, 7, 9, 15, 5))
+        agg.on_tick(22510.0, datetime(2026, 3, 7, 9, 18, 2))
+        self.assertEqual(child.count, before + 1)
+        self.assertAlmostEqual(child.sum - before_sum, 2.0)
+
+    def test_pulse_rate_read_does_not_trim_buffer(self):
+        pulse = PulseModule()
+        for i in range(11):
+            pulse.on_tick(1_000_000 + i * 100, 22500.0 + i)
+        self.assertAlmostEqual(pulse.current_tick_rate(1_001_000), 11.0)
+        self.assertEqual(pulse.current_tick_rate(9_000_000), 0.0)
+        self.assertEqual(pulse.get_pulse(1_001_000).tick_count, 11)
+
+    def test_gateway_exports_call_and_order_latency(self):
+        gw = BrokerGateway(FakeBrokerAdapter(), name="MetricsFake")
+        self.addCleanup(gw.close)
+        ok, _ = gw.place_entry_sync("NSE:NIFTY2631022500CE", 65, 1, 100.0)
+        self.assertTrue(ok)
+        text = metrics.get_registry().render()
+        self.assertIn('gateway_call_seconds_count{broker="MetricsFake",op="place_entry"} 1', text)
+        self.assertIn('gateway_order_seconds_count{broker="MetricsFake",op="place_entry"} 1', text)
+        self.assertIn('gateway_lane_waiting{broker="MetricsFake",lane="entry"} 0', text)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -61,6 +61,7 @@ def _load_functions(*names: str, extra_ns: dict | None = None):
         "dt": datetime,
         "timedelta": timedelta,
         "logging": test_logger,
+        "emit_event": lambda *_args, **_kwargs: None,
         "calculate_cci": lambda _df: pd.Series([0.0]),
         "williams_r": lambda _df: 0.0,
         "momentum_ok": lambda _df, _side: (True, 0.0),
@@ -216,7 +217,7 @@ class ScalpControlTests(unittest.TestCase):
 
 class ScalpExitLogicTests(unittest.TestCase):
     def test_scalp_pt_suppressed_before_min_bars(self):
-        funcs, logger, _ns = _load_functions("check_exit_condition")
+        funcs, logger, _ns = _load_functions("check_exit_condition", "compile_exit_plan")
         fn = funcs["check_exit_condition"]
         state = _base_state(entry_candle=len(_mk_df()) - 1)  # bars_held=0
 
@@ -231,7 +232,7 @@ class ScalpExitLogicTests(unittest.TestCase):
         self.assertIsNone(reason)
 
     def test_scalp_pt_fires_after_min_bars(self):
-        funcs, _logger, _ns = _load_functions("check_exit_condition")
+        funcs, _logger, _ns = _load_functions("check_exit_condition", "compile_exit_plan")
         fn = funcs["check_exit_condition"]
         state = _base_state(entry_candle=0)  # bars_held=3 >= 2
 
@@ -247,7 +248,7 @@ class ScalpExitLogicTests(unittest.TestCase):
 
     def test_scalp_sl_points_logic_is_removed(self):
         """The old SCALP_SL_HIT based on fixed points should no longer fire."""
-        funcs, _logger, _ns = _load_functions("check_exit_condition")
+        funcs, _logger, _ns = _load_functions("check_exit_condition", "compile_exit_plan")
         fn = funcs["check_exit_condition"]
         state = _base_state(stop=180.0)  # Main SL is far away
 
@@ -259,7 +260,7 @@ class ScalpExitLogicTests(unittest.TestCase):
 
     def test_sl_backstop_active_in_scalp_mode(self):
         """The main ATR-based SL should still fire for scalp trades."""
-        funcs, _logger, _ns = _load_functions("check_exit_condition")
+        funcs, _logger, _ns = _load_functions("check_exit_condition", "compile_exit_plan")
         fn = funcs["check_exit_condition"]
         state = _base_state(stop=198.0, scalp_pt_points=10.0, entry_candle=0)
 
@@ -272,7 +273,7 @@ class ScalpExitLogicTests(unittest.TestCase):
         self.assertEqual(state.get("last_exit_type"), "SL")
 
     def test_hft_override_wins_over_scalp_pt(self):
-        funcs, _logger, _ns = _load_functions("check_exit_condition")
+        funcs, _logger, _ns = _load_functions("check_exit_condition", "compile_exit_plan")
         fn = funcs["check_exit_condition"]
         state = _base_state(
             hf_exit_manager=FakeHFManager(True, "DYNAMIC_TRAILING_STOP"),
@@ -293,7 +294,7 @@ class ScalpExitLogicTests(unittest.TestCase):
 
     def test_hft_can_fire_for_scalp_trade(self):
         """Verify HFT logic can fire for scalp trades (fall-through)."""
-        funcs, _logger, _ns = _load_functions("check_exit_condition")
+        funcs, _logger, _ns = _load_functions("check_exit_condition", "compile_exit_plan")
         fn = funcs["check_exit_condition"]
         state = _base_state(
             scalp_pt_points=20.0,  # PT not hit
@@ -309,7 +310,7 @@ class ScalpExitLogicTests(unittest.TestCase):
         self.assertEqual(reason, "MOMENTUM_EXHAUSTION")
 
     def test_duplicate_exit_rejected_when_closed(self):
-        funcs, _logger, _ns = _load_functions("check_exit_condition")
+        funcs, _logger, _ns = _load_functions("check_exit_condition", "compile_exit_plan")
         fn = funcs["check_exit_condition"]
         state = _base_state(is_open=False)
 
@@ -324,7 +325,7 @@ class ScalpExitLogicTests(unittest.TestCase):
         self.assertIsNone(reason)
 
     def test_audit_log_contains_scalp_exit_fields(self):
-        funcs, logger, _ns = _load_functions("check_exit_condition")
+        funcs, logger, _ns = _load_functions("check_exit_condition", "compile_exit_plan")
         fn = funcs["check_exit_condition"]
         state = _base_state(position_id="POS_AUDIT_1", entry_candle=0)
 
@@ -0,0 +1,88 @@
+"""Tests for option_chain_index — strike-indexed option selection."""
+
+import random
+import unittest
+
+import pandas as pd
+
+from option_chain_index import OptionChainIndex, normalise_side
+
+
+def _chain(strikes, underlying="NSE:NIFTY50-INDEX"):
+    rows = [{"symbol": underlying, "strike_price": -1, "option_type": "", "underlying": underlying}]
+    for k in strikes:
+        for side in ("CE", "PE"):
+            rows.append({"symbol": f"NSE:NIFTY{k}{side}", "strike_price": k,
+                         "option_type": side, "underlying": underlying})
+    return pd.DataFrame(rows)
+
+
+def _reference(chain, quotes, side, strike):
+    """The DataFrame scan get_option_by_moneyness used before the index."""
+    cand = chain[chain["option_type"] == side].copy()
+    if cand.empty:
+        return None, None
+    cand["d"] = (cand["strike_price"] - strike).abs()
+    cand = cand.sort_values("d", kind="mergesort")
+    for _, row in cand.iterrows():
+        if not quotes.empty and row["symbol"] in quotes.index:
+            return row["symbol"], row["strike_price"]
+    return cand.iloc[0]["symbol"], cand.iloc[0]["strike_price"]
+
+
+class OptionChainIndexTests(unittest.TestCase):
+    def setUp(self):
+        self.strikes = list(range(21000, 23050, 50))
+        self.chain = _chain(self.strikes)
+        self.index = OptionChainIndex.from_frame(self.chain)
+
+    def test_books_sorted_by_side(self):
+        self.assertEqual(len(self.index.books), 2)
+        self.assertEqual(len(self.index), 2 * len(self.strikes))
+        book = self.index.books[("NSE:NIFTY50-INDEX", "", "CE")]
+        self.assertEqual(list(book.strikes), [float(k) for k in self.strikes])
+
+    def test_exact_and_nearest_without_quotes(self):
+        self.assertEqual(self.index.select("CALL", 22000)[:2], ("NSE:NIFTY22000CE", 22000.0))
+        self.assertEqual(self.index.select("PE", 22020)[:2], ("NSE:NIFTY22000PE", 22000.0))
+        self.assertEqual(self.index.select("CE", 99999)[:2], ("NSE:NIFTY23000CE", 23000.0))
+        self.assertEqual(self.index.select("CE", 22000, pd.DataFrame())[2], False)
+
+    def test_prefers_symbols_in_quote_book(self):
+        quotes = pd.DataFrame(index=["NSE:NIFTY22100PE", "NSE:NIFTY21900PE"], columns=["ltp"])
+        sym, k, liquid = self.index.select("PE", 22000, quotes)
+        self.assertTrue(liquid)
+        self.assertIn(sym, quotes.index)
+        self.assertEqual(abs(k - 22000), 100)
+
+        quotes = pd.DataFrame(index=["NSE:OTHER"], columns=["ltp"])
+        self.assertEqual(self.index.select("PE", 22000, quotes), ("NSE:NIFTY22000PE", 22000.0, False))
+
+    def test_matches_dataframe_scan(self):
+        rng = random.Random(3)
+        for _ in range(200):
+            live = rng.sample(list(self.chain["symbol"]), rng.randint(0, 20))
+            quotes = pd.DataFrame(index=live, columns=["ltp"])
+            side = rng.choice(["CE", "PE"])
+            strike = rng.choice(self.strikes) + rng.choice([-100, 0, 50, 5000, -5000])
+            got = self.index.select(side, strike, quotes)[:2]
+            exp_sym, exp_k = _reference(self.chain, quotes, side, strike)
+            self.assertEqual(abs(got[1] - strike), abs(exp_k - strike))
+            if abs(got[1] - strike) > 0 and got[0] != exp_sym:
+                # Equidistant strikes on both sides: either is a valid pick.
+                self.assertEqual(abs(got[1] - strike), abs(float(exp_k) - strike))
+            else:
+                self.assertEqual(got, (exp_sym, float(exp_k)))
+
+    def test_placeholder_chain_gives_empty_index(self):
+        for chain in ({}, pd.DataFrame(), pd.DataFrame(columns=["strike_price", "symbol", "option_type"])):
+            idx = OptionChainIndex.from_frame(chain)
+            self.assertEqual(idx.select("CE", 22000), (None, None, False))
+
+    def test_normalise_side(self):
+        self.assertEqual(normalise_side("CALL"), "CE")
+        self.assertEqual(normalise_side("PUT"), "PE")
+
+
+if __name__ == "__main__":
+    unittest.main()
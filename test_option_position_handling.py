@@ -43,6 +43,7 @@ def _load_functions(*names: str, extra_ns: dict | None = None):
         "dt": datetime,
         "time_zone": None,
         "logging": logger,
+        "emit_event": lambda *_args, **_kwargs: None,
         "calculate_cci": lambda _df: pd.Series([0.0]),
         "williams_r": lambda _df: 0.0,
         "momentum_ok": lambda _df, _side: (True, 0.0),
@@ -86,7 +87,7 @@ class OptionPositionHandlingTests(unittest.TestCase):
         self.assertEqual(side_fn("PUT"), "LONG")
 
     def test_sl_exit_audit_logs_long_for_put(self):
-        funcs, logger, _ns = _load_functions("check_exit_condition")
+        funcs, logger, _ns = _load_functions("check_exit_condition", "compile_exit_plan")
         fn = funcs["check_exit_condition"]
         state = {
             "side": "PUT",
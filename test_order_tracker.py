@@ -0,0 +1,128 @@
+"""Tests for order_tracker — order state machine, reconciliation and chasing."""
+
+import threading
+import unittest
+
+from order_tracker import OrderTracker, TokenBucket
+
+
+class _Clock:
+    def __init__(self, t=1000.0):
+        self.t = t
+
+    def __call__(self):
+        return self.t
+
+
+def _msg(status, filled=0, limit=100.0, oid="O1", typ=1, qty=65):
+    return {"id": oid, "symbol": "NSE:NIFTY22000CE", "status": status, "type": typ,
+            "qty": qty, "filledQty": filled, "limitPrice": limit, "tradedPrice": 0}
+
+
+class OrderStateTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.tracker = OrderTracker(clock=self.clock)
+
+    def tearDown(self):
+        self.tracker.shutdown()
+
+    def test_transitions_and_terminal_states_are_sticky(self):
+        t = self.tracker
+        self.assertEqual(t.on_order(_msg(4)).status_name, "TRANSIT")
+        self.assertEqual([o.id for o in t.pending()], [])
+        t.on_order(_msg(6))
+        self.assertEqual([o.id for o in t.pending()], ["O1"])
+        t.on_order(_msg(2, filled=65))
+        self.assertTrue(t.get("O1").is_terminal)
+        t.on_order(_msg(6), source="rest")        # late REST snapshot
+        self.assertEqual(t.get("O1").status_name, "FILLED")
+        self.assertEqual(t.get("O1").filled_qty, 65)
+
+    def test_stale_partial_fill_ignored(self):
+        t = self.tracker
+        t.on_order(_msg(6, filled=30))
+        t.on_order(_msg(6, filled=10))
+        self.assertEqual(t.get("O1").filled_qty, 30)
+        self.assertIsNone(t.on_order({"status": 6}))
+
+    def test_reconcile_interval_and_changes(self):
+        t = self.tracker
+        self.assertTrue(t.reconcile_due())
+        self.assertEqual(t.reconcile([_msg(6), _msg(2, oid="O2", filled=65)]), 2)
+        self.assertFalse(t.reconcile_due())
+        self.assertEqual(t.reconcile([_msg(6)]), 0)
+        self.clock.t += t.reconcile_interval
+        self.assertTrue(t.reconcile_due())
+        self.assertEqual(t.stats["rest_updates"], 3)
+
+
+class ChaseTests(unittest.TestCase):
+    def setUp(self):
+        self.clock = _Clock()
+        self.calls = []
+
+    def _modify(self, payload):
+        self.calls.append(payload)
+        return {"s": "ok"}
+
+    def test_chase_steps_toward_ltp_once_per_interval(self):
+        t = OrderTracker(clock=self.clock)
+        t.on_order(_msg(6, limit=100.0))
+        t.on_order(_msg(6, limit=50.0, oid="O2", typ=2))       # market: never chased
+        for f in t.chase(lambda s: 101.0, self._modify):
+            f.result()
+        self.assertEqual(self.calls, [{"id": "O1", "type": 1, "limitPrice": 100.1, "qty": 65}])
+        self.assertEqual(t.get("O1").limit_price, 100.1)
+
+        self.assertEqual(t.chase(lambda s: 99.0, self._modify), [])
+        self.clock.t += t.chase_interval
+        for f in t.chase(lambda s: 99.0, self._modify):
+            f.result()
+        self.assertEqual(self.calls[-1]["limitPrice"], 100.0)
+        t.shutdown()
+
+    def test_modifies_are_concurrent_and_rate_limited(self):
+        t = OrderTracker(clock=self.clock, modify_rate=3, workers=3)
+        for i in range(5):
+            t.on_order(_msg(6, oid=f"O{i}"))
+        started, release = threading.Barrier(3, timeout=5), threading.Event()
+
+        def slow_modify(payload):
+            started.wait()                      # all three in flight together
+            release.wait(5)
+            return {"s": "ok"}
+
+        futures = t.chase(lambda s: 101.0, slow_modify)
+        self.assertEqual(len(futures), 3)
+        self.assertEqual(t.stats["rate_limited"], 1)
+        release.set()
+        for f in futures:
+            f.result()
+        self.assertEqual(t.stats["modifies"], 3)
+        t.shutdown()
+
+    def test_failed_modify_keeps_price(self):
+        t = OrderTracker(clock=self.clock)
+        t.on_order(_msg(6, limit=100.0))
+        for f in t.chase(lambda s: 101.0, lambda p: {"s": "error", "message": "x"}):
+            f.result()
+        self.assertEqual(t.get("O1").limit_price, 100.0)
+        self.assertEqual(t.stats["modify_errors"], 1)
+        t.shutdown()
+
+
+class TokenBucketTests(unittest.TestCase):
+    def test_refill(self):
+        clock = _Clock()
+        b = TokenBucket(2, clock=clock)
+        self.assertTrue(b.try_acquire())
+        self.assertTrue(b.try_acquire())
+        self.assertFalse(b.try_acquire())
+        clock.t += 0.5
+        self.assertTrue(b.try_acquire())
+        self.assertFalse(b.try_acquire())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,147 @@
+"""Tests for param_sweep — sampling, shared memory, and the PM exit sweep."""
+
+import logging
+import os
+import sqlite3
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from param_sweep import (
+    PM_SWEEP_SPACE,
+    ParamRange,
+    SharedArrays,
+    evaluate_pm_params,
+    load_pm_dataset,
+    run_sweep,
+    sample_params,
+    write_results_table,
+)
+
+
+def _write_day_db(path, date_str, seed):
+    rng = np.random.default_rng(seed)
+    slots = pd.date_range(f"{date_str} 09:15", f"{date_str} 15:27", freq="3min")
+    close = 22000 + np.cumsum(rng.normal(0, 12, len(slots)))
+    rows3 = [
+        (date_str, ts.strftime("%H:%M:%S"), "NSE:NIFTY50-INDEX",
+         c - 3, c + 8, c - 8, c, 0.0)
+        for ts, c in zip(slots, close)
+    ]
+    rows15 = [
+        (date_str, slots[i].strftime("%H:%M:%S"), "NSE:NIFTY50-INDEX",
+         close[i] - 5, close[i:i + 5].max() + 8, close[i:i + 5].min() - 8,
+         close[min(i + 4, len(close) - 1)], 0.0)
+        for i in range(0, len(slots), 5)
+    ]
+    with sqlite3.connect(path) as con:
+        for table, rows in (("candles_3m_ist", rows3), ("candles_15m_ist", rows15)):
+            con.execute(
+                f"CREATE TABLE {table} (trade_date TEXT, ist_slot TEXT, symbol TEXT, "
+                "open REAL, high REAL, low REAL, close REAL, volume REAL)"
+            )
+            con.executemany(f"INSERT INTO {table} VALUES (?,?,?,?,?,?,?,?)", rows)
+    return slots, close
+
+
+class SampleParamsTests(unittest.TestCase):
+    def test_grid_is_cartesian_product(self):
+        space = {"a": [1, 2, 3], "b": ParamRange(0.0, 1.0, steps=2)}
+        sets = sample_params(space, "grid")
+        self.assertEqual(len(sets), 6)
+        self.assertIn({"a": 3, "b": 1.0}, sets)
+
+    def test_lhs_hits_every_stratum_once(self):
+        sets = sample_params({"x": ParamRange(0.0, 1.0)}, "lhs", n=20, seed=7)
+        strata = sorted(int(p["x"] * 20) for p in sets)
+        self.assertEqual(strata, list(range(20)))
+
+    def test_integer_ranges_round(self):
+        sets = sample_params({"n": ParamRange(10, 30, integer=True)}, "random", n=50)
+        self.assertTrue(all(isinstance(p["n"], int) and 10 <= p["n"] <= 30 for p in sets))
+
+    def test_random_requires_n(self):
+        with self.assertRaises(ValueError):
+            sample_params(PM_SWEEP_SPACE, "random")
+
+
+def _sum_eval(params, arrays):
+    return {"total": float(arrays["x"].sum() * params["k"])}
+
+
+class SharedArraysTests(unittest.TestCase):
+    def test_attach_sees_same_data(self):
+        with SharedArrays({"x": np.arange(5.0), "y": np.array([1, 2], dtype=np.int8)}) as sa:
+            shm, views = SharedArrays.attach(sa.spec)
+            np.testing.assert_array_equal(views["x"], np.arange(5.0))
+            np.testing.assert_array_equal(views["y"], [1, 2])
+            self.assertFalse(views["x"].flags.writeable)
+            del views
+            shm.close()
+
+    def test_pool_matches_in_process(self):
+        params = [{"k": k} for k in range(1, 6)]
+        with SharedArrays({"x": np.arange(10.0)}) as sa:
+            serial = run_sweep(_sum_eval, params, shared=sa, workers=1)
+            pooled = run_sweep(_sum_eval, params, shared=sa, workers=2)
+        pd.testing.assert_frame_equal(serial, pooled)
+        self.assertEqual(list(serial["total"]), [45.0 * k for k in range(1, 6)])
+
+
+class PMSweepTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+        cls.tmp = tempfile.TemporaryDirectory()
+        entries = []
+        for n, day in enumerate(("2026-03-02", "2026-03-03")):
+            slots, close = _write_day_db(
+                os.path.join(cls.tmp.name, f"ticks_{day}.db"), day, seed=n
+            )
+            for j, side in ((30, "CALL"), (60, "PUT"), (62, "CALL")):
+                entries.append({
+                    "time": slots[j].strftime("%Y-%m-%d %H:%M:%S"),
+                    "side": side,
+                    "est_premium": round(close[j] * 0.006, 1),
+                })
+        cls.signals = os.path.join(cls.tmp.name, "signals_test.csv")
+        pd.DataFrame(entries).to_csv(cls.signals, index=False)
+        cls.arrays = load_pm_dataset(os.path.join(cls.tmp.name, "ticks_*.db"), cls.signals)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def test_dataset_matches_all_entries(self):
+        self.assertEqual(len(self.arrays["entry_row"]), 6)
+        # day_end points at the last bar of the entry's own day
+        first_day_end = self.arrays["day_end"][self.arrays["entry_row"][0]]
+        self.assertEqual(self.arrays["day_end"][first_day_end], first_day_end)
+
+    def test_overlapping_entry_skipped(self):
+        # The PUT at bar 60 blocks the CALL two bars later on each day.
+        res = evaluate_pm_params({"MAX_HOLD": 12}, self.arrays)
+        self.assertLessEqual(res["trades"], 6)
+        self.assertGreaterEqual(res["trades"], 4)
+
+    def test_params_change_outcome_and_pool_is_deterministic(self):
+        params = [{"MAX_HOLD": 10, "HARD_STOP_FRAC": 0.99}, {"MAX_HOLD": 30, "HARD_STOP_FRAC": 0.3}]
+        with SharedArrays(self.arrays) as sa:
+            serial = run_sweep(evaluate_pm_params, params, shared=sa, workers=1)
+            pooled = run_sweep(evaluate_pm_params, params, shared=sa, workers=2)
+        pd.testing.assert_frame_equal(serial, pooled)
+        # A 99% hard stop fires on the first adverse bar; 30% never does.
+        self.assertIn("HARD_STOP", serial.loc[0, "exit_reasons"])
+        self.assertNotIn("HARD_STOP", serial.loc[1, "exit_reasons"])
+
+    def test_results_table_written(self):
+        df = pd.DataFrame([{"MAX_HOLD": 15, "trades": 3}])
+        path = write_results_table(df, os.path.join(self.tmp.name, "out", "r.parquet"))
+        self.assertTrue(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -230,8 +230,7 @@ class TestPulseExhaustion(unittest.TestCase):
         # If there was a burst, now decay
         if pm._peak_tick_rate > 0:
             # Advance time far beyond the window so tick rate drops
-            pm._tick_buffer.clear()
-            pm._cached_metrics = None
+            pm.reset()
             pm.on_tick(base + 20000, 100.0)
             pm.on_tick(base + 25000, 100.0)
             pm.on_tick(base + 30000, 100.0)
@@ -139,5 +139,85 @@ class TestConfigIntegration(unittest.TestCase):
         self.assertEqual(_cfg.SLOPE_CONFLICT_TIME_BARS, 5)
 
 
+class TestSimExchangeRouting(unittest.TestCase):
+    """use_sim_exchange() sends the live order path to the local matching engine."""
+
+    def test_live_orders_reach_sim_exchange(self):
+        import pandas as pd
+        from sim_exchange import ST_FILLED, LatencyModel, SimExchange, SimFyersClient
+
+        sym = "NSE:NIFTY2630322000CE"
+        ticks = pd.DataFrame({"ts": [0.0, 1.0], "symbol": sym, "bid": [100.0, 101.0],
+                              "ask": [100.1, 101.1], "ltp": [100.05, 101.05], "volume": 0})
+        ex = SimExchange(ticks, latency=LatencyModel(0.0, 0.0))
+        ex.advance(0)
+        execution.use_sim_exchange(SimFyersClient(ex))
+        self.addCleanup(execution.use_sim_exchange, None)
+
+        ok, entry_id = execution.send_live_entry_order(sym, 65, 1, buffer=0.0)
+        self.assertTrue(ok)
+        ok, exit_id = execution.send_live_exit_order(sym, 65, "TEST")
+        self.assertTrue(ok)
+        ex.advance(1)
+        self.assertEqual(ex.orders[exit_id].status, ST_FILLED)
+        self.assertEqual(ex.orders[entry_id].symbol, sym)
+
+
+class TestLiveExitPending(unittest.TestCase):
+    """An exit still in flight past the wait keeps the leg open until it settles."""
+
+    SYM = "NSE:NIFTY2630322000PE"
+
+    def _gateway(self, broker):
+        from broker_gateway import BrokerGateway
+        gw = BrokerGateway(broker, limits=[(100, 1.0)], max_retries=1, backoff=0.0).start()
+        self.addCleanup(gw.close)
+        self.addCleanup(execution._pending_live_exits.pop, self.SYM, None)
+        patcher = patch.object(execution, "_live_gateway", return_value=gw)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        return gw
+
+    def _wait_settled(self):
+        import time
+        deadline = time.monotonic() + 5.0
+        while execution._pending_live_exits[self.SYM]["status"] == "PENDING":
+            self.assertLess(time.monotonic(), deadline)
+            time.sleep(0.01)
+
+    def test_late_failure_keeps_leg_open_and_reissues(self):
+        from broker_gateway import FakeBrokerAdapter
+        broker = FakeBrokerAdapter(latency=0.1, fail_next=2)
+        self._gateway(broker)
+
+        with patch.object(execution, "LIVE_ORDER_WAIT_SECONDS", 0.02):
+            self.assertEqual(execution.send_live_exit_order(self.SYM, 65, "SL_HIT"), (False, None))
+            # Still in flight: nothing new is sent and the leg is not closed.
+            self.assertEqual(execution.send_live_exit_order(self.SYM, 65, "SL_HIT"), (False, None))
+            self._wait_settled()
+        self.assertEqual(execution._pending_live_exits[self.SYM]["status"], "FAILED")
+        self.assertEqual(len(broker.calls), 2)   # first attempt + one retry
+        self.assertEqual(broker.orders, {})
+
+        with patch.object(execution, "LIVE_ORDER_WAIT_SECONDS", 5.0):
+            ok, order_id = execution.send_live_exit_order(self.SYM, 65, "SL_HIT")
+        self.assertTrue(ok)
+        self.assertEqual(broker.orders[order_id]["kind"], "exit")
+        self.assertNotIn(self.SYM, execution._pending_live_exits)
+
+    def test_late_fill_closes_leg_on_next_call(self):
+        from broker_gateway import FakeBrokerAdapter
+        broker = FakeBrokerAdapter(latency=0.1)
+        self._gateway(broker)
+
+        with patch.object(execution, "LIVE_ORDER_WAIT_SECONDS", 0.02):
+            self.assertEqual(execution.send_live_exit_order(self.SYM, 65, "TG_HIT"), (False, None))
+            self._wait_settled()
+            ok, order_id = execution.send_live_exit_order(self.SYM, 65, "TG_HIT")
+        self.assertTrue(ok)
+        self.assertEqual(list(broker.orders), [order_id])
+        self.assertNotIn(self.SYM, execution._pending_live_exits)
+
+
 if __name__ == "__main__":
     unittest.main()
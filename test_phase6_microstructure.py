@@ -67,8 +67,7 @@ class TestPulseExhaustionDecay(unittest.TestCase):
             pm.on_tick(base + i * 50, 100.0 + i * 0.01)
         _ = pm.detect_exhaustion(base + 800)
         if pm._peak_tick_rate > 0:
-            pm._tick_buffer.clear()
-            pm._cached_metrics = None
+            pm.reset()
             pm.on_tick(base + 20000, 100.0)
             pm.on_tick(base + 25000, 100.0)
             pm.on_tick(base + 30000, 100.0)
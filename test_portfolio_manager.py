@@ -0,0 +1,166 @@
+"""Tests for portfolio_manager — parity with PositionManager and batch exits."""
+
+import logging
+import time
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from portfolio_manager import PortfolioManager
+from position_manager import PositionManager
+
+
+def _bars(seed, n=125, start="2026-03-02 09:15"):
+    rng = np.random.default_rng(seed)
+    times = pd.date_range(start, periods=n, freq="3min")
+    close = 22000 + np.cumsum(rng.normal(0, 9, n))
+    ema9 = pd.Series(close).ewm(span=9, adjust=False).mean().to_numpy()
+    ema13 = pd.Series(close).ewm(span=13, adjust=False).mean().to_numpy()
+    rows = []
+    for i in range(n):
+        rows.append({
+            "open": close[i] - rng.normal(0, 3),
+            "high": close[i] + abs(rng.normal(6, 3)),
+            "low": close[i] - abs(rng.normal(6, 3)),
+            "close": close[i],
+            "ema9": ema9[i] if i % 17 else float("nan"),
+            "ema13": ema13[i],
+            "cci20": float(rng.normal(0, 120)),
+            "atr14": float(rng.uniform(8, 95)) if i % 11 else float("nan"),
+        })
+    return [t.strftime("%Y-%m-%d %H:%M:%S") for t in times], close, rows
+
+
+def _entries(seed, n_bars, count):
+    rng = np.random.default_rng(seed + 1000)
+    out = []
+    for k in range(count):
+        out.append((
+            f"p{k}",
+            int(rng.integers(0, n_bars - 5)),
+            {
+                "side": "CALL" if rng.random() < 0.5 else "PUT",
+                "atr": float(rng.uniform(10, 90)),
+                "cpr_width": str(rng.choice(["NARROW", "NORMAL", "WIDE"])),
+                "day_type": str(rng.choice(["TRENDING", "RANGE", "UNKNOWN",
+                                            "DOUBLE_DISTRIBUTION"])),
+                "option_name": f"NIFTY{k}",
+            },
+            float(rng.uniform(80, 220)),
+        ))
+    return out
+
+
+def _run_both(seed, count):
+    times, close, rows = _bars(seed)
+    entries = _entries(seed, len(times), count)
+    book = PortfolioManager(mode="REPLAY", capacity=2)
+    singles = {}
+    got, want = [], []
+    for i, (bt, c, row) in enumerate(zip(times, close, rows)):
+        for pos_id, decision in book.update(i, bt, c, row):
+            got.append((i, pos_id, decision.reason, round(decision.exit_px, 6),
+                        decision.bars_held, decision.exit_bd))
+            if decision.exit_bd.get("HARD"):
+                book.close(pos_id, i, bt, c, decision.exit_px, decision.reason)
+        for pos_id in sorted(singles):
+            pm = singles[pos_id]
+            d = pm.update(i, bt, c, row)
+            if d.should_exit:
+                want.append((i, pos_id, d.reason, round(d.exit_px, 6),
+                             d.bars_held, d.exit_bd))
+                if d.exit_bd.get("HARD"):
+                    pm.close(i, bt, c, d.exit_px, d.reason)
+                    del singles[pos_id]
+        for pos_id, bar, signal, prem in entries:
+            if bar == i:
+                book.open(pos_id, i, bt, c, prem, signal)
+                singles[pos_id] = PositionManager(mode="REPLAY")
+                singles[pos_id].open(i, bt, c, prem, signal)
+    got.sort(key=lambda r: (r[0], r[1]))
+    return got, want, book
+
+
+class PortfolioParityTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def test_exits_match_individual_position_managers(self):
+        for seed in range(6):
+            got, want, _ = _run_both(seed, count=12)
+            self.assertTrue(want)
+            self.assertEqual(got, want, f"seed={seed}")
+
+    def test_every_hard_exit_closes_and_frees_slot(self):
+        got, _, book = _run_both(3, count=12)
+        self.assertEqual(len(book), 0)        # EOD_EXIT flattens everything
+        self.assertIn("EOD_EXIT", {r[2].split(" |")[0] for r in got})
+        self.assertEqual(sorted(book._free), list(range(book._cap)))
+
+    def test_close_record_and_duplicate_open(self):
+        book = PortfolioManager(mode="REPLAY")
+        book.open("a", 0, "2026-03-02 09:30:00", 22000.0, 120.0, {"side": "PUT"})
+        with self.assertRaises(RuntimeError):
+            book.open("a", 1, "2026-03-02 09:33:00", 22000.0, 120.0, {"side": "PUT"})
+        rec = book.close("a", 4, "2026-03-02 09:42:00", 21980.0, 130.0, "MANUAL")
+        self.assertEqual(rec["position_id"], "a")
+        self.assertEqual(rec["pnl_points"], 10.0)
+        self.assertFalse(book.is_open("a"))
+
+    def test_broker_exit_called_in_paper_mode(self):
+        calls = []
+        book = PortfolioManager(
+            mode="PAPER", broker_exit_fn=lambda *a: calls.append(a) or (True, "X1")
+        )
+        book.open("a", 0, "2026-03-02 09:30:00", 100.0, 100.0,
+                  {"side": "CALL", "option_name": "NIFTY26MAR22000CE"})
+        book.close("a", 1, "2026-03-02 09:33:00", 90.0, 90.0, "HARD_STOP | x")
+        self.assertEqual(calls, [("NIFTY26MAR22000CE", 50, "HARD_STOP | x")])
+
+    def test_symbols_are_evaluated_independently(self):
+        book = PortfolioManager(mode="REPLAY")
+        book.open("n", 0, "2026-03-02 09:30:00", 22000.0, 120.0, {"side": "CALL"},
+                  symbol="NSE:NIFTY50-INDEX")
+        book.open("b", 0, "2026-03-02 09:30:00", 48000.0, 250.0, {"side": "CALL"},
+                  symbol="NSE:NIFTYBANK-INDEX")
+        row = {"high": 22010.0, "low": 21990.0, "close": 22000.0}
+        book.update(1, "2026-03-02 09:33:00", 22000.0, row, symbol="NSE:NIFTY50-INDEX")
+        self.assertEqual(book.state("n")["bars_held"], 1)
+        self.assertEqual(book.state("b")["bars_held"], 0)
+
+
+class PortfolioScalingTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        logging.disable(logging.CRITICAL)
+
+    @classmethod
+    def tearDownClass(cls):
+        logging.disable(logging.NOTSET)
+
+    def _time_update(self, n_pos):
+        book = PortfolioManager(mode="REPLAY")
+        for k in range(n_pos):
+            book.open(f"p{k}", 0, "2026-03-02 09:30:00", 22000.0, 150.0,
+                      {"side": "CALL" if k % 2 else "PUT", "atr": 40})
+        row = {"high": 22004.0, "low": 21996.0, "close": 22000.0,
+               "ema9": 22000.0, "ema13": 22000.0, "atr14": 40.0}
+        t0 = time.perf_counter()
+        for i in range(1, 9):       # stays inside MIN_HOLD..MAX_HOLD, no exits
+            book.update(i, "2026-03-02 10:00:00", 22000.0, row)
+        return time.perf_counter() - t0
+
+    def test_cost_roughly_flat_from_1_to_50_positions(self):
+        one = min(self._time_update(1) for _ in range(3))
+        fifty = min(self._time_update(50) for _ in range(3))
+        self.assertLess(fifty, one * 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+"""Tests for pulse_module — ring-buffer windows, per-symbol engine and O(1) reads."""
+
+import time
+import unittest
+
+from pulse_module import PulseEngine, PulseMetrics, PulseModule
+
+BASE = 1_000_000.0
+
+
+class PulseModuleTests(unittest.TestCase):
+    def test_metrics_match_window_contents(self):
+        pm = PulseModule(window_seconds=5, burst_threshold=3.0, min_ticks=3)
+        for i in range(11):
+            pm.on_tick(BASE + i * 100, 100.0 + i * 0.01)
+        m = pm.get_pulse(BASE + 1000)
+        self.assertEqual(m.tick_count, 11)
+        self.assertEqual(m.tick_rate, 11.0)
+        self.assertEqual(m.avg_interval_ms, 100.0)
+        self.assertEqual(m.direction_drift, "UP")
+        self.assertEqual(m.price_change_pct, 0.1)
+        self.assertEqual(m.last_tick_time_ms, BASE + 1000)
+        self.assertTrue(m.burst_flag)
+        self.assertEqual(m.to_tag(), "[MOMENTUM_TICK_RATE][UP]")
+        self.assertEqual(PulseModule(min_ticks=3).get_pulse(BASE), PulseMetrics())
+
+    def test_windows_are_independent(self):
+        pm = PulseModule(windows=(5, 30, 120), min_ticks=2)
+        for i in range(121):                          # one tick per second for 120s
+            pm.on_tick(BASE + i * 1000, 100.0)
+        now = BASE + 120_000
+        counts = {w: m.tick_count for w, m in pm.get_windows(now).items()}
+        self.assertEqual(counts, {5: 6, 30: 31, 120: 121})
+        self.assertEqual(pm.get_pulse(now).tick_count, 31)           # primary = 30s
+        self.assertEqual(set(pm.burst_state()), {5, 30, 120})
+        with self.assertRaises(ValueError):
+            pm.get_pulse(now, window=60)
+
+    def test_burst_state_updated_on_ingest_per_window(self):
+        pm = PulseModule(window_seconds=30, burst_threshold=15.0, windows=(5, 30), min_ticks=5)
+        for i in range(300):                          # 1 tick/sec for 5 minutes
+            pm.on_tick(BASE + i * 1000, 100.0)
+        t = BASE + 300_000
+        for i in range(100):                          # then 100 ticks in 1s, rising
+            pm.on_tick(t + i * 10, 100.0 + i * 0.01)
+        state = pm.burst_state()
+        self.assertEqual(state, {5: True, 30: False})
+        self.assertEqual(pm.burst_count, 0)           # counted on the primary window only
+
+    def test_reads_have_no_side_effects(self):
+        pm = PulseModule(window_seconds=5, burst_threshold=3.0, min_ticks=3)
+        for i in range(20):
+            pm.on_tick(BASE + i * 50, 100.0 + i * 0.05)
+        self.assertEqual((pm.burst_count, pm.upward_bursts), (1, 1))
+        stale = pm.get_pulse(BASE + 60_000)           # window has emptied since
+        self.assertEqual(stale.tick_count, 0)
+        fresh = pm.get_pulse(BASE + 19 * 50)
+        self.assertEqual(fresh.tick_count, 20)
+        self.assertEqual(pm.burst_count, 1)
+        self.assertEqual(pm._tails, [0, 0, 0])
+
+    def test_ring_wraps_past_capacity(self):
+        pm = PulseModule(window_seconds=120, windows=(5, 120), capacity=64, min_ticks=2)
+        self.assertEqual(len(pm._ts), 64)
+        for i in range(1000):
+            pm.on_tick(BASE + i * 10, 100.0 + i)
+        m = pm.get_pulse(BASE + 9990)
+        self.assertEqual(m.tick_count, 64)            # capped at the ring size
+        self.assertEqual(m.last_tick_time_ms, BASE + 9990)
+        self.assertEqual(pm.get_pulse(BASE + 9990, window=5).tick_count, 64)
+        pm.reset()
+        self.assertEqual(pm.get_pulse(BASE + 9990).tick_count, 0)
+
+    def test_read_cost_independent_of_buffered_ticks(self):
+        def read_time(n):
+            pm = PulseModule(window_seconds=120, capacity=n, min_ticks=2)
+            for i in range(n):
+                pm.on_tick(BASE + i, 100.0)
+            now = BASE + n
+            start = time.perf_counter()
+            for _ in range(2000):
+                pm.get_pulse(now)
+            return time.perf_counter() - start
+
+        small, large = read_time(64), read_time(65_536)
+        self.assertLess(large, small * 5)
+
+
+class PulseEngineTests(unittest.TestCase):
+    def test_symbols_do_not_mix(self):
+        engine = PulseEngine(window_seconds=5, burst_threshold=3.0, min_ticks=3)
+        for i in range(20):
+            engine.on_tick("NSE:NIFTY50-INDEX", BASE + i * 50, 22500.0 + i * 5)
+            if i % 5 == 0:
+                engine.on_tick("NSE:BANKNIFTY-INDEX", BASE + i * 50, 48000.0 - i * 10)
+        nifty = engine.get_pulse("NSE:NIFTY50-INDEX", BASE + 950)
+        bank = engine.get_pulse("NSE:BANKNIFTY-INDEX", BASE + 950)
+        self.assertEqual((nifty.tick_count, nifty.direction_drift), (20, "UP"))
+        self.assertEqual((bank.tick_count, bank.direction_drift), (4, "DOWN"))
+        stats = engine.get_stats()
+        self.assertEqual(stats["NSE:NIFTY50-INDEX"]["upward_bursts"], 1)
+        self.assertEqual(stats["NSE:BANKNIFTY-INDEX"]["burst_count"], 1)
+        self.assertEqual(set(engine.symbols()), {"NSE:NIFTY50-INDEX", "NSE:BANKNIFTY-INDEX"})
+        engine.reset()
+        self.assertEqual(engine.get_pulse("NSE:NIFTY50-INDEX", BASE + 950).tick_count, 0)
+
+    def test_new_symbol_hook_called_once(self):
+        engine = PulseEngine()
+        seen = []
+        engine.on_new_symbol = lambda sym, module: seen.append((sym, module.symbol))
+        engine.on_tick("NSE:NIFTY50-INDEX", BASE, 22500.0)
+        engine.on_tick("NSE:NIFTY50-INDEX", BASE + 10, 22501.0)
+        self.assertIs(engine.get("NSE:NIFTY50-INDEX"), engine.get("NSE:NIFTY50-INDEX"))
+        self.assertEqual(seen, [("NSE:NIFTY50-INDEX", "NSE:NIFTY50-INDEX")])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+"""Parity tests for the streaming tick context in replay_option_exit_validation."""
+
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from replay_option_exit_validation import TickContext
+
+
+def _reference_context(prices):
+    """Windowed pandas rebuild the replay used before TickContext."""
+    s = pd.Series(prices, dtype="float64")
+    if len(s) < 25:
+        return {"adx14": np.nan, "rsi14": np.nan, "cci20": np.nan,
+                "slope_agreement": False, "osc_extreme": False}
+    ema_fast = s.ewm(span=5, adjust=False).mean()
+    ema_slow = s.ewm(span=13, adjust=False).mean()
+    gap = float(ema_fast.iloc[-1] - ema_slow.iloc[-1])
+    slope = float(ema_fast.iloc[-1] - ema_fast.iloc[-4])
+    d = s.diff().fillna(0.0)
+    atr = d.abs().rolling(14).mean().replace(0, np.nan)
+    plus_di = 100.0 * d.clip(lower=0.0).rolling(14).mean() / atr
+    minus_di = 100.0 * (-d.clip(upper=0.0)).rolling(14).mean() / atr
+    dx = 100.0 * (plus_di - minus_di).abs() / (plus_di + minus_di).replace(0, np.nan)
+    diff = s.diff()
+    gain = diff.clip(lower=0).rolling(14).mean()
+    loss = (-diff.clip(upper=0)).rolling(14).mean().replace(0, np.nan)
+    rsi = 100 - (100 / (1 + gain / loss))
+    ma20 = s.rolling(20).mean()
+    md20 = (s - ma20).abs().rolling(20).mean().replace(0, np.nan)
+    cci = (s - ma20) / (0.015 * md20)
+    rsi14, cci20 = float(rsi.iloc[-1]), float(cci.iloc[-1])
+    return {
+        "adx14": float(dx.rolling(14).mean().iloc[-1]),
+        "rsi14": rsi14,
+        "cci20": cci20,
+        "slope_agreement": bool((gap >= 0 and slope > 0) or (gap < 0 and slope < 0)),
+        "osc_extreme": bool(
+            (np.isfinite(rsi14) and (rsi14 < 35.0 or rsi14 > 65.0))
+            or (np.isfinite(cci20) and (cci20 < -120.0 or cci20 > 120.0))
+        ),
+    }
+
+
+class TickContextParityTests(unittest.TestCase):
+    def _assert_parity(self, prices):
+        ctx = TickContext()
+        for i, px in enumerate(prices):
+            ctx.update(px)
+            got = ctx.snapshot()
+            want = _reference_context(prices[max(0, i - 80): i + 1])
+            for key in ("adx14", "rsi14", "cci20"):
+                if np.isnan(want[key]):
+                    self.assertTrue(np.isnan(got[key]), f"{key} at tick {i}")
+                else:
+                    self.assertAlmostEqual(got[key], want[key], places=6, msg=f"{key} at tick {i}")
+            self.assertEqual(got["slope_agreement"], want["slope_agreement"], f"tick {i}")
+            self.assertEqual(got["osc_extreme"], want["osc_extreme"], f"tick {i}")
+
+    def test_random_walk_matches_windowed_pandas(self):
+        rng = np.random.default_rng(11)
+        prices = list(np.round(120 + np.cumsum(rng.normal(0, 0.8, 400)), 2))
+        self._assert_parity(prices)
+
+    def test_flat_stretch_yields_nan_oscillators(self):
+        prices = [100.0] * 60 + [100.5, 101.0, 100.75] + [100.75] * 50
+        self._assert_parity(prices)
+
+    def test_short_history_is_neutral(self):
+        ctx = TickContext()
+        for px in range(20):
+            ctx.update(100.0 + px)
+        snap = ctx.snapshot()
+        self.assertFalse(snap["slope_agreement"])
+        self.assertTrue(np.isnan(snap["adx14"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -45,6 +45,7 @@ def _load_functions(*names: str, extra_ns: dict | None = None):
         "timedelta": timedelta,
         "time_zone": None,
         "logging": logger,
+        "emit_event": lambda *_args, **_kwargs: None,
         "STARTUP_SUPPRESSION_MINUTES": 5,
         "_load_restart_state": lambda _acct: {},
         "_save_restart_state": lambda *_args, **_kwargs: None,
@@ -0,0 +1,186 @@
+"""Tests for sim_exchange — tick-driven matching, latency, slippage, partial fills."""
+
+import os
+import tempfile
+import time
+import unittest
+from datetime import UTC, datetime, timedelta
+from unittest import mock
+
+import pandas as pd
+
+from order_tracker import OrderTracker
+from sim_exchange import (
+    BUY, LIMIT, MARKET, SELL, ST_CANCELLED, ST_FILLED, ST_PENDING, ST_REJECTED, ST_TRANSIT,
+    LatencyModel, PartialFillRule, SimExchange, SimFyersClient, SlippageModel, load_ticks, soak,
+)
+from tickdb import TickDatabase
+
+CE = "NSE:NIFTY2630322000CE"
+PE = "NSE:NIFTY2630322000PE"
+
+
+class _Clock(datetime):
+    """tickdb.datetime stand-in: ``now`` returns ``current`` (UTC-aware)."""
+    current = None
+
+    @classmethod
+    def now(cls, tz=None):
+        return cls.current.astimezone(tz) if tz is not None else cls.current.replace(tzinfo=None)
+
+
+def _ticks_db(base, n=200):
+    """Record one tick per second per symbol through TickDatabase.insert_tick."""
+    db = TickDatabase(base_path=base)
+    start = datetime(2026, 3, 3, 3, 45, tzinfo=UTC)          # 09:15 IST
+    with mock.patch("tickdb.datetime", _Clock):
+        for i in range(n):
+            _Clock.current = start + timedelta(seconds=i)
+            db.insert_tick(CE, 100.0 + i * 0.1, 100.1 + i * 0.1, 100.05 + i * 0.1, i)
+            db.insert_tick(PE, 80.0 - i * 0.05, 80.1 - i * 0.05, 80.05 - i * 0.05, i)
+    db.conn.close()
+
+
+class SimExchangeTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.tmp = tempfile.TemporaryDirectory()
+        _ticks_db(cls.tmp.name)
+        cls.ticks = load_ticks(os.path.join(cls.tmp.name, "ticks_*.db"))
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def _exchange(self, **kw):
+        kw.setdefault("latency", LatencyModel(0.0, 0.0))
+        kw.setdefault("slippage", SlippageModel(ticks=1))
+        ex = SimExchange(self.ticks, **kw)
+        ex.advance(0)                       # first tick → quotes available
+        return ex, SimFyersClient(ex)
+
+    def test_load_ticks(self):
+        self.assertEqual(len(self.ticks), 400)
+        self.assertEqual(set(self.ticks["symbol"]), {CE, PE})
+        self.assertTrue(self.ticks["ts"].is_monotonic_increasing)
+        first = self.ticks.iloc[0]
+        self.assertEqual((first["symbol"], first["ts"]),
+                         (CE, datetime(2026, 3, 3, 3, 45, tzinfo=UTC).timestamp()))
+        self.assertEqual(self.ticks["ts"].iloc[-1] - first["ts"], 199.0)
+
+    def test_market_order_fills_with_slippage(self):
+        ex, client = self._exchange()
+        resp = client.place_order({"symbol": CE, "qty": 65, "side": BUY, "type": MARKET})
+        self.assertEqual(resp["s"], "ok")
+        self.assertEqual(ex.orders[resp["id"]].status, ST_TRANSIT)
+        ex.advance(0)
+        row = client.orderbook(data={"id": resp["id"]})["orderBook"][0]
+        self.assertEqual(row["status"], ST_FILLED)
+        self.assertAlmostEqual(row["tradedPrice"], 100.15)    # ask 100.10 + 1 tick
+
+    def test_limit_rests_until_marketable(self):
+        ex, client = self._exchange()
+        oid = client.place_order({"symbol": CE, "qty": 65, "side": BUY, "type": LIMIT,
+                                  "limitPrice": 99.0})["id"]
+        ex.advance(1)
+        self.assertEqual(ex.orders[oid].status, ST_PENDING)
+        # Price rises — a resting sell at 101 trades when the bid reaches it.
+        sid = client.place_order({"symbol": CE, "qty": 65, "side": SELL, "type": LIMIT,
+                                  "limitPrice": 101.0})["id"]
+        ex.advance(5)
+        self.assertEqual(ex.orders[sid].status, ST_PENDING)
+        ex.advance(10)
+        self.assertEqual(ex.orders[sid].status, ST_FILLED)
+        self.assertAlmostEqual(ex.orders[sid].avg_price, 101.0)
+        self.assertEqual(ex.orders[oid].status, ST_PENDING)
+
+    def test_partial_fills_across_ticks(self):
+        ex, client = self._exchange(fills=PartialFillRule(lot_size=65, max_lots_per_tick=1))
+        oid = client.place_order({"symbol": CE, "qty": 195, "side": BUY, "type": MARKET})["id"]
+        ex.advance(0)
+        self.assertEqual(ex.orders[oid].filled_qty, 65)
+        ex.advance(0.5)                                      # one CE tick
+        self.assertEqual(ex.orders[oid].filled_qty, 65)
+        ex.advance(2)
+        self.assertEqual(ex.orders[oid].status, ST_FILLED)
+        self.assertEqual(ex.stats["partial_fills"], 2)
+
+    def test_rejects(self):
+        ex, client = self._exchange(fills=PartialFillRule(lot_size=65))
+        self.assertEqual(client.place_order({"symbol": CE, "qty": 10, "side": BUY})["s"], "error")
+        self.assertEqual(client.place_order({"symbol": "NSE:BAD", "qty": 65, "side": BUY})["s"], "error")
+        self.assertEqual(client.place_order({"symbol": CE, "qty": 65, "side": BUY, "type": LIMIT,
+                                             "limitPrice": 0})["s"], "error")
+        self.assertEqual(ex.stats["rejected"], 3)
+        ex, client = self._exchange(reject_rate=1.0)
+        resp = client.place_order({"symbol": CE, "qty": 1, "side": BUY})
+        self.assertEqual(ex.orders[resp["id"]].status, ST_REJECTED)
+
+    def test_latency_defers_fill_to_later_tick(self):
+        ex, client = self._exchange(latency=LatencyModel(mean_ms=2500, jitter_ms=0))
+        t0 = ex.now
+        oid = client.place_order({"symbol": CE, "qty": 1, "side": BUY, "type": MARKET})["id"]
+        ex.advance(2)
+        self.assertEqual(ex.orders[oid].status, ST_TRANSIT)
+        ex.advance(1)
+        o = ex.orders[oid]
+        self.assertEqual(o.status, ST_FILLED)
+        # Arrives at t0+2.5s and takes the standing t0+2s ask 100.30 + 1 tick.
+        self.assertAlmostEqual(o.avg_price, 100.35)
+        self.assertAlmostEqual(o.updated_at - t0, 2.5)
+
+    def test_modify_and_cancel(self):
+        ex, client = self._exchange()
+        oid = client.place_order({"symbol": CE, "qty": 65, "side": BUY, "type": LIMIT,
+                                  "limitPrice": 90.0})["id"]
+        cid = client.place_order({"symbol": CE, "qty": 65, "side": BUY, "type": LIMIT,
+                                  "limitPrice": 90.0})["id"]
+        ex.advance(0)
+        self.assertEqual(client.modify_order({"id": oid, "type": 1, "limitPrice": 105.0,
+                                              "qty": 65})["s"], "ok")
+        self.assertEqual(ex.orders[oid].status, ST_FILLED)
+        self.assertAlmostEqual(ex.orders[oid].avg_price, 100.1)
+        self.assertEqual(client.modify_order({"id": oid, "limitPrice": 1.0})["s"], "error")
+        self.assertEqual(client.cancel_order({"id": cid})["s"], "ok")
+        self.assertEqual(ex.orders[cid].status, ST_CANCELLED)
+        ex.advance(100)
+        self.assertEqual(ex.orders[cid].filled_qty, 0)
+
+    def test_positions_pnl(self):
+        ex, client = self._exchange(slippage=SlippageModel(ticks=0))
+        client.place_order({"symbol": CE, "qty": 2, "side": BUY, "type": MARKET})
+        ex.advance(10)                                      # bought at 100.10
+        client.place_order({"symbol": CE, "qty": 1, "side": SELL, "type": MARKET})
+        ex.advance(0)                                       # sold at bid 101.00
+        pos = client.positions()
+        row = pos["netPositions"][0]
+        self.assertEqual(row["netQty"], 1)
+        self.assertAlmostEqual(row["realized_profit"], 0.9)
+        self.assertAlmostEqual(row["unrealized_profit"], 0.95)     # ltp 101.05
+        self.assertAlmostEqual(pos["overall"]["pl_total"], 1.85)
+
+    def test_quotes_and_order_events_feed_tracker(self):
+        ex, client = self._exchange()
+        tracker = OrderTracker()
+        ex.listeners.append(lambda msg: tracker.on_order(msg["orders"]))
+        self.assertEqual(client.quotes({"symbols": CE})["d"][0]["v"]["lp"], 100.05)
+        oid = client.place_order({"symbol": CE, "qty": 65, "side": BUY, "type": LIMIT,
+                                  "limitPrice": 99.0})["id"]
+        ex.advance(0)
+        self.assertEqual([o.id for o in tracker.pending()], [oid])
+        client.modify_order({"id": oid, "limitPrice": 120.0})
+        self.assertEqual(tracker.get(oid).status_name, "FILLED")
+        tracker.shutdown()
+
+    def test_soak_throughput(self):
+        ex = SimExchange(self.ticks, latency=LatencyModel(5, 2))
+        t0 = time.perf_counter()
+        result = soak(ex, 3000)
+        self.assertLess(time.perf_counter() - t0, 5.0)
+        self.assertEqual(result["placed"], 3000)
+        self.assertTrue(ex.feed_done)
+        self.assertGreater(result["filled"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
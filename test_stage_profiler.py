@@ -0,0 +1,56 @@
+"""Tests for stage_profiler — no-op when off, histograms and dumps when on."""
+
+import os
+import tempfile
+import time
+import unittest
+
+import stage_profiler as sp
+
+
+class StageProfilerTests(unittest.TestCase):
+    def setUp(self):
+        self._was_enabled = sp.ENABLED
+        sp.reset()
+
+    def tearDown(self):
+        if not self._was_enabled:
+            sp.disable()
+        sp.reset()
+
+    def test_disabled_stage_is_shared_noop(self):
+        sp.disable()
+        self.assertIs(sp.stage("a"), sp.stage("b"))
+        with sp.stage("a"):
+            pass
+        self.assertEqual(sp.summary(), [])
+
+    def test_summary_counts_and_percentiles(self):
+        sp.enable()
+        for _ in range(20):
+            with sp.stage("fast"):
+                pass
+        with sp.stage("slow"):
+            time.sleep(0.01)
+        rows = {r["stage"]: r for r in sp.summary()}
+        self.assertEqual(rows["fast"]["calls"], 20)
+        self.assertGreaterEqual(rows["slow"]["p99_ms"], 9.0)
+        self.assertEqual(sp.summary()[0]["stage"], "slow")
+        self.assertIn("fast", sp.format_summary())
+
+    def test_nested_stages_fold_self_time(self):
+        sp.enable()
+        with sp.stage("bar"):
+            with sp.stage("signal"):
+                time.sleep(0.005)
+        with tempfile.TemporaryDirectory() as tmp:
+            written = sp.dump(os.path.join(tmp, "prof"))
+            with open(written[0], encoding="utf-8") as f:
+                folded = dict(line.rsplit(" ", 1) for line in f.read().splitlines())
+        self.assertIn("bar;signal", folded)
+        self.assertGreaterEqual(int(folded["bar;signal"]), 4000)
+        self.assertLess(int(folded["bar"]), int(folded["bar;signal"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+"""Tests for state_journal — append, torn-write recovery and compaction."""
+
+import pickle
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+from state_journal import StateJournal, import_legacy_ledger
+
+
+def _snap(i):
+    return {"timestamp": i, "state": {"trade_count": i, "filled_df": pd.DataFrame({"p": [i]})}}
+
+
+class StateJournalTests(unittest.TestCase):
+    def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self.dir = Path(self._tmp.name)
+        self.path = self.dir / "data-2026-03-03-PAPER.journal"
+
+    def tearDown(self):
+        self._tmp.cleanup()
+
+    def test_append_and_read_back(self):
+        j = StateJournal(self.path)
+        self.assertIsNone(j.last())
+        self.assertEqual(list(j.snapshots()), [])
+        for i in range(5):
+            j.append(_snap(i))
+        self.assertEqual(j.last()["state"]["trade_count"], 4)
+        self.assertEqual([s["timestamp"] for s in j.snapshots()], [0, 1, 2, 3, 4])
+
+    def test_appends_do_not_rewrite_earlier_records(self):
+        j = StateJournal(self.path)
+        j.append(_snap(0))
+        head = self.path.read_bytes()
+        j.append(_snap(1))
+        self.assertTrue(self.path.read_bytes().startswith(head))
+
+    def test_torn_tail_is_ignored_and_repaired(self):
+        j = StateJournal(self.path)
+        for i in range(3):
+            j.append(_snap(i))
+        data = self.path.read_bytes()
+        self.path.write_bytes(data[:-7])          # crash mid-write of record 2
+        reader = StateJournal(self.path)
+        self.assertEqual(reader.last()["timestamp"], 1)
+        self.assertEqual(len(reader), 2)
+
+        reader.append(_snap(9))                   # next process appends
+        self.assertEqual([s["timestamp"] for s in StateJournal(self.path).snapshots()], [0, 1, 9])
+
+    def test_corrupt_payload_falls_back_to_previous_record(self):
+        j = StateJournal(self.path)
+        j.append(_snap(0))
+        j.append(_snap(1))
+        data = bytearray(self.path.read_bytes())
+        data[-3] ^= 0xFF                          # flip a byte in the last payload
+        self.path.write_bytes(bytes(data))
+        self.assertEqual(StateJournal(self.path).last()["timestamp"], 0)
+
+    def test_periodic_compaction_keeps_every_snapshot(self):
+        j = StateJournal(self.path, compact_every=4)
+        for i in range(10):
+            j.append(_snap(i))
+        self.assertEqual([s["timestamp"] for s in j.snapshots()], list(range(10)))
+        self.assertEqual(j.last()["timestamp"], 9)
+        self.assertFalse(self.path.with_name(self.path.name + ".tmp").exists())
+        self.assertEqual(len(j._index()[0]), 3)   # batch(8) + 2 snapshots
+
+    def test_import_legacy_ledger(self):
+        legacy = self.dir / "data-2026-03-03-PAPER.pickle"
+        with legacy.open("wb") as fh:
+            pickle.dump([_snap(0), _snap(1)], fh)
+        j = StateJournal(self.path)
+        self.assertEqual(import_legacy_ledger(j, legacy), 2)
+        self.assertEqual(import_legacy_ledger(j, legacy), 0)
+        j.append(_snap(2))
+        self.assertEqual([s["timestamp"] for s in j.snapshots()], [0, 1, 2])
+
+
+if __name__ == "__main__":
+    unittest.main()
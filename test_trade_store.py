@@ -0,0 +1,134 @@
+"""Tests for trade_store — partitioned appends, pruned scans and report helpers."""
+
+import os
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+import pandas as pd
+
+import trade_store
+from dashboard import store_history_report
+from position_manager import TradeLogger
+from trade_store import TradeStore, get_trade_store
+
+SYM = "NSE:NIFTY50-INDEX"
+
+
+def _trade(entry_time, pnl, side="CALL", reason="TG_HIT"):
+    return {"side": side, "entry_time": entry_time, "exit_time": entry_time,
+            "pnl_points": pnl, "pnl_value": pnl * 65, "exit_reason": reason,
+            "bars_held": 4, "entry_premium": 150.0, "peak_premium": 160.0}
+
+
+class TradeStoreTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = TradeStore(self.tmp.name)
+
+    def test_append_partitions_by_time_column(self):
+        parts = self.store.append("trades", [
+            _trade("2026-03-05 09:45:00", 10.0),
+            _trade("2026-03-06 10:00:00", -5.0),
+            _trade("2026-03-06 11:00:00", 3.0),
+        ], "REPLAY", symbol=SYM)
+        self.assertEqual(len(parts), 2)
+        self.assertEqual(self.store.partitions("trades"),
+                         [("2026-03-05", "REPLAY"), ("2026-03-06", "REPLAY")])
+        self.assertTrue(all(p.suffix in (".parquet", ".pkl") for p in parts))
+        self.assertFalse(list(Path(self.tmp.name).rglob("*.tmp")))
+        with self.assertRaises(ValueError):
+            self.store.append("blockers", [{"blocker": "WEAK_ADX", "count": 3}], "REPLAY")
+        with self.assertRaises(ValueError):
+            self.store.append("orders", [{"x": 1}], "REPLAY", "2026-03-05")
+
+    def test_scan_prunes_by_date_and_mode(self):
+        self.store.append("trades", [_trade("2026-03-05 09:45:00", 10.0)], "REPLAY", symbol=SYM)
+        self.store.append("trades", [_trade("2026-03-05 09:45:00", 7.0)], "PAPER", symbol=SYM)
+        self.store.append("trades", [_trade("2026-04-01 09:45:00", 1.0)], "REPLAY", symbol="NSE:BANKNIFTY-INDEX")
+        opened = []
+        real = TradeStore._read_part
+        with mock.patch.object(TradeStore, "_read_part",
+                               side_effect=lambda p, c=None: opened.append(p) or real(p, c)):
+            df = self.store.scan("trades", start="2026-03-01", end="2026-03-31", modes="REPLAY")
+        self.assertEqual(len(opened), 1)
+        self.assertEqual(df["pnl_points"].tolist(), [10.0])
+        self.assertEqual((df["date"][0], df["mode"][0], df["symbol"][0]), ("2026-03-05", "REPLAY", SYM))
+        only = self.store.scan("trades", columns=["pnl_points"], filters={"symbol": "NSE:BANKNIFTY-INDEX"})
+        self.assertEqual(list(only.columns), ["pnl_points", "date", "mode"])
+        self.assertEqual(only["date"].tolist(), ["2026-04-01"])
+        self.assertTrue(self.store.scan("signals").empty)
+
+    def test_summary_aggregate_and_compact(self):
+        for day, pnls in (("2026-03-05", [10.0, -4.0]), ("2026-03-06", [2.0]), ("2026-04-02", [-1.0])):
+            for pnl in pnls:
+                self.store.append("trades", [_trade(f"{day} 10:00:00", pnl)], "REPLAY", symbol=SYM)
+        daily = self.store.trade_summary()
+        self.assertEqual(daily["trades"].tolist(), [2, 1, 1])
+        self.assertEqual(daily["win_rate_pct"].tolist(), [50.0, 100.0, 0.0])
+        monthly = self.store.trade_summary(by="month")
+        self.assertEqual(monthly["month"].tolist(), ["2026-03", "2026-04"])
+        self.assertEqual(monthly["pnl_points"].tolist(), [8.0, -1.0])
+        by_reason = self.store.aggregate("trades", by="exit_reason", agg={"pnl_value": "sum"})
+        self.assertEqual(by_reason["pnl_value"].tolist(), [7.0 * 65])
+        part_dir = Path(self.tmp.name) / "trades" / "date=2026-03-05" / "mode=REPLAY"
+        self.assertEqual(len(list(part_dir.glob("part-*"))), 2)
+        self.store.compact("trades", "2026-03-05", "REPLAY")
+        self.assertEqual(len(list(part_dir.glob("part-*"))), 1)
+        self.assertEqual(self.store.trade_summary()["trades"].tolist(), [2, 1, 1])
+
+    def test_record_session_and_trade_logger(self):
+        rows = self.store.record_session(
+            "REPLAY", SYM,
+            trades=[_trade("2026-03-05 09:45:00", 10.0)],
+            signals=[{"bar": 10, "time": "2026-03-05 09:42:00", "side": "CALL", "score": 72,
+                      "reason": "PIVOT", "pivot": {"R1": 22500.0}}],
+            blockers={"ST_CONFLICT": 4, "WEAK_ADX": 2},
+        )
+        self.assertEqual(rows, 4)
+        blockers = self.store.scan("blockers")
+        self.assertEqual(dict(zip(blockers["blocker"], blockers["count"])), {"ST_CONFLICT": 4, "WEAK_ADX": 2})
+        self.assertEqual(blockers["date"].unique().tolist(), ["2026-03-05"])
+        tl = TradeLogger(SYM)
+        tl.append(_trade("2026-03-06 09:45:00", -3.0))
+        self.assertEqual(tl.to_store("PAPER", "2026-03-06", store=self.store), 1)
+        self.assertEqual(self.store.partitions("trades")[-1], ("2026-03-06", "PAPER"))
+
+    def test_record_session_replaces_earlier_run(self):
+        other = "NSE:BANKNIFTY-INDEX"
+        self.store.record_session("REPLAY", other, trades=[_trade("2026-03-05 10:00:00", 1.0)],
+                                  date="2026-03-05")
+        for pnls in ([10.0, -4.0], [10.0, -4.0], [2.0]):     # same day replayed three times
+            self.store.record_session("REPLAY", SYM,
+                                      trades=[_trade("2026-03-05 10:00:00", p) for p in pnls],
+                                      blockers={"ST_CONFLICT": 3}, date="2026-03-05")
+        trades = self.store.scan("trades")
+        self.assertEqual(sorted(zip(trades["symbol"], trades["pnl_points"])), [(other, 1.0), (SYM, 2.0)])
+        self.assertEqual(self.store.scan("blockers")["count"].tolist(), [3])
+        self.store.record_session("REPLAY", SYM, blockers={"ST_CONFLICT": 1}, date="2026-03-05")
+        self.assertEqual(self.store.scan("trades", filters={"symbol": SYM}).shape[0], 0)
+
+    def test_process_store_follows_env(self):
+        self.addCleanup(setattr, trade_store, "_STORE", None)
+        with mock.patch.dict(os.environ, {"TRADE_STORE_DIR": ""}):
+            self.assertIsNone(get_trade_store())
+        with mock.patch.dict(os.environ, {"TRADE_STORE_DIR": self.tmp.name}):
+            self.assertEqual(get_trade_store().root, Path(self.tmp.name))
+
+    def test_dashboard_history_report(self):
+        for day, pnl in (("2026-03-05", 10.0), ("2026-03-06", -4.0)):
+            self.store.record_session("REPLAY", SYM, trades=[_trade(f"{day} 10:00:00", pnl)],
+                                      blockers={"ST_CONFLICT": 3}, date=day)
+        out = os.path.join(self.tmp.name, "reports")
+        result = store_history_report(self.tmp.name, start="2026-03-01", by="month", output_dir=out)
+        self.assertEqual(result["trades"], 2)
+        self.assertEqual(result["summary"]["pnl_points"].tolist(), [6.0])
+        self.assertEqual(int(result["blockers"]["ST_CONFLICT"]), 6)
+        self.assertTrue(Path(result["csv"]).exists())
+        self.assertEqual(pd.read_csv(result["csv"])["trades"].tolist(), [2])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+"""Tests for walk_forward — folds, per-fold selection, results store and cache."""
+
+import logging
+import os
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+import walk_forward
+from walk_forward import day_metrics_from_pnl, make_folds, run_walk_forward
+
+_CALLS = []
+
+
+def _fake_day(params, trade_date, db_path, symbol):
+    """ADX gate 16 wins in early March, 24 wins afterwards."""
+    _CALLS.append((params["TREND_ENTRY_ADX_MIN"], trade_date))
+    good = 16.0 if trade_date < "2026-03-09" else 24.0
+    edge = 5.0 if params["TREND_ENTRY_ADX_MIN"] == good else -2.0
+    return day_metrics_from_pnl(np.array([edge, edge, -1.0]))
+
+
+class MakeFoldsTests(unittest.TestCase):
+    def test_rolling_windows_tile_oos(self):
+        days = [f"d{i:02d}" for i in range(12)]
+        folds = make_folds(days, is_days=5, oos_days=3)
+        self.assertEqual(len(folds), 2)
+        self.assertEqual(folds[0].oos_days, ("d05", "d06", "d07"))
+        self.assertEqual(folds[1].is_days[0], "d03")
+        self.assertEqual(folds[1].oos_days, ("d08", "d09", "d10"))
+
+    def test_too_few_days_gives_no_folds(self):
+        self.assertEqual(make_folds(["a", "b"], 2, 1), [])
+
+
+class RunWalkForwardTests(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.CRITICAL)
+        self.tmp = tempfile.TemporaryDirectory()
+        for day in pd.bdate_range("2026-03-02", periods=10):
+            open(os.path.join(self.tmp.name, f"ticks_{day.date()}.db"), "w").close()
+        self.store = os.path.join(self.tmp.name, "wf.db")
+        _CALLS.clear()
+
+    def tearDown(self):
+        self.tmp.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def _run(self, run_id):
+        return run_walk_forward(
+            os.path.join(self.tmp.name, "ticks_*.db"), self.store,
+            space={"TREND_ENTRY_ADX_MIN": [16.0, 20.0, 24.0]},
+            is_days=4, oos_days=2, min_trades=1, workers=1,
+            run_id=run_id, evaluate_day=_fake_day,
+        )
+
+    def test_each_fold_picks_in_sample_winner(self):
+        res = self._run("r1")
+        self.assertEqual(len(res), 3)
+        chosen = [eval(p)["TREND_ENTRY_ADX_MIN"] for p in res["params"]]
+        # IS windows: 03-02..05 → 16; 03-04..09 → 16 (3 of 4 early); 03-06..11 → 24
+        self.assertEqual(chosen, [16.0, 16.0, 24.0])
+        self.assertEqual(res.loc[0, "oos_trades"], 6)
+        with sqlite3.connect(self.store) as con:
+            self.assertEqual(con.execute("SELECT COUNT(*) FROM wf_folds").fetchone()[0], 3)
+
+    def test_second_run_replays_nothing(self):
+        self._run("r1")
+        first = len(_CALLS)
+        # 8 distinct IS days x 3 candidates + the last fold's 2 unseen OOS days
+        self.assertEqual(first, 26)
+        self._run("r2")
+        self.assertEqual(len(_CALLS), first)
+
+    def test_code_version_change_replays_again(self):
+        self._run("r1")
+        first = len(_CALLS)
+        with mock.patch.object(walk_forward, "WF_CACHE_VERSION", walk_forward.WF_CACHE_VERSION + 1):
+            self._run("r2")
+        self.assertEqual(len(_CALLS), 2 * first)
+
+    def test_replay_argv_is_restored(self):
+        argv = list(walk_forward.sys.argv)
+        with walk_forward._offline_argv("/data/ticks.db"):
+            self.assertEqual(walk_forward.sys.argv[1:], ["--db", "/data/ticks.db"])
+        self.assertEqual(walk_forward.sys.argv, argv)
+
+
+if __name__ == "__main__":
+    unittest.main()
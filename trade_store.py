@@ -0,0 +1,375 @@
+"""trade_store.py — partitioned columnar store for trades, signals and blockers.
+
+Replays and sessions used to leave one ``trades_<sym>_<date>.csv`` /
+``signals_<sym>_<date>.csv`` pair per run, scattered across output folders,
+and multi-month reports re-parsed thousands of them.  Every run now also
+appends its records here, partitioned by table, trading date and mode:
+
+    trade_store/
+      trades/date=2026-03-07/mode=REPLAY/part-1772855100123-4242-0001.parquet
+      signals/date=2026-03-07/mode=REPLAY/...
+      blockers/date=2026-03-07/mode=REPLAY/...
+
+  * ``append`` writes one immutable part file per call (no read-modify-write,
+    so parallel replay workers never contend); ``compact`` merges a
+    partition's parts when they pile up
+  * ``record_session`` replaces the session's symbol in every partition it
+    touches, so re-running a replay day overwrites its rows instead of
+    counting them twice
+  * ``scan`` prunes partitions from the directory names alone — a date /
+    mode filter never opens files outside the range — then concatenates the
+    surviving parts, with ``date`` and ``mode`` restored as columns
+  * ``aggregate`` / ``trade_summary`` are the grouping helpers the dashboard
+    and replay analyzer build their reports on
+
+Parts are parquet when pyarrow or fastparquet is installed; otherwise they
+are pickled DataFrames (still columnar, read back without parsing).  A
+partition may hold both kinds; readers accept either.
+
+Environment:
+  TRADE_STORE_DIR=<dir>   store root for ``get_trade_store`` (default
+                          ``trade_store``; empty or ``0`` disables it)
+
+Log tags
+--------
+[TRADE STORE]  append / compact / replaced rows / unreadable part
+"""
+
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+import pandas as pd
+
+TABLES = ("trades", "signals", "blockers")
+
+# Column holding each row's timestamp, used to partition multi-day appends.
+TIME_COLUMNS = {"trades": "entry_time", "signals": "time", "blockers": None}
+
+PARQUET = ".parquet"
+PICKLE = ".pkl"
+
+
+def _parquet_available() -> bool:
+    for module in ("pyarrow", "fastparquet"):
+        try:
+            __import__(module)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+_HAS_PARQUET = _parquet_available()
+_SEQ = itertools.count(1)
+
+
+def _as_frame(records: Union[pd.DataFrame, Iterable[dict]]) -> pd.DataFrame:
+    return records.copy() if isinstance(records, pd.DataFrame) else pd.DataFrame(list(records))
+
+
+def _parquet_safe(df: pd.DataFrame) -> pd.DataFrame:
+    """Stringify object columns holding containers (parquet needs scalars)."""
+    for col in df.columns:
+        if df[col].dtype == object and df[col].map(lambda v: isinstance(v, (dict, list, tuple, set))).any():
+            df[col] = df[col].map(lambda v: v if v is None else str(v))
+    return df
+
+
+class TradeStore:
+    """Date/mode-partitioned tables of immutable part files under ``root``."""
+
+    def __init__(self, root: Union[str, Path], fmt: Optional[str] = None) -> None:
+        self.root = Path(root)
+        if fmt is None:
+            fmt = PARQUET if _HAS_PARQUET else PICKLE
+        if fmt not in (PARQUET, PICKLE):
+            raise ValueError(f"unknown part format {fmt!r}")
+        self.fmt = fmt
+
+    # ── layout ────────────────────────────────────────────────────────────────
+
+    def _partition_dir(self, table: str, date: str, mode: str) -> Path:
+        return self.root / table / f"date={date}" / f"mode={mode}"
+
+    @staticmethod
+    def _check_table(table: str) -> None:
+        if table not in TABLES:
+            raise ValueError(f"unknown table {table!r}; expected one of {TABLES}")
+
+    def partitions(self, table: str) -> List[Tuple[str, str]]:
+        """Sorted (date, mode) pairs present for ``table``."""
+        self._check_table(table)
+        found = []
+        base = self.root / table
+        if not base.is_dir():
+            return found
+        for date_dir in base.glob("date=*"):
+            for mode_dir in date_dir.glob("mode=*"):
+                found.append((date_dir.name[5:], mode_dir.name[5:]))
+        return sorted(found)
+
+    def _parts(self, part_dir: Path) -> List[Path]:
+        return sorted(p for p in part_dir.glob("part-*") if p.suffix in (PARQUET, PICKLE))
+
+    # ── writes ────────────────────────────────────────────────────────────────
+
+    def append(
+        self,
+        table: str,
+        records: Union[pd.DataFrame, Iterable[dict]],
+        mode: str,
+        date: Optional[str] = None,
+        **columns,
+    ) -> List[Path]:
+        """Append rows to ``table``; returns the part files written.
+
+        ``date`` ('YYYY-MM-DD') puts every row in one partition.  Without it
+        the rows are split by the date of the table's time column (see
+        TIME_COLUMNS), so a multi-day replay lands in per-day partitions.
+        Extra keyword arguments become constant columns (e.g. symbol=...).
+        """
+        self._check_table(table)
+        df = _as_frame(records)
+        if df.empty:
+            return []
+        for name, value in columns.items():
+            df[name] = value
+        df = df.drop(columns=[c for c in ("date", "mode") if c in df.columns])
+        if date is not None:
+            groups = [(str(date)[:10], df)]
+        else:
+            time_col = TIME_COLUMNS.get(table)
+            if time_col is None or time_col not in df.columns:
+                raise ValueError(f"{table}: pass date= (no {time_col!r} column to partition on)")
+            days = pd.to_datetime(df[time_col].astype(str).str[:19], errors="coerce").dt.strftime("%Y-%m-%d")
+            groups = [(day, part) for day, part in df.groupby(days.fillna("unknown"), sort=True)]
+        return [self._write_part(table, day, mode, part.reset_index(drop=True)) for day, part in groups]
+
+    def _write_part(self, table: str, date: str, mode: str, df: pd.DataFrame) -> Path:
+        part_dir = self._partition_dir(table, date, mode)
+        part_dir.mkdir(parents=True, exist_ok=True)
+        name = f"part-{int(time.time() * 1000)}-{os.getpid()}-{next(_SEQ):04d}"
+        final = part_dir / (name + self.fmt)
+        tmp = part_dir / (name + ".tmp")
+        if self.fmt == PARQUET:
+            _parquet_safe(df).to_parquet(tmp, index=False)
+        else:
+            df.to_pickle(tmp)
+        os.replace(tmp, final)            # readers never see a half-written part
+        logging.debug(f"[TRADE STORE] {table} date={date} mode={mode} rows={len(df)} -> {final.name}")
+        return final
+
+    def compact(self, table: str, date: str, mode: str) -> Optional[Path]:
+        """Merge a partition's parts into one; returns the merged part."""
+        part_dir = self._partition_dir(table, date, mode)
+        parts = self._parts(part_dir)
+        if len(parts) < 2:
+            return parts[0] if parts else None
+        read = [(p, self._read_part(p)) for p in parts]
+        read = [(p, f) for p, f in read if f is not None]      # keep unreadable parts on disk
+        if not read:
+            return None
+        merged = self._write_part(table, date, mode, pd.concat([f for _, f in read], ignore_index=True))
+        for p, _ in read:
+            p.unlink()
+        logging.info(f"[TRADE STORE] compacted {table} date={date} mode={mode} parts={len(read)}")
+        return merged
+
+    def _drop_symbol(self, table: str, date: str, mode: str, symbol: str) -> int:
+        """Remove ``symbol``'s rows from one partition; returns rows removed."""
+        removed = 0
+        for path in self._parts(self._partition_dir(table, date, mode)):
+            df = self._read_part(path)
+            if df is None or "symbol" not in df.columns:
+                continue
+            hit = df["symbol"] == symbol
+            if not hit.any():
+                continue
+            if not hit.all():
+                self._write_part(table, date, mode, df[~hit].reset_index(drop=True))
+            path.unlink()
+            removed += int(hit.sum())
+        return removed
+
+    # ── reads ─────────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _read_part(path: Path, columns: Optional[Sequence[str]] = None) -> Optional[pd.DataFrame]:
+        try:
+            if path.suffix == PARQUET:
+                try:
+                    return pd.read_parquet(path, columns=list(columns) if columns else None)
+                except Exception:
+                    if not columns:
+                        raise
+                    df = pd.read_parquet(path)    # part predates a requested column
+            else:
+                df = pd.read_pickle(path)
+        except Exception as exc:
+            logging.warning(f"[TRADE STORE] unreadable part {path}: {exc}")
+            return None
+        if columns:
+            df = df[[c for c in columns if c in df.columns]]
+        return df
+
+    def scan(
+        self,
+        table: str,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        modes: Optional[Sequence[str]] = None,
+        columns: Optional[Sequence[str]] = None,
+        filters: Optional[Dict[str, object]] = None,
+    ) -> pd.DataFrame:
+        """Rows of ``table`` for dates in [start, end] and the given modes.
+
+        ``filters`` maps column -> value (or list of values) for equality
+        filtering after the partition pruning.  ``date`` and ``mode`` are
+        always present in the result.
+        """
+        wanted_modes = {modes} if isinstance(modes, str) else (set(modes) if modes else None)
+        if columns:
+            columns = list(columns) + [c for c in ("date", "mode") if c not in columns]
+        frames = []
+        for date, mode in self.partitions(table):
+            if (start and date < start) or (end and date > end):
+                continue
+            if wanted_modes is not None and mode not in wanted_modes:
+                continue
+            cols = None
+            if columns:
+                cols = [c for c in columns if c not in ("date", "mode")]
+                cols += [c for c in (filters or {}) if c not in cols]
+            for path in self._parts(self._partition_dir(table, date, mode)):
+                df = self._read_part(path, cols)
+                if df is None or df.empty:
+                    continue
+                df["date"] = date
+                df["mode"] = mode
+                frames.append(df)
+        if not frames:
+            return pd.DataFrame(columns=list(columns) if columns else ["date", "mode"])
+        out = pd.concat(frames, ignore_index=True)
+        for col, value in (filters or {}).items():
+            if col not in out.columns:
+                return out.iloc[0:0]
+            if isinstance(value, (list, tuple, set, frozenset)):
+                out = out[out[col].isin(value)]
+            else:
+                out = out[out[col] == value]
+        if columns:
+            out = out[[c for c in columns if c in out.columns]]
+        return out.reset_index(drop=True)
+
+    def aggregate(
+        self,
+        table: str,
+        by: Union[str, Sequence[str]],
+        agg: Dict[str, Union[str, Callable]],
+        **scan_kwargs,
+    ) -> pd.DataFrame:
+        """``scan`` then ``groupby(by).agg(agg)`` in one pass."""
+        by = [by] if isinstance(by, str) else list(by)
+        needed = list(dict.fromkeys(by + list(agg)))
+        df = self.scan(table, columns=needed, **scan_kwargs)
+        if df.empty:
+            return pd.DataFrame(columns=by + list(agg))
+        return df.groupby(by, sort=True).agg(agg).reset_index()
+
+    def trade_summary(self, by: Union[str, Sequence[str]] = "date", **scan_kwargs) -> pd.DataFrame:
+        """Trades, wins, win rate and P&L per group (default: per day)."""
+        by = [by] if isinstance(by, str) else list(by)
+        cols = list(dict.fromkeys([c for c in by if c != "month"] + ["pnl_points", "pnl_value"]))
+        df = self.scan("trades", columns=cols, **scan_kwargs)
+        if df.empty:
+            return pd.DataFrame(columns=by + ["trades", "wins", "win_rate_pct", "pnl_points", "pnl_value"])
+        if "month" in by and "month" not in df.columns:
+            df["month"] = df["date"].str[:7]
+        df["win"] = df["pnl_points"] > 0
+        out = df.groupby(by, sort=True).agg(
+            trades=("pnl_points", "size"),
+            wins=("win", "sum"),
+            pnl_points=("pnl_points", "sum"),
+            pnl_value=("pnl_value", "sum"),
+        ).reset_index()
+        out["win_rate_pct"] = (out["wins"] / out["trades"] * 100).round(1)
+        out["pnl_points"] = out["pnl_points"].round(2)
+        out["pnl_value"] = out["pnl_value"].round(2)
+        return out[by + ["trades", "wins", "win_rate_pct", "pnl_points", "pnl_value"]]
+
+    # ── session helpers ───────────────────────────────────────────────────────
+
+    def record_session(
+        self,
+        mode: str,
+        symbol: str,
+        trades: Iterable[dict] = (),
+        signals: Iterable[dict] = (),
+        blockers: Optional[Dict[str, int]] = None,
+        date: Optional[str] = None,
+    ) -> int:
+        """Write one run's trades, signals and blocker counts; returns rows written.
+
+        The run replaces whatever ``symbol`` already had in the same
+        (table, date, mode) partitions, so a replay repeated for the same day
+        is counted once.  Blocker counts are per run, so they need ``date``
+        (or the date of the last trade / signal for a multi-day run).
+        """
+        trades, signals = list(trades), list(signals)
+        day = str(date)[:10] if date is not None else None
+        blocker_day = day
+        if blockers and blocker_day is None:
+            stamps = [str(r.get("exit_time") or r.get("time") or "") for r in trades + signals]
+            blocker_day = max((s[:10] for s in stamps if s), default=None)
+        if day is not None:
+            days = {day}
+        else:
+            days = {str(r.get(TIME_COLUMNS[table]) or "")[:10]
+                    for table, recs in (("trades", trades), ("signals", signals)) for r in recs}
+            days.add(blocker_day)
+        days = sorted(d for d in days if d)
+        replaced = sum(self._drop_symbol(table, d, mode, symbol) for table in TABLES for d in days)
+
+        rows = 0
+        if trades:
+            self.append("trades", trades, mode, date, symbol=symbol)
+            rows += len(trades)
+        if signals:
+            self.append("signals", signals, mode, date, symbol=symbol)
+            rows += len(signals)
+        if blockers and blocker_day is not None:
+            frame = pd.DataFrame({"blocker": list(blockers), "count": list(blockers.values())})
+            self.append("blockers", frame, mode, blocker_day, symbol=symbol)
+            rows += len(frame)
+        logging.info(
+            f"[TRADE STORE] {mode} {symbol} date={date or 'multi'} rows={rows} "
+            f"replaced={replaced} root={self.root}"
+        )
+        return rows
+
+
+_STORE: Optional[TradeStore] = None
+
+
+def get_trade_store() -> Optional[TradeStore]:
+    """Process-wide store at TRADE_STORE_DIR, or None when disabled."""
+    global _STORE
+    root = os.getenv("TRADE_STORE_DIR", "trade_store")
+    if root in ("", "0"):
+        return None
+    if _STORE is None or _STORE.root != Path(root):
+        _STORE = TradeStore(root)
+    return _STORE
+
+
+__all__ = [
+    "TABLES",
+    "TradeStore",
+    "get_trade_store",
+]
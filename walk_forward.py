@@ -0,0 +1,513 @@
+"""Walk-forward optimisation of entry parameters over the replay archive.
+
+Rolling folds over the ticks_YYYY-MM-DD.db archive: each fold optimises
+entry parameters on an in-sample (IS) window of trading days, then replays
+the winning set on the following out-of-sample (OOS) window.  The chosen
+parameters and OOS metrics of every fold go to a SQLite results store.
+
+The unit of work is one (parameter set, trading day) replay through
+run_offline_replay.  Overlapping IS windows share most of their days, so
+instead of optimising fold by fold the harness pools the distinct
+(params, day) replays of ALL folds into one run_sweep fan-out, then ranks
+candidates per fold from the per-day metrics.  Per-day metrics are cached
+in the store keyed by parameter set and code version (``cache_version``), so
+a nightly run over the full archive only replays the days added since the
+previous run — and everything again once the replay code has changed.
+
+Tunable parameters (see apply_entry_params):
+  TREND_ENTRY_ADX_MIN, SLOPE_ADX_GATE, TIME_SLOPE_ADX_GATE
+                        execution module globals (imported from config)
+  THRESHOLD_<REGIME>    entry_logic.THRESHOLDS[<REGIME>] score threshold
+
+Usage:
+    python walk_forward.py --db "C:\\SQLite\\ticks\\ticks_*.db" \\
+        --is-days 10 --oos-days 5 --method lhs --n 24 --workers 8
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import glob
+import hashlib
+import importlib.util
+import inspect
+import json
+import logging
+import os
+import re
+import sqlite3
+import sys
+import tempfile
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from param_sweep import ParamRange, _max_drawdown, run_sweep, sample_params
+
+
+WF_PARAM_SPACE: Dict[str, Any] = {
+    "TREND_ENTRY_ADX_MIN": ParamRange(14.0, 26.0, steps=4),
+    "THRESHOLD_NORMAL": ParamRange(40, 60, integer=True, steps=5),
+    "THRESHOLD_HIGH": ParamRange(50, 70, integer=True, steps=5),
+}
+
+_EXECUTION_GLOBALS = ("TREND_ENTRY_ADX_MIN", "SLOPE_ADX_GATE", "TIME_SLOPE_ADX_GATE")
+
+OBJECTIVES = ("total_pnl_pts", "profit_factor", "avg_pnl_pts")
+
+# Bump when replay results change in a way the source hashes below miss
+# (e.g. a data or dependency change).
+WF_CACHE_VERSION = 1
+# Modules whose source decides a replay's trades; hashed into cache_version.
+_REPLAY_MODULES = ("execution", "entry_logic", "signals", "position_manager", "indicators", "config")
+
+_DAY_RE = re.compile(r"ticks_(\d{4}-\d{2}-\d{2})\.db$")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Folds
+# ─────────────────────────────────────────────────────────────────────────────
+
+@dataclass(frozen=True)
+class Fold:
+    """One walk-forward step: optimise on ``is_days``, evaluate on ``oos_days``."""
+
+    index: int
+    is_days: tuple
+    oos_days: tuple
+
+
+def discover_days(db_glob: str) -> Dict[str, str]:
+    """Map trade date → DB path for every ticks_YYYY-MM-DD.db matching ``db_glob``."""
+    days = {}
+    for path in sorted(glob.glob(db_glob)):
+        m = _DAY_RE.search(os.path.basename(path))
+        if m:
+            days[m.group(1)] = path
+    return dict(sorted(days.items()))
+
+
+def make_folds(
+    days: Sequence[str],
+    is_days: int,
+    oos_days: int,
+    step: Optional[int] = None,
+) -> List[Fold]:
+    """Rolling IS/OOS windows over ``days`` (sorted), advancing ``step`` days.
+
+    ``step`` defaults to ``oos_days`` so OOS windows tile without overlap.
+    Trailing days that cannot fill a whole OOS window are left out.
+    """
+    if is_days < 1 or oos_days < 1:
+        raise ValueError("is_days and oos_days must be >= 1")
+    step = step or oos_days
+    days = list(days)
+    folds = []
+    start = 0
+    while start + is_days + oos_days <= len(days):
+        folds.append(Fold(
+            index=len(folds),
+            is_days=tuple(days[start:start + is_days]),
+            oos_days=tuple(days[start + is_days:start + is_days + oos_days]),
+        ))
+        start += step
+    return folds
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Replay of one (params, day)
+# ─────────────────────────────────────────────────────────────────────────────
+
+def param_key(params: Dict[str, Any]) -> str:
+    """Stable cache key for a parameter set."""
+    return json.dumps(params, sort_keys=True, default=float)
+
+
+@contextlib.contextmanager
+def apply_entry_params(params: Dict[str, Any]) -> Iterator[None]:
+    """Temporarily override entry parameters read by run_offline_replay."""
+    import execution
+    import entry_logic
+
+    saved_globals = {}
+    saved_thresholds = dict(entry_logic.THRESHOLDS)
+    try:
+        for name, value in params.items():
+            if name in _EXECUTION_GLOBALS:
+                saved_globals[name] = getattr(execution, name)
+                setattr(execution, name, float(value))
+            elif name.startswith("THRESHOLD_"):
+                entry_logic.THRESHOLDS[name[len("THRESHOLD_"):]] = value
+            else:
+                raise ValueError(f"Unknown walk-forward parameter: {name}")
+        yield
+    finally:
+        for name, value in saved_globals.items():
+            setattr(execution, name, value)
+        entry_logic.THRESHOLDS.clear()
+        entry_logic.THRESHOLDS.update(saved_thresholds)
+
+
+@contextlib.contextmanager
+def _offline_argv(db_path: str) -> Iterator[None]:
+    """Present ``--db <db_path>`` as the command line while execution imports.
+
+    execution decides at import time, from ``--db`` in argv, to skip the
+    paper/live (Fyers) bootstrap; the real argv is restored afterwards.
+    """
+    saved = sys.argv
+    sys.argv = [saved[0] if saved else "walk_forward.py", "--db", db_path]
+    try:
+        yield
+    finally:
+        sys.argv = saved
+
+
+def replay_day_metrics(
+    params: Dict[str, Any],
+    trade_date: str,
+    db_path: str,
+    symbol: str,
+) -> Dict[str, Any]:
+    """Replay one day with ``params`` applied; return per-day trade metrics."""
+    with _offline_argv(db_path):
+        from execution import run_offline_replay
+
+    with tempfile.TemporaryDirectory(prefix="wf_") as out_dir:
+        with apply_entry_params(params):
+            run_offline_replay(
+                None,
+                symbols_list=[symbol],
+                date_str=trade_date,
+                output_dir=out_dir,
+                db_path=db_path,
+                auto_report=False,
+                record_store=False,
+            )
+        trades_csv = os.path.join(out_dir, f"trades_{symbol.replace(':', '_')}_{trade_date}.csv")
+        pnl = (
+            pd.read_csv(trades_csv)["pnl_points"].to_numpy(dtype=float)
+            if os.path.exists(trades_csv) else np.empty(0)
+        )
+    return day_metrics_from_pnl(pnl)
+
+
+def cache_version(evaluate_day: Callable = None) -> str:
+    """Code version of cached day metrics: changes with the evaluator's source.
+
+    Hashes WF_CACHE_VERSION, the evaluator's name and source file and, for
+    the default full replay, the source of ``_REPLAY_MODULES``.
+    """
+    evaluate_day = evaluate_day or replay_day_metrics
+    digest = hashlib.sha1(
+        f"{WF_CACHE_VERSION}:{evaluate_day.__module__}.{evaluate_day.__qualname__}".encode("utf-8")
+    )
+    files = [inspect.getsourcefile(evaluate_day)]
+    if evaluate_day is replay_day_metrics:
+        files += [getattr(importlib.util.find_spec(name), "origin", None) for name in _REPLAY_MODULES]
+    for path in files:
+        if path and os.path.exists(path):
+            digest.update(Path(path).read_bytes())
+    return digest.hexdigest()[:12]
+
+
+def day_metrics_from_pnl(pnl: np.ndarray) -> Dict[str, Any]:
+    """Additive per-day trade statistics (summed across days for a window)."""
+    return {
+        "trades": int(pnl.size),
+        "wins": int((pnl > 0).sum()),
+        "pnl_pts": float(pnl.sum()),
+        "gross_win": float(pnl[pnl > 0].sum()),
+        "gross_loss": float(-pnl[pnl < 0].sum()),
+    }
+
+
+def _day_job(job: Dict[str, Any], _arrays: dict) -> Dict[str, Any]:
+    try:
+        metrics = job["evaluate"](job["params"], job["trade_date"], job["db_path"], job["symbol"])
+        error = ""
+    except Exception as e:
+        logging.error(f"[WALKFWD] replay failed {job['trade_date']} {job['params']}: {e}")
+        metrics, error = day_metrics_from_pnl(np.empty(0)), str(e)
+    return {"param_key": job["key"], "trade_date": job["trade_date"], "error": error, **metrics}
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Results store
+# ─────────────────────────────────────────────────────────────────────────────
+
+class WalkForwardStore:
+    """SQLite store: cached per-day replay metrics and one row per fold result."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        cols = [r[1] for r in self.conn.execute("PRAGMA table_info(wf_day_metrics)")]
+        if cols and "version" not in cols:
+            # Unversioned cache from an older harness: cannot tell what produced it.
+            self.conn.execute("DROP TABLE wf_day_metrics")
+        self.conn.executescript("""
+            CREATE TABLE IF NOT EXISTS wf_day_metrics (
+                param_key TEXT, symbol TEXT, trade_date TEXT, version TEXT,
+                trades INTEGER, wins INTEGER, pnl_pts REAL,
+                gross_win REAL, gross_loss REAL,
+                PRIMARY KEY (param_key, symbol, trade_date, version)
+            );
+            CREATE TABLE IF NOT EXISTS wf_folds (
+                run_id TEXT, fold INTEGER, symbol TEXT,
+                is_start TEXT, is_end TEXT, oos_start TEXT, oos_end TEXT,
+                params TEXT, objective TEXT, is_score REAL, is_trades INTEGER,
+                oos_trades INTEGER, oos_win_rate REAL, oos_total_pnl_pts REAL,
+                oos_profit_factor REAL, oos_max_dd_pts REAL,
+                PRIMARY KEY (run_id, fold)
+            );
+        """)
+
+    def cached_day_metrics(self, symbol: str, version: str) -> pd.DataFrame:
+        return pd.read_sql_query(
+            "SELECT * FROM wf_day_metrics WHERE symbol = ? AND version = ?",
+            self.conn, params=(symbol, version),
+        ).drop(columns=["version"])
+
+    def save_day_metrics(self, symbol: str, version: str, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+        ok = df[df["error"] == ""] if "error" in df.columns else df
+        self.conn.executemany(
+            "INSERT OR REPLACE INTO wf_day_metrics VALUES (?,?,?,?,?,?,?,?,?)",
+            [
+                (r.param_key, symbol, r.trade_date, version, int(r.trades), int(r.wins),
+                 float(r.pnl_pts), float(r.gross_win), float(r.gross_loss))
+                for r in ok.itertuples(index=False)
+            ],
+        )
+        self.conn.commit()
+
+    def save_fold(self, row: Dict[str, Any]) -> None:
+        cols = ", ".join(row)
+        self.conn.execute(
+            f"INSERT OR REPLACE INTO wf_folds ({cols}) VALUES ({', '.join('?' * len(row))})",
+            list(row.values()),
+        )
+        self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "WalkForwardStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  Walk-forward driver
+# ─────────────────────────────────────────────────────────────────────────────
+
+def window_metrics(day_rows: pd.DataFrame) -> Dict[str, Any]:
+    """Aggregate per-day rows (one parameter set) into window metrics."""
+    trades = int(day_rows["trades"].sum())
+    wins = int(day_rows["wins"].sum())
+    pnl = float(day_rows["pnl_pts"].sum())
+    gross_loss = float(day_rows["gross_loss"].sum())
+    daily = day_rows.sort_values("trade_date")["pnl_pts"].to_numpy(dtype=float)
+    return {
+        "trades": trades,
+        "win_rate": round(wins / trades * 100, 2) if trades else 0.0,
+        "total_pnl_pts": round(pnl, 2),
+        "avg_pnl_pts": round(pnl / trades, 3) if trades else 0.0,
+        "profit_factor": round(float(day_rows["gross_win"].sum()) / gross_loss, 3)
+        if gross_loss > 0 else float("inf") if trades else 0.0,
+        "max_dd_pts": round(_max_drawdown(daily), 2),
+    }
+
+
+def _evaluate_pairs(
+    pairs: Sequence[tuple],
+    candidates: Dict[str, Dict[str, Any]],
+    days: Dict[str, str],
+    symbol: str,
+    store: WalkForwardStore,
+    cache: pd.DataFrame,
+    evaluate_day: Callable,
+    workers: Optional[int],
+    version: str,
+) -> pd.DataFrame:
+    """Replay the (param_key, day) pairs missing from ``cache``; return the union."""
+    have = set(zip(cache["param_key"], cache["trade_date"])) if not cache.empty else set()
+    todo = [(k, d) for k, d in dict.fromkeys(pairs) if (k, d) not in have]
+    if todo:
+        logging.info(f"[WALKFWD] replaying {len(todo)} (params, day) pairs ({len(have)} cached)")
+        jobs = [
+            {"evaluate": evaluate_day, "key": k, "params": candidates[k],
+             "trade_date": d, "db_path": days[d], "symbol": symbol}
+            for k, d in todo
+        ]
+        fresh = run_sweep(_day_job, jobs, workers=workers, chunksize=1, merge_params=False)
+        store.save_day_metrics(symbol, version, fresh)
+        fresh = fresh[fresh["error"] == ""].drop(columns=["error"])
+        cache = pd.concat([cache, fresh], ignore_index=True)
+    return cache
+
+
+def run_walk_forward(
+    db_glob: str,
+    store_path: str,
+    space: Optional[Dict[str, Any]] = None,
+    method: str = "grid",
+    n: Optional[int] = None,
+    seed: int = 0,
+    is_days: int = 10,
+    oos_days: int = 5,
+    step: Optional[int] = None,
+    objective: str = "total_pnl_pts",
+    min_trades: int = 5,
+    symbol: str = "NSE:NIFTY50-INDEX",
+    workers: Optional[int] = None,
+    run_id: Optional[str] = None,
+    evaluate_day: Callable = replay_day_metrics,
+) -> pd.DataFrame:
+    """Run every fold and return one row per fold (also written to the store).
+
+    evaluate_day  top-level (picklable) fn(params, trade_date, db_path, symbol)
+                  → day_metrics_from_pnl() dict; defaults to a full replay
+    min_trades    IS candidates with fewer trades are not eligible
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"objective must be one of {OBJECTIVES}")
+    days = discover_days(db_glob)
+    folds = make_folds(list(days), is_days, oos_days, step)
+    if not folds:
+        logging.warning(
+            f"[WALKFWD] {len(days)} days found — need at least {is_days + oos_days} for one fold"
+        )
+        return pd.DataFrame()
+
+    param_sets = sample_params(space or WF_PARAM_SPACE, method, n=n, seed=seed)
+    candidates = {param_key(p): p for p in param_sets}
+    run_id = run_id or pd.Timestamp.now().strftime("%Y%m%d_%H%M%S")
+    version = cache_version(evaluate_day)
+    logging.info(
+        f"[WALKFWD] run={run_id} days={len(days)} folds={len(folds)} "
+        f"candidates={len(candidates)} IS={is_days} OOS={oos_days} objective={objective} "
+        f"version={version}"
+    )
+
+    with WalkForwardStore(store_path) as store:
+        cache = store.cached_day_metrics(symbol, version)
+        cache = cache[cache["param_key"].isin(list(candidates))]
+
+        # Phase 1 — every candidate on the union of IS days, all folds at once.
+        is_pairs = [(k, d) for f in folds for d in f.is_days for k in candidates]
+        cache = _evaluate_pairs(is_pairs, candidates, days, symbol, store, cache,
+                                evaluate_day, workers, version)
+
+        chosen = {}
+        for fold in folds:
+            is_rows = cache[cache["trade_date"].isin(fold.is_days)]
+            scored = []
+            for key, rows in is_rows.groupby("param_key", sort=False):
+                m = window_metrics(rows)
+                if m["trades"] >= min_trades:
+                    scored.append((m[objective], m["trades"], key, m))
+            if scored:
+                scored.sort(key=lambda s: (s[0], s[1]), reverse=True)
+                chosen[fold.index] = scored[0]
+
+        # Phase 2 — each fold's winner on its OOS window, all folds at once.
+        oos_pairs = [(chosen[f.index][2], d) for f in folds if f.index in chosen for d in f.oos_days]
+        cache = _evaluate_pairs(oos_pairs, candidates, days, symbol, store, cache,
+                                evaluate_day, workers, version)
+
+        results = []
+        for fold in folds:
+            row = {
+                "run_id": run_id, "fold": fold.index, "symbol": symbol,
+                "is_start": fold.is_days[0], "is_end": fold.is_days[-1],
+                "oos_start": fold.oos_days[0], "oos_end": fold.oos_days[-1],
+                "objective": objective,
+            }
+            if fold.index not in chosen:
+                logging.warning(
+                    f"[WALKFWD] fold {fold.index} {row['is_start']}..{row['is_end']}: "
+                    f"no candidate reached {min_trades} IS trades — skipped"
+                )
+                continue
+            is_score, is_trades, key, _ = chosen[fold.index]
+            oos = window_metrics(cache[
+                (cache["param_key"] == key) & cache["trade_date"].isin(fold.oos_days)
+            ])
+            row.update({
+                "params": key, "is_score": is_score, "is_trades": is_trades,
+                **{f"oos_{k}": v for k, v in oos.items() if k != "avg_pnl_pts"},
+            })
+            store.save_fold(row)
+            results.append(row)
+            logging.info(
+                f"[WALKFWD] fold {fold.index} IS {row['is_start']}..{row['is_end']} "
+                f"OOS {row['oos_start']}..{row['oos_end']} params={key} "
+                f"IS {objective}={is_score} | OOS trades={oos['trades']} "
+                f"win={oos['win_rate']}% pnl={oos['total_pnl_pts']:+.1f}pts "
+                f"pf={oos['profit_factor']} dd={oos['max_dd_pts']}"
+            )
+
+    return pd.DataFrame(results)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+#  CLI
+# ─────────────────────────────────────────────────────────────────────────────
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Walk-forward optimisation of entry parameters")
+    parser.add_argument("--db", default=r"C:\SQLite\ticks\ticks_*.db",
+                        help="glob of ticks_YYYY-MM-DD.db files (the archive)")
+    parser.add_argument("--symbol", default="NSE:NIFTY50-INDEX")
+    parser.add_argument("--is-days", type=int, default=10)
+    parser.add_argument("--oos-days", type=int, default=5)
+    parser.add_argument("--step", type=int, default=None, help="fold advance (default = --oos-days)")
+    parser.add_argument("--method", choices=["grid", "random", "lhs"], default="grid")
+    parser.add_argument("--n", type=int, default=None, help="configs for random/lhs (grid cap)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--objective", choices=OBJECTIVES, default="total_pnl_pts")
+    parser.add_argument("--min-trades", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--store", default="walk_forward_results.db")
+    return parser.parse_args()
+
+
+def main() -> None:
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    args = parse_args()
+    results = run_walk_forward(
+        db_glob=args.db,
+        store_path=args.store,
+        method=args.method,
+        n=args.n,
+        seed=args.seed,
+        is_days=args.is_days,
+        oos_days=args.oos_days,
+        step=args.step,
+        objective=args.objective,
+        min_trades=args.min_trades,
+        symbol=args.symbol,
+        workers=args.workers,
+    )
+    if results.empty:
+        print("No walk-forward folds completed.")
+        return
+    print(results.drop(columns=["run_id", "symbol"]).to_string(index=False))
+    print(
+        f"\nOOS total: {results['oos_total_pnl_pts'].sum():+.1f}pts over "
+        f"{int(results['oos_trades'].sum())} trades → {args.store}"
+    )
+
+
+if __name__ == "__main__":
+    main()